@@ -1,8 +1,8 @@
 from dash import callback, Input, Output, State
 import pandas as pd
-import json
 from datetime import datetime
 from src.utils.db import run_queries
+from src.utils.json_columns import decode_json_lists, parse_json_list_columns
 import time
 from inflection import titleize, pluralize
 from functools import wraps
@@ -50,16 +50,11 @@ def register_compliance_filter_callbacks(app):
         result = run_queries({"compliance_attributes": query}, 'compliance', 1)
         compliance_df = result["compliance_attributes"]
 
-        # Parse JSON columns
-        compliance_df['ViolationName'] = compliance_df['ViolationName'].apply(json.loads)
-        compliance_df['RuleNumber'] = compliance_df['RuleNumber'].apply(json.loads)
-        compliance_df['RuleTitle'] = compliance_df['RuleTitle'].apply(json.loads)
-        compliance_df['CitationFee'] = compliance_df['CitationFee'].apply(json.loads)
-        compliance_df['FineType'] = compliance_df['FineType'].apply(json.loads)
-        compliance_df['ReportIds'] = compliance_df['ReportIds'].apply(lambda x: json.loads(x) if pd.notna(x) else [])
-        
-        # Create NumReportIds column
-        compliance_df.insert(compliance_df.columns.get_loc('ReportIds') + 1, 'NumReportIds', compliance_df['ReportIds'].apply(len))
+        # Parse JSON columns (one pass per column); ReportIds is only needed as a count
+        parse_json_list_columns(compliance_df, ['ViolationName', 'RuleNumber', 'RuleTitle', 'CitationFee', 'FineType'])
+        compliance_df.insert(
+            compliance_df.columns.get_loc('ReportIds') + 1, 'NumReportIds', decode_json_lists(compliance_df['ReportIds']).lengths
+        )
         
         # Drop ReportIds as we only need the count
         compliance_df.drop('ReportIds', axis=1, inplace=True)
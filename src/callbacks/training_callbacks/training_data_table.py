@@ -13,6 +13,11 @@ from src.utils.db import run_queries
 import time
 from functools import wraps
 from src.utils.performance import monitor_performance, monitor_query_performance
+from src.utils.cache import make_cache_key
+from src.utils.paged_table import PagedFrameCache
+
+# Prepared report frames shared by the paging callback and the exports
+_training_report_frames = PagedFrameCache()
 
 def register_training_data_table_callbacks(app):
     """
@@ -30,7 +35,7 @@ def register_training_data_table_callbacks(app):
         queries = {
             # Member engagement data for member activity summary
             "member_engagement": """
-                SELECT TOP 5000
+                SELECT
                     [MemberID],
                     [MemberName],
                     [FirstName],
@@ -54,7 +59,7 @@ def register_training_data_table_callbacks(app):
             
             # Class attendance details
             "class_attendance": """
-                SELECT TOP 5000
+                SELECT
                     [AttendanceID],
                     [TrainingClassId],
                     [ClassName],
@@ -455,6 +460,33 @@ def register_training_data_table_callbacks(app):
             traceback.print_exc()
             return pd.DataFrame()
 
+    def get_training_report_frame(query_selections, report_type):
+        """
+        Build (or reuse) the prepared report frame for the current filters and report type
+        The frame is kept in-process so page, sort and filter requests never rebuild it
+        """
+        cache_key = make_cache_key(query_selections or {}, report_type)
+
+        def build_report_frame():
+            base_data = get_training_data_table_base_data()
+            filtered_data = apply_data_table_filters(base_data, query_selections)
+            return prepare_data_table_report(filtered_data, report_type)
+
+        return _training_report_frames.get_or_build(cache_key, build_report_frame)
+
+    def create_data_table_summary(total_records, matching_records, report_type):
+        """Summary line shown above the data table"""
+        if matching_records == total_records:
+            record_text = f"Showing {total_records:,} records"
+        else:
+            record_text = f"Showing {matching_records:,} of {total_records:,} records"
+        
+        return html.P([
+            html.Strong(record_text),
+            f" • Report: {report_type.replace('_', ' ').title()}",
+            f" • Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        ], className="text-muted small mb-3")
+
     @callback(
         Output("training-data-table-container", "children"),
         [Input("training-filtered-query-store", "data"),
@@ -466,18 +498,14 @@ def register_training_data_table_callbacks(app):
     def update_training_data_table(query_selections, report_type, page_size):  # ✅ REMOVED: search_term parameter
         """
         Update training data table based on selections
+        Only the first page is sent; paging, sorting and filtering are served by update_training_data_table_page
         """
         try:
             # print(f"🔄 Updating training data table: report={report_type}, page_size={page_size}")
             
-            # Get base data
-            base_data = get_training_data_table_base_data()
-            
-            # Apply filters
-            filtered_data = apply_data_table_filters(base_data, query_selections)
-            
-            # Prepare report data
-            report_df = prepare_data_table_report(filtered_data, report_type)  # ✅ REMOVED: search_term argument
+            # Prepared (filtered) report frame over the full dataset
+            report_frame = get_training_report_frame(query_selections, report_type)
+            report_df = report_frame.df
             
             if report_df.empty:
                 return html.Div([
@@ -519,15 +547,23 @@ def register_training_data_table_callbacks(app):
                 }
             ]
             
+            # First page only - the rest is served on demand
+            first_page, total_records, page_count = report_frame.get_page(0, page_size)
+            
             # Create the data table
             data_table = dash_table.DataTable(
                 id="training-data-table",
                 columns=columns,
-                data=report_df.to_dict('records'),
+                data=first_page,
+                page_current=0,
                 page_size=page_size,
-                sort_action="native",
+                page_count=page_count,
+                page_action="custom",
+                sort_action="custom",
                 sort_mode="multi",
-                filter_action="native",  # ✅ This provides per-column filtering
+                sort_by=[],
+                filter_action="custom",  # ✅ Per-column filtering evaluated server-side
+                filter_query="",
                 style_table={
                     'overflowX': 'auto',
                     'minWidth': '100%'
@@ -553,13 +589,10 @@ def register_training_data_table_callbacks(app):
             )
             
             # Add summary information
-            summary_info = html.Div([
-                html.P([
-                    html.Strong(f"Showing {len(report_df):,} records"),
-                    f" • Report: {report_type.replace('_', ' ').title()}",
-                    f" • Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                ], className="text-muted small mb-3")
-            ])
+            summary_info = html.Div(
+                create_data_table_summary(total_records, total_records, report_type),
+                id="training-data-table-summary"
+            )
             
             return html.Div([summary_info, data_table])
             
@@ -571,6 +604,47 @@ def register_training_data_table_callbacks(app):
                 html.P(f"Error loading data table: {str(e)}", 
                        className="text-danger text-center p-4")
             ])
+
+    @callback(
+        [Output("training-data-table", "data"),
+         Output("training-data-table", "page_count"),
+         Output("training-data-table", "page_current"),
+         Output("training-data-table-summary", "children")],
+        [Input("training-data-table", "page_current"),
+         Input("training-data-table", "page_size"),
+         Input("training-data-table", "sort_by"),
+         Input("training-data-table", "filter_query")],
+        [State("training-filtered-query-store", "data"),
+         State("data-table-report-type-dropdown", "value")],
+        prevent_initial_call=True
+    )
+    @monitor_performance("Training Data Table Page")
+    def update_training_data_table_page(page_current, page_size, sort_by, filter_query, query_selections, report_type):
+        """
+        Serve one page of the training data table with server-side sorting and filtering
+        """
+        try:
+            report_frame = get_training_report_frame(query_selections, report_type)
+            
+            # A new filter or sort always starts from the first page
+            if ctx.triggered_id is not None and any(
+                trigger['prop_id'].endswith(('.sort_by', '.filter_query')) for trigger in ctx.triggered
+            ):
+                page_current = 0
+            
+            records, matching_records, page_count = report_frame.get_page(
+                page_current, page_size, sort_by, filter_query
+            )
+            page_current = min(max(0, page_current or 0), page_count - 1)
+            summary = create_data_table_summary(len(report_frame), matching_records, report_type)
+            
+            return records, page_count, page_current, summary
+            
+        except Exception as e:
+            print(f"❌ Error paging training data table: {e}")
+            import traceback
+            traceback.print_exc()
+            return no_update, no_update, no_update, no_update
         
     @callback(
         Output("download-csv", "data"),
@@ -590,14 +664,8 @@ def register_training_data_table_callbacks(app):
         try:
             # print(f"📥 Exporting CSV: report={report_type}")
             
-            # Get base data
-            base_data = get_training_data_table_base_data()
-            
-            # Apply filters
-            filtered_data = apply_data_table_filters(base_data, query_selections)
-            
-            # Prepare report data
-            report_df = prepare_data_table_report(filtered_data, report_type)  # ✅ REMOVED: search_term argument
+            # Reuse the prepared report frame served to the table
+            report_df = get_training_report_frame(query_selections, report_type).df
             
             if report_df.empty:
                 return no_update
@@ -630,14 +698,8 @@ def register_training_data_table_callbacks(app):
         try:
             # print(f"📥 Exporting Excel: report={report_type}")
             
-            # Get base data
-            base_data = get_training_data_table_base_data()
-            
-            # Apply filters
-            filtered_data = apply_data_table_filters(base_data, query_selections)
-            
-            # Prepare report data
-            report_df = prepare_data_table_report(filtered_data, report_type)
+            # Reuse the prepared report frame served to the table
+            report_df = get_training_report_frame(query_selections, report_type).df
             
             if report_df.empty:
                 # print("❌ No data to export")
@@ -694,9 +756,7 @@ def register_training_data_table_callbacks(app):
             # ✅ FALLBACK: If Excel fails, export as CSV with .xlsx extension
             try:
                 # print("⚠️ Falling back to CSV export with Excel extension")
-                base_data = get_training_data_table_base_data()
-                filtered_data = apply_data_table_filters(base_data, query_selections)
-                report_df = prepare_data_table_report(filtered_data, report_type)
+                report_df = get_training_report_frame(query_selections, report_type).df
                 
                 if not report_df.empty:
                     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -726,14 +786,8 @@ def register_training_data_table_callbacks(app):
         try:
             # print(f"📄 Exporting PDF: report={report_type}")
             
-            # Get base data
-            base_data = get_training_data_table_base_data()
-            
-            # Apply filters
-            filtered_data = apply_data_table_filters(base_data, query_selections)
-            
-            # Prepare report data
-            report_df = prepare_data_table_report(filtered_data, report_type)
+            # Reuse the prepared report frame served to the table
+            report_df = get_training_report_frame(query_selections, report_type).df
             
             if report_df.empty:
                 # print("❌ No data to export")
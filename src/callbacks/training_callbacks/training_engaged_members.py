@@ -8,6 +8,11 @@ from functools import wraps
 import logging
 from src.utils.db import run_queries
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
+from src.utils.cache import LocalCache
+from src.utils.engagement_index import EngagementIndex
+
+# Ranked member engagement index shared by every filter selection until the data refreshes
+_engagement_indexes = LocalCache(max_entries=1)
 
 def register_training_engaged_members_callbacks(app):
     """
@@ -15,32 +20,6 @@ def register_training_engaged_members_callbacks(app):
     """
     # print("Registering Training Engaged Members callback (server-side)...")
 
-    @monitor_performance("Member Engagement Filter Application for Members")
-    def apply_member_filters(df_members, query_selections):
-        """
-        Apply user filter selections to member engagement data
-        """
-        if not query_selections:
-            # print("📋 No query selections for members - returning all data")
-            return df_members
-        
-        df_filtered = df_members.copy()
-        # print(f"📊 Starting with {len(df_filtered)} member records")
-        
-        # Apply Office filter (members have OfficeCode)
-        offices_filter = query_selections.get('Offices', '')
-        if offices_filter and offices_filter.strip():
-            office_list = [office.strip().strip("'\"") for office in offices_filter.split(',')]
-            office_list = [office for office in office_list if office]
-            
-            if office_list and 'OfficeCode' in df_filtered.columns:
-                before_count = len(df_filtered)
-                df_filtered = df_filtered[df_filtered['OfficeCode'].isin(office_list)]
-                # print(f"🏢 Office filter ({office_list}): {before_count} → {len(df_filtered)} members")
-        
-        # print(f"✅ Final filtered members: {len(df_filtered)} records")
-        return df_filtered
-
     @monitor_performance("Member Engagement Filter Application for Attendance")
     def apply_attendance_filters(df_attendance, query_selections):
         """
@@ -140,62 +119,45 @@ def register_training_engaged_members_callbacks(app):
         # print(f"✅ Final filtered attendance: {len(df_filtered)} records")
         return df_filtered
 
-    @monitor_performance("Top Members Calculation for Member Engagement")
-    def calculate_top_members(df_members, metric, top_count):
+    @monitor_performance("Engagement Index Build")
+    def build_engagement_bundle():
         """
-        Calculate top members based on selected engagement metric from Fact_MemberEngagement
+        Fetch member engagement and attendance stats concurrently and rank members once per refresh
         """
-        # print(f"📊 Calculating top members using metric: {metric}")
-        # print(f"📋 Available columns: {list(df_members.columns)}")
-        
-        # Ensure we have the required columns
-        required_columns = ['MemberID', 'MemberName', 'TotalSessionsRegistered','TotalSessionsAttended', 'MissedSessions','AttendanceRate']
-        missing_columns = [col for col in required_columns if col not in df_members.columns]
-        
-        if missing_columns:
-            # print(f"❌ Missing required columns: {missing_columns}")
-            return pd.DataFrame()
-        
-        # Calculate metric values
-        df_calc = df_members.copy()
-        
-        # Fill any null values with defaults
-        df_calc['TotalSessionsRegistered'] = df_calc.get('TotalSessionsRegistered', 0).fillna(0)
-        df_calc['TotalSessionsAttended'] = df_calc.get('TotalSessionsAttended', 0).fillna(0)
-        df_calc['AttendanceRate'] = df_calc.get('AttendanceRate', 0).fillna(0)
-        df_calc['MissedSessions'] = df_calc.get('MissedSessions', 0).fillna(0)
-        
-        # Calculate training hours (estimate: 1 hour per session attended)
-        df_calc['training_hours'] = df_calc['TotalSessionsAttended'] * 1.0
-        
-        # For topics completed, we'd need additional data - use a placeholder calculation
-        # This could be enhanced by joining with attendance_stats to count unique topics
-        df_calc['topics_completed'] = (df_calc['TotalSessionsAttended'] / 2).apply(lambda x: max(1, int(x)))
-        
-        # Select metric value based on user selection
-        if metric == 'sessions_attended':
-            df_calc['metric_value'] = df_calc['TotalSessionsAttended']
-            metric_label = ''
-        elif metric == 'training_hours':
-            df_calc['metric_value'] = df_calc['training_hours']
-            metric_label = ' hrs'
-        elif metric == 'topics_completed':
-            df_calc['metric_value'] = df_calc['topics_completed']
-            metric_label = ''
-        else:
-            df_calc['metric_value'] = df_calc['TotalSessionsAttended']  # Default
-            metric_label = ''
-        
-        # Sort by metric value and get top N
-        df_sorted = df_calc.sort_values('metric_value', ascending=False)
-        top_members = df_sorted.head(top_count)
+        queries = {
+            "attendance_stats": 'SELECT [TrainingClassId],[StartTime],[TrainingTopicId],[LocationId],[InstructorId],[AorShortName],[MemberOffice],[TotalAttendances] FROM [consumable].[Fact_AttendanceStats]',
+            "active_members": "SELECT [MemberID],[MemberName],[OfficeCode],[TotalSessionsRegistered],[TotalSessionsAttended],[MissedSessions],[AttendanceRate] FROM [consumable].[Fact_MemberEngagement] WHERE ([TotalSessionsRegistered] > 0 OR [TotalSessionsAttended] > 0) AND [MemberStatus] = 'Active'"            
+        }
         
-        # Add metric label for display
-        top_members = top_members.copy()
-        top_members['metric_label'] = metric_label
+        # Execute all queries at once
+        results = run_queries(queries, 'training', len(queries))
         
-        # print(f"📊 Calculated top {len(top_members)} members by {metric}")
-        return top_members
+        df_members = results["active_members"]
+        return {
+            "index": EngagementIndex(df_members),
+            "member_count": len(df_members),
+            "attendance": results["attendance_stats"]
+        }
+
+    def get_engagement_bundle():
+        return _engagement_indexes.get_or_build('engagement_index', build_engagement_bundle)
+
+    def get_office_scope(query_selections):
+        """Office codes selected in the filters (None = no office restriction)"""
+        offices_filter = (query_selections or {}).get('Offices', '')
+        if offices_filter and offices_filter.strip():
+            office_list = [office.strip().strip("'\"") for office in offices_filter.split(',')]
+            office_list = [office for office in office_list if office]
+            if office_list:
+                return set(office_list)
+        return None
+
+    @monitor_performance("Top Members Calculation for Member Engagement")
+    def calculate_top_members(engagement_index, metric, top_count, offices=None):
+        """
+        Top members for the selected engagement metric, served from the ranked index
+        """
+        return engagement_index.leaderboard(metric, top_count, offices)
 
     @monitor_chart_performance("Top Engaged Members Chart Creation")
     def create_members_chart(top_members, metric, top_count):
@@ -206,51 +168,43 @@ def register_training_engaged_members_callbacks(app):
             return create_empty_chart("No Data", "No member data available")
         
         # Prepare chart data
-        member_names = top_members['MemberName'].tolist()
         values = top_members['metric_value'].tolist()
         metric_label = top_members['metric_label'].iloc[0] if 'metric_label' in top_members.columns else ''
         
         # ✅ FIXED: Handle duplicate names by making them unique with member ID suffix
-        display_names = []
-        name_counts = {}
-        
-        # First pass: count occurrences of each name
-        for name in member_names:
-            name_counts[name] = name_counts.get(name, 0) + 1
+        member_names = top_members['MemberName']
+        is_duplicate = member_names.duplicated(keep=False)
+        # Use last 4 chars of member ID to make it unique
+        suffixes = top_members['MemberID'].astype(str).str[-4:]
+        unique_names = member_names.where(~is_duplicate, member_names + ' #' + suffixes)
         
-        # Second pass: create unique display names
-        for i, (_, member) in enumerate(top_members.iterrows()):
-            name = member['MemberName']
-            member_id = member.get('MemberID', '')
-            
-            if name_counts[name] > 1:  # Duplicate name found
-                # Use last 4 chars of member ID to make it unique
-                suffix = member_id[-4:] if len(member_id) >= 4 else member_id
-                unique_name = f"{name} #{suffix}"
-            else:
-                unique_name = name
-            
-            # Truncate if too long for display
-            if len(unique_name) > 25:
-                unique_name = unique_name[:22] + '...'
-            
-            display_names.append(unique_name)
+        # Truncate if too long for display
+        display_names = unique_names.where(unique_names.str.len() <= 25, unique_names.str[:22] + '...').tolist()
         
         # Create hover text with detailed information including MemberID
-        hover_texts = []
-        for i, (_, member) in enumerate(top_members.iterrows()):
-            hover_text = (
-                f"<b>{member['MemberName']}</b><br>"
-                f"Member ID: {member.get('MemberID', 'Unknown')}<br>"
-                f"Office: {member.get('OfficeCode', 'Unknown')}<br>"
-                f"Sessions Attended: {member.get('TotalSessionsAttended', 0)}<br>"
-                f"Sessions Registered: {member.get('TotalSessionsRegistered', 0)}<br>"
-                f"Attendance Rate: {member.get('AttendanceRate', 0):.1f}%<br>"
-                f"Missed Sessions: {member.get('MissedSessions', 0)}<br>"
-                f"Est. Training Hours: {member.get('training_hours', 0):.1f}<br>"
+        hover_texts = [
+            (
+                f"<b>{name}</b><br>"
+                f"Member ID: {member_id}<br>"
+                f"Office: {office}<br>"
+                f"Sessions Attended: {attended}<br>"
+                f"Sessions Registered: {registered}<br>"
+                f"Attendance Rate: {rate:.1f}%<br>"
+                f"Missed Sessions: {missed}<br>"
+                f"Est. Training Hours: {hours:.1f}<br>"
                 f"<extra></extra>"
             )
-            hover_texts.append(hover_text)
+            for name, member_id, office, attended, registered, rate, missed, hours in zip(
+                member_names,
+                top_members['MemberID'],
+                top_members.get('OfficeCode', pd.Series('Unknown', index=top_members.index)),
+                top_members['TotalSessionsAttended'],
+                top_members['TotalSessionsRegistered'],
+                top_members['AttendanceRate'],
+                top_members['MissedSessions'],
+                top_members['training_hours']
+            )
+        ]
         
         # Determine chart title and axis label based on metric
         metric_info = {
@@ -263,9 +217,7 @@ def register_training_engaged_members_callbacks(app):
         
         # ✅ CRITICAL FIX: Create individual bar traces to prevent stacking
         # Instead of one trace with multiple bars, create separate traces for duplicate names
-        duplicate_names = [name for name, count in name_counts.items() if count > 1]
-        
-        if any(member['MemberName'] in duplicate_names for _, member in top_members.iterrows()):
+        if is_duplicate.any():
             # When we have duplicates, create individual traces
             traces = []
             for i, (display_name, value, hover_text) in enumerate(zip(display_names, values, hover_texts)):
@@ -475,43 +427,31 @@ def register_training_engaged_members_callbacks(app):
         
         
         try:
-            queries = {
-                "attendance_stats": 'SELECT [TrainingClassId],[StartTime],[TrainingTopicId],[LocationId],[InstructorId],[AorShortName],[MemberOffice],[TotalAttendances] FROM [consumable].[Fact_AttendanceStats]',
-                "active_members": "SELECT [MemberID],[MemberName],[OfficeCode],[TotalSessionsRegistered],[TotalSessionsAttended],[MissedSessions],[AttendanceRate] FROM [consumable].[Fact_MemberEngagement] WHERE ([TotalSessionsRegistered] > 0 OR [TotalSessionsAttended] > 0) AND [MemberStatus] = 'Active'"            
-            }
+            bundle = get_engagement_bundle()
+            engagement_index = bundle["index"]
+            df_attendance = bundle["attendance"]
             
-            # Execute all queries at once
-            results = run_queries(queries, 'training',  1)
-
-            df_members = results["active_members"]
-            df_attendance = results["attendance_stats"]
-            
-            if df_members.empty:
+            if bundle["member_count"] == 0:
                 # print("⚠️ No member engagement data available")
                 return create_empty_chart("No Member Data", "No member engagement data found")
             
-            # Apply user filters to both datasets
-            df_members_filtered = apply_member_filters(df_members, query_selections)
-            df_attendance_filtered = apply_attendance_filters(df_attendance, query_selections)
+            # Members are only filtered by office, so user filters reduce to an office scope
+            offices = get_office_scope(query_selections)
             
-            if df_members_filtered.empty:
+            if offices is not None and engagement_index.member_count(offices) == 0 and not engagement_index.empty:
                 # print("⚠️ No members after applying filters")
                 return create_empty_chart("No Data After Filtering", "No members match the selected filters")
             
-            # print(f"📊 Members after filtering: {len(df_members_filtered)}")
-            # print(f"📊 Attendance records after filtering: {len(df_attendance_filtered)}")
-            
-            # Get member IDs that are active in the filtered attendance data (if date filters applied)
-            active_member_ids = None
-            if not df_attendance_filtered.empty and query_selections and ('Day_From' in query_selections or 'Day_To' in query_selections):
+            # Get member offices that are active in the filtered attendance data (if date filters applied)
+            if query_selections and ('Day_From' in query_selections or 'Day_To' in query_selections):
+                df_attendance_filtered = apply_attendance_filters(df_attendance, query_selections)
                 # Get unique offices from filtered attendance to further filter members
                 active_offices = set(df_attendance_filtered['MemberOffice'].dropna().unique()) if 'MemberOffice' in df_attendance_filtered.columns else set()
                 if active_offices:
-                    df_members_filtered = df_members_filtered[df_members_filtered['OfficeCode'].isin(active_offices)]
-                    # print(f"📊 Members after date-based office filtering: {len(df_members_filtered)}")
+                    offices = active_offices if offices is None else offices & active_offices
             
             # Calculate engagement metrics and get top members
-            top_members = calculate_top_members(df_members_filtered, engagement_metric, top_count)
+            top_members = calculate_top_members(engagement_index, engagement_metric, top_count, offices)
             
             if top_members.empty:
                 # print("⚠️ No engagement data calculated")
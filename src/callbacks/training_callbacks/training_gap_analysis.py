@@ -1,5 +1,6 @@
 from dash import callback, ctx, dcc, html, Input, Output, State, no_update
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from src.utils.db import run_queries
@@ -7,6 +8,11 @@ import time
 import copy
 from functools import wraps
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
+from src.utils.cache import LocalCache
+from src.utils.gap_analysis_engine import GapAnalysisEngine, SLOT_COLUMNS, MEMBER_COLUMNS
+
+# Registration/attendance engine shared by every filter selection until the data refreshes
+_gap_analysis_engines = LocalCache(max_entries=1)
 
 def register_training_gap_analysis_callbacks(app):
     """
@@ -142,21 +148,53 @@ def register_training_gap_analysis_callbacks(app):
             print(f"⚠️ Error parsing date '{date_str}': {e}")
             return None
 
-    @monitor_performance("Gap Analysis Filter Application")
-    def apply_gap_analysis_filters(base_data, query_selections):
+    @monitor_performance("Gap Analysis Engine Build")
+    def build_gap_analysis_engine():
         """
-        Apply filters to base gap analysis data using pandas
+        Build the sparse registration/attendance engine from the unfiltered base data
+        Runs once per data refresh; filter changes only recompute masks
         """
-        if not query_selections:
-            query_selections = {}
+        base_data = get_gap_analysis_base_data()
         
         # Convert to DataFrames and create explicit copies
         df_class_attendance = pd.DataFrame(base_data.get('class_attendance', [])).copy()
-        df_training_classes = pd.DataFrame(base_data.get('training_classes', [])).copy()
         df_topics = pd.DataFrame(base_data.get('topic_assignments', [])).copy()
         df_aor_offices = pd.DataFrame(base_data.get('aor_offices', [])).copy()
         
-        # print(f"📊 Starting gap analysis filtering: {len(df_class_attendance)} attendance records")
+        # Parse dates from class attendance data
+        if not df_class_attendance.empty and 'StartTime' in df_class_attendance.columns:
+            # Handle different datetime formats
+            if df_class_attendance['StartTime'].dtype == 'object':
+                df_class_attendance.loc[:, 'ParsedStartTime'] = df_class_attendance['StartTime'].apply(parse_custom_datetime)
+            else:
+                df_class_attendance.loc[:, 'ParsedStartTime'] = pd.to_datetime(df_class_attendance['StartTime'])
+            df_class_attendance['ParsedStartTime'] = pd.to_datetime(df_class_attendance['ParsedStartTime'])
+        else:
+            df_class_attendance = pd.DataFrame(columns=SLOT_COLUMNS + MEMBER_COLUMNS + ['AttendanceID', 'WasPresent'])
+        
+        return GapAnalysisEngine(df_class_attendance, df_topics, df_aor_offices)
+
+    def get_gap_analysis_engine():
+        return _gap_analysis_engines.get_or_build('gap_analysis_engine', build_gap_analysis_engine)
+
+    @monitor_performance("Gap Analysis Filter Application")
+    def apply_gap_analysis_filters(engine, query_selections):
+        """
+        Translate filter selections into boolean masks over the engine's session slots
+        and topic assignments (same semantics as filtering the raw registrations)
+        
+        Returns:
+            tuple: (slot_mask, topic_mask)
+        """
+        if not query_selections:
+            query_selections = {}
+        
+        df_slots = engine.slots
+        df_topics = engine.topics
+        df_aor_offices = engine.aor_offices
+        
+        slot_mask = np.ones(len(df_slots), dtype=bool)
+        topic_mask = np.ones(len(df_topics), dtype=bool) if not df_topics.empty else None
         
         # Parse filter values
         aors_filter = query_selections.get('AORs', '')
@@ -174,183 +212,66 @@ def register_training_gap_analysis_callbacks(app):
         locations_filter = query_selections.get('Locations', '')
         location_list = [location.strip("'\"") for location in locations_filter.split(',') if location.strip("'\"")]
         
-        # Parse dates from class attendance data
-        if not df_class_attendance.empty and 'StartTime' in df_class_attendance.columns:
-            df_class_attendance = df_class_attendance.copy()
-            
-            # Handle different datetime formats
-            if df_class_attendance['StartTime'].dtype == 'object':
-                df_class_attendance.loc[:, 'ParsedStartTime'] = df_class_attendance['StartTime'].apply(parse_custom_datetime)
-            else:
-                df_class_attendance.loc[:, 'ParsedStartTime'] = pd.to_datetime(df_class_attendance['StartTime'])
-            
-            df_class_attendance = df_class_attendance.dropna(subset=['ParsedStartTime']).copy()
-            
-            # Apply date range filter if specified
-            start_date = query_selections.get('Day_From')
-            end_date = query_selections.get('Day_To')
-            
-            if start_date and end_date:
-                try:
-                    start_dt = pd.to_datetime(start_date)
-                    end_dt = pd.to_datetime(end_date)
-                    df_class_attendance = df_class_attendance.loc[
-                        (df_class_attendance['ParsedStartTime'] >= start_dt) & 
-                        (df_class_attendance['ParsedStartTime'] <= end_dt)
-                    ].copy()
-                    # print(f"📅 Date filter applied: {len(df_class_attendance)} attendance records")
-                except Exception as e:
-                    print(f"❌ Error applying date filter: {e}")
+        if df_slots.empty:
+            return slot_mask, topic_mask
+        
+        # Apply date range filter if specified
+        start_date = query_selections.get('Day_From')
+        end_date = query_selections.get('Day_To')
+        
+        if start_date and end_date:
+            try:
+                start_dt = pd.to_datetime(start_date)
+                end_dt = pd.to_datetime(end_date)
+                slot_mask &= ((df_slots['ParsedStartTime'] >= start_dt) & 
+                              (df_slots['ParsedStartTime'] <= end_dt)).to_numpy()
+            except Exception as e:
+                print(f"❌ Error applying date filter: {e}")
         
         # Apply AOR filter
         if aor_list:
-            if not df_class_attendance.empty:
-                df_class_attendance = df_class_attendance.loc[df_class_attendance['AorShortName'].isin(aor_list)].copy()
-            if not df_topics.empty:
+            slot_mask &= df_slots['AorShortName'].isin(aor_list).to_numpy()
+            if topic_mask is not None:
                 # Filter topic assignments by AorId - need to map AorShortName to AorId
                 aor_id_mapping = df_aor_offices.set_index('AorShortName')['AorID'].to_dict() if not df_aor_offices.empty else {}
                 aor_ids = [aor_id_mapping.get(aor) for aor in aor_list if aor_id_mapping.get(aor)]
                 if aor_ids:
-                    df_topics = df_topics.loc[df_topics['AorId'].isin(aor_ids)].copy()
-            # print(f"🎯 AOR filter applied: {len(df_class_attendance)} attendance records")
+                    topic_mask &= df_topics['AorId'].isin(aor_ids).to_numpy()
         
         # Apply Office filter (via AOR mapping)
         if office_list and not df_aor_offices.empty:
             office_aors = df_aor_offices.loc[df_aor_offices['OfficeCode'].isin(office_list), 'AorShortName'].unique()
-            if len(office_aors) > 0 and not df_class_attendance.empty:
-                df_class_attendance = df_class_attendance.loc[df_class_attendance['AorShortName'].isin(office_aors)].copy()
-            # print(f"🏢 Office filter applied: {len(df_class_attendance)} attendance records")
+            if len(office_aors) > 0:
+                slot_mask &= df_slots['AorShortName'].isin(office_aors).to_numpy()
         
         # Apply Topic filter
-        if topic_list and not df_topics.empty:
-            df_topics = df_topics.loc[df_topics['TrainingTopicId'].astype(str).isin(topic_list)].copy()
-            # Filter attendance to only those with matching topics
-            if not df_class_attendance.empty:
-                matching_class_ids = df_topics['TrainingClassId'].unique()
-                df_class_attendance = df_class_attendance.loc[df_class_attendance['TrainingClassId'].isin(matching_class_ids)].copy()
-            # print(f"📚 Topic filter applied: {len(df_class_attendance)} attendance records")
+        if topic_list and topic_mask is not None:
+            topic_mask &= df_topics['TrainingTopicId'].astype(str).isin(topic_list).to_numpy()
+            # Keep only sessions of classes with matching topics
+            matching_class_ids = df_topics.loc[topic_mask, 'TrainingClassId'].unique()
+            slot_mask &= df_slots['TrainingClassId'].isin(matching_class_ids).to_numpy()
         
         # Apply Instructor filter
         if instructor_list:
-            if not df_class_attendance.empty:
-                df_class_attendance = df_class_attendance.loc[df_class_attendance['InstructorId'].astype(str).isin(instructor_list)].copy()
-            # print(f"👨‍🏫 Instructor filter applied: {len(df_class_attendance)} attendance records")
+            slot_mask &= df_slots['InstructorId'].astype(str).isin(instructor_list).to_numpy()
         
         # Apply Location filter
-        if location_list and not df_class_attendance.empty:
-            df_class_attendance = df_class_attendance.loc[df_class_attendance['LocationId'].astype(str).isin(location_list)].copy()
-            # print(f"📍 Location filter applied: {len(df_class_attendance)} attendance records")
+        if location_list:
+            slot_mask &= df_slots['LocationId'].astype(str).isin(location_list).to_numpy()
         
-        return {
-            "class_attendance": df_class_attendance,
-            "training_classes": df_training_classes,
-            "topic_assignments": df_topics,
-            "aor_offices": df_aor_offices
-        }
+        return slot_mask, topic_mask
 
     @monitor_performance("Gap Analysis Data Preparation")
-    def prepare_gap_analysis_data(filtered_data, analysis_level, sort_by):
+    def prepare_gap_analysis_data(engine, slot_mask, topic_mask, analysis_level, sort_by):
         """
         Prepare gap analysis data comparing registrations vs attendances
+        Totals come from sparse reductions in the engine, not from regrouping registrations
         """
-        df_class_attendance = filtered_data.get('class_attendance', pd.DataFrame())
-        df_topics = filtered_data.get('topic_assignments', pd.DataFrame())
-        
-        if df_class_attendance.empty:
+        if engine.slots.empty or not slot_mask.any():
             return pd.DataFrame()
         
         try:
-            # Calculate registration vs attendance metrics
-            df_class_attendance = df_class_attendance.copy()
-            
-            # Add topic information if analyzing by topic
-            if analysis_level == "topic" and not df_topics.empty:
-                df_class_attendance = df_class_attendance.merge(
-                    df_topics[['TrainingClassId', 'TrainingTopicName']], 
-                    on='TrainingClassId', 
-                    how='left'
-                )
-            
-            # Group by the specified analysis level
-            if analysis_level == "class":
-                group_cols = ['TrainingClassId', 'ClassName']
-                gap_data = df_class_attendance.groupby(group_cols).agg({
-                    'AttendanceID': 'count',  # Total registrations
-                    'WasPresent': lambda x: (x == 'True').sum()  # Total attendances
-                }).reset_index()
-                gap_data = gap_data.rename(columns={
-                    'ClassName': 'CategoryName',
-                    'AttendanceID': 'Registrations',
-                    'WasPresent': 'Attendances'
-                })
-                
-            elif analysis_level == "topic":
-                if 'TrainingTopicName' in df_class_attendance.columns:
-                    gap_data = df_class_attendance.groupby('TrainingTopicName').agg({
-                        'AttendanceID': 'count',
-                        'WasPresent': lambda x: (x == 'True').sum()
-                    }).reset_index()
-                    gap_data = gap_data.rename(columns={
-                        'TrainingTopicName': 'CategoryName',
-                        'AttendanceID': 'Registrations',
-                        'WasPresent': 'Attendances'
-                    })
-                else:
-                    # Fallback to class level if no topic data
-                    gap_data = df_class_attendance.groupby(['TrainingClassId', 'ClassName']).agg({
-                        'AttendanceID': 'count',
-                        'WasPresent': lambda x: (x == 'True').sum()
-                    }).reset_index()
-                    gap_data = gap_data.rename(columns={
-                        'ClassName': 'CategoryName',
-                        'AttendanceID': 'Registrations',
-                        'WasPresent': 'Attendances'
-                    })
-                    
-            elif analysis_level == "instructor":
-                gap_data = df_class_attendance.groupby('InstructorName').agg({
-                    'AttendanceID': 'count',
-                    'WasPresent': lambda x: (x == 'True').sum()
-                }).reset_index()
-                gap_data = gap_data.rename(columns={
-                    'InstructorName': 'CategoryName',
-                    'AttendanceID': 'Registrations',
-                    'WasPresent': 'Attendances'
-                })
-                
-            elif analysis_level == "location":
-                gap_data = df_class_attendance.groupby('LocationName').agg({
-                    'AttendanceID': 'count',
-                    'WasPresent': lambda x: (x == 'True').sum()
-                }).reset_index()
-                gap_data = gap_data.rename(columns={
-                    'LocationName': 'CategoryName',
-                    'AttendanceID': 'Registrations',
-                    'WasPresent': 'Attendances'
-                })
-                
-            elif analysis_level == "aor":
-                gap_data = df_class_attendance.groupby('AorShortName').agg({
-                    'AttendanceID': 'count',
-                    'WasPresent': lambda x: (x == 'True').sum()
-                }).reset_index()
-                gap_data = gap_data.rename(columns={
-                    'AorShortName': 'CategoryName',
-                    'AttendanceID': 'Registrations',
-                    'WasPresent': 'Attendances'
-                })
-                
-            else:
-                # Default to class level
-                gap_data = df_class_attendance.groupby(['TrainingClassId', 'ClassName']).agg({
-                    'AttendanceID': 'count',
-                    'WasPresent': lambda x: (x == 'True').sum()
-                }).reset_index()
-                gap_data = gap_data.rename(columns={
-                    'ClassName': 'CategoryName',
-                    'AttendanceID': 'Registrations',
-                    'WasPresent': 'Attendances'
-                })
+            gap_data = engine.gap_totals(analysis_level, slot_mask, topic_mask)
             
             # Calculate gap metrics
             gap_data.loc[:, 'NoShows'] = gap_data['Registrations'] - gap_data['Attendances']
@@ -450,7 +371,9 @@ def register_training_gap_analysis_callbacks(app):
                 "topic": "Topics",
                 "instructor": "Instructors", 
                 "location": "Locations",
-                "aor": "AORs"
+                "aor": "AORs",
+                "member": "Members",
+                "office": "Offices"
             }
             chart_title = f"Registration vs Attendance by {level_labels.get(analysis_level, 'Category')}"
             
@@ -628,7 +551,9 @@ def register_training_gap_analysis_callbacks(app):
                     "topic": "Topic", 
                     "instructor": "Instructor",
                     "location": "Location",
-                    "aor": "AOR"
+                    "aor": "AOR",
+                    "member": "Member",
+                    "office": "Office"
                 }
                 entity_type = level_labels.get(analysis_level, "Entity")
                 
@@ -691,14 +616,14 @@ def register_training_gap_analysis_callbacks(app):
         try:
             # print(f"🔄 Updating gap analysis: level={analysis_level}, sort={sort_by}")
             
-            # Get base data
-            base_data = get_gap_analysis_base_data()
+            # Sparse registration/attendance matrices, built once per data refresh
+            engine = get_gap_analysis_engine()
             
             # Apply filters
-            filtered_data = apply_gap_analysis_filters(base_data, query_selections)
+            slot_mask, topic_mask = apply_gap_analysis_filters(engine, query_selections)
             
             # Prepare gap analysis data
-            gap_data = prepare_gap_analysis_data(filtered_data, analysis_level, sort_by)
+            gap_data = prepare_gap_analysis_data(engine, slot_mask, topic_mask, analysis_level, sort_by)
             
             # Create visualizations
             comparison_fig = create_registration_attendance_comparison_chart(gap_data, analysis_level)
@@ -1,5 +1,6 @@
 from dash import callback, ctx, dcc, html, Input, Output, State, no_update
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 from src.utils.db import run_queries
@@ -7,6 +8,26 @@ import time
 import copy
 from functools import wraps
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
+from src.utils.cache import LocalCache, make_cache_key
+from src.utils.instructor_metrics_store import InstructorMetricsStore, rank_frame
+
+# Instructors shown on the chart
+TOP_INSTRUCTORS = 20
+
+# performance_metric -> (metric table column, display name)
+INSTRUCTOR_METRICS = {
+    'attendance_rate': ('FinalAttendanceRate', "Attendance Rate (%)"),
+    'total_students': ('FinalUniqueStudents', "Total Students Taught"),
+    'avg_class_size': ('FinalAverageClassSize', "Average Class Size"),
+    'classes_conducted': ('FinalClassesConducted', "Classes Conducted"),
+    'sessions_per_month': ('FinalSessionsPerMonth', "Sessions per Month")
+}
+
+# Per-instructor session metrics, synced incrementally as new classes land
+_instructor_metrics_store = InstructorMetricsStore()
+_instructor_store_syncs = LocalCache(max_entries=1)
+# Metric tables per (store version, filter selection); metric/chart toggles reuse them
+_instructor_metric_tables = LocalCache()
 
 def register_training_instructor_performance_callbacks(app):
     """
@@ -148,13 +169,20 @@ def register_training_instructor_performance_callbacks(app):
             print(f"⚠️ Error parsing date '{date_str}': {e}")
             return None
 
-    @monitor_performance("Instructor Performance Filter Application")
-    def apply_instructor_performance_filters(base_data, query_selections):
+    def parse_start_times(start_times):
+        """Parse a StartTime column (custom 'Feb-04-25@6 PM' strings or native datetimes)"""
+        if start_times.dtype == 'object':
+            return pd.to_datetime(start_times.apply(parse_custom_datetime))
+        return pd.to_datetime(start_times)
+
+    @monitor_performance("Instructor Metrics Store Sync")
+    def sync_instructor_metrics_store():
         """
-        Apply filters to base instructor performance data using pandas
+        Fold the latest base data into the instructor metrics store
+        Only classes whose attendance changed (or, for the class list, recent enough to still
+        change) are re-aggregated
         """
-        if not query_selections:
-            query_selections = {}
+        base_data = get_instructor_performance_base_data()
         
         # Convert to DataFrames and create explicit copies
         df_instructor_perf = pd.DataFrame(base_data.get('instructor_performance', [])).copy()
@@ -162,7 +190,29 @@ def register_training_instructor_performance_callbacks(app):
         df_training_classes = pd.DataFrame(base_data.get('training_classes', [])).copy()
         df_aor_offices = pd.DataFrame(base_data.get('aor_offices', [])).copy()
         
-        # print(f"📊 Starting instructor performance filtering: {len(df_instructor_perf)} instructor records, {len(df_class_attendance)} attendance records")
+        _instructor_metrics_store.sync(
+            df_instructor_perf, df_class_attendance, df_training_classes, parse_start_times, df_aor_offices
+        )
+        return _instructor_metrics_store
+
+    def get_instructor_metrics_store():
+        # Re-synced whenever the marker expires (same lifetime as the cached base data)
+        return _instructor_store_syncs.get_or_build('instructor_metrics_store', sync_instructor_metrics_store)
+
+    @monitor_performance("Instructor Performance Filter Application")
+    def apply_instructor_performance_filters(store, query_selections):
+        """
+        Translate filter selections into boolean masks over the metrics store
+        (same semantics as filtering the raw attendance and class records)
+        
+        Returns:
+            dict: instructor_mask, session_mask, class_mask
+        """
+        if not query_selections:
+            query_selections = {}
+        
+        df_instructor_perf = store.instructors
+        df_aor_offices = store.aor_offices
         
         # Parse filter values
         aors_filter = query_selections.get('AORs', '')
@@ -171,120 +221,52 @@ def register_training_instructor_performance_callbacks(app):
         offices_filter = query_selections.get('Offices', '')
         office_list = [office.strip("'\"") for office in offices_filter.split(',') if office.strip("'\"")]
         
-        topics_filter = query_selections.get('Topics', '')
-        topic_list = [topic.strip("'\"") for topic in topics_filter.split(',') if topic.strip("'\"")]
-        
         instructors_filter = query_selections.get('Instructors', '')
         instructor_list = [instructor.strip("'\"") for instructor in instructors_filter.split(',') if instructor.strip("'\"")]
         
         locations_filter = query_selections.get('Locations', '')
         location_list = [location.strip("'\"") for location in locations_filter.split(',') if location.strip("'\"")]
         
-        # Parse dates from class data
-        if not df_class_attendance.empty and 'StartTime' in df_class_attendance.columns:
-            df_class_attendance = df_class_attendance.copy()
-            
-            # Handle different datetime formats
-            if df_class_attendance['StartTime'].dtype == 'object':
-                df_class_attendance.loc[:, 'ParsedStartTime'] = df_class_attendance['StartTime'].apply(parse_custom_datetime)
-            else:
-                df_class_attendance.loc[:, 'ParsedStartTime'] = pd.to_datetime(df_class_attendance['StartTime'])
-            
-            df_class_attendance = df_class_attendance.dropna(subset=['ParsedStartTime']).copy()
-            
-            # Apply date range filter if specified
-            start_date = query_selections.get('Day_From')
-            end_date = query_selections.get('Day_To')
-            
-            if start_date and end_date:
-                try:
-                    start_dt = pd.to_datetime(start_date)
-                    end_dt = pd.to_datetime(end_date)
-                    df_class_attendance = df_class_attendance.loc[
-                        (df_class_attendance['ParsedStartTime'] >= start_dt) & 
-                        (df_class_attendance['ParsedStartTime'] <= end_dt)
-                    ].copy()
-                    # print(f"📅 Date filter applied: {len(df_class_attendance)} attendance records")
-                except Exception as e:
-                    print(f"❌ Error applying date filter: {e}")
-        
-        # Parse dates from training classes
-        if not df_training_classes.empty and 'StartTime' in df_training_classes.columns:
-            df_training_classes = df_training_classes.copy()
-            
-            if df_training_classes['StartTime'].dtype == 'object':
-                df_training_classes.loc[:, 'ParsedStartTime'] = df_training_classes['StartTime'].apply(parse_custom_datetime)
-            else:
-                df_training_classes.loc[:, 'ParsedStartTime'] = pd.to_datetime(df_training_classes['StartTime'])
-            
-            df_training_classes = df_training_classes.dropna(subset=['ParsedStartTime']).copy()
-            
-            # Apply same date filter to training classes
-            if start_date and end_date:
-                try:
-                    start_dt = pd.to_datetime(start_date)
-                    end_dt = pd.to_datetime(end_date)
-                    df_training_classes = df_training_classes.loc[
-                        (df_training_classes['ParsedStartTime'] >= start_dt) & 
-                        (df_training_classes['ParsedStartTime'] <= end_dt)
-                    ].copy()
-                except Exception as e:
-                    print(f"❌ Error applying date filter to training classes: {e}")
+        # Apply date range filter if specified
+        start_dt = end_dt = None
+        start_date = query_selections.get('Day_From')
+        end_date = query_selections.get('Day_To')
+        if start_date and end_date:
+            try:
+                start_dt = pd.to_datetime(start_date)
+                end_dt = pd.to_datetime(end_date)
+            except Exception as e:
+                print(f"❌ Error applying date filter: {e}")
+                start_dt = end_dt = None
         
-        # Apply AOR filter
-        if aor_list:
-            if not df_class_attendance.empty:
-                df_class_attendance = df_class_attendance.loc[df_class_attendance['AorShortName'].isin(aor_list)].copy()
-            if not df_training_classes.empty:
-                df_training_classes = df_training_classes.loc[df_training_classes['AorShortName'].isin(aor_list)].copy()
-            # print(f"🎯 AOR filter applied: {len(df_class_attendance)} attendance, {len(df_training_classes)} classes")
-        
-        # Apply Office filter (via AOR mapping)
+        # Office filter (via AOR mapping)
+        office_aors = None
         if office_list and not df_aor_offices.empty:
             office_aors = df_aor_offices.loc[df_aor_offices['OfficeCode'].isin(office_list), 'AorShortName'].unique()
-            if len(office_aors) > 0:
-                if not df_class_attendance.empty:
-                    df_class_attendance = df_class_attendance.loc[df_class_attendance['AorShortName'].isin(office_aors)].copy()
-                if not df_training_classes.empty:
-                    df_training_classes = df_training_classes.loc[df_training_classes['AorShortName'].isin(office_aors)].copy()
-            # print(f"🏢 Office filter applied: {len(df_class_attendance)} attendance, {len(df_training_classes)} classes")
         
-        # Apply Instructor filter
-        if instructor_list:
-            # Filter instructor performance data
-            if not df_instructor_perf.empty:
-                df_instructor_perf = df_instructor_perf.loc[df_instructor_perf['InstructorID'].astype(str).isin(instructor_list)].copy()
-            if not df_class_attendance.empty:
-                df_class_attendance = df_class_attendance.loc[df_class_attendance['InstructorId'].astype(str).isin(instructor_list)].copy()
-            if not df_training_classes.empty:
-                df_training_classes = df_training_classes.loc[df_training_classes['InstructorId'].astype(str).isin(instructor_list)].copy()
-            # print(f"👨‍🏫 Instructor filter applied: {len(df_instructor_perf)} instructors, {len(df_class_attendance)} attendance")
+        filters = dict(start_dt=start_dt, end_dt=end_dt, aor_list=aor_list, office_aors=office_aors,
+                       instructor_list=instructor_list, location_list=location_list)
         
-        # Apply Location filter
-        if location_list:
-            if not df_class_attendance.empty:
-                df_class_attendance = df_class_attendance.loc[df_class_attendance['LocationId'].astype(str).isin(location_list)].copy()
-            if not df_training_classes.empty:
-                df_training_classes = df_training_classes.loc[df_training_classes['LocationId'].astype(str).isin(location_list)].copy()
-            # print(f"📍 Location filter applied: {len(df_class_attendance)} attendance, {len(df_training_classes)} classes")
+        instructor_mask = np.ones(len(df_instructor_perf), dtype=bool)
+        if instructor_list and not df_instructor_perf.empty:
+            instructor_mask &= df_instructor_perf['InstructorID'].astype(str).isin(instructor_list).to_numpy()
         
         return {
-            "instructor_performance": df_instructor_perf,
-            "class_attendance": df_class_attendance,
-            "training_classes": df_training_classes,
-            "aor_offices": df_aor_offices
+            "instructor_mask": instructor_mask,
+            "session_mask": store.filter_mask(store.sessions, **filters),
+            "class_mask": store.filter_mask(store.classes, **filters)
         }
 
     @monitor_performance("Instructor Performance Data Preparation")
-    def prepare_instructor_performance_data(filtered_data, performance_metric):
+    def prepare_instructor_performance_data(store, masks):
         """
-        Prepare instructor performance data for analysis
+        Per-instructor metric table for a filter selection
+        Holds every selectable metric, so metric and chart-type changes never recompute it
         """
-        df_instructor_perf = filtered_data.get('instructor_performance', pd.DataFrame())
-        df_class_attendance = filtered_data.get('class_attendance', pd.DataFrame())
-        df_training_classes = filtered_data.get('training_classes', pd.DataFrame())
+        df_instructor_perf = store.instructors.loc[masks['instructor_mask']] if not store.instructors.empty else store.instructors
+        session_mask = masks['session_mask']
         
-        if df_instructor_perf.empty and df_class_attendance.empty:
+        if df_instructor_perf.empty and not session_mask.any():
             return pd.DataFrame()
         
         try:
@@ -292,122 +274,32 @@ def register_training_instructor_performance_callbacks(app):
             if not df_instructor_perf.empty:
                 performance_data = df_instructor_perf.copy()
             else:
-                # Create minimal instructor data from class attendance if no performance data
-                if df_class_attendance.empty:
-                    return pd.DataFrame()
-                
-                instructor_summary = df_class_attendance.groupby(['InstructorId', 'InstructorName']).first().reset_index()
-                performance_data = instructor_summary[['InstructorId', 'InstructorName']].copy()
+                # Create minimal instructor data from class sessions if no performance data
+                performance_data = store.sessions.loc[session_mask, ['InstructorId', 'InstructorName']].dropna()
+                performance_data = performance_data.drop_duplicates('InstructorId').sort_values('InstructorId')
                 performance_data = performance_data.rename(columns={'InstructorId': 'InstructorID'})
             
-            # Calculate additional metrics from class attendance and training classes data
-            if not df_class_attendance.empty:
-                # Calculate metrics from detailed attendance data
-                attendance_metrics = df_class_attendance.groupby('InstructorId').agg({
-                    'TrainingClassId': 'nunique',  # Classes conducted
-                    'MemberID': 'nunique',  # Unique students
-                    'WasPresent': lambda x: (x == 'True').sum(),  # Total attendees present
-                    'AttendeeEmail': 'count'  # Total registrations
-                }).reset_index()
-                
-                attendance_metrics = attendance_metrics.rename(columns={
-                    'InstructorId': 'InstructorID',
-                    'TrainingClassId': 'ClassesConductedFromAttendance',
-                    'MemberID': 'UniqueStudents',
-                    'WasPresent': 'AttendeesPresent',
-                    'AttendeeEmail': 'TotalRegistrations'
-                })
-                
-                # Calculate attendance rate
-                attendance_metrics.loc[:, 'CalculatedAttendanceRate'] = (
-                    attendance_metrics['AttendeesPresent'] / attendance_metrics['TotalRegistrations'] * 100
-                ).fillna(0)
-                
-                # Calculate average class size
-                class_sizes = df_class_attendance.groupby(['InstructorId', 'TrainingClassId']).agg({
-                    'MemberID': 'nunique'
-                }).reset_index()
-                avg_class_size = class_sizes.groupby('InstructorId')['MemberID'].mean().reset_index()
-                avg_class_size = avg_class_size.rename(columns={
-                    'InstructorId': 'InstructorID',
-                    'MemberID': 'AverageClassSize'
-                })
-                
-                # Merge attendance metrics
-                performance_data = performance_data.merge(attendance_metrics, on='InstructorID', how='left')
-                performance_data = performance_data.merge(avg_class_size, on='InstructorID', how='left')
-            
-            # Calculate sessions per month from training classes
-            if not df_training_classes.empty:
-                # Calculate time span and sessions per month
-                classes_with_dates = df_training_classes.dropna(subset=['ParsedStartTime']).copy()
-                if not classes_with_dates.empty:
-                    instructor_sessions = classes_with_dates.groupby('InstructorId').agg({
-                        'TrainingClassId': 'nunique',
-                        'ParsedStartTime': ['min', 'max']
-                    }).reset_index()
-                    
-                    instructor_sessions.columns = ['InstructorID', 'TotalClassesFromClasses', 'FirstSession', 'LastSession']
-                    
-                    # Calculate months between first and last session
-                    instructor_sessions.loc[:, 'MonthsActive'] = (
-                        (instructor_sessions['LastSession'] - instructor_sessions['FirstSession']).dt.days / 30.44
-                    ).fillna(1).apply(lambda x: max(1, x))  # At least 1 month
-                    
-                    instructor_sessions.loc[:, 'SessionsPerMonth'] = (
-                        instructor_sessions['TotalClassesFromClasses'] / instructor_sessions['MonthsActive']
-                    )
-                    
-                    # Merge with performance data
-                    performance_data = performance_data.merge(
-                        instructor_sessions[['InstructorID', 'SessionsPerMonth']], 
-                        on='InstructorID', 
-                        how='left'
-                    )
-            
-            # Use the best available data for each metric
-            performance_data.loc[:, 'FinalClassesConducted'] = performance_data.get('TotalSessions', performance_data.get('ClassesConductedFromAttendance', 0)).fillna(0)
-            performance_data.loc[:, 'FinalAttendanceRate'] = performance_data.get('AverageAttendanceRate', performance_data.get('CalculatedAttendanceRate', 0)).fillna(0)
-            performance_data.loc[:, 'FinalUniqueStudents'] = performance_data.get('UniqueAttendees', performance_data.get('UniqueStudents', 0)).fillna(0)
-            performance_data.loc[:, 'FinalAverageClassSize'] = performance_data.get('AverageClassSize', 0).fillna(0)
-            performance_data.loc[:, 'FinalSessionsPerMonth'] = performance_data.get('SessionsPerMonth', 0).fillna(0)
+            # Unique students are not additive across sessions, so only count them when needed
+            attendance_metrics = store.attendance_metrics(
+                session_mask, include_unique_students='UniqueAttendees' not in performance_data.columns
+            )
+            session_rates = store.session_rate_metrics(masks['class_mask'])
             
-            # ✅ REMOVED: Apply minimum classes filter - no longer filtering by min_classes
+            # Without sessions or classes in the selection there is nothing to rank
+            if attendance_metrics.empty or session_rates.empty:
+                return pd.DataFrame()
             
-            # Select the requested metric
-            if performance_metric == "attendance_rate":
-                performance_data.loc[:, 'MetricValue'] = performance_data['FinalAttendanceRate']
-                metric_name = "Attendance Rate (%)"
-                
-            elif performance_metric == "total_students":
-                performance_data.loc[:, 'MetricValue'] = performance_data['FinalUniqueStudents']
-                metric_name = "Total Students Taught"
-                
-            elif performance_metric == "avg_class_size":
-                performance_data.loc[:, 'MetricValue'] = performance_data['FinalAverageClassSize']
-                metric_name = "Average Class Size"
-                
-            elif performance_metric == "classes_conducted":
-                performance_data.loc[:, 'MetricValue'] = performance_data['FinalClassesConducted']
-                metric_name = "Classes Conducted"
-                
-            elif performance_metric == "sessions_per_month":
-                performance_data.loc[:, 'MetricValue'] = performance_data['FinalSessionsPerMonth']
-                metric_name = "Sessions per Month"
-                
-            else:
-                # Default to attendance rate
-                performance_data.loc[:, 'MetricValue'] = performance_data['FinalAttendanceRate']
-                metric_name = "Attendance Rate (%)"
+            performance_data = performance_data.merge(attendance_metrics, on='InstructorID', how='left')
+            performance_data = performance_data.merge(session_rates, on='InstructorID', how='left')
             
-            # Add metadata
-            performance_data.loc[:, 'MetricName'] = metric_name
-            
-            # Sort by metric value (descending for better visualization)
-            performance_data = performance_data.sort_values('MetricValue', ascending=False)
+            # Use the best available data for each metric
+            performance_data.loc[:, 'FinalClassesConducted'] = performance_data.get('TotalSessions', performance_data['ClassesConductedFromAttendance']).fillna(0)
+            performance_data.loc[:, 'FinalAttendanceRate'] = performance_data.get('AverageAttendanceRate', performance_data['CalculatedAttendanceRate']).fillna(0)
+            performance_data.loc[:, 'FinalUniqueStudents'] = performance_data.get('UniqueAttendees', performance_data.get('UniqueStudents', pd.Series(0, index=performance_data.index))).fillna(0)
+            performance_data.loc[:, 'FinalAverageClassSize'] = performance_data['AverageClassSize'].fillna(0)
+            performance_data.loc[:, 'FinalSessionsPerMonth'] = performance_data['SessionsPerMonth'].fillna(0)
             
-            # print(f"📊 Prepared instructor performance data: {len(performance_data)} instructors, metric: {metric_name}")
-            return performance_data
+            return performance_data.reset_index(drop=True)
             
         except Exception as e:
             print(f"❌ Error preparing instructor performance data: {e}")
@@ -415,6 +307,35 @@ def register_training_instructor_performance_callbacks(app):
             traceback.print_exc()
             return pd.DataFrame()
 
+    def get_instructor_performance_table(query_selections):
+        store = get_instructor_metrics_store()
+        cache_key = make_cache_key(store.version, query_selections or {})
+        
+        def build_table():
+            masks = apply_instructor_performance_filters(store, query_selections)
+            return prepare_instructor_performance_data(store, masks)
+        
+        return _instructor_metric_tables.get_or_build(cache_key, build_table)
+
+    def select_instructor_metric(metric_table, performance_metric):
+        """
+        Attach the selected metric and rank instructors by it
+        Only the charted top instructors are fully ordered (partial sort)
+        """
+        if metric_table.empty:
+            return metric_table
+        
+        metric_column, metric_name = INSTRUCTOR_METRICS.get(performance_metric, INSTRUCTOR_METRICS['attendance_rate'])
+        
+        performance_data = metric_table.copy()
+        performance_data.loc[:, 'MetricValue'] = performance_data[metric_column]
+        
+        # Add metadata
+        performance_data.loc[:, 'MetricName'] = metric_name
+        
+        # Rank by metric value (descending for better visualization)
+        return rank_frame(performance_data, 'MetricValue', head=TOP_INSTRUCTORS)
+
     @monitor_chart_performance("Instructor Performance Chart")
     def create_instructor_performance_chart(performance_data, performance_metric, chart_type):
         """
@@ -451,7 +372,7 @@ def register_training_instructor_performance_callbacks(app):
             fig = go.Figure()
             
             # Prepare data - limit to top 20 instructors for readability
-            display_data = performance_data.head(20).copy()
+            display_data = performance_data.head(TOP_INSTRUCTORS).copy()
             
             if chart_type == "bar":
                 # Vertical bar chart
@@ -721,14 +642,11 @@ def register_training_instructor_performance_callbacks(app):
         try:
             # print(f"🔄 Updating instructor performance: metric={performance_metric}, chart={chart_type}")
             
-            # Get base data
-            base_data = get_instructor_performance_base_data()
-            
-            # Apply filters
-            filtered_data = apply_instructor_performance_filters(base_data, query_selections)
+            # Per-instructor metrics for the filter selection (store-backed, cached per selection)
+            metric_table = get_instructor_performance_table(query_selections)
             
-            # Prepare performance data
-            performance_data = prepare_instructor_performance_data(filtered_data, performance_metric)
+            # Select and rank the requested metric
+            performance_data = select_instructor_metric(metric_table, performance_metric)
             
             # Create visualization
             fig = create_instructor_performance_chart(performance_data, performance_metric, chart_type)
@@ -7,6 +7,20 @@ import time
 import copy
 from functools import wraps
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
+from src.utils.cache import LocalCache, make_cache_key
+from src.utils.time_buckets import period_labels, combine_labels
+
+ENGAGEMENT_GRANULARITIES = ["monthly", "quarterly", "yearly"]
+
+# metric_type -> (source column, aggregation, display name)
+ENGAGEMENT_METRICS = {
+    "sessions_held": ('TrainingClassId', 'nunique', 'Training Sessions Held'),  # Count unique training sessions/classes
+    "total_attendances": ('TotalAttendances', 'sum', 'Total Attendances'),
+    "unique_members": ('MembersAttended', 'sum', 'Members Trained')
+}
+
+# Period-labeled attendance and its per-granularity aggregates, keyed by filter selection
+_engagement_time_series = LocalCache()
 
 def register_training_office_engagement_callbacks(app):
     """
@@ -214,82 +228,83 @@ def register_training_office_engagement_callbacks(app):
             "aor_offices": df_aor_offices
         }
 
-    @monitor_performance("Time Series Data Preparation")
-    def prepare_time_series_data(filtered_data, grouping_level, time_granularity, metric_type):
+    @monitor_performance("Engagement Time Series Precomputation")
+    def build_engagement_time_series_bundle(filtered_data):
         """
-        Prepare time series data for trend analysis
-        Updated to handle sessions_held metric and removed problematic metrics
+        Label the filtered attendance once for every granularity
+        TimeLabel_<granularity> and OfficeLabel are vectorized categoricals - no row-wise apply
         """
         df_attendance = filtered_data.get('attendance_data', pd.DataFrame())
-        df_members = filtered_data.get('member_engagement', pd.DataFrame())
-        df_aor_offices = filtered_data.get('aor_offices', pd.DataFrame())
         
         if df_attendance.empty:
+            return {'frame': pd.DataFrame(), 'series': {}}
+        
+        columns = ['AorShortName', 'MemberOffice'] + [col for col, _, _ in ENGAGEMENT_METRICS.values()]
+        df_labeled = df_attendance[list(dict.fromkeys(columns))].copy()
+        for granularity in ENGAGEMENT_GRANULARITIES:
+            df_labeled[f'TimeLabel_{granularity}'] = period_labels(df_attendance['ParsedStartTime'], granularity)
+        
+        # Create office labels for better identification
+        df_labeled['OfficeLabel'] = combine_labels(df_labeled['AorShortName'], df_labeled['MemberOffice'])
+        
+        return {'frame': df_labeled, 'series': {}}
+
+    def get_engagement_series(time_series_bundle, group_col, metric_type):
+        """
+        Aggregated series for every granularity of one grouping/metric pair
+        Computed on first use and kept in the bundle, so switching granularity is a lookup
+        """
+        series_key = (group_col, metric_type)
+        series = time_series_bundle['series'].get(series_key)
+        if series is not None:
+            return series
+        
+        df_labeled = time_series_bundle['frame']
+        value_col, agg_func, _ = ENGAGEMENT_METRICS[metric_type]
+        
+        series = {}
+        for granularity in ENGAGEMENT_GRANULARITIES:
+            time_series = df_labeled.groupby(
+                [f'TimeLabel_{granularity}', group_col], observed=True
+            )[value_col].agg(agg_func).reset_index()
+            time_series.columns = ['TimeLabel', group_col, 'MetricValue']
+            
+            # Aggregates are small - plain strings keep downstream groupby/sort semantics unchanged
+            time_series['TimeLabel'] = time_series['TimeLabel'].astype(str)
+            time_series[group_col] = time_series[group_col].astype(str)
+            series[granularity] = time_series
+        
+        time_series_bundle['series'][series_key] = series
+        return series
+
+    @monitor_performance("Time Series Data Preparation")
+    def prepare_time_series_data(time_series_bundle, grouping_level, time_granularity, metric_type):
+        """
+        Prepare time series data for trend analysis
+        Updated to handle sessions_held metric and removed problematic metrics
+        Reads the precomputed per-granularity series instead of regrouping raw attendance
+        """
+        if time_series_bundle['frame'].empty:
             return pd.DataFrame()
         
         try:
-            # Create time period columns
-            df_attendance = df_attendance.copy()
-            df_attendance.loc[:, 'YearNumber'] = df_attendance['ParsedStartTime'].dt.year
-            df_attendance.loc[:, 'MonthNumber'] = df_attendance['ParsedStartTime'].dt.month
-            df_attendance.loc[:, 'QuarterNumber'] = df_attendance['ParsedStartTime'].dt.quarter
-            
-            # Create time period labels
-            if time_granularity == "monthly":
-                df_attendance.loc[:, 'TimePeriod'] = df_attendance['ParsedStartTime'].dt.to_period('M')
-                df_attendance.loc[:, 'TimeLabel'] = df_attendance['ParsedStartTime'].dt.strftime('%Y-%m')
-            elif time_granularity == "quarterly":
-                df_attendance.loc[:, 'TimePeriod'] = df_attendance['ParsedStartTime'].dt.to_period('Q')
-                df_attendance.loc[:, 'TimeLabel'] = df_attendance.apply(
-                    lambda x: f"{x['YearNumber']}-Q{x['QuarterNumber']}", axis=1
-                )
-            else:  # yearly
-                df_attendance.loc[:, 'TimePeriod'] = df_attendance['ParsedStartTime'].dt.to_period('Y')
-                df_attendance.loc[:, 'TimeLabel'] = df_attendance['YearNumber'].astype(str)
-            
             # Updated grouping logic to handle top3, top5, top10
             if grouping_level == "aor":
                 group_col = 'AorShortName'
                 group_label = 'AOR'
             else:  # office or top performers (top3, top5, top10)
-                group_col = 'MemberOffice'
+                group_col = 'OfficeLabel'
                 group_label = 'Office'
-                # Create office labels for better identification
-                df_attendance.loc[:, 'OfficeLabel'] = df_attendance.apply(
-                    lambda row: f"{row['AorShortName']}-{row['MemberOffice']}", axis=1
-                )
-                if grouping_level in ["office", "top3", "top5", "top10"]:
-                    group_col = 'OfficeLabel'
-            
-            # ✅ Updated metric calculations - removed problematic metrics, added sessions_held
-            if metric_type == "sessions_held":
-                time_series = df_attendance.groupby(['TimeLabel', group_col]).agg({
-                    'TrainingClassId': 'nunique'  # Count unique training sessions/classes
-                }).reset_index()
-                time_series = time_series.rename(columns={'TrainingClassId': 'MetricValue'})
-                metric_name = 'Training Sessions Held'
-                
-            elif metric_type == "total_attendances":
-                time_series = df_attendance.groupby(['TimeLabel', group_col]).agg({
-                    'TotalAttendances': 'sum'
-                }).reset_index()
-                time_series = time_series.rename(columns={'TotalAttendances': 'MetricValue'})
-                metric_name = 'Total Attendances'
-                
-            elif metric_type == "unique_members":
-                time_series = df_attendance.groupby(['TimeLabel', group_col]).agg({
-                    'MembersAttended': 'sum'
-                }).reset_index()
-                time_series = time_series.rename(columns={'MembersAttended': 'MetricValue'})
-                metric_name = 'Members Trained'
-                
-            else:
-                # Fallback to sessions_held if unknown metric type
-                time_series = df_attendance.groupby(['TimeLabel', group_col]).agg({
-                    'TrainingClassId': 'nunique'
-                }).reset_index()
-                time_series = time_series.rename(columns={'TrainingClassId': 'MetricValue'})
-                metric_name = 'Training Sessions Held'
+            
+            # Fallback to sessions_held if unknown metric type
+            if metric_type not in ENGAGEMENT_METRICS:
+                metric_type = "sessions_held"
+            metric_name = ENGAGEMENT_METRICS[metric_type][2]
+            
+            if time_granularity not in ENGAGEMENT_GRANULARITIES:
+                time_granularity = "yearly"
+            
+            time_series = get_engagement_series(time_series_bundle, group_col, metric_type)[time_granularity].copy()
             
             # Updated top performers logic to handle top3, top5, top10
             if grouping_level in ["top3", "top5", "top10"]:
@@ -297,12 +312,10 @@ def register_training_office_engagement_callbacks(app):
                 top_count = int(grouping_level.replace("top", ""))
                 
                 # Calculate total metric value per group
-                group_totals = time_series.groupby(group_col).agg({
-                    'MetricValue': 'sum'
-                }).reset_index().sort_values('MetricValue', ascending=False)
+                group_totals = time_series.groupby(group_col)['MetricValue'].sum()
                 
                 # Take top N performers
-                top_groups = group_totals.head(top_count)[group_col].tolist()
+                top_groups = group_totals.nlargest(top_count).index
                 time_series = time_series.loc[time_series[group_col].isin(top_groups)].copy()
                 
                 # print(f"📊 Filtered to top {top_count} performers: {top_groups}")
@@ -320,6 +333,15 @@ def register_training_office_engagement_callbacks(app):
             traceback.print_exc()
             return pd.DataFrame()
 
+    def get_engagement_time_series_bundle(query_selections):
+        """Reuse the labeled attendance for a filter selection across grouping/granularity/metric changes"""
+        def build_bundle():
+            base_data = get_office_engagement_base_data()
+            filtered_data = apply_office_engagement_filters(base_data, query_selections)
+            return build_engagement_time_series_bundle(filtered_data)
+        
+        return _engagement_time_series.get_or_build(make_cache_key(query_selections or {}), build_bundle)
+
     @monitor_chart_performance("Engagement Trend Chart")
     def create_engagement_trend_chart(time_series_data, grouping_level, metric_type):
         """
@@ -573,14 +595,11 @@ def register_training_office_engagement_callbacks(app):
         try:
             # print(f"🔄 Updating engagement trends: grouping={grouping_level}, granularity={time_granularity}, metric={metric_type}")
             
-            # Get base data
-            base_data = get_office_engagement_base_data()
-            
-            # Apply filters
-            filtered_data = apply_office_engagement_filters(base_data, query_selections)
+            # Filtered, period-labeled attendance - built once per filter selection
+            time_series_bundle = get_engagement_time_series_bundle(query_selections)
             
             # Prepare time series data
-            time_series_data = prepare_time_series_data(filtered_data, grouping_level, time_granularity, metric_type)
+            time_series_data = prepare_time_series_data(time_series_bundle, grouping_level, time_granularity, metric_type)
             
             # Create visualization - now handles top3, top5, top10
             fig = create_engagement_trend_chart(time_series_data, grouping_level, metric_type)
@@ -7,9 +7,16 @@ import time
 import copy
 from functools import wraps
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
+from src.utils.cache import LocalCache, make_cache_key
+from src.utils.time_buckets import period_labels
 # ✅ REMOVED: import numpy as np
 # ✅ REMOVED: from scipy import stats
 
+SCHEDULING_AGGREGATION_LEVELS = ["monthly", "quarterly", "yearly"]
+
+# Period-labeled classes and their per-level session counts, keyed by filter selection
+_scheduling_time_series = LocalCache()
+
 def register_training_session_scheduling_callbacks(app):
     """
     Register session scheduling trend callbacks
@@ -234,87 +241,81 @@ def register_training_session_scheduling_callbacks(app):
             "aor_offices": df_aor_offices
         }
 
-    @monitor_performance("Scheduling Time Series Data Preparation")
-    def prepare_scheduling_time_series_data(filtered_data, aggregation_level, trend_type):
+    @monitor_performance("Scheduling Time Series Precomputation")
+    def build_scheduling_time_series_bundle(filtered_data):
         """
-        Prepare time series data for scheduling trend analysis
+        Label the filtered classes once for every aggregation level
+        TimeLabel_<level> columns are vectorized categorical period labels - no row-wise apply
         """
         df_classes = filtered_data.get('training_classes', pd.DataFrame())
         df_topics = filtered_data.get('topic_assignments', pd.DataFrame())
         
         if df_classes.empty:
-            return pd.DataFrame()
+            return {'classes': pd.DataFrame(), 'topics': df_topics, 'series': {}}
         
-        try:
-            # Create time period columns
-            df_classes = df_classes.copy()
-            df_classes.loc[:, 'YearNumber'] = df_classes['ParsedStartTime'].dt.year
-            df_classes.loc[:, 'MonthNumber'] = df_classes['ParsedStartTime'].dt.month
-            df_classes.loc[:, 'QuarterNumber'] = df_classes['ParsedStartTime'].dt.quarter
-            
-            # Create time period labels
-            if aggregation_level == "monthly":
-                df_classes.loc[:, 'TimePeriod'] = df_classes['ParsedStartTime'].dt.to_period('M')
-                df_classes.loc[:, 'TimeLabel'] = df_classes['ParsedStartTime'].dt.strftime('%Y-%m')
-            elif aggregation_level == "quarterly":
-                df_classes.loc[:, 'TimePeriod'] = df_classes['ParsedStartTime'].dt.to_period('Q')
-                df_classes.loc[:, 'TimeLabel'] = df_classes.apply(
-                    lambda x: f"{x['YearNumber']}-Q{x['QuarterNumber']}", axis=1
-                )
-            else:  # yearly
-                df_classes.loc[:, 'TimePeriod'] = df_classes['ParsedStartTime'].dt.to_period('Y')
-                df_classes.loc[:, 'TimeLabel'] = df_classes['YearNumber'].astype(str)
-            
-            # Determine grouping based on trend type
-            if trend_type == "all":
-                # All sessions grouped together
-                time_series = df_classes.groupby('TimeLabel').agg({
-                    'TrainingClassId': 'nunique'  # Count unique sessions
-                }).reset_index()
+        df_labeled = df_classes[['TrainingClassId', 'AorShortName', 'InstructorName']].copy()
+        for aggregation_level in SCHEDULING_AGGREGATION_LEVELS:
+            df_labeled[f'TimeLabel_{aggregation_level}'] = period_labels(df_classes['ParsedStartTime'], aggregation_level)
+        
+        return {'classes': df_labeled, 'topics': df_topics, 'series': {}}
+
+    def get_scheduling_series(time_series_bundle, trend_type):
+        """
+        Session counts for every aggregation level of one trend type
+        Computed on first use and kept in the bundle, so switching aggregation is a lookup
+        """
+        series = time_series_bundle['series'].get(trend_type)
+        if series is not None:
+            return series
+        
+        df_classes = time_series_bundle['classes']
+        df_topics = time_series_bundle['topics']
+        
+        # Determine grouping based on trend type
+        if trend_type == "by_aor":
+            source, group_col = df_classes, 'AorShortName'
+        elif trend_type == "by_topic" and not df_topics.empty:
+            # Group by topic - need to join with topic assignments
+            source = df_classes.merge(
+                df_topics[['TrainingClassId', 'TrainingTopicName']], 
+                on='TrainingClassId', 
+                how='left'
+            )
+            group_col = 'TrainingTopicName'
+        elif trend_type == "by_instructor":
+            source, group_col = df_classes, 'InstructorName'
+        else:
+            # All sessions grouped together (also the fallback when no topic data)
+            source, group_col = df_classes, None
+        
+        series = {}
+        for aggregation_level in SCHEDULING_AGGREGATION_LEVELS:
+            keys = [f'TimeLabel_{aggregation_level}'] + ([group_col] if group_col else [])
+            time_series = source.groupby(keys, observed=True)['TrainingClassId'].nunique().reset_index()  # Count unique sessions
+            time_series.columns = ['TimeLabel'] + (['GroupName'] if group_col else []) + ['SessionCount']
+            if not group_col:
                 time_series.loc[:, 'GroupName'] = 'All Sessions'
-                
-            elif trend_type == "by_aor":
-                # Group by AOR
-                time_series = df_classes.groupby(['TimeLabel', 'AorShortName']).agg({
-                    'TrainingClassId': 'nunique'
-                }).reset_index()
-                time_series = time_series.rename(columns={'AorShortName': 'GroupName'})
-                
-            elif trend_type == "by_topic":
-                # Group by topic - need to join with topic assignments
-                if not df_topics.empty:
-                    class_topics = df_classes.merge(
-                        df_topics[['TrainingClassId', 'TrainingTopicName']], 
-                        on='TrainingClassId', 
-                        how='left'
-                    )
-                    time_series = class_topics.groupby(['TimeLabel', 'TrainingTopicName']).agg({
-                        'TrainingClassId': 'nunique'
-                    }).reset_index()
-                    time_series = time_series.rename(columns={'TrainingTopicName': 'GroupName'})
-                else:
-                    # Fallback to all sessions if no topic data
-                    time_series = df_classes.groupby('TimeLabel').agg({
-                        'TrainingClassId': 'nunique'
-                    }).reset_index()
-                    time_series.loc[:, 'GroupName'] = 'All Sessions'
-                    
-            elif trend_type == "by_instructor":
-                # Group by instructor
-                time_series = df_classes.groupby(['TimeLabel', 'InstructorName']).agg({
-                    'TrainingClassId': 'nunique'
-                }).reset_index()
-                time_series = time_series.rename(columns={'InstructorName': 'GroupName'})
             
-            else:
-                # Default to all sessions
-                time_series = df_classes.groupby('TimeLabel').agg({
-                    'TrainingClassId': 'nunique'
-                }).reset_index()
-                time_series.loc[:, 'GroupName'] = 'All Sessions'
+            time_series['TimeLabel'] = time_series['TimeLabel'].astype(str)
+            series[aggregation_level] = time_series
+        
+        time_series_bundle['series'][trend_type] = series
+        return series
+
+    @monitor_performance("Scheduling Time Series Data Preparation")
+    def prepare_scheduling_time_series_data(time_series_bundle, aggregation_level, trend_type):
+        """
+        Prepare time series data for scheduling trend analysis
+        Reads the precomputed per-level series instead of regrouping raw classes
+        """
+        if time_series_bundle['classes'].empty:
+            return pd.DataFrame()
+        
+        try:
+            if aggregation_level not in SCHEDULING_AGGREGATION_LEVELS:
+                aggregation_level = "yearly"
             
-            # Rename the metric column
-            time_series = time_series.rename(columns={'TrainingClassId': 'SessionCount'})
+            time_series = get_scheduling_series(time_series_bundle, trend_type)[aggregation_level].copy()
             
             # Add metadata
             time_series.loc[:, 'MetricName'] = 'Sessions Scheduled'
@@ -330,6 +331,15 @@ def register_training_session_scheduling_callbacks(app):
             traceback.print_exc()
             return pd.DataFrame()
 
+    def get_scheduling_time_series_bundle(query_selections):
+        """Reuse the labeled classes for a filter selection across aggregation/trend changes"""
+        def build_bundle():
+            base_data = get_session_scheduling_base_data()
+            filtered_data = apply_scheduling_filters(base_data, query_selections)
+            return build_scheduling_time_series_bundle(filtered_data)
+        
+        return _scheduling_time_series.get_or_build(make_cache_key(query_selections or {}), build_bundle)
+
     @monitor_chart_performance("Session Scheduling Chart")
     def create_scheduling_trend_chart(time_series_data, trend_type):
         """
@@ -570,14 +580,11 @@ def register_training_session_scheduling_callbacks(app):
         try:
             # print(f"🔄 Updating scheduling trends: aggregation={aggregation_level}, trend={trend_type}")
             
-            # Get base data
-            base_data = get_session_scheduling_base_data()
-            
-            # Apply filters
-            filtered_data = apply_scheduling_filters(base_data, query_selections)
+            # Filtered, period-labeled classes - built once per filter selection
+            time_series_bundle = get_scheduling_time_series_bundle(query_selections)
             
             # Prepare time series data
-            time_series_data = prepare_scheduling_time_series_data(filtered_data, aggregation_level, trend_type)
+            time_series_data = prepare_scheduling_time_series_data(time_series_bundle, aggregation_level, trend_type)
             
             # Create visualization
             fig = create_scheduling_trend_chart(time_series_data, trend_type)
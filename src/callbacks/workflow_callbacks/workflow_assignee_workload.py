@@ -2,9 +2,14 @@ from dash import callback, Input, Output, State, ctx, html, dcc
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+from datetime import datetime
 from src.utils.db import run_queries
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
-from inflection import titleize
+from src.utils.cache import LocalCache, make_cache_key
+from src.utils.assignee_workload import AssigneeWorkloadMatrix
+
+_assignee_workload_base_data = LocalCache(max_entries=1)
+_assignee_workload_matrices = LocalCache(max_entries=16)
 
 def register_workflow_assignee_workload_callbacks(app):
     
@@ -62,7 +67,8 @@ def register_workflow_assignee_workload_callbacks(app):
         Filter assignee workload DataFrame based on all supported fields.
         Uses the same extraction logic as apply_workflow_data_table_filters.
         """
-        df = pd.DataFrame(work_items)
+        # Shallow copy: the cached base frame is never modified
+        df = pd.DataFrame(work_items).copy(deep=False)
         if df.empty:
             return df
 
@@ -116,153 +122,64 @@ def register_workflow_assignee_workload_callbacks(app):
 
         return df
 
+    @monitor_performance("Assignee Workload Matrix Build")
+    def build_assignee_workload_matrix(stored_selections, base_data):
+        """Assignee x status category counts for a filter selection (None when no tickets match)"""
+        filtered_data = apply_assignee_workload_filters(base_data['work_items'], stored_selections)
+        if filtered_data.empty:
+            return None
+        return AssigneeWorkloadMatrix(filtered_data)
+
+    def get_assignee_workload_matrix(stored_selections):
+        """
+        Cached workload matrix keyed by dataset version and filter hash, so top count and
+        category changes never re-read or re-group the tickets
+        """
+        if not stored_selections:
+            stored_selections = {}
+        base_data = _assignee_workload_base_data.get_or_build(
+            'assignee_workload_base', lambda: dict(get_assignee_workload_base_data(), version=datetime.now().isoformat())
+        )
+        return _assignee_workload_matrices.get_or_build(
+            make_cache_key(stored_selections, base_data['version']),
+            lambda: build_assignee_workload_matrix(stored_selections, base_data)
+        )
+
     @monitor_performance("Assignee Workload Data Preparation")
-    def prepare_assignee_workload_data(filtered_data, top_count=10):
+    def prepare_assignee_workload_data(workload_matrix, top_count=10):
         """
         Prepare assignee workload analysis data
         Creates workload distribution with 3 status buckets: Closed, Active, Non-Actionable
         UPDATED: Enhanced to handle 'all' option for displaying all assignees
+        Slices the ranked assignees of a precomputed AssigneeWorkloadMatrix
         """
-        if filtered_data.empty:
+        if workload_matrix is None:
             return pd.DataFrame(), {}
         
         try:
-            df = filtered_data.copy()
-            
-            # Clean and format assignee names
-            def format_assignee_name(assignee):
-                if pd.isna(assignee) or assignee == '' or assignee.lower() == 'unassigned':
-                    return 'Unassigned'
-                # Clean up assignee names - remove domain info, format properly
-                cleaned = str(assignee).split('@')[0].replace('.', ' ').replace('_', ' ').replace('\r', ' ').replace('\n', ' ')
-                return titleize(cleaned)
-            
-            df['AssigneeDisplay'] = df['AssignedTo'].apply(format_assignee_name)
-            
-            # UPDATED: Categorize WorkItemStatus into 3 meaningful buckets
-            def categorize_status(status):
-                if pd.isna(status):
-                    return 'Non-Actionable'
-                
-                status = str(status).strip()
-                
-                # CLOSED: Tickets that are completed/resolved
-                closed_statuses = {
-                    'Closed', 'First Call Closed', 'Self-Fix', 'Resolved', 
-                    'Escalation Resolved', 'Done', 'Canceled', 'Escalation Canceled'
-                }
-                
-                # ACTIVE: Tickets that require action/work
-                active_statuses = {
-                    'Not Started', 'In Progress', 'Open', 'Scheduled', 
-                    'Escalated', 'Pending', 'Pending Verification', 'Existing Escalation'
-                }
-                
-                # NON-ACTIONABLE: Tickets that are blocked/suspended/insufficient
-                non_actionable_statuses = {
-                    'On Hold', 'Insufficient Details'
-                }
-                
-                if status in closed_statuses:
-                    return 'Closed'
-                elif status in active_statuses:
-                    return 'Active'
-                elif status in non_actionable_statuses:
-                    return 'Non-Actionable'
-                else:
-                    # Unknown status - default to Active for safety
-                    return 'Active'
-            
-            # Apply status categorization
-            df['StatusCategory'] = df['WorkItemStatus'].apply(categorize_status)
-            
-            # UPDATED: Convert date columns for escalation analysis
-            df['CreatedOn'] = pd.to_datetime(df['CreatedOn'], errors='coerce')
-            df['EscalatedOn'] = pd.to_datetime(df['EscalatedOn'], errors='coerce')
-            
-            # Enhanced escalation check
-            def is_escalated_ticket(row):
-                # Check both IsEscalated flag and status
-                is_flag_escalated = str(row['IsEscalated']).strip() in ['1', 'True', 'true']
-                is_status_escalated = str(row['WorkItemStatus']).strip() in ['Escalated', 'Existing Escalation', 'Escalation Resolved', 'Escalation Canceled']
-                return is_flag_escalated or is_status_escalated
-            
-            df['IsActuallyEscalated'] = df.apply(is_escalated_ticket, axis=1)
-            
-            # UPDATED: Calculate comprehensive workload metrics per assignee
-            assignee_metrics = df.groupby('AssigneeDisplay').agg({
-                'WorkItemId': 'count',  # Total tickets
-                'IsActuallyEscalated': lambda x: x.sum(),  # Escalated tickets
-                'StatusCategory': lambda x: (x == 'Closed').sum(),  # Closed tickets
-                'CreatedOn': ['min', 'max'],  # Date range for activity
-                'Priority': lambda x: x.mode().iloc[0] if not x.mode().empty else 'Unknown'  # Most common priority
-            })
-            
-            # Add status category counts
-            status_counts = df.groupby(['AssigneeDisplay', 'StatusCategory']).size().unstack(fill_value=0)
-            
-            # Ensure all status categories exist (even if 0)
-            for status_cat in ['Closed', 'Active', 'Non-Actionable']:
-                if status_cat not in status_counts.columns:
-                    status_counts[status_cat] = 0
-            
-            # Flatten main metrics column names
-            assignee_metrics.columns = [
-                'total_tickets', 'escalated_tickets', 'closed_tickets_alt', 
-                'first_ticket_date', 'last_ticket_date', 'common_priority'
-            ]
-            
-            # UPDATED: Merge with status category counts
-            assignee_metrics = assignee_metrics.merge(status_counts, left_index=True, right_index=True, how='left')
-            
-            # Fill any missing status counts with 0
-            assignee_metrics['Closed'] = assignee_metrics['Closed'].fillna(0).astype(int)
-            assignee_metrics['Active'] = assignee_metrics['Active'].fillna(0).astype(int)
-            assignee_metrics['Non-Actionable'] = assignee_metrics['Non-Actionable'].fillna(0).astype(int)
-            
-            # Calculate performance metrics
-            assignee_metrics['escalation_rate'] = (
-                assignee_metrics['escalated_tickets'] / assignee_metrics['total_tickets'] * 100
-            ).round(1)
-            
-            assignee_metrics['closure_rate'] = (
-                assignee_metrics['Closed'] / assignee_metrics['total_tickets'] * 100
-            ).round(1)
-            
-            assignee_metrics['active_rate'] = (
-                assignee_metrics['Active'] / assignee_metrics['total_tickets'] * 100
-            ).round(1)
-            
-            # UPDATED: Sort by total tickets and handle 'all' vs top N
-            assignee_metrics = assignee_metrics.sort_values('total_tickets', ascending=False)
-            
             # Apply top count filter (if not 'all')
-            if top_count != 'all' and isinstance(top_count, int):
-                assignee_metrics = assignee_metrics.head(top_count)
-            # If top_count is 'all', we keep all assignees (no filtering)
+            assignee_metrics = workload_matrix.top(top_count)
             
-            # UPDATED: Enhanced summary statistics
-            total_closed = df[df['StatusCategory'] == 'Closed'].shape[0]
-            total_active = df[df['StatusCategory'] == 'Active'].shape[0]
-            total_non_actionable = df[df['StatusCategory'] == 'Non-Actionable'].shape[0]
+            total_assignees = len(workload_matrix.assignees)
+            total_tickets = workload_matrix.total_tickets
             
             summary_stats = {
-                'total_assignees': len(df['AssigneeDisplay'].unique()),
+                'total_assignees': total_assignees,
                 'displayed_assignees': len(assignee_metrics),  # ADDED: How many are actually displayed
-                'total_tickets': len(df),
-                'total_closed_tickets': int(total_closed),
-                'total_active_tickets': int(total_active),
-                'total_non_actionable_tickets': int(total_non_actionable),
-                'avg_tickets_per_assignee': (len(df) / len(df['AssigneeDisplay'].unique())),
+                'total_tickets': total_tickets,
+                'total_closed_tickets': workload_matrix.category_total('Closed'),
+                'total_active_tickets': workload_matrix.category_total('Active'),
+                'total_non_actionable_tickets': workload_matrix.category_total('Non-Actionable'),
+                'avg_tickets_per_assignee': (total_tickets / total_assignees),
                 'top_assignee': assignee_metrics.index[0] if len(assignee_metrics) > 0 else 'N/A',
                 'top_assignee_count': assignee_metrics['total_tickets'].iloc[0] if len(assignee_metrics) > 0 else 0,
-                'unassigned_tickets': len(df[df['AssigneeDisplay'] == 'Unassigned']),
+                'unassigned_tickets': workload_matrix.assignee_total('Unassigned'),
                 'escalation_rate_avg': assignee_metrics['escalation_rate'].mean(),
                 'closure_rate_avg': assignee_metrics['closure_rate'].mean(),
                 'active_rate_avg': assignee_metrics['active_rate'].mean()
             }
             
-            # print(f"📊 Prepared assignee workload data: {len(assignee_metrics)} assignees displayed (of {len(df['AssigneeDisplay'].unique())} total), {len(df)} total tickets")
+            # print(f"📊 Prepared assignee workload data: {len(assignee_metrics)} assignees displayed (of {total_assignees} total), {total_tickets} total tickets")
             return assignee_metrics, summary_stats
             
         except Exception as e:
@@ -713,14 +630,11 @@ def register_workflow_assignee_workload_callbacks(app):
             
             # print(f"🔄 Updating assignee workload analysis: display = {top_count}, categories = {selected_categories}")
             
-            # Get base data
-            base_data = get_assignee_workload_base_data()
-            
-            # Apply filters
-            filtered_data = apply_assignee_workload_filters(base_data['work_items'], stored_selections)
+            # Assignee x status counts for the filter selection (cached)
+            workload_matrix = get_assignee_workload_matrix(stored_selections)
             
             # Prepare analysis data
-            workload_data, summary_stats = prepare_assignee_workload_data(filtered_data, top_count)
+            workload_data, summary_stats = prepare_assignee_workload_data(workload_matrix, top_count)
             
             # Create visualization with selected categories
             fig = create_assignee_workload_chart(workload_data, summary_stats, top_count, selected_categories)
@@ -770,9 +684,8 @@ def register_workflow_assignee_workload_callbacks(app):
             try:
                 if selected_categories is None or len(selected_categories) == 0:
                     selected_categories = ['Closed', 'Active', 'Non-Actionable', 'Total']
-                base_data = get_assignee_workload_base_data()
-                filtered_data = apply_assignee_workload_filters(base_data['work_items'], stored_selections)
-                workload_data, summary_stats = prepare_assignee_workload_data(filtered_data, top_count or 10)
+                workload_matrix = get_assignee_workload_matrix(stored_selections)
+                workload_data, summary_stats = prepare_assignee_workload_data(workload_matrix, top_count or 10)
                 fig = create_assignee_workload_chart(workload_data, summary_stats, top_count or 10, selected_categories)
                 fig.update_layout(height=600)
                 return True, fig
@@ -9,7 +9,14 @@ import time
 import copy
 from functools import wraps
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
-from inflection import titleize, pluralize
+from src.utils.cache import LocalCache
+from src.utils.classification_crosstab import ClassificationCodes, CLASSIFICATION_DIMENSIONS
+from inflection import pluralize
+
+# Display preference -> rows shown by the charts
+DISPLAY_ROW_LIMITS = {'top3': 3, 'top5': 5, 'top10': 10}
+
+_classification_data = LocalCache(max_entries=1)
 
 def register_workflow_classification_analysis_callbacks(app):
     """
@@ -81,8 +88,8 @@ def register_workflow_classification_analysis_callbacks(app):
         if not stored_selections:
             stored_selections = {}
         
-        # Convert to DataFrames and create explicit copies
-        df_work_items = pd.DataFrame(work_items).copy()
+        # Shallow copy: the cached work items are never modified
+        df_work_items = pd.DataFrame(work_items).copy(deep=False)
         
         # print(f"📊 Starting classification analysis filtering: {len(df_work_items)} work item records")
         
@@ -165,93 +172,50 @@ def register_workflow_classification_analysis_callbacks(app):
 
         return df_work_items
 
+    @monitor_performance("Classification Codes Build")
+    def build_classification_data():
+        base_data = get_classification_analysis_base_data()
+        work_items = pd.DataFrame(base_data['work_items'])
+        return {
+            'work_items': work_items,
+            'codes': ClassificationCodes(work_items, base_data['case_types'])
+        }
+
+    def get_classification_data():
+        """
+        Work items with every classification dimension integer-coded
+        (cached until the data refreshes)
+        """
+        return _classification_data.get_or_build('classification_data', build_classification_data)
+
     @monitor_performance("Classification Analysis Data Preparation")
-    def prepare_classification_analysis_data(filtered_data, case_types_data, row_dimension="case_type", column_dimension="case_origin"):
+    def prepare_classification_analysis_data(filtered_data, classification_codes, row_dimension="case_type", column_dimension="case_origin", max_rows=None):
         """
         Prepare classification analysis data for visualization
         Creates cross-tabulation of any two dimensions
         UPDATED: Added support for AOR and Case Reason dimensions
+        Counts come from the precomputed dimension codes of the filtered rows; high-cardinality
+        pairs are counted sparsely and only their top max_rows rows are densified
         """
         if filtered_data.empty:
             return pd.DataFrame(), {}
         
         try:
-            df = filtered_data.copy()
-            
-            # Get case type mapping for proper display names
-            case_type_mapping = {}
-            if case_types_data is not None and len(case_types_data) > 0:
-                df_case_types = pd.DataFrame(case_types_data).copy()
-                case_type_mapping = dict(zip(df_case_types['CaseTypeCode'], df_case_types['CaseTypeName']))
-            
-            # Handle missing values for ALL dimensions including AOR and Case Reason
-            df['WorkItemDefinitionShortCode'] = df['WorkItemDefinitionShortCode'].fillna('Unspecified')
-            df['CaseOrigin'] = df['CaseOrigin'].fillna('Unspecified')
-            df['AorShortName'] = df['AorShortName'].fillna('Unspecified')                   # ADDED: AOR handling
-            df['CaseReason'] = df['CaseReason'].fillna('Unspecified')                       # ADDED: Case Reason handling
-            df['Priority'] = df['Priority'].fillna('Unspecified')
-            df['Product'] = df['Product'].fillna('Unspecified')
-            df['Module'] = df['Module'].fillna('Unspecified')
-            df['Feature'] = df['Feature'].fillna('Unspecified')
-            df['Issue'] = df['Issue'].fillna('Unspecified')
-            df['WorkItemStatus'] = df['WorkItemStatus'].fillna('Unspecified')
-            
-            # UPDATED: Simple formatting function using titleize with N/A removal like filter callbacks
-            def format_for_display(value):
-                if pd.isna(value) or value == '' or value == 'Unspecified':
-                    return 'Unspecified'
-                formatted = str(value).replace('_', ' ').replace('-', ' ').replace('N/A', '').strip()
-                return titleize(formatted) if formatted else 'Unspecified'
-            
-            # Create display names for case types
-            def get_case_type_display_name(code):
-                if pd.isna(code) or code == '' or code == 'Unspecified':
-                    return 'Unspecified'
-                return case_type_mapping.get(code, format_for_display(code))
-            
-            # UPDATED: Create display columns for ALL dimensions including AOR and Case Reason
-            df['CaseTypeDisplay'] = df['WorkItemDefinitionShortCode'].apply(get_case_type_display_name)
-            df['CaseOriginDisplay'] = df['CaseOrigin'].apply(format_for_display)
-            df['AorDisplay'] = df['AorShortName'].apply(format_for_display)                 # ADDED: AOR display formatting
-            df['CaseReasonDisplay'] = df['CaseReason'].apply(format_for_display)            # ADDED: Case Reason display formatting
-            df['PriorityDisplay'] = df['Priority'].apply(format_for_display)
-            df['ProductDisplay'] = df['Product'].apply(format_for_display)
-            df['ModuleDisplay'] = df['Module'].apply(format_for_display)
-            df['FeatureDisplay'] = df['Feature'].apply(format_for_display)
-            df['IssueDisplay'] = df['Issue'].apply(format_for_display)
-            df['StatusDisplay'] = df['WorkItemStatus'].apply(format_for_display)
-            
-            # UPDATED: Mapping from dimension keys to display column names including new dimensions
-            dimension_column_mapping = {
-                'case_type': 'CaseTypeDisplay',
-                'case_origin': 'CaseOriginDisplay',
-                'aor': 'AorDisplay',                                                        
-                'case_reason': 'CaseReasonDisplay',                                         
-                'priority': 'PriorityDisplay',
-                'product': 'ProductDisplay',
-                'module': 'ModuleDisplay',
-                'feature': 'FeatureDisplay',
-                'issue': 'IssueDisplay',
-                'status': 'StatusDisplay'
-            }
-            
-            # Get the actual column names for the selected dimensions
-            row_column = dimension_column_mapping.get(row_dimension, 'CaseTypeDisplay')
-            column_column = dimension_column_mapping.get(column_dimension, 'CaseOriginDisplay')
+            # Get the actual dimensions to cross-tabulate
+            row_key = row_dimension if row_dimension in CLASSIFICATION_DIMENSIONS else 'case_type'
+            column_key = column_dimension if column_dimension in CLASSIFICATION_DIMENSIONS else 'case_origin'
             
             # Prevent same dimension being used for both rows and columns
             if row_dimension == column_dimension:
                 # print(f"⚠️ Same dimension selected for both axes: {row_dimension}. Using default combination.")
-                row_column = 'CaseTypeDisplay'
-                column_column = 'CaseOriginDisplay'
+                row_key = 'case_type'
+                column_key = 'case_origin'
             
             # Create cross-tabulation for selected dimensions
-            crosstab_data = pd.crosstab(
-                df[row_column], 
-                df[column_column],
-                margins=True, 
-                margins_name="Total"
+            crosstab = classification_codes.crosstab(
+                row_key, column_key, classification_codes.positions(filtered_data.index)
             )
+            crosstab_data = crosstab.to_frame(max_rows=max_rows, margins_name="Total")
             
             # Handle products and AOR specially (limit to avoid overcrowding)
             if column_dimension in ['product', 'aor'] and len(crosstab_data.columns) > 11:  # 10 + Total column
@@ -259,19 +223,22 @@ def register_workflow_classification_analysis_callbacks(app):
                 column_totals = crosstab_data.loc['Total'].drop('Total', errors='ignore').sort_values(ascending=False).head(10)
                 top_items = column_totals.index.tolist() + ['Total']
                 crosstab_data = crosstab_data[top_items]
+            
+            # Rows before any trimming, for the charts' "Top N of M" titles
+            crosstab_data.attrs['row_count'] = len(crosstab.row_labels)
                 
             # Calculate summary statistics
             summary_stats = {
-                'total_tickets': len(df),
+                'total_tickets': len(filtered_data),
                 'row_dimension': row_dimension,
                 'column_dimension': column_dimension,
-                'unique_rows': df[row_column].nunique(),
-                'unique_columns': df[column_column].nunique(),
-                'top_row': df[row_column].mode().iloc[0] if not df[row_column].mode().empty else 'N/A',
-                'top_column': df[column_column].mode().iloc[0] if not df[column_column].mode().empty else 'N/A'
+                'unique_rows': len(crosstab.row_labels),
+                'unique_columns': len(crosstab.column_labels),
+                'top_row': crosstab.top_row(),
+                'top_column': crosstab.top_column()
             }
             
-            # print(f"📊 Prepared classification analysis with AOR & Case Reason: {len(df)} tickets, {row_dimension} vs {column_dimension}")
+            # print(f"📊 Prepared classification analysis with AOR & Case Reason: {len(filtered_data)} tickets, {row_dimension} vs {column_dimension}")
             return crosstab_data, summary_stats
             
         except Exception as e:
@@ -389,8 +356,8 @@ def register_workflow_classification_analysis_callbacks(app):
             row_totals = crosstab_data.sum(axis=1).sort_values(ascending=False)
             crosstab_data = crosstab_data.reindex(row_totals.index)
             
-            # Apply display limit based on user selection
-            total_rows = len(crosstab_data)
+            # Apply display limit based on user selection (sparse cross-tabs arrive already trimmed)
+            total_rows = analysis_data.attrs.get('row_count', len(crosstab_data))
             if display_limit == "top3":
                 crosstab_data = crosstab_data.head(3)
                 displayed_count = min(3, total_rows)
@@ -514,8 +481,8 @@ def register_workflow_classification_analysis_callbacks(app):
             row_totals = crosstab_data.sum(axis=1).sort_values(ascending=False)
             crosstab_data = crosstab_data.reindex(row_totals.index)
             
-            # Apply display limit
-            total_rows = len(crosstab_data)
+            # Apply display limit (sparse cross-tabs arrive already trimmed)
+            total_rows = analysis_data.attrs.get('row_count', len(crosstab_data))
             if display_limit == "top3":
                 crosstab_data = crosstab_data.head(3)
                 displayed_count = min(3, total_rows)
@@ -770,7 +737,8 @@ def register_workflow_classification_analysis_callbacks(app):
                 if len(columns_to_analyze) > 0:
                     column_totals = {}
                     for col in columns_to_analyze:
-                        column_totals[col] = analysis_data[col].sum()
+                        # The Total margin row already holds the column total
+                        column_totals[col] = analysis_data.loc['Total', col] if 'Total' in analysis_data.index else analysis_data[col].sum()
                     
                     if column_totals:
                         top_column_item = max(column_totals, key=column_totals.get)
@@ -890,18 +858,19 @@ def register_workflow_classification_analysis_callbacks(app):
             
             # print(f"🔄 Updating classification analysis: {row_dimension} vs {column_dimension}, view={view_state}, display={display_preference}")
             
-            # Get base data
-            base_data = get_classification_analysis_base_data()
+            # Get coded base data
+            classification_data = get_classification_data()
             
             # Apply filters
-            filtered_data = apply_classification_analysis_filters(base_data['work_items'], stored_selections)
+            filtered_data = apply_classification_analysis_filters(classification_data['work_items'], stored_selections)
             
             # Prepare analysis data with selected dimensions
             analysis_data, summary_stats = prepare_classification_analysis_data(
                 filtered_data, 
-                base_data['case_types'], 
+                classification_data['codes'], 
                 row_dimension,
-                column_dimension
+                column_dimension,
+                DISPLAY_ROW_LIMITS.get(display_preference)
             )
             
             # Create visualization based on view state and display preference
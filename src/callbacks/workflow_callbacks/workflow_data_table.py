@@ -2,21 +2,158 @@ from dash import callback, ctx, dcc, html, Input, Output, State, no_update, dash
 import pandas as pd
 from datetime import datetime
 from src.utils.db import run_queries
+from src.utils.cache import make_cache_key
+from src.utils.paged_table import PagedFrameCache
 from src.utils.performance import monitor_performance, monitor_query_performance
 
+# Work item columns the global filters are applied on
+WORKFLOW_FILTER_COLUMNS = [
+    'CreatedOn', 'AorShortName', 'WorkItemDefinitionShortCode', 'WorkItemStatus', 'Priority',
+    'CaseOrigin', 'CaseReason', 'Product', 'Feature', 'Module', 'Issue'
+]
+
+# Report type -> displayed columns (source column -> header, in display order)
+# Joined reports also name the duration table and the columns taken from it;
+# every other column comes from Fact_WorkFlowItems
+WORKFLOW_REPORTS = {
+    'ticket_summary': {
+        'columns': {
+            'WorkItemId': 'Ticket ID',
+            'Title': 'Title',
+            'CreatedOn': 'Created On',
+            'ClosedOn': 'Closed On',
+            'WorkItemStatus': 'Status',
+            'WorkItemDefinitionShortCode': 'Type',
+            'AorShortName': 'AOR',
+            'CaseOrigin': 'Origin',
+            'CaseReason': 'Reason',
+            'Feature': 'Feature',
+            'Issue': 'Issue',
+            'Module': 'Module',
+            'Priority': 'Priority',
+            'Product': 'Product',
+            'AssignedTo': 'Assigned To',
+            'IsEscalated': 'Escalated',
+            'EscalationOwner': 'Escalation Owner'
+        }
+    },
+    'resolution_details': {
+        'columns': {
+            'WorkItemId': 'Ticket ID',
+            'Title': 'Title',
+            'ResolutionSummary': 'Resolution',
+            'ClosedOn': 'Closed On',
+            'AssignedTo': 'Assigned To',
+            'WorkItemStatus': 'Status',
+            'Priority': 'Priority',
+            'Product': 'Product'
+        },
+        'closed_only': True
+    },
+    'user_performance': {
+        'columns': {
+            'WorkItemId': 'Ticket ID',
+            'AssignedFrom': 'Assigned From',
+            'AssignedTo': 'Assigned To',
+            'FromUserId': 'From User',
+            'ToUserId': 'To User',
+            'DurationHours': 'Assignment Duration (hrs)',
+            'Title': 'Title',
+            'CreatedOn': 'Created On',
+            'ClosedOn': 'Closed On',
+            'WorkItemStatus': 'Status',
+            'Priority': 'Priority',
+            'Product': 'Product'
+        },
+        'durations_table': 'Fact_AssignmentDurations',
+        'duration_columns': ['WorkItemId', 'AssignedFrom', 'AssignedTo', 'FromUserId', 'ToUserId', 'DurationHours']
+    },
+    'escalation_history': {
+        'columns': {
+            'WorkItemId': 'Ticket ID',
+            'AssignedFrom': 'Escalation From',
+            'AssignedTo': 'Escalation To',
+            'FromUserId': 'Escalated By',
+            'ToUserId': 'Escalation Owner',
+            'DurationHours': 'Escalation Duration (hrs)',
+            'Title': 'Title',
+            'CreatedOn': 'Created On',
+            'ClosedOn': 'Closed On',
+            'WorkItemStatus': 'Status',
+            'Priority': 'Priority',
+            'Product': 'Product'
+        },
+        'durations_table': 'Fact_EscalationDurations',
+        'duration_columns': ['WorkItemId', 'AssignedFrom', 'AssignedTo', 'FromUserId', 'ToUserId', 'DurationHours']
+    },
+    'product_impact': {
+        'columns': {
+            'Product': 'Product',
+            'WorkItemId': 'Ticket ID',
+            'Title': 'Title',
+            'CreatedOn': 'Created On',
+            'ClosedOn': 'Closed On',
+            'WorkItemStatus': 'Status',
+            'Priority': 'Priority',
+            'Module': 'Module',
+            'Feature': 'Feature',
+            'Issue': 'Issue'
+        }
+    }
+}
+
+_workflow_report_frames = PagedFrameCache()
+
 def register_workflow_data_table_callbacks(app):
     """
     Register workflow data table callbacks with export functionality.
     Matches the component IDs from the layout file.
     """
 
+    @monitor_query_performance("Workflow Data Table Columns")
+    def get_workflow_table_columns():
+        """Columns of the report source tables ({} when the schema cannot be read)"""
+        query = """
+            SELECT TABLE_NAME, COLUMN_NAME
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = 'consumable'
+              AND TABLE_NAME IN ('Fact_WorkFlowItems', 'Fact_AssignmentDurations', 'Fact_EscalationDurations')
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """
+        try:
+            columns = run_queries({"table_columns": query}, 'workflow', 1)["table_columns"]
+        except Exception as e:
+            print(f"⚠️ Could not read workflow table columns, selecting all columns: {e}")
+            return {}
+        return columns.groupby('TABLE_NAME')['COLUMN_NAME'].apply(list).to_dict()
+
+    def projected_query(table, columns, table_columns):
+        """SELECT of only the wanted columns the table actually has (all columns when its schema is unknown)"""
+        available = table_columns.get(table)
+        if available:
+            columns = [column for column in dict.fromkeys(columns) if column in available]
+        select_list = ', '.join(f"[{column}]" for column in columns) if available and columns else '*'
+        return f"SELECT {select_list} FROM [consumable].[{table}]"
+
     @monitor_query_performance("Workflow Data Table Base Data")
-    def get_workflow_data_table_base_data():
+    def get_workflow_data_table_base_data(report_type):
+        """Fetch only the tables and columns the report type displays or filters on"""
+        report = WORKFLOW_REPORTS.get(report_type)
+        if report is None:
+            return {}
+
+        table_columns = get_workflow_table_columns()
+        durations_table = report.get('durations_table')
+        duration_columns = report.get('duration_columns', [])
+        item_columns = ['WorkItemId'] + [column for column in report['columns'] if column not in duration_columns]
+
         queries = {
-            "Fact_WorkFlowItems": "SELECT * FROM [consumable].[Fact_WorkFlowItems]",
-            "Fact_AssignmentDurations": "SELECT * FROM [consumable].[Fact_AssignmentDurations]",
-            "Fact_EscalationDurations": "SELECT * FROM [consumable].[Fact_EscalationDurations]",
+            "Fact_WorkFlowItems": projected_query(
+                'Fact_WorkFlowItems', item_columns + WORKFLOW_FILTER_COLUMNS, table_columns
+            )
         }
+        if durations_table:
+            queries[durations_table] = projected_query(durations_table, duration_columns, table_columns)
         return run_queries(queries, 'workflow', len(queries))
 
     @monitor_performance("Workflow Data Table Filter Application")
@@ -84,121 +221,67 @@ def register_workflow_data_table_callbacks(app):
         """
         Compose the required report using pandas, joining tables as needed.
         """
+        report = WORKFLOW_REPORTS.get(report_type)
+        if report is None:
+            return pd.DataFrame()
+
         df_items = pd.DataFrame(base_data.get("Fact_WorkFlowItems", []))
-        df_items = apply_workflow_data_table_filters(df_items, query_selections)
-        df_assign = pd.DataFrame(base_data.get("Fact_AssignmentDurations", []))
-        df_escal = pd.DataFrame(base_data.get("Fact_EscalationDurations", []))
-
-        if report_type == "ticket_summary":
-            # Select and rename columns
-            mapping = {
-                'WorkItemId': 'Ticket ID',
-                'Title': 'Title',
-                'CreatedOn': 'Created On',
-                'ClosedOn': 'Closed On',
-                'WorkItemStatus': 'Status',
-                'WorkItemDefinitionShortCode': 'Type',
-                'AorShortName': 'AOR',
-                'CaseOrigin': 'Origin',
-                'CaseReason': 'Reason',
-                'Feature': 'Feature',
-                'Issue': 'Issue',
-                'Module': 'Module',
-                'Priority': 'Priority',
-                'Product': 'Product',
-                'AssignedTo': 'Assigned To',
-                'IsEscalated': 'Escalated',
-                'EscalationOwner': 'Escalation Owner'
-            }
-            cols = [c for c in mapping if c in df_items.columns]
-            df = df_items[cols].rename(columns=mapping)
-            return df
-
-        elif report_type == "resolution_details":
-            # Filter closed tickets
-            df = df_items[df_items['ClosedOn'].notnull()].copy()
-            mapping = {
-                'WorkItemId': 'Ticket ID',
-                'Title': 'Title',
-                'ResolutionSummary': 'Resolution',
-                'ClosedOn': 'Closed On',
-                'AssignedTo': 'Assigned To',
-                'WorkItemStatus': 'Status',
-                'Priority': 'Priority',
-                'Product': 'Product'
-            }
-            cols = [c for c in mapping if c in df.columns]
-            df = df[cols].rename(columns=mapping)
-            return df
-
-        elif report_type == "user_performance":
-            # Merge assignment durations with ticket info
-            if not df_assign.empty and not df_items.empty:
-                df = pd.merge(df_assign, df_items, on="WorkItemId", how="left", suffixes=("_assign", "_item"))
-                mapping = {
-                    'WorkItemId': 'Ticket ID',
-                    'AssignedFrom': 'Assigned From',
-                    'AssignedTo': 'Assigned To',
-                    'FromUserId': 'From User',
-                    'ToUserId': 'To User',
-                    'DurationHours': 'Assignment Duration (hrs)',
-                    'Title': 'Title',
-                    'CreatedOn': 'Created On',
-                    'ClosedOn': 'Closed On',
-                    'WorkItemStatus': 'Status',
-                    'Priority': 'Priority',
-                    'Product': 'Product'
-                }
-                cols = [c for c in mapping if c in df.columns]
-                df = df[cols].rename(columns=mapping)
-                return df
-            else:
-                return pd.DataFrame()
+        df_items = apply_workflow_data_table_filters(df_items, query_selections or {})
+        mapping = report['columns']
 
-        elif report_type == "escalation_history":
-            # Merge escalation durations with ticket info
-            if not df_escal.empty and not df_items.empty:
-                df = pd.merge(df_escal, df_items, on="WorkItemId", how="left", suffixes=("_escal", "_item"))
-                mapping = {
-                    'WorkItemId': 'Ticket ID',
-                    'AssignedFrom': 'Escalation From',
-                    'AssignedTo': 'Escalation To',
-                    'FromUserId': 'Escalated By',
-                    'ToUserId': 'Escalation Owner',
-                    'DurationHours': 'Escalation Duration (hrs)',
-                    'Title': 'Title',
-                    'CreatedOn': 'Created On',
-                    'ClosedOn': 'Closed On',
-                    'WorkItemStatus': 'Status',
-                    'Priority': 'Priority',
-                    'Product': 'Product'
-                }
-                cols = [c for c in mapping if c in df.columns]
-                df = df[cols].rename(columns=mapping)
-                return df
-            else:
+        durations_table = report.get('durations_table')
+        if durations_table:
+            # Merge assignment/escalation durations with ticket info
+            df_durations = pd.DataFrame(base_data.get(durations_table, []))
+            if df_durations.empty or df_items.empty:
                 return pd.DataFrame()
+            df_durations = df_durations[[c for c in report['duration_columns'] if c in df_durations.columns]]
+            item_columns = [c for c in df_items.columns if c == 'WorkItemId' or c not in report['duration_columns']]
+            df = pd.merge(df_durations, df_items[item_columns], on="WorkItemId", how="left")
+        elif report.get('closed_only'):
+            # Filter closed tickets
+            df = df_items[df_items['ClosedOn'].notnull()] if 'ClosedOn' in df_items.columns else df_items.iloc[0:0]
+        else:
+            df = df_items
+
+        cols = [c for c in mapping if c in df.columns]
+        return df[cols].rename(columns=mapping)
+
+    def get_workflow_report_frame(query_selections, report_type):
+        """
+        Build (or reuse) the prepared report frame for the current filters and report type
+        The frame is kept in-process so page, sort and filter requests never rebuild it
+        """
+        cache_key = make_cache_key(query_selections or {}, report_type)
+
+        def build_report_frame():
+            base_data = get_workflow_data_table_base_data(report_type)
+            return prepare_workflow_data_table_report(base_data, query_selections, report_type)
+
+        return _workflow_report_frames.get_or_build(cache_key, build_report_frame)
 
-        elif report_type == "product_impact":
-            mapping = {
-                'Product': 'Product',
-                'WorkItemId': 'Ticket ID',
-                'Title': 'Title',
-                'CreatedOn': 'Created On',
-                'ClosedOn': 'Closed On',
-                'WorkItemStatus': 'Status',
-                'Priority': 'Priority',
-                'Module': 'Module',
-                'Feature': 'Feature',
-                'Issue': 'Issue'
-            }
-            cols = [c for c in mapping if c in df_items.columns]
-            df = df_items[cols].rename(columns=mapping)
-            return df
+    def format_page_records(records, report_df):
+        """Show datetime values of a page as 'YYYY-MM-DD HH:MM'"""
+        datetime_columns = [c for c in report_df.columns if pd.api.types.is_datetime64_any_dtype(report_df[c])]
+        for record in records:
+            for col in datetime_columns:
+                value = record.get(col)
+                record[col] = value.strftime('%Y-%m-%d %H:%M') if pd.notna(value) else None
+        return records
 
+    def create_data_table_summary(total_records, matching_records, report_type):
+        """Summary line shown above the data table"""
+        if matching_records == total_records:
+            record_text = f"Showing {total_records:,} records"
         else:
-            return pd.DataFrame()
-        
+            record_text = f"Showing {matching_records:,} of {total_records:,} records"
+
+        return html.P([
+            html.Strong(record_text),
+            f" • Report: {report_type.replace('_', ' ').title()}",
+            f" • Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        ], className="text-muted small mb-3")
+
     @callback(
         Output("workflow-data-table-container", "children"),
         [
@@ -210,9 +293,12 @@ def register_workflow_data_table_callbacks(app):
     )
     @monitor_performance("Workflow Data Table Update")
     def update_workflow_data_table(query_selections, report_type, page_size):
+        """
+        Only the first page is sent; paging, sorting and filtering are served by update_workflow_data_table_page
+        """
         try:
-            base_data = get_workflow_data_table_base_data()
-            report_df = prepare_workflow_data_table_report(base_data, query_selections, report_type)
+            report_frame = get_workflow_report_frame(query_selections, report_type)
+            report_df = report_frame.df
 
             if report_df.empty:
                 return html.Div([
@@ -220,25 +306,28 @@ def register_workflow_data_table_callbacks(app):
                         className="text-muted text-center p-4")
                 ])
 
-            # Format datetime columns
-            for col in report_df.columns:
-                if report_df[col].dtype == 'datetime64[ns]':
-                    report_df[col] = report_df[col].dt.strftime('%Y-%m-%d %H:%M')
-
             columns = [{"name": col, "id": col, "deletable": False, "selectable": False} for col in report_df.columns]
 
             style_data_conditional = [
                 {'if': {'row_index': 'odd'}, 'backgroundColor': '#f8f9fa'}
             ]
 
+            # First page only - the rest is served on demand
+            first_page, total_records, page_count = report_frame.get_page(0, page_size)
+
             data_table = dash_table.DataTable(
                 id="workflow-data-table",
                 columns=columns,
-                data=report_df.to_dict('records'),
+                data=format_page_records(first_page, report_df),
+                page_current=0,
                 page_size=page_size,
-                sort_action="native",
+                page_count=page_count,
+                page_action="custom",
+                sort_action="custom",
                 sort_mode="multi",
-                filter_action="native",
+                sort_by=[],
+                filter_action="custom",
+                filter_query="",
                 style_table={'overflowX': 'auto', 'minWidth': '100%'},
                 style_cell={'textAlign': 'left', 'padding': '10px', 'fontFamily': 'Arial, sans-serif', 'fontSize': '12px', 'border': '1px solid #dee2e6'},
                 style_header={'backgroundColor': '#f8f9fa', 'fontWeight': 'bold', 'color': '#495057', 'border': '1px solid #dee2e6'},
@@ -246,13 +335,10 @@ def register_workflow_data_table_callbacks(app):
                 css=[{'selector': '.dash-table-tooltip', 'rule': 'background-color: grey; font-family: monospace; color: white'}]
             )
 
-            summary_info = html.Div([
-                html.P([
-                    html.Strong(f"Showing {len(report_df):,} records"),
-                    f" • Report: {report_type.replace('_', ' ').title()}",
-                    f" • Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                ], className="text-muted small mb-3")
-            ])
+            summary_info = html.Div(
+                create_data_table_summary(total_records, total_records, report_type),
+                id="workflow-data-table-summary"
+            )
 
             return html.Div([summary_info, data_table])
 
@@ -263,6 +349,51 @@ def register_workflow_data_table_callbacks(app):
                     className="text-danger text-center p-4")
             ])               
 
+    @callback(
+        [
+            Output("workflow-data-table", "data"),
+            Output("workflow-data-table", "page_count"),
+            Output("workflow-data-table", "page_current"),
+            Output("workflow-data-table-summary", "children")
+        ],
+        [
+            Input("workflow-data-table", "page_current"),
+            Input("workflow-data-table", "page_size"),
+            Input("workflow-data-table", "sort_by"),
+            Input("workflow-data-table", "filter_query")
+        ],
+        [
+            State("workflow-filtered-query-store", "data"),
+            State("workflow-data-table-report-type-dropdown", "value")
+        ],
+        prevent_initial_call=True
+    )
+    @monitor_performance("Workflow Data Table Page")
+    def update_workflow_data_table_page(page_current, page_size, sort_by, filter_query, query_selections, report_type):
+        """
+        Serve one page of the workflow data table with server-side sorting and filtering
+        """
+        try:
+            report_frame = get_workflow_report_frame(query_selections, report_type)
+
+            # A new filter or sort always starts from the first page
+            if ctx.triggered_id is not None and any(
+                trigger['prop_id'].endswith(('.sort_by', '.filter_query')) for trigger in ctx.triggered
+            ):
+                page_current = 0
+
+            records, matching_records, page_count = report_frame.get_page(
+                page_current, page_size, sort_by, filter_query
+            )
+            page_current = min(max(0, page_current or 0), page_count - 1)
+            summary = create_data_table_summary(len(report_frame), matching_records, report_type)
+
+            return format_page_records(records, report_frame.df), page_count, page_current, summary
+
+        except Exception as e:
+            print(f"❌ Error paging workflow data table: {e}")
+            return no_update, no_update, no_update, no_update
+
     @callback(
         Output("workflow-download-csv", "data"),
         Input("workflow-export-csv-btn", "n_clicks"),
@@ -276,8 +407,8 @@ def register_workflow_data_table_callbacks(app):
         if not n_clicks:
             return no_update
         try:
-            base_data = get_workflow_data_table_base_data()
-            report_df = prepare_workflow_data_table_report(base_data, query_selections, report_type)
+            # Reuse the prepared report frame served to the table
+            report_df = get_workflow_report_frame(query_selections, report_type).df
             if report_df.empty:
                 return no_update
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -300,8 +431,8 @@ def register_workflow_data_table_callbacks(app):
         if not n_clicks:
             return no_update
         try:
-            base_data = get_workflow_data_table_base_data()
-            report_df = prepare_workflow_data_table_report(base_data, query_selections, report_type)
+            # Reuse the prepared report frame served to the table
+            report_df = get_workflow_report_frame(query_selections, report_type).df
             if report_df.empty:
                 return no_update
             import io
@@ -330,8 +461,8 @@ def register_workflow_data_table_callbacks(app):
         if not n_clicks:
             return no_update
         try:
-            base_data = get_workflow_data_table_base_data()
-            report_df = prepare_workflow_data_table_report(base_data, query_selections, report_type)
+            # Reuse the prepared report frame served to the table
+            report_df = get_workflow_report_frame(query_selections, report_type).df
             if report_df.empty:
                 return no_update
             import io
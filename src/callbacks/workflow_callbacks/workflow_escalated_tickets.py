@@ -2,13 +2,25 @@ from dash import callback, Input, Output, State, ctx, html, dcc, no_update
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 from src.utils.db import run_queries
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
-from inflection import titleize
+from src.utils.cache import LocalCache, make_cache_key
+from src.utils.escalation_features import (
+    add_escalation_features, escalation_categories, long_duration_starts, category_epoch
+)
+from src.utils.escalation_trends import EscalationTrendIndex, GRANULARITY_LABELS
 import dash_bootstrap_components as dbc
 import copy
 
+# Escalated tickets with their derived feature columns, computed once per data refresh
+_escalation_feature_data = LocalCache(max_entries=1)
+# The same tickets with EscalationCategory as of the current category epoch
+_escalation_category_data = LocalCache(max_entries=1)
+_escalated_filtered_data = LocalCache(max_entries=8)
+_escalation_trend_indexes = LocalCache(max_entries=16)
+
 def register_workflow_escalated_tickets_callbacks(app):
     
     @monitor_query_performance("Escalated Tickets Base Data")
@@ -74,13 +86,66 @@ def register_workflow_escalated_tickets_callbacks(app):
         
         return run_queries(queries, 'workflow', len(queries))
 
+    @monitor_performance("Escalation Feature Pipeline")
+    def build_escalation_feature_data():
+        base_data = get_escalated_tickets_base_data()
+        work_items = pd.DataFrame(base_data['work_items'])
+        category_changes = np.array([], dtype='datetime64[ns]')
+        if not work_items.empty:
+            work_items = add_escalation_features(work_items, base_data['case_type_mapping'])
+            category_changes = long_duration_starts(work_items['IsEscalated'], work_items['ClosedOn'], work_items['EscalatedOn'])
+        return {'work_items': work_items, 'case_type_mapping': base_data['case_type_mapping'],
+                'category_changes': category_changes, 'version': datetime.now().isoformat()}
+
+    def with_current_categories(features, epoch, now):
+        work_items = features['work_items']
+        if not work_items.empty:
+            # Shallow copy: only EscalationCategory is replaced
+            work_items = work_items.copy(deep=False)
+            work_items['EscalationCategory'] = escalation_categories(
+                work_items['IsEscalated'], work_items['ClosedOn'], work_items['EscalatedOn'], now
+            )
+        return {'work_items': work_items, 'case_type_mapping': features['case_type_mapping'],
+                'version': make_cache_key(features['version'], epoch)}
+
+    def get_escalation_feature_data():
+        """
+        Escalated tickets with AssigneeDisplay, CaseTypeName, duration buckets, escalation
+        categories and formatted durations already derived (cached until the data refreshes)
+        EscalationCategory depends on the current time, so it is re-derived whenever an open
+        escalation has crossed into long_duration since it was last computed
+        """
+        features = _escalation_feature_data.get_or_build('escalation_features', build_escalation_feature_data)
+        now = datetime.now()
+        epoch = category_epoch(features['category_changes'], now)
+        return _escalation_category_data.get_or_build(
+            make_cache_key(features['version'], epoch), lambda: with_current_categories(features, epoch, now)
+        )
+
+    def get_filtered_escalation_data(base_data, stored_selections):
+        """Filtered feature tickets per filter selection, cached per feature data version"""
+        return _escalated_filtered_data.get_or_build(
+            make_cache_key(stored_selections or {}, base_data['version']),
+            lambda: apply_escalated_tickets_filters(base_data['work_items'], stored_selections or {})
+        )
+
+    def get_escalation_trend_index(filtered_data, stored_selections, version):
+        """
+        Time-indexed escalations for a filter selection, cached per feature data version so
+        switching the trend window only slices the index
+        """
+        return _escalation_trend_indexes.get_or_build(
+            make_cache_key(stored_selections or {}, version), lambda: EscalationTrendIndex(filtered_data)
+        )
+
     @monitor_performance("Escalated Tickets Filter Application")
     def apply_escalated_tickets_filters(work_items, query_selections):
         """
         Filter escalated tickets DataFrame based on all supported fields.
         Uses the same extraction logic as apply_workflow_data_table_filters.
         """
-        df = pd.DataFrame(work_items)
+        # Shallow copy: the cached feature frame is never modified
+        df = pd.DataFrame(work_items).copy(deep=False)
         if df.empty:
             return df
 
@@ -139,6 +204,7 @@ def register_workflow_escalated_tickets_callbacks(app):
         """
         Prepare escalated tickets analysis data with proper duration buckets and case type names
         Updated to handle priority filtering for Escalated view
+        Expects tickets from get_escalation_feature_data (features are derived here otherwise)
         """
         if filtered_data.empty:
             return pd.DataFrame(), {}
@@ -157,123 +223,10 @@ def register_workflow_escalated_tickets_callbacks(app):
                 df = df[df['Priority'].isin(selected_priorities)]
                 # print(f"🔽 Filtered to selected priorities: {selected_priorities}, {len(df)} tickets remaining")
             
-            # Clean and format assignee names
-            def format_assignee_name(assignee):
-                if pd.isna(assignee) or assignee == '' or assignee.lower() == 'unassigned':
-                    return 'Unassigned'
-                cleaned = str(assignee).split('@')[0].replace('.', ' ').replace('_', ' ').replace('\r', ' ').replace('\n', ' ')
-                return titleize(cleaned)
-            
-            df['AssigneeDisplay'] = df['AssignedTo'].apply(format_assignee_name)
-            
-            # Map case type codes to names using the dimension table
-            if case_type_mapping is not None and not case_type_mapping.empty:
-                case_type_dict = dict(zip(case_type_mapping['CaseTypeCode'], case_type_mapping['CaseTypeName']))
-                case_type_dict['Unspecified'] = 'Unspecified'
-                case_type_dict[''] = 'Unspecified'
-                
-                def map_case_type(code):
-                    if pd.isna(code) or code == '':
-                        return 'Unspecified'
-                    return case_type_dict.get(str(code), titleize(str(code)))
-                
-                df['CaseTypeName'] = df['WorkItemDefinitionShortCode'].apply(map_case_type)
-            else:
-                df['CaseTypeName'] = df['WorkItemDefinitionShortCode'].apply(
-                    lambda x: 'Unspecified' if pd.isna(x) or x == '' else titleize(str(x))
-                )
-            
-            # Create detailed duration buckets for escalation analysis
-            def categorize_escalation_duration(minutes):
-                if pd.isna(minutes):
-                    return 'No Duration Data'
-                elif minutes < 60:
-                    return '<1h'
-                elif minutes < 120:
-                    return '1-2h'
-                elif minutes < 180:
-                    return '2-3h'
-                elif minutes < 360:
-                    return '3-6h'
-                elif minutes < 720:
-                    return '6-12h'
-                elif minutes < 1440:
-                    return '12-24h'
-                elif minutes < 2880:
-                    return '1-2d'
-                elif minutes < 4320:
-                    return '2-3d'
-                elif minutes < 7200:
-                    return '3-5d'
-                elif minutes < 14400:
-                    return '5-10d'
-                elif minutes < 43200:
-                    return '10-30d'
-                elif minutes < 86400:
-                    return '1-2m'
-                elif minutes < 129600:
-                    return '2-3m'
-                elif minutes < 259200:
-                    return '3-6m'
-                elif minutes < 525600:  
-                    return '6-12m'
-                else:
-                    return '>12m'
-            
-            df['EscalationDurationBucket'] = df['EscalationDurationMinutes'].apply(categorize_escalation_duration)
-            
-            # Categorize escalation status (with proper date handling)
-            def categorize_escalation_status(row):
-                is_escalated = str(row['IsEscalated']).strip() in ['1', 'True', 'true']
-                status = str(row['WorkItemStatus']).strip()
-                closed_on = row['ClosedOn']
-                escalated_on = row['EscalatedOn']
-                
-                if not is_escalated:
-                    return 'other_escalated'
-                
-                # Check if ticket was escalated and is now closed (regardless of specific status)
-                if not pd.isna(closed_on) and not pd.isna(escalated_on):
-                    # This is a closed escalated ticket
-                    return 'recently_resolved'
-                
-                # Currently open escalated tickets
-                elif pd.isna(closed_on) and not pd.isna(escalated_on):
-                    # Calculate days since escalation for long duration check
-                    days_escalated = (datetime.now() - escalated_on).days
-                    if days_escalated > 5:  # Using 5-day threshold
-                        return 'long_duration'
-                    else:
-                        return 'current_escalated'
-                
-                # Escalated but missing escalation date (data quality issue)
-                elif is_escalated:
-                    return 'other_escalated'
-                
-                else:
-                    return 'other_escalated'
-            
-            df['EscalationCategory'] = df.apply(categorize_escalation_status, axis=1)
-            
-            # Format duration for display
-            def format_duration(minutes):
-                if pd.isna(minutes) or minutes == 0:
-                    return "0h"
-                
-                hours = int(minutes / 60)
-                remaining_minutes = int(minutes % 60)
-                days = int(hours / 24)
-                remaining_hours = hours % 24
-                
-                if days > 0:
-                    return f"{days}d {remaining_hours}h"
-                elif hours > 0:
-                    return f"{hours}h {remaining_minutes}m"
-                else:
-                    return f"{remaining_minutes}m"
-            
-            df['EscalationDurationFormatted'] = df['EscalationDurationMinutes'].apply(format_duration)
-            df['TimeToEscalationFormatted'] = df['TimeToEscalationMinutes'].apply(format_duration)
+            # AssigneeDisplay, CaseTypeName, EscalationDurationBucket, EscalationCategory and the
+            # formatted durations come precomputed from the escalation feature pipeline
+            if 'EscalationCategory' not in df.columns:
+                df = add_escalation_features(df, case_type_mapping)
             
             # Prepare visualization data based on view type
             if view_type == 'current':
@@ -426,87 +379,18 @@ def register_workflow_escalated_tickets_callbacks(app):
                 detailed_data = summary_stats.get('detailed_data', pd.DataFrame())
                 if not detailed_data.empty:
                     # Determine the effective end date (either Day_To filter or current date)
-                    stored_selections = summary_stats.get('stored_selections', {}) or stored_selections or {}
+                    stored_selections = summary_stats.get('stored_selections') or {}
                     day_to = stored_selections.get('Day_To')
                     if day_to:
                         end_date = pd.to_datetime(day_to)
                     else:
                         end_date = pd.Timestamp.now().normalize()
                     
-                    # Filter data based on time period selection
-                    if time_period != 'all':
-                        # Calculate start date based on period and end date
-                        if time_period == 7:
-                            start_date = end_date - pd.Timedelta(days=6)  # 7 days total including end date
-                            granularity = 'D'  # Daily
-                            date_format = '%Y-%m-%d'
-                            title_period = f"Last {time_period} Days"
-                        elif time_period == 30:
-                            start_date = end_date - pd.Timedelta(days=29)  # 30 days total
-                            granularity = 'D'  # Daily
-                            date_format = '%Y-%m-%d'
-                            title_period = f"Last {time_period} Days"
-                        elif time_period == 90:
-                            start_date = end_date - pd.Timedelta(days=89)  # 90 days total
-                            granularity = 'W'  # Weekly
-                            date_format = '%Y-W%U'
-                            title_period = f"Last {time_period} Days"
-                        
-                        # Filter detailed_data to the calculated time window using EscalatedOn
-                        mask = (detailed_data['EscalatedOn'] >= start_date) & (detailed_data['EscalatedOn'] <= end_date + pd.Timedelta(days=1))
-                        filtered_detailed_data = detailed_data[mask].copy()
-                    else:
-                        # 'all' time period - determine granularity based on data span
-                        filtered_detailed_data = detailed_data.copy()
-                        if not filtered_detailed_data.empty and not filtered_detailed_data['EscalatedOn'].isna().all():
-                            data_start = filtered_detailed_data['EscalatedOn'].min()
-                            data_end = filtered_detailed_data['EscalatedOn'].max()
-                            data_span_days = (data_end - data_start).days
-                            
-                            if data_span_days <= 365:  # Less than or equal to 1 year
-                                granularity = 'W'  # Weekly
-                                date_format = '%Y-W%U'
-                            else:  # More than 1 year
-                                granularity = 'M'  # Monthly
-                                date_format = '%Y-%m'
-                            title_period = "All Time"
-                        else:
-                            granularity = 'W'
-                            date_format = '%Y-W%U'
-                            title_period = "All Time"
+                    # Category x period counts come from the time-indexed escalations of this filter selection
+                    trend_index = summary_stats.get('trend_index') or EscalationTrendIndex(detailed_data)
+                    trends_data, granularity, title_period, ticket_count = trend_index.trends(time_period, end_date)
                     
-                    if not filtered_detailed_data.empty:
-                        # Create time period column based on granularity
-                        if granularity == 'D':
-                            filtered_detailed_data['TimePeriod'] = filtered_detailed_data['EscalatedOn'].dt.strftime(date_format)
-                        elif granularity == 'W':
-                            filtered_detailed_data['TimePeriod'] = filtered_detailed_data['EscalatedOn'].dt.to_period('W').astype(str)
-                        elif granularity == 'M':
-                            filtered_detailed_data['TimePeriod'] = filtered_detailed_data['EscalatedOn'].dt.to_period('M').astype(str)
-                        
-                        # Group by time period and escalation category
-                        trends_data = filtered_detailed_data.groupby(['TimePeriod', 'EscalationCategory']).size().unstack(fill_value=0)
-                        
-                        # Sort the time periods properly
-                        if granularity == 'D':
-                            # For daily, convert back to datetime for proper sorting
-                            trends_data.index = pd.to_datetime(trends_data.index)
-                            trends_data = trends_data.sort_index()
-                            # Convert back to string for display
-                            trends_data.index = trends_data.index.strftime('%Y-%m-%d')
-                        elif granularity == 'W':
-                            # For weekly, sort by converting to period and back
-                            period_index = pd.to_datetime([pd.Period(p).start_time for p in trends_data.index])
-                            trends_data.index = period_index
-                            trends_data = trends_data.sort_index()
-                            trends_data.index = [f"Week of {d.strftime('%Y-%m-%d')}" for d in trends_data.index]
-                        elif granularity == 'M':
-                            # For monthly, sort by converting to period and back
-                            period_index = pd.to_datetime([pd.Period(p).start_time for p in trends_data.index])
-                            trends_data.index = period_index
-                            trends_data = trends_data.sort_index()
-                            trends_data.index = [d.strftime('%Y-%m') for d in trends_data.index]
-                        
+                    if not trends_data.empty:
                         # Define colors for all escalation categories
                         category_colors = {
                             'current_escalated': '#e74c3c',      # Red - Currently escalated
@@ -540,13 +424,9 @@ def register_workflow_escalated_tickets_callbacks(app):
                                 ))
                         
                         # Determine granularity label for title
-                        granularity_label = {
-                            'D': 'Daily',
-                            'W': 'Weekly', 
-                            'M': 'Monthly'
-                        }.get(granularity, 'Weekly')
+                        granularity_label = GRANULARITY_LABELS.get(granularity, 'Weekly')
                         
-                        title_text = f"Escalation Trends - {granularity_label} ({title_period}) - {len(filtered_detailed_data):,} total tickets"
+                        title_text = f"Escalation Trends - {granularity_label} ({title_period}) - {ticket_count:,} total tickets"
                         
                         fig.update_layout(
                             title={'text': title_text, 'x': 0.5, 'xanchor': 'center', 'font': {'size': 14, 'color': '#2c3e50'}},
@@ -568,9 +448,9 @@ def register_workflow_escalated_tickets_callbacks(app):
                         )
                         
                         # Adjust x-axis based on granularity
-                        if granularity == 'D':
+                        if granularity == 'daily':
                             fig.update_layout(xaxis=dict(tickangle=45, tickfont={'size': 10}))
-                        elif granularity == 'W':
+                        elif granularity == 'weekly':
                             fig.update_layout(xaxis=dict(tickangle=45, tickfont={'size': 10}))
                         else:  # Monthly
                             fig.update_layout(xaxis=dict(tickangle=0, tickfont={'size': 10}))
@@ -1156,7 +1036,7 @@ def register_workflow_escalated_tickets_callbacks(app):
         
         try:
             # Get base data
-            base_data = get_escalated_tickets_base_data()
+            base_data = get_escalation_feature_data()
             
             # Apply current filters to get available priorities
             filtered_data = apply_escalated_tickets_filters(base_data['work_items'], stored_selections)
@@ -1224,15 +1104,17 @@ def register_workflow_escalated_tickets_callbacks(app):
             # print(f"🔄 Updating escalated tickets analysis: view = {view_type}, period = {time_period}, categories = {selected_categories}, priorities = {selected_priorities}")
             
             # Get base data
-            base_data = get_escalated_tickets_base_data()
+            base_data = get_escalation_feature_data()
             
-            # Apply filters
-            filtered_data = apply_escalated_tickets_filters(base_data['work_items'], stored_selections)
+            # Apply filters (cached per selection, so display controls reuse the filtered tickets)
+            filtered_data = get_filtered_escalation_data(base_data, stored_selections)
             
             # Prepare analysis data with case type mapping
             escalation_data, summary_stats = prepare_escalated_tickets_data(
                 filtered_data, base_data['case_type_mapping'], view_type, time_period, selected_categories, stored_selections, selected_priorities
             )
+            if view_type == 'trends' and summary_stats:
+                summary_stats['trend_index'] = get_escalation_trend_index(filtered_data, stored_selections, base_data['version'])
 
             # Create visualization
             fig = create_escalated_tickets_chart(escalation_data, summary_stats, view_type, time_period, selected_categories, assignee_count)
@@ -1397,7 +1279,7 @@ def register_workflow_escalated_tickets_callbacks(app):
                     # print("🔄 Generating fresh escalated tickets data for details modal...")
                     
                     # Get base data
-                    base_data = get_escalated_tickets_base_data()
+                    base_data = get_escalation_feature_data()
                     
                     # Apply filters
                     filtered_data = apply_escalated_tickets_filters(base_data['work_items'], stored_selections)
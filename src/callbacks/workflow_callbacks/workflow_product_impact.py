@@ -4,9 +4,15 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import copy
+from datetime import datetime
 from src.utils.db import run_queries
 from inflection import titleize, pluralize
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
+from src.utils.cache import LocalCache, make_cache_key
+from src.utils.product_rollup import ProductImpactRollup
+
+_product_impact_base_data = LocalCache(max_entries=1)
+_product_impact_rollups = LocalCache(max_entries=16)
 
 def register_workflow_product_impact_callbacks(app):
 
@@ -45,7 +51,8 @@ def register_workflow_product_impact_callbacks(app):
         if not stored_selections:
             stored_selections = {}
 
-        df = pd.DataFrame(work_items).copy()
+        # Shallow copy: the cached base frame is never modified
+        df = pd.DataFrame(work_items).copy(deep=False)
         if df.empty:
             return df
 
@@ -105,27 +112,39 @@ def register_workflow_product_impact_callbacks(app):
 
         return df    
     
+    @monitor_performance("Product Impact Rollup Build")
+    def build_product_impact_rollup(stored_selections, base_data):
+        filtered_data = apply_product_impact_filters(base_data['work_items'], stored_selections)
+        return ProductImpactRollup(filtered_data)
+
+    def get_product_impact_rollup(stored_selections):
+        """
+        Product -> Feature -> Issue rollup cached per dataset version and filter hash,
+        so chart type and top count changes never regroup tickets
+        """
+        if not stored_selections:
+            stored_selections = {}
+        base_data = _product_impact_base_data.get_or_build(
+            'product_impact_base', lambda: dict(get_product_impact_base_data(), version=datetime.now().isoformat())
+        )
+        return _product_impact_rollups.get_or_build(
+            make_cache_key(stored_selections, base_data['version']),
+            lambda: build_product_impact_rollup(stored_selections, base_data)
+        )
+
     @monitor_performance("Product Impact Data Preparation")
-    def prepare_product_impact_data(filtered_data, top_count=15):
+    def prepare_product_impact_data(rollup, top_count=15):
         """
         Prepare product/feature impact data for visualization
         """
-        if filtered_data.empty:
+        if rollup.empty:
             return pd.DataFrame(), {}
-        df = filtered_data.copy()
-        # Group by Product and Feature, count tickets
-        impact_counts = (
-            df.groupby(['Product', 'Feature'])
-            .size()
-            .reset_index(name='TicketCount')
-            .sort_values('TicketCount', ascending=False)
-        )
-        # Top N by ticket count
-        impact_counts = impact_counts.head(top_count)
+        # Top N Product/Feature pairs by ticket count
+        impact_counts = rollup.top_product_features(top_count)
         summary_stats = {
-            'total_tickets': df.shape[0],
-            'num_products': df['Product'].nunique(),
-            'num_features': df['Feature'].nunique(),
+            'total_tickets': rollup.total_tickets,
+            'num_products': rollup.num_products,
+            'num_features': rollup.num_features,
             'top_product': impact_counts.iloc[0]['Product'] if len(impact_counts) > 0 else 'N/A',
             'top_feature': impact_counts.iloc[0]['Feature'] if len(impact_counts) > 0 else 'N/A',
             'top_count': impact_counts.iloc[0]['TicketCount'] if len(impact_counts) > 0 else 0
@@ -175,9 +194,8 @@ def register_workflow_product_impact_callbacks(app):
         return fig
 
     @monitor_chart_performance("Product Impact Stacked Chart")
-    def create_product_impact_stacked_chart(filtered_data, top_count):
-        df = filtered_data.copy()
-        if df.empty:
+    def create_product_impact_stacked_chart(rollup, top_count):
+        if rollup.empty:
             fig = go.Figure()
             fig.add_annotation(
                 text="No product/feature data available for selected filters",
@@ -189,14 +207,8 @@ def register_workflow_product_impact_callbacks(app):
             fig.update_layout(title="Product/Feature Impact (Stacked Bar)", height=400)
             return fig
 
-        top_products = (
-            df.groupby('Product').size().reset_index(name='TicketCount')
-            .sort_values('TicketCount', ascending=False)
-            .head(top_count)['Product']
-            .tolist()
-        )
-        df_top = df[df['Product'].isin(top_products)]
-        grouped = df_top.groupby(['Product', 'Feature']).size().reset_index(name='TicketCount')
+        top_products = rollup.top_products(top_count)['Product'].tolist()
+        grouped = rollup.features_of(top_products)
 
         fig = go.Figure()
         for feature in grouped['Feature'].unique():
@@ -220,9 +232,8 @@ def register_workflow_product_impact_callbacks(app):
         return fig
 
     @monitor_chart_performance("Product Impact Bubble Chart")
-    def create_product_impact_bubble_chart(filtered_data, top_count):
-        df = filtered_data.copy()
-        if df.empty:
+    def create_product_impact_bubble_chart(rollup, top_count):
+        if rollup.empty:
             fig = go.Figure()
             fig.add_annotation(
                 text="No product/feature data available for selected filters",
@@ -234,13 +245,7 @@ def register_workflow_product_impact_callbacks(app):
             fig.update_layout(title="Product/Feature Impact (Bubble Chart)", height=400)
             return fig
 
-        grouped = (
-            df.groupby(['Product', 'Feature'])
-            .size()
-            .reset_index(name='TicketCount')
-            .sort_values('TicketCount', ascending=False)
-            .head(top_count)
-        )
+        grouped = rollup.top_product_features(top_count)
         fig = go.Figure()
         fig.add_trace(go.Scatter(
             x=grouped['Product'],
@@ -268,9 +273,8 @@ def register_workflow_product_impact_callbacks(app):
         return fig
 
     @monitor_chart_performance("Product Impact Treemap Chart")
-    def create_product_impact_treemap_chart(filtered_data, top_count):
-        df = filtered_data.copy()
-        if df.empty:
+    def create_product_impact_treemap_chart(rollup, top_count):
+        if rollup.empty:
             fig = go.Figure()
             fig.add_annotation(
                 text="No product/feature data available for selected filters",
@@ -282,13 +286,7 @@ def register_workflow_product_impact_callbacks(app):
             fig.update_layout(title="Product/Feature Impact (Treemap)", height=400)
             return fig
 
-        grouped = (
-            df.groupby(['Product', 'Feature'])
-            .size()
-            .reset_index(name='TicketCount')
-            .sort_values('TicketCount', ascending=False)
-            .head(top_count)
-        )
+        grouped = rollup.top_product_features(top_count)
 
         fig = px.treemap(
             grouped,
@@ -303,7 +301,7 @@ def register_workflow_product_impact_callbacks(app):
         return fig
      
     @monitor_performance("Product Impact Insights Generation")
-    def generate_product_impact_insights(impact_counts, summary_stats, filtered_data=None):
+    def generate_product_impact_insights(impact_counts, summary_stats, rollup=None):
         """
         Generate meaningful insights for product/feature impact.
         """ 
@@ -317,14 +315,8 @@ def register_workflow_product_impact_callbacks(app):
             insights = []
 
             # 1. Product with highest total ticket volume
-            if filtered_data is not None and not filtered_data.empty:
-                product_ticket_counts = (
-                    filtered_data.groupby('Product')
-                    .size()
-                    .reset_index(name='TicketCount')
-                    .sort_values('TicketCount', ascending=False)
-                )
-                top_product_row = product_ticket_counts.iloc[0]
+            if rollup is not None and not rollup.empty:
+                top_product_row = rollup.top_products(1).iloc[0]
                 top_product = titleize(top_product_row['Product'])
                 top_product_count = top_product_row['TicketCount']
                 insights.append(
@@ -333,13 +325,7 @@ def register_workflow_product_impact_callbacks(app):
                 )
 
                 # 2. Product with most number of different features generating tickets
-                product_feature_counts = (
-                    filtered_data.groupby('Product')['Feature']
-                    .nunique()
-                    .reset_index(name='FeatureCount')
-                    .sort_values('FeatureCount', ascending=False)
-                )
-                most_features_row = product_feature_counts.iloc[0]
+                most_features_row = rollup.widest_product()
                 most_features_product = titleize(most_features_row['Product'])
                 most_features_count = most_features_row['FeatureCount']
                 insights.append(
@@ -348,15 +334,8 @@ def register_workflow_product_impact_callbacks(app):
                 )
 
                 # 3. Recurring issues tied to specific products/features
-                recurring_issues = (
-                    filtered_data.groupby(['Product', 'Feature', 'Issue'])
-                    .size()
-                    .reset_index(name='Count')
-                    .sort_values('Count', ascending=False)
-                )
-                recurring_issues = recurring_issues[recurring_issues['Issue'].notna() & (recurring_issues['Issue'] != '')]
-                if not recurring_issues.empty:
-                    top_issue_row = recurring_issues.iloc[0]
+                top_issue_row = rollup.top_issue()
+                if top_issue_row is not None:
                     issue_product = titleize(top_issue_row['Product'])
                     issue_feature = titleize(top_issue_row['Feature'])
                     issue_name = titleize(top_issue_row['Issue'])
@@ -390,20 +369,19 @@ def register_workflow_product_impact_callbacks(app):
     )
     @monitor_performance("Product Impact Chart Update")
     def update_product_impact_chart(top_count, stored_selections, chart_type):
-        base_data = get_product_impact_base_data()
-        filtered_data = apply_product_impact_filters(base_data['work_items'], stored_selections)
-        impact_counts, summary_stats = prepare_product_impact_data(filtered_data, top_count)
+        rollup = get_product_impact_rollup(stored_selections)
+        impact_counts, summary_stats = prepare_product_impact_data(rollup, top_count)
         if chart_type == "bar":
             fig = create_product_impact_bar_chart(impact_counts, summary_stats)
         elif chart_type == "stacked":
-            fig = create_product_impact_stacked_chart(filtered_data, top_count)
+            fig = create_product_impact_stacked_chart(rollup, top_count)
         elif chart_type == "bubble":
-            fig = create_product_impact_bubble_chart(filtered_data, top_count)
+            fig = create_product_impact_bubble_chart(rollup, top_count)
         elif chart_type == "treemap":
-            fig = create_product_impact_treemap_chart(filtered_data, top_count)
+            fig = create_product_impact_treemap_chart(rollup, top_count)
         else:
             fig = create_product_impact_bar_chart(impact_counts, summary_stats)
-        insights = generate_product_impact_insights(impact_counts, summary_stats, filtered_data)
+        insights = generate_product_impact_insights(impact_counts, summary_stats, rollup)
         return (
             fig, insights,
             chart_type == "bar",
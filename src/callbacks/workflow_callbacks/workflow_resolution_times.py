@@ -11,12 +11,17 @@ import copy
 import numpy as np
 from functools import wraps
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
+from src.utils.box_stats import grouped_box_statistics
+from src.utils.cache import LocalCache
+from src.utils.quantile_sketch import SketchCube
+from src.utils.derived_cache import fingerprint_frames
 
 @monitor_query_performance("Resolution Times Base Data")
 def get_resolution_times_base_data():
     """
     Fetch base data for resolution times analysis
     Uses FACT tables to get comprehensive duration and resolution data
+    status_transitions is a LazyDataset handle; call load_dataset() where a view needs it
     """
     
     queries = {
@@ -66,6 +71,7 @@ def get_resolution_times_base_data():
         """,
         
         # Get status transitions for workflow analysis - using FACT_StatusTransitions
+        # (declared lazily: only fetched by views that load it)
         "status_transitions": """
             SELECT 
                 st.WorkItemId,
@@ -81,7 +87,7 @@ def get_resolution_times_base_data():
         """
     }
 
-    return run_queries(queries, 'workflow', len(queries))
+    return run_queries(queries, 'workflow', len(queries), lazy=['status_transitions'])
 
 def apply_resolution_times_filters(work_items, duration_summary, stored_selections):
     """
@@ -156,35 +162,382 @@ def apply_resolution_times_filters(work_items, duration_summary, stored_selectio
     
     return df_work_items, df_duration_summary
 
+# Dimensions the resolution views break down by; empty values are shown as "Unspecified"
+RESOLUTION_DIMENSIONS = ['WorkItemDefinitionShortCode', 'Priority', 'Product', 'Module',
+                         'Feature', 'Issue', 'CaseOrigin', 'AorShortName']
+
+# Filter selection key -> work item column (matching apply_resolution_times_filters)
+RESOLUTION_FILTER_COLUMNS = {
+    'AOR': 'AorShortName',
+    'CaseTypes': 'WorkItemDefinitionShortCode',
+    'Products': 'Product',
+    'Priority': 'Priority'
+}
+
+# Escalation population codes: summary statistics compare IsEscalated with '1'/'0' only,
+# while the population selector also accepts the other boolean representations
+ESCALATED_STRICT, ESCALATED_OTHER, NON_ESCALATED_STRICT, NON_ESCALATED_OTHER, UNCLASSIFIED = range(5)
+POPULATION_CODES = {
+    'summary_escalated': [ESCALATED_STRICT],
+    'summary_non_escalated': [NON_ESCALATED_STRICT],
+    'escalated': [ESCALATED_STRICT, ESCALATED_OTHER],
+    'non_escalated': [NON_ESCALATED_STRICT, NON_ESCALATED_OTHER]
+}
+
+# Resolution time distribution buckets: (previous edge, edge] minutes
+RESOLUTION_CATEGORY_EDGES = [0, 15, 60, 240, 1440, 10080, np.inf]
+RESOLUTION_CATEGORIES = ['≤15 min', '15-60 min', '1-4 hours', '4-24 hours', '1-7 days', '7+ days']
+
+# Resolution time sketches shared by every filter selection, one index per base data snapshot
+_resolution_sketch_indexes = LocalCache(max_entries=1)
+
+def merge_resolution_times(filtered_work_items, filtered_duration_summary):
+    """
+    Merge work items with duration summary and derive resolution times
+    
+    Returns:
+        tuple: (merged_df, df_for_analysis) - all tickets and those with a valid resolution time
+    """
+    merged_df = filtered_work_items.merge(
+        filtered_duration_summary, 
+        on='WorkItemId', 
+        how='left'
+    )
+    
+    # Use FACT_DurationSummary data as primary source (more accurate)
+    merged_df['ResolutionTimeMinutes'] = merged_df['OpenToClosed_Min'].fillna(merged_df['ResolutionTimeMinutes'])
+    merged_df['ResolutionTimeHours'] = merged_df['ResolutionTimeMinutes'] / 60
+    merged_df['ResolutionTimeDays'] = merged_df['ResolutionTimeHours'] / 24
+    
+    df_for_analysis = merged_df[
+        (merged_df['ResolutionTimeMinutes'] > 0) & 
+        (merged_df['ResolutionTimeMinutes'] < 525600) &  # Less than 1 year
+        (merged_df['ResolutionTimeMinutes'].notna())
+    ].copy()
+    
+    return merged_df, df_for_analysis
+
+def normalize_dimension_values(values):
+    """Replace empty strings, None, and NaN with "Unspecified" """
+    values = values.fillna('').astype(str)
+    values = values.replace('', 'Unspecified')
+    return values.replace('nan', 'Unspecified')
+
+def categorize_resolution_times(minutes):
+    """Resolution time category per ticket ('Invalid' for missing or non-positive times)"""
+    categories = pd.cut(pd.Series(minutes, dtype=np.float64), bins=RESOLUTION_CATEGORY_EDGES,
+                        labels=RESOLUTION_CATEGORIES, right=True)
+    return categories.astype(object).fillna('Invalid').to_numpy()
+
+def prepare_analysis_tickets(df_for_analysis):
+    """Analyzable tickets with "Unspecified" dimension values and their ResolutionCategory"""
+    df = df_for_analysis.copy()
+    
+    # Handle empty values consistently across all dimensions
+    for col in RESOLUTION_DIMENSIONS:
+        if col in df.columns:
+            df[col] = normalize_dimension_values(df[col])
+    
+    # Categorize resolution times for distribution analysis
+    df['ResolutionCategory'] = categorize_resolution_times(df['ResolutionTimeMinutes'])
+    return df
+
+def escalation_population_codes(is_escalated):
+    """Escalation population code per ticket (see POPULATION_CODES)"""
+    as_text = is_escalated.astype(str).str.upper()
+    escalated = (is_escalated == '1') | (is_escalated == 1) | (is_escalated == True) | (as_text == 'TRUE')
+    non_escalated = (
+        (is_escalated == '0') | (is_escalated == 0) | (is_escalated == False) | (as_text == 'FALSE') |
+        is_escalated.isna() | (is_escalated == '') | (as_text == 'NULL')
+    )
+    return np.select(
+        [is_escalated == '1', escalated, is_escalated == '0', non_escalated],
+        [ESCALATED_STRICT, ESCALATED_OTHER, NON_ESCALATED_STRICT, NON_ESCALATED_OTHER],
+        default=UNCLASSIFIED
+    ).astype(np.int64)
+
+class ResolutionSketchIndex:
+    """
+    Resolution time sketches per (dimension value, month), built once per data refresh
+    
+    Cells are keyed by dimension value, CreatedOn month, the raw filter columns and the
+    escalation population, so any filter/dimension combination is answered by merging
+    the matching cells. Months only partly covered by the date filter are merged from
+    their raw tickets, so date filters stay exact to the timestamp.
+    Percentile accuracy is documented in src/utils/quantile_sketch.py.
+    
+    The index also keeps the merged tickets and the prepared analyzable tickets of the
+    same snapshot, so a selection's raw rows are a mask away and never re-merged.
+    """
+    
+    def __init__(self, merged_df, df_for_analysis, duration_ids):
+        # Every closed ticket (for ticket totals), in the order the filters keep them
+        self.merged = merged_df.reset_index(drop=True)
+        self.has_duration = self.merged['WorkItemId'].isin(duration_ids).to_numpy()
+        merged_filter_codes = {}
+        for key, column in RESOLUTION_FILTER_COLUMNS.items():
+            codes, uniques = pd.factorize(self.merged[column])
+            merged_filter_codes[key] = (np.asarray(codes, dtype=np.int64), pd.Index(uniques))
+        self.merged_filter_codes = merged_filter_codes
+        
+        # Analyzable tickets as prepare_resolution_times_data returns them
+        self.analysis_positions = merged_df.index.get_indexer(df_for_analysis.index)
+        self.analysis = prepare_analysis_tickets(df_for_analysis).reset_index(drop=True)
+        
+        # Sketched tickets: the analyzable tickets ordered by CreatedOn
+        order = np.argsort(df_for_analysis['CreatedOn'].to_numpy(dtype='datetime64[ns]'), kind='stable')
+        tickets = df_for_analysis.iloc[order].reset_index(drop=True)
+        self.tickets = tickets
+        self.created = tickets['CreatedOn'].to_numpy(dtype='datetime64[ns]')
+        self.hours = tickets['ResolutionTimeHours'].to_numpy(dtype=np.float64)
+        # Month ordinals (same numbering as pd.Period(..., freq='M').ordinal)
+        self.months = ((tickets['CreatedOn'].dt.year - 1970) * 12 + tickets['CreatedOn'].dt.month - 1).to_numpy(dtype=np.int64)
+        if 'IsEscalated' in tickets.columns:
+            self.populations = escalation_population_codes(tickets['IsEscalated'])
+        else:
+            self.populations = np.full(len(tickets), UNCLASSIFIED, dtype=np.int64)
+        
+        # Raw filter values (missing values get -1 and never match a selection)
+        self.filter_codes = {
+            key: (codes[self.analysis_positions][order], uniques)
+            for key, (codes, uniques) in merged_filter_codes.items()
+        }
+        
+        self._dimensions = {}
+        self._cubes = {}
+    
+    def dimension(self, dimension):
+        """Normalized dimension value codes and sorted labels (None = a single 'All' group)"""
+        if dimension is None:
+            return np.zeros(len(self.tickets), dtype=np.int64), pd.Index(['All'])
+        if dimension not in self._dimensions:
+            codes, labels = pd.factorize(normalize_dimension_values(self.tickets[dimension]), sort=True)
+            self._dimensions[dimension] = (np.asarray(codes, dtype=np.int64), pd.Index(labels, name=dimension))
+        return self._dimensions[dimension]
+    
+    def cube(self, dimension):
+        """Sketch cells for a dimension, built the first time the dimension is requested"""
+        if dimension not in self._cubes:
+            group_codes, _ = self.dimension(dimension)
+            keys = pd.DataFrame({'Group': group_codes, 'Month': self.months, 'Population': self.populations})
+            for key, (codes, _) in self.filter_codes.items():
+                keys[key] = codes
+            self._cubes[dimension] = SketchCube(self.hours, keys)
+        return self._cubes[dimension]
+    
+    def select(self, stored_selections):
+        return ResolutionSketchSelection(self, stored_selections)
+
+class ResolutionSketchSelection:
+    """
+    A filter selection over a ResolutionSketchIndex
+    Same semantics as apply_resolution_times_filters
+    """
+    
+    def __init__(self, index, stored_selections):
+        self.index = index
+        if not stored_selections:
+            stored_selections = {}
+        
+        # Allowed raw filter values per filter, as a mask over the filter's codes
+        self.allowed = {}
+        for key in RESOLUTION_FILTER_COLUMNS:
+            selected = [item.strip("'") if item != "'-'" else "" for item in stored_selections.get(key, '').split(', ') if item.strip("'")]
+            if selected and "All" not in selected:
+                _, uniques = index.filter_codes[key]
+                self.allowed[key] = np.asarray(uniques.isin(selected), dtype=bool)
+        
+        # Months fully inside the date range are merged from cells, the partly covered
+        # months at either end from their raw tickets
+        self.full_months = None
+        self.edge_positions = np.array([], dtype=np.int64)
+        self.date_range = None
+        start_date = stored_selections.get('StartDate')
+        end_date = stored_selections.get('EndDate')
+        if start_date and end_date:
+            try:
+                start_dt, end_dt = pd.to_datetime(start_date), pd.to_datetime(end_date)
+                self._split_date_range(start_dt, end_dt)
+                self.date_range = (start_dt, end_dt)
+            except Exception as e:
+                print(f"❌ Error applying date filter: {e}")
+    
+    def _split_date_range(self, start_dt, end_dt):
+        created = self.index.created
+        low = np.searchsorted(created, np.datetime64(start_dt, 'ns'), side='left')
+        high = np.searchsorted(created, np.datetime64(end_dt, 'ns'), side='right')
+        
+        start_month = pd.Period(start_dt, freq='M')
+        end_month = pd.Period(end_dt, freq='M')
+        first_full = start_month if start_dt == start_month.start_time else start_month + 1
+        last_full = end_month if end_dt >= end_month.end_time else end_month - 1
+        
+        if first_full > last_full:
+            self.full_months = np.array([], dtype=np.int64)
+            self.edge_positions = np.arange(low, max(low, high))
+            return
+        
+        self.full_months = np.arange(first_full.ordinal, last_full.ordinal + 1)
+        full_start = np.searchsorted(created, np.datetime64(first_full.start_time, 'ns'), side='left')
+        full_end = np.searchsorted(created, np.datetime64((last_full + 1).start_time, 'ns'), side='left')
+        self.edge_positions = np.concatenate([np.arange(low, max(low, full_start)), np.arange(min(high, full_end), high)])
+    
+    def _mask(self, codes_by_key, populations=None, population_codes=None):
+        """Filter and population mask (everything but the date range)"""
+        mask = np.ones(len(next(iter(codes_by_key.values()))), dtype=bool)
+        for key, allowed in self.allowed.items():
+            codes = codes_by_key[key]
+            mask &= (codes >= 0) & allowed[np.maximum(codes, 0)]
+        if population_codes is not None:
+            mask &= np.isin(populations, population_codes)
+        return mask
+    
+    def tickets(self):
+        """
+        The selection's tickets, as merging the filtered base data would give them
+        
+        Returns:
+            tuple: (merged_df, df_for_analysis, has_duration_summary) - every selected ticket,
+                the prepared analyzable ones (labelled by position in merged_df) and whether any
+                selected ticket has a duration summary
+        """
+        index = self.index
+        mask = self._mask({key: codes for key, (codes, _) in index.merged_filter_codes.items()})
+        if self.date_range is not None:
+            created = index.merged['CreatedOn']
+            mask &= ((created >= self.date_range[0]) & (created <= self.date_range[1])).to_numpy()
+        
+        selected_positions = np.flatnonzero(mask)
+        analysis_mask = mask[index.analysis_positions]
+        df_for_analysis = index.analysis[analysis_mask]
+        df_for_analysis.index = np.searchsorted(selected_positions, index.analysis_positions[analysis_mask])
+        merged_df = index.merged.iloc[selected_positions].reset_index(drop=True)
+        return merged_df, df_for_analysis, bool(index.has_duration[mask].any())
+    
+    def merged(self, dimension=None, population=None):
+        """
+        Merged sketches per dimension value (or a single 'All' sketch) for the selection
+        
+        Args:
+            population (str): optional POPULATION_CODES key
+        """
+        index = self.index
+        population_codes = POPULATION_CODES.get(population) if population else None
+        group_codes, labels = index.dimension(dimension)
+        cube = index.cube(dimension)
+        
+        cells = cube.cells
+        cell_mask = self._mask(
+            {key: cells[key].to_numpy() for key in RESOLUTION_FILTER_COLUMNS},
+            cells['Population'].to_numpy(), population_codes
+        )
+        if self.full_months is not None:
+            cell_mask &= np.isin(cells['Month'].to_numpy(), self.full_months)
+        merged = cube.merge(cell_mask, cells['Group'].to_numpy(), labels)
+        
+        if len(self.edge_positions):
+            positions = self.edge_positions
+            edge_mask = self._mask(
+                {key: codes[positions] for key, (codes, _) in index.filter_codes.items()},
+                index.populations[positions], population_codes
+            )
+            positions = positions[edge_mask]
+            merged = merged + cube.sketch_values(index.hours[positions], group_codes[positions], labels)
+        
+        return merged
+    
+    def dimension_stats(self, dimension, include_std=True):
+        """
+        Count / mean / median (/ std) hours per dimension value, sorted by mean descending
+        Same table as grouping the filtered tickets by the dimension
+        """
+        merged = self.merged(dimension)
+        present = merged.counts > 0
+        stats = pd.DataFrame({
+            'Count': merged.counts[present],
+            'Mean_Hours': merged.mean()[present],
+            'Median_Hours': merged.quantile(0.5)[present]
+        }, index=merged.labels[present])
+        if include_std:
+            stats['Std_Hours'] = merged.std()[present]
+        return stats.round(2).sort_values('Mean_Hours', ascending=False)
+    
+    def population_stats(self, population=None, quantiles=(0.5, 0.75, 0.9, 0.95, 0.99)):
+        """
+        Hours statistics for a population (None = every ticket in the selection)
+        Count, mean, std, min and max are exact; percentiles come from the sketches
+        
+        Returns:
+            dict: count, mean_hours, median_hours, std_hours, min_hours, max_hours, p<q>_hours
+        """
+        merged = self.merged(None, population)
+        stats = {
+            'count': int(merged.counts[0]),
+            'mean_hours': float(merged.mean()[0]),
+            'std_hours': float(merged.std()[0]),
+            'min_hours': float(merged.minimums[0]),
+            'max_hours': float(merged.maximums[0])
+        }
+        for q in quantiles:
+            stats[f'p{int(round(q * 100))}_hours'] = float(merged.quantile(q)[0])
+        stats['median_hours'] = stats.get('p50_hours', float(merged.quantile(0.5)[0]))
+        return stats
+
+def build_resolution_sketch_index(base_data):
+    """Sketch index over every analyzable ticket of the (unfiltered) base data"""
+    work_items, duration_summary = apply_resolution_times_filters(base_data['work_items'], base_data['duration_summary'], {})
+    if work_items.empty or duration_summary.empty:
+        return None
+    merged_df, df_for_analysis = merge_resolution_times(work_items, duration_summary)
+    return ResolutionSketchIndex(merged_df, df_for_analysis, duration_summary['WorkItemId'])
+
+def get_resolution_sketch_index(base_data):
+    """
+    Shared sketch index of the base data snapshot
+    Keyed by a content fingerprint, so a data refresh (or another worker's snapshot) gets its own index
+    """
+    version = fingerprint_frames({
+        'work_items': pd.DataFrame(base_data['work_items']),
+        'duration_summary': pd.DataFrame(base_data['duration_summary'])
+    })
+    return _resolution_sketch_indexes.get_or_build(version, lambda: build_resolution_sketch_index(base_data))
+
+def resolution_dimension_stats(df, dimension, sketches=None, include_std=True):
+    """
+    Count / mean / median (/ std) resolution hours per dimension value, sorted by mean descending
+    Merged from the sketches when available, otherwise grouped from the (normalized) tickets
+    """
+    if sketches is not None:
+        return sketches.dimension_stats(dimension, include_std)
+    
+    aggregations = ['count', 'mean', 'median', 'std'] if include_std else ['count', 'mean', 'median']
+    dimension_stats = df.groupby(normalize_dimension_values(df[dimension]))['ResolutionTimeHours'].agg(aggregations).round(2)
+    dimension_stats.columns = ['Count', 'Mean_Hours', 'Median_Hours', 'Std_Hours'][:len(aggregations)]
+    return dimension_stats.sort_values('Mean_Hours', ascending=False)
+
 @monitor_performance("Resolution Times Data Preparation")
-def prepare_resolution_times_data(filtered_work_items, filtered_duration_summary, status_transitions_data):
+def prepare_resolution_times_data(filtered_work_items, filtered_duration_summary, status_transitions_data, sketches=None):
     """
     Prepare comprehensive resolution times data for multiple visualization types
     Updated to properly handle empty values and use consistent labeling
+    
+    Args:
+        sketches (ResolutionSketchSelection): when given, the tickets come prepared from the
+            sketch index (the filtered frames are not used) and summary and category statistics
+            are merged from the resolution time sketches instead of rescanning the tickets
     """
-    if filtered_work_items.empty or filtered_duration_summary.empty:
+    if sketches is None and (filtered_work_items.empty or filtered_duration_summary.empty):
         return pd.DataFrame(), {}, {}
     
     try:
-        # Merge work items with duration summary for comprehensive analysis
-        merged_df = filtered_work_items.merge(
-            filtered_duration_summary, 
-            on='WorkItemId', 
-            how='left'
-        )
-
+        if sketches is not None:
+            merged_df, df_for_analysis, has_duration_summary = sketches.tickets()
+            if merged_df.empty or not has_duration_summary:
+                return pd.DataFrame(), {}, {}
+        else:
+            # Merge work items with duration summary for comprehensive analysis
+            merged_df, df_for_analysis = merge_resolution_times(filtered_work_items, filtered_duration_summary)
         total_tickets = len(merged_df)
-        
-        # Use FACT_DurationSummary data as primary source (more accurate)
-        merged_df['ResolutionTimeMinutes'] = merged_df['OpenToClosed_Min'].fillna(merged_df['ResolutionTimeMinutes'])
-        merged_df['ResolutionTimeHours'] = merged_df['ResolutionTimeMinutes'] / 60
-        merged_df['ResolutionTimeDays'] = merged_df['ResolutionTimeHours'] / 24
-        
-        df_for_analysis = merged_df[
-            (merged_df['ResolutionTimeMinutes'] > 0) & 
-            (merged_df['ResolutionTimeMinutes'] < 525600) &  # Less than 1 year
-            (merged_df['ResolutionTimeMinutes'].notna())
-        ].copy()
 
         analyzable_tickets = len(df_for_analysis)
         # print(f"📊 Tickets available for resolution analysis: {analyzable_tickets} out of {total_tickets} total")
@@ -198,65 +551,59 @@ def prepare_resolution_times_data(filtered_work_items, filtered_duration_summary
                 'median_hours': 0
             }, {}
         
-        df = df_for_analysis.copy()        
-        
-        # Handle empty values consistently across all dimensions
-        dimension_columns = ['WorkItemDefinitionShortCode', 'Priority', 'Product', 'Module', 
-                        'Feature', 'Issue', 'CaseOrigin', 'AorShortName']
-        
-        for col in dimension_columns:
-            if col in df.columns:
-                # Replace empty strings, None, and NaN with "Unspecified"
-                df[col] = df[col].fillna('').astype(str)
-                df[col] = df[col].replace('', 'Unspecified')
-                df[col] = df[col].replace('nan', 'Unspecified')
-        
-        # Categorize resolution times for distribution analysis
-        def categorize_resolution_time(minutes):
-            if pd.isna(minutes) or minutes <= 0:
-                return 'Invalid'
-            elif minutes <= 15:
-                return '≤15 min'
-            elif minutes <= 60:
-                return '15-60 min'
-            elif minutes <= 240:  # 4 hours
-                return '1-4 hours'
-            elif minutes <= 1440:  # 24 hours
-                return '4-24 hours'
-            elif minutes <= 10080:  # 7 days
-                return '1-7 days'
-            else:
-                return '7+ days'
-        
-        df['ResolutionCategory'] = df['ResolutionTimeMinutes'].apply(categorize_resolution_time)
+        # Normalized dimensions and resolution categories (precomputed in the sketch index)
+        df = df_for_analysis if sketches is not None else prepare_analysis_tickets(df_for_analysis)
         
         # Calculate comprehensive summary statistics
-        summary_stats = {
-            'total_tickets': total_tickets,  # NEW: Total tickets matching filters
-            'analyzable_tickets': analyzable_tickets,  # NEW: Tickets with valid resolution data
-            'total_resolved': len(df),
-            'mean_minutes': df['ResolutionTimeMinutes'].mean(),
-            'median_minutes': df['ResolutionTimeMinutes'].median(),
-            'mean_hours': df['ResolutionTimeHours'].mean(),
-            'median_hours': df['ResolutionTimeHours'].median(),
-            'p75_hours': df['ResolutionTimeHours'].quantile(0.75),
-            'p90_hours': df['ResolutionTimeHours'].quantile(0.90),
-            'p95_hours': df['ResolutionTimeHours'].quantile(0.95),
-            'std_hours': df['ResolutionTimeHours'].std(),
-            'min_hours': df['ResolutionTimeHours'].min(),
-            'max_hours': df['ResolutionTimeHours'].max()
-        }
+        if sketches is not None:
+            overall = sketches.population_stats(quantiles=(0.5, 0.75, 0.9, 0.95))
+            summary_stats = {
+                'total_tickets': total_tickets,
+                'analyzable_tickets': analyzable_tickets,
+                'total_resolved': len(df),
+                'mean_minutes': overall['mean_hours'] * 60,
+                'median_minutes': overall['median_hours'] * 60,
+                'mean_hours': overall['mean_hours'],
+                'median_hours': overall['median_hours'],
+                'p75_hours': overall['p75_hours'],
+                'p90_hours': overall['p90_hours'],
+                'p95_hours': overall['p95_hours'],
+                'std_hours': overall['std_hours'],
+                'min_hours': overall['min_hours'],
+                'max_hours': overall['max_hours']
+            }
+            escalated = sketches.merged(population='summary_escalated')
+            non_escalated = sketches.merged(population='summary_non_escalated')
+            escalation_counts = (int(escalated.counts[0]), int(non_escalated.counts[0]))
+            escalation_means = (float(escalated.mean()[0]), float(non_escalated.mean()[0]))
+        else:
+            summary_stats = {
+                'total_tickets': total_tickets,  # NEW: Total tickets matching filters
+                'analyzable_tickets': analyzable_tickets,  # NEW: Tickets with valid resolution data
+                'total_resolved': len(df),
+                'mean_minutes': df['ResolutionTimeMinutes'].mean(),
+                'median_minutes': df['ResolutionTimeMinutes'].median(),
+                'mean_hours': df['ResolutionTimeHours'].mean(),
+                'median_hours': df['ResolutionTimeHours'].median(),
+                'p75_hours': df['ResolutionTimeHours'].quantile(0.75),
+                'p90_hours': df['ResolutionTimeHours'].quantile(0.90),
+                'p95_hours': df['ResolutionTimeHours'].quantile(0.95),
+                'std_hours': df['ResolutionTimeHours'].std(),
+                'min_hours': df['ResolutionTimeHours'].min(),
+                'max_hours': df['ResolutionTimeHours'].max()
+            }
+            escalated_tickets = df.loc[df['IsEscalated'] == '1', 'ResolutionTimeHours']
+            non_escalated_tickets = df.loc[df['IsEscalated'] == '0', 'ResolutionTimeHours']
+            escalation_counts = (len(escalated_tickets), len(non_escalated_tickets))
+            escalation_means = (escalated_tickets.mean(), non_escalated_tickets.mean())
         
         # Escalation impact analysis
-        escalated_tickets = df[df['IsEscalated'] == '1']
-        non_escalated_tickets = df[df['IsEscalated'] == '0']
-        
-        if not escalated_tickets.empty and not non_escalated_tickets.empty:
-            summary_stats['escalated_mean_hours'] = escalated_tickets['ResolutionTimeHours'].mean()
-            summary_stats['non_escalated_mean_hours'] = non_escalated_tickets['ResolutionTimeHours'].mean()
+        if escalation_counts[0] > 0 and escalation_counts[1] > 0:
+            summary_stats['escalated_mean_hours'] = escalation_means[0]
+            summary_stats['non_escalated_mean_hours'] = escalation_means[1]
             summary_stats['escalation_impact_hours'] = summary_stats['escalated_mean_hours'] - summary_stats['non_escalated_mean_hours']
-            summary_stats['escalated_count'] = len(escalated_tickets)
-            summary_stats['non_escalated_count'] = len(non_escalated_tickets)
+            summary_stats['escalated_count'] = escalation_counts[0]
+            summary_stats['non_escalated_count'] = escalation_counts[1]
         else:
             summary_stats['escalated_mean_hours'] = 0
             summary_stats['non_escalated_mean_hours'] = summary_stats['mean_hours']
@@ -269,23 +616,11 @@ def prepare_resolution_times_data(filtered_work_items, filtered_duration_summary
         
         # Analysis by Case Type (updated key name) - now handles "Unspecified"
         if 'WorkItemDefinitionShortCode' in df.columns:
-            type_stats = df.groupby('WorkItemDefinitionShortCode')['ResolutionTimeHours'].agg([
-                'count', 'mean', 'median', 'std'
-            ]).round(2)
-            type_stats.columns = ['Count', 'Mean_Hours', 'Median_Hours', 'Std_Hours']
-            category_analysis['CaseType'] = type_stats.sort_values('Mean_Hours', ascending=False)  # CHANGED KEY
-            
-            # print(f"📊 Case Type analysis includes: {list(type_stats.index)}")
+            category_analysis['CaseType'] = resolution_dimension_stats(df, 'WorkItemDefinitionShortCode', sketches)  # CHANGED KEY
         
         # Analysis by Priority - now handles "Unspecified"
         if 'Priority' in df.columns:
-            priority_stats = df.groupby('Priority')['ResolutionTimeHours'].agg([
-                'count', 'mean', 'median'
-            ]).round(2)
-            priority_stats.columns = ['Count', 'Mean_Hours', 'Median_Hours']
-            category_analysis['Priority'] = priority_stats.sort_values('Mean_Hours', ascending=False)
-            
-            # print(f"📊 Priority analysis includes: {list(priority_stats.index)}")
+            category_analysis['Priority'] = resolution_dimension_stats(df, 'Priority', sketches, include_std=False)
         
         # Resolution time distribution
         distribution_analysis = df.groupby('ResolutionCategory').size().sort_index()
@@ -306,13 +641,13 @@ def prepare_resolution_times_data(filtered_work_items, filtered_duration_summary
         return pd.DataFrame(), {}, {}
 
 @monitor_performance("Resolution Times Data Preparation with Dimension")
-def prepare_resolution_times_data_with_dimension(filtered_work_items, filtered_duration_summary, status_transitions_data, selected_dimension):
+def prepare_resolution_times_data_with_dimension(filtered_work_items, filtered_duration_summary, status_transitions_data, selected_dimension, sketches=None):
     """
     Enhanced version that calculates statistics for any selected dimension
     Updated to handle empty values and use consistent labeling
     """
     resolution_data, summary_stats, category_analysis = prepare_resolution_times_data(
-        filtered_work_items, filtered_duration_summary, status_transitions_data
+        filtered_work_items, filtered_duration_summary, status_transitions_data, sketches
     )
     
     # Add dynamic dimension analysis with updated key mapping
@@ -320,17 +655,7 @@ def prepare_resolution_times_data_with_dimension(filtered_work_items, filtered_d
         dimension_key = selected_dimension.replace('WorkItemDefinitionShortCode', 'CaseType')  # CHANGED
         
         if dimension_key not in category_analysis:
-            # Make sure empty values are handled properly
-            working_data = resolution_data.copy()
-            working_data[selected_dimension] = working_data[selected_dimension].fillna('').astype(str)
-            working_data[selected_dimension] = working_data[selected_dimension].replace('', 'Unspecified')
-            working_data[selected_dimension] = working_data[selected_dimension].replace('nan', 'Unspecified')
-            
-            dimension_stats = working_data.groupby(selected_dimension)['ResolutionTimeHours'].agg([
-                'count', 'mean', 'median', 'std'
-            ]).round(2)
-            dimension_stats.columns = ['Count', 'Mean_Hours', 'Median_Hours', 'Std_Hours']
-            category_analysis[dimension_key] = dimension_stats.sort_values('Mean_Hours', ascending=False)
+            category_analysis[dimension_key] = resolution_dimension_stats(resolution_data, selected_dimension, sketches)
             
             # print(f"📊 Dynamic {dimension_key} analysis includes: {list(dimension_stats.index)}")
     
@@ -432,17 +757,8 @@ def register_workflow_resolution_times_callbacks(app):
                 else:
                     return go.Figure()
             else:
-                # Use pre-calculated data but ensure it handles empty values
-                base_category_data = category_analysis[dimension_key].copy()
-                
-                # Check if we need to recalculate to include "Unspecified" values
-                if 'Unspecified' not in base_category_data.index:
-                    # Recalculate with proper empty value handling
-                    dimension_stats = working_data.groupby(dimension)['ResolutionTimeHours'].agg([
-                        'count', 'mean', 'median', 'std'
-                    ]).round(2)
-                    dimension_stats.columns = ['Count', 'Mean_Hours', 'Median_Hours', 'Std_Hours']
-                    base_category_data = dimension_stats
+                # Pre-calculated tables already group empty values as "Unspecified"
+                base_category_data = category_analysis[dimension_key]
                 
                 # UPDATED: Consistent sorting and filtering logic
                 if show_all:
@@ -693,13 +1009,16 @@ def register_workflow_resolution_times_callbacks(app):
                     
                     return transformed_label if transformed_label else raw_str
             
-            # ENHANCED: Create box plot with better handling for sparse data categories
+            # Quartiles, whiskers and capped outliers are computed server-side so the figure
+            # carries a handful of numbers per box instead of every resolved ticket
+            box_stats = grouped_box_statistics(plot_data, dimension, 'ResolutionTimeHours', top_categories)
+            
             categories_with_data = []
             categories_without_data = []
             
             for i, category in enumerate(top_categories):
-                category_data = plot_data[plot_data[dimension] == category]['ResolutionTimeHours']
-                category_count = len(category_data)
+                stats = box_stats.get(category)
+                category_count = stats['count'] if stats else 0
                 
                 if category_count > 0:
                     # Create display label that matches filter dropdown using same transformations
@@ -711,48 +1030,52 @@ def register_workflow_resolution_times_callbacks(app):
                     else:
                         display_name = display_label[:20] + "..." if len(display_label) > 20 else display_label
                     
-                    # ENHANCED: Adjust box plot settings based on data characteristics
-                    if category_count >= 5:
-                        # Sufficient data for proper box plot
-                        boxpoints_setting = 'outliers'
-                        jitter = 0.3
-                    elif category_count >= 2:
-                        # Few data points - show all points with box
-                        boxpoints_setting = 'all'
-                        jitter = 0.5
-                    else:
-                        # Single data point - show as point only
-                        boxpoints_setting = 'all'
-                        jitter = 0.8
+                    box_name = f"{display_name} (n={category_count})"  # Show count in legend
+                    color = px.colors.qualitative.Set3[i % len(px.colors.qualitative.Set3)]
+                    hover_template = (
+                        f'<b>{display_name}</b><br>' +
+                        'Value: %{y:.1f}h<br>' +
+                        f'Count: {category_count}<br>' +
+                        f'Mean: {stats["mean"]:.1f}h<br>' +
+                        f'Median: {stats["median"]:.1f}h<br>' +
+                        '<extra></extra>'
+                    )
                     
-                    # Add box plot trace with enhanced settings
+                    # Add precomputed box trace
                     fig.add_trace(go.Box(
-                        y=category_data,
-                        name=f"{display_name} (n={category_count})",  # Show count in legend
-                        boxpoints=boxpoints_setting,
-                        jitter=jitter,
-                        pointpos=0,  # Center points on box
-                        marker=dict(
-                            color=px.colors.qualitative.Set3[i % len(px.colors.qualitative.Set3)],
-                            size=6 if category_count <= 2 else 4,  # Larger points for sparse data
-                            line=dict(width=1, color='white')
-                        ),
-                        line=dict(
-                            color=px.colors.qualitative.Set3[i % len(px.colors.qualitative.Set3)],
-                            width=2
-                        ),
-                        fillcolor=px.colors.qualitative.Set3[i % len(px.colors.qualitative.Set3)],
-                        # Enhanced hover information
-                        hovertemplate=(
-                            f'<b>{display_name}</b><br>' +
-                            'Value: %{y:.1f}h<br>' +
-                            f'Count: {category_count}<br>' +
-                            f'Mean: {category_data.mean():.1f}h<br>' +
-                            f'Median: {category_data.median():.1f}h<br>' +
-                            '<extra></extra>'
-                        )
+                        x=[box_name],
+                        name=box_name,
+                        q1=[stats['q1']],
+                        median=[stats['median']],
+                        q3=[stats['q3']],
+                        lowerfence=[stats['lowerfence']],
+                        upperfence=[stats['upperfence']],
+                        mean=[stats['mean']],
+                        line=dict(color=color, width=2),
+                        fillcolor=color,
+                        hovertemplate=hover_template
                     ))
                     
+                    # ENHANCED: Sparse categories (< 5 tickets) show every point, others only outliers
+                    if category_count < 5:
+                        points = plot_data.loc[plot_data[dimension] == category, 'ResolutionTimeHours'].to_numpy()
+                    else:
+                        points = stats['outliers']
+                    
+                    if len(points) > 0:
+                        fig.add_trace(go.Scatter(
+                            x=[box_name] * len(points),
+                            y=points,
+                            mode='markers',
+                            name=box_name,
+                            marker=dict(
+                                color=color,
+                                size=6 if category_count <= 2 else 4,  # Larger points for sparse data
+                                line=dict(width=1, color='white')
+                            ),
+                            hovertemplate=hover_template
+                        ))
+                    
                     categories_with_data.append(display_name)
                 else:
                     categories_without_data.append(create_display_label(category, dimension))
@@ -829,13 +1152,14 @@ def register_workflow_resolution_times_callbacks(app):
             return go.Figure()
              
     @monitor_chart_performance("Resolution Times Statistics Figure")
-    def create_resolution_times_statistics_figure(resolution_data, summary_stats, category_analysis, dimension, population="all"):
+    def create_resolution_times_statistics_figure(resolution_data, summary_stats, category_analysis, dimension, population="all", sketches=None):
         """
         Create focused statistics view showing distribution with statistical markers
         Population parameter controls which subset of data to analyze:
         - "all": All tickets
         - "escalated": Only escalated tickets  
         - "non_escalated": Only non-escalated tickets
+        Population statistics are merged from the resolution time sketches when available
         """
         if resolution_data.empty or not summary_stats:
             fig = go.Figure()
@@ -943,23 +1267,27 @@ def register_workflow_resolution_times_callbacks(app):
             
             # Calculate statistics for the filtered population
             hours_data = filtered_data['ResolutionTimeHours']
-            pop_stats = {
-                'count': len(filtered_data),
-                'mean_hours': float(hours_data.mean()),
-                'median_hours': float(hours_data.median()),
-                'p75_hours': float(hours_data.quantile(0.75)),
-                'p90_hours': float(hours_data.quantile(0.90)),
-                'p95_hours': float(hours_data.quantile(0.95)),
-                'min_hours': float(hours_data.min()),
-                'max_hours': float(hours_data.max()),
-                'std_hours': float(hours_data.std())
-            }
+            if sketches is not None and (population == "all" or 'IsEscalated' in resolution_data.columns):
+                pop_stats = sketches.population_stats(None if population == "all" else population)
+            else:
+                pop_stats = {
+                    'count': len(filtered_data),
+                    'mean_hours': float(hours_data.mean()),
+                    'median_hours': float(hours_data.median()),
+                    'p75_hours': float(hours_data.quantile(0.75)),
+                    'p90_hours': float(hours_data.quantile(0.90)),
+                    'p95_hours': float(hours_data.quantile(0.95)),
+                    'p99_hours': float(hours_data.quantile(0.99)),
+                    'min_hours': float(hours_data.min()),
+                    'max_hours': float(hours_data.max()),
+                    'std_hours': float(hours_data.std())
+                }
             
             # Create the visualization
             fig = go.Figure()
             
             # Filter outliers for better visualization (keep 99% of data)
-            q99 = hours_data.quantile(0.99)
+            q99 = pop_stats['p99_hours']
             display_hours = hours_data[hours_data <= q99]
             
             # Create histogram
@@ -1146,10 +1474,11 @@ def register_workflow_resolution_times_callbacks(app):
             return fig
                                     
     @monitor_chart_performance("Resolution Times Distribution Chart")
-    def create_resolution_times_distribution_chart(resolution_data, summary_stats, category_analysis, population="all"):
+    def create_resolution_times_distribution_chart(resolution_data, summary_stats, category_analysis, population="all", sketches=None):
         """
         Create pie chart showing resolution time distribution by categories
         Population parameter controls which subset of data to analyze with improved escalation handling
+        Population statistics are merged from the resolution time sketches when available
         """
         if resolution_data.empty:
             fig = go.Figure()
@@ -1251,26 +1580,9 @@ def register_workflow_resolution_times_callbacks(app):
             
             # print(f"📊 Distribution population filtering: {population} = {len(filtered_data)} tickets")
             
-            # Recalculate distribution for the filtered population
-            def categorize_resolution_time(minutes):
-                if pd.isna(minutes) or minutes <= 0:
-                    return 'Invalid'
-                elif minutes <= 15:
-                    return '≤15 min'
-                elif minutes <= 60:
-                    return '15-60 min'
-                elif minutes <= 240:  # 4 hours
-                    return '1-4 hours'
-                elif minutes <= 1440:  # 24 hours
-                    return '4-24 hours'
-                elif minutes <= 10080:  # 7 days
-                    return '1-7 days'
-                else:
-                    return '7+ days'
-            
             # Add resolution category if not already present
             if 'ResolutionCategory' not in filtered_data.columns:
-                filtered_data['ResolutionCategory'] = filtered_data['ResolutionTimeMinutes'].apply(categorize_resolution_time)
+                filtered_data['ResolutionCategory'] = categorize_resolution_times(filtered_data['ResolutionTimeMinutes'])
             
             # Create distribution analysis for this population
             distribution_analysis = filtered_data.groupby('ResolutionCategory').size()
@@ -1303,13 +1615,22 @@ def register_workflow_resolution_times_callbacks(app):
                 return fig
             
             # Calculate population-specific statistics
-            pop_hours_data = filtered_data['ResolutionTimeHours']
-            pop_stats = {
-                'total_tickets': len(filtered_data),
-                'mean_hours': pop_hours_data.mean(),
-                'median_hours': pop_hours_data.median(),
-                'p90_hours': pop_hours_data.quantile(0.90)
-            }
+            if sketches is not None and (population == "all" or 'IsEscalated' in resolution_data.columns):
+                sketch_stats = sketches.population_stats(None if population == "all" else population, quantiles=(0.5, 0.9))
+                pop_stats = {
+                    'total_tickets': len(filtered_data),
+                    'mean_hours': sketch_stats['mean_hours'],
+                    'median_hours': sketch_stats['median_hours'],
+                    'p90_hours': sketch_stats['p90_hours']
+                }
+            else:
+                pop_hours_data = filtered_data['ResolutionTimeHours']
+                pop_stats = {
+                    'total_tickets': len(filtered_data),
+                    'mean_hours': pop_hours_data.mean(),
+                    'median_hours': pop_hours_data.median(),
+                    'p90_hours': pop_hours_data.quantile(0.90)
+                }
             
             # Create pie chart with population-specific colors
             fig = go.Figure()
@@ -1737,19 +2058,27 @@ def register_workflow_resolution_times_callbacks(app):
             # Get base data
             base_data = get_resolution_times_base_data()
             
-            # Apply filters
-            filtered_work_items, filtered_duration_summary = apply_resolution_times_filters(
-                base_data['work_items'], 
-                base_data['duration_summary'], 
-                stored_selections
-            )
+            # Tickets and percentiles come from the shared resolution time sketch index;
+            # the base data is only filtered directly when there is no index
+            sketch_index = get_resolution_sketch_index(base_data)
+            if sketch_index is not None:
+                sketches = sketch_index.select(stored_selections)
+                filtered_work_items, filtered_duration_summary = None, None
+            else:
+                sketches = None
+                filtered_work_items, filtered_duration_summary = apply_resolution_times_filters(
+                    base_data['work_items'], 
+                    base_data['duration_summary'], 
+                    stored_selections
+                )
             
             # Prepare resolution times data with dynamic dimension analysis
             resolution_data, summary_stats, category_analysis = prepare_resolution_times_data_with_dimension(
                 filtered_work_items, 
                 filtered_duration_summary, 
                 base_data['status_transitions'],
-                selected_dimension
+                selected_dimension,
+                sketches
             )
             
             # Generate insights (always generated for all views)
@@ -1763,7 +2092,7 @@ def register_workflow_resolution_times_callbacks(app):
                 # For statistics view, pass the population parameter
                 fig = create_resolution_times_statistics_figure(
                     resolution_data, summary_stats, category_analysis, 
-                    selected_dimension, selected_population
+                    selected_dimension, selected_population, sketches
                 )
             elif view_state == "box":
                 # UPDATED: Pass show_all parameter
@@ -1771,7 +2100,7 @@ def register_workflow_resolution_times_callbacks(app):
             elif view_state == "dist":
                 # For distribution view, also pass the population parameter
                 fig = create_resolution_times_distribution_chart(
-                    resolution_data, summary_stats, category_analysis, selected_population
+                    resolution_data, summary_stats, category_analysis, selected_population, sketches
                 )
             else:  # bar chart (default)
                 # UPDATED: Pass show_all parameter
@@ -3,17 +3,26 @@ import dash_bootstrap_components as dbc
 import pandas as pd
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from src.utils.db import run_queries
+from src.utils.db import run_queries, load_dataset
+from src.utils.cache import LocalCache
+from src.utils.derived_cache import fingerprint_frames
+from src.utils.status_transitions import StatusTransitionEngine
+from src.utils.status_catalog import StatusCatalog, category_colors
 import time
 import copy
 from functools import wraps
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
 
+_status_transition_engine = LocalCache(max_entries=1)
+_status_catalog = LocalCache(max_entries=1)
+
 @monitor_query_performance("Status Distribution Base Data")
 def get_status_distribution_base_data():
     """
     Fetch base data for ticket status distribution analysis
     Uses consumable fact tables with minimal joins
+    status_transitions and item_status are LazyDataset handles, fetched only once
+    a view actually needs them (see load_dataset)
     """
     
     queries = {
@@ -63,7 +72,7 @@ def get_status_distribution_base_data():
         """
     }
 
-    return run_queries(queries, 'workflow', len(queries))
+    return run_queries(queries, 'workflow', len(queries), lazy=['status_transitions', 'item_status'])
 
 def apply_status_distribution_filters(work_items, stored_selections):
     """
@@ -158,6 +167,24 @@ def apply_status_distribution_filters(work_items, stored_selections):
     
     return df_work_items
 
+def get_status_transition_engine(status_transitions_data):
+    """
+    Time-in-status arrays over all status transitions, built the first time a view needs
+    them and reused for every filter selection until the transitions data changes
+    """
+    transitions = pd.DataFrame(load_dataset(status_transitions_data))
+    version = fingerprint_frames(transitions.reindex(columns=StatusTransitionEngine.COLUMNS))
+    return _status_transition_engine.get_or_build(
+        f"status_transition_engine:{version}", lambda: StatusTransitionEngine(transitions)
+    )
+
+def get_status_catalog(item_status_data):
+    """Status categories, colors and sort order from Dim_ItemStatus, shared by every filter selection"""
+    item_status = pd.DataFrame(load_dataset(item_status_data))
+    return _status_catalog.get_or_build(
+        f"status_catalog:{fingerprint_frames(item_status)}", lambda: StatusCatalog(item_status)
+    )
+
 @monitor_performance("Status Distribution Data Preparation")
 def prepare_status_distribution_data(filtered_data, status_transitions_data, item_status_data):
     """
@@ -168,18 +195,7 @@ def prepare_status_distribution_data(filtered_data, status_transitions_data, ite
         return pd.DataFrame()
     
     try:
-        df = filtered_data.copy()
-        
-        # Fix: Check if data exists and convert properly
-        if status_transitions_data is not None and len(status_transitions_data) > 0:
-            df_transitions = pd.DataFrame(status_transitions_data).copy()
-        else:
-            df_transitions = pd.DataFrame()
-            
-        if item_status_data is not None and len(item_status_data) > 0:
-            df_item_status = pd.DataFrame(item_status_data).copy()
-        else:
-            df_item_status = pd.DataFrame()
+        df = filtered_data
         
         # Calculate status distribution
         status_counts = df['WorkItemStatus'].value_counts().reset_index()
@@ -189,90 +205,41 @@ def prepare_status_distribution_data(filtered_data, status_transitions_data, ite
         total_tickets = status_counts['Count'].sum()
         status_counts['Percentage'] = (status_counts['Count'] / total_tickets * 100).round(1)
         
-        # Enhanced status categorization using dimension table data
-        def categorize_status_enhanced(status):
-            if pd.isna(status):
-                return 'Unknown'
-            
-            # First try to match with dimension table
-            if not df_item_status.empty:
-                matching_status = df_item_status[df_item_status['Status'].str.lower() == str(status).lower()]
-                if not matching_status.empty:
-                    item_type = matching_status.iloc[0]['Item']
-                    if pd.notna(item_type):
-                        item_lower = str(item_type).lower()
-                        if any(term in item_lower for term in ['open', 'new', 'created']):
-                            return 'Open'
-                        elif any(term in item_lower for term in ['progress', 'working', 'active']):
-                            return 'In Progress'
-                        elif any(term in item_lower for term in ['escalated', 'escalation']):
-                            return 'Escalated'
-                        elif any(term in item_lower for term in ['closed', 'resolved', 'completed']):
-                            return 'Closed'
-                        elif any(term in item_lower for term in ['hold', 'waiting', 'pending']):
-                            return 'On Hold'
-            
-            # Fallback to original categorization logic
-            status_lower = str(status).lower()
-            if any(term in status_lower for term in ['open', 'new', 'created', 'not started']):
-                return 'Open'
-            elif any(term in status_lower for term in ['in progress', 'working', 'assigned', 'active']):
-                return 'In Progress'
-            elif any(term in status_lower for term in ['escalated', 'escalation']):
-                return 'Escalated'
-            elif any(term in status_lower for term in ['closed', 'resolved', 'completed', 'done']):
-                return 'Closed'
-            elif any(term in status_lower for term in ['hold', 'waiting', 'pending']):
-                return 'On Hold'
-            elif any(term in status_lower for term in ['cancelled', 'canceled']):
-                return 'Cancelled'
-            else:
-                return 'Other'
-        
-        status_counts['StatusCategory'] = status_counts['Status'].apply(categorize_status_enhanced)
+        # Status category, color and sort order from the status catalog
+        categories, colors, sort_orders = get_status_catalog(item_status_data).describe(status_counts['Status'])
+        status_counts['StatusCategory'] = categories
+        status_counts['StatusColor'] = colors
+        status_counts['SortOrder'] = sort_orders
         
         # Add escalation information
         escalated_counts = df[df['IsEscalated'] == '1']['WorkItemStatus'].value_counts()
         status_counts['EscalatedCount'] = status_counts['Status'].map(escalated_counts).fillna(0)
         status_counts['EscalationRate'] = (status_counts['EscalatedCount'] / status_counts['Count'] * 100).round(1)
         
-        # Add transition insights using status_transitions data
-        if not df_transitions.empty and not df.empty:
-            # Get work item IDs for filtered data
-            filtered_work_item_ids = set(df['WorkItemId'].tolist())
-            
-            # Filter transitions to only include relevant work items
-            relevant_transitions = df_transitions[
-                df_transitions['WorkItemId'].isin(filtered_work_item_ids)
-            ].copy()
-            
-            if not relevant_transitions.empty:
-                # Parse transition dates
-                relevant_transitions['StatusFromDate'] = pd.to_datetime(relevant_transitions['StatusFromDate'], errors='coerce')
-                relevant_transitions['StatusToDate'] = pd.to_datetime(relevant_transitions['StatusToDate'], errors='coerce')
-                
-                # Calculate average time spent in each status
-                status_durations = relevant_transitions.groupby('FromStatusName')['DurationMinutes'].agg(['mean', 'count']).reset_index()
-                status_durations.columns = ['Status', 'AvgDurationMinutes', 'TransitionCount']
-                
-                # Merge with status counts
-                status_counts = status_counts.merge(status_durations, on='Status', how='left')
-                status_counts['AvgDurationMinutes'] = status_counts['AvgDurationMinutes'].fillna(0)
-                status_counts['TransitionCount'] = status_counts['TransitionCount'].fillna(0)
-                
-                # Calculate status "stickiness" (how long tickets stay in each status)
-                status_counts['StatusStickiness'] = status_counts['AvgDurationMinutes'] / 60  # Convert to hours
-            else:
-                status_counts['AvgDurationMinutes'] = 0
-                status_counts['TransitionCount'] = 0
-                status_counts['StatusStickiness'] = 0
+        # Add transition insights: time spent in each status by the filtered work items
+        status_durations = pd.DataFrame()
+        transition_engine = get_status_transition_engine(status_transitions_data)
+        if not transition_engine.empty:
+            item_mask = transition_engine.work_item_mask(df['WorkItemId'])
+            status_durations = transition_engine.dwell_summary(item_mask)
+        
+        if not status_durations.empty:
+            # Merge with status counts
+            status_counts = status_counts.merge(
+                status_durations[['Status', 'AvgDurationMinutes', 'TransitionCount']], on='Status', how='left'
+            )
+            status_counts['AvgDurationMinutes'] = status_counts['AvgDurationMinutes'].fillna(0)
+            status_counts['TransitionCount'] = status_counts['TransitionCount'].fillna(0)
+            
+            # Calculate status "stickiness" (how long tickets stay in each status)
+            status_counts['StatusStickiness'] = status_counts['AvgDurationMinutes'] / 60  # Convert to hours
         else:
             status_counts['AvgDurationMinutes'] = 0
             status_counts['TransitionCount'] = 0
             status_counts['StatusStickiness'] = 0
         
-        # Sort by count for better visualization
-        status_counts = status_counts.sort_values('Count', ascending=False).reset_index(drop=True)
+        # Sort by count for better visualization (stable, so ties keep their value_counts order)
+        status_counts = status_counts.sort_values('Count', ascending=False, kind='mergesort').reset_index(drop=True)
         
         # print(f"📊 Prepared enhanced status distribution data: {len(status_counts)} status types with transition insights")
         return status_counts
@@ -293,52 +260,50 @@ def create_status_breakdown_table(status_data):
     
     try:
         # Sort by count descending
-        df_sorted = status_data.sort_values('Count', ascending=False).reset_index(drop=True)
+        df_sorted = status_data.sort_values('Count', ascending=False, kind='mergesort').reset_index(drop=True)
         
-        # Create table rows
-        table_rows = []
-        for i, row in df_sorted.iterrows():
-            # Color indicator based on status category
-            status_colors = {
-                'Open': '#E74C3C', 'In Progress': '#3498DB', 'Escalated': '#E67E22',
-                'Closed': '#2ECC71', 'On Hold': '#F39C12', 'Cancelled': '#95A5A6', 'Other': '#9B59B6'
-            }
-            color = status_colors.get(row['StatusCategory'], '#7F8C8D')
-            
-            # Format duration - simplified to just show hours
-            duration_display = ""
-            if 'StatusStickiness' in row and pd.notna(row['StatusStickiness']) and row['StatusStickiness'] > 0:
-                duration_display = f"{row['StatusStickiness']:.1f}h"
-            else:
-                duration_display = "—"
-            
-            table_rows.append(
-                html.Tr([
-                    html.Td([
-                        html.Div(style={
-                            'width': '14px', 'height': '14px', 'backgroundColor': color,
-                            'borderRadius': '50%', 'display': 'inline-block', 'marginRight': '10px'
-                        }),
-                        html.Span(row['Status'], style={
-                            'fontWeight': 'bold' if i < 3 else '500' if i < 8 else 'normal'
-                        })
-                    ], style={'verticalAlign': 'middle'}),
-                    html.Td(f"{row['Count']:,}", className="text-end fw-bold"),
-                    html.Td(f"{row['Percentage']:.1f}%", className="text-end"),
-                    html.Td([
-                        html.Span(row['StatusCategory'], className="badge rounded-pill", style={
-                            'backgroundColor': color, 'color': 'white', 'fontSize': '11px'
-                        })
-                    ], className="text-center"),
-                    html.Td(f"{row['EscalatedCount']:.0f}", className="text-end"),
-                    html.Td(f"{row['EscalationRate']:.1f}%", className="text-end"),
-                    html.Td(duration_display, className="text-end")  # Changed to match Esc. Rate formatting
-                ], style={
-                    'fontSize': '14px', 
-                    'backgroundColor': '#f8f9fa' if i < 3 else 'white',
-                    'borderLeft': f'4px solid {color}'
-                })
-            )
+        # Color indicator based on status category
+        colors = df_sorted['StatusColor'] if 'StatusColor' in df_sorted.columns else category_colors(df_sorted['StatusCategory'])
+        
+        # Format duration - simplified to just show hours
+        if 'StatusStickiness' in df_sorted.columns:
+            stickiness = pd.to_numeric(df_sorted['StatusStickiness'], errors='coerce').to_numpy()
+            durations = [f"{hours:.1f}h" if hours > 0 else "—" for hours in stickiness]
+        else:
+            durations = ["—"] * len(df_sorted)
+        
+        # Create table rows from the column arrays
+        table_rows = [
+            html.Tr([
+                html.Td([
+                    html.Div(style={
+                        'width': '14px', 'height': '14px', 'backgroundColor': color,
+                        'borderRadius': '50%', 'display': 'inline-block', 'marginRight': '10px'
+                    }),
+                    html.Span(status, style={
+                        'fontWeight': 'bold' if i < 3 else '500' if i < 8 else 'normal'
+                    })
+                ], style={'verticalAlign': 'middle'}),
+                html.Td(f"{count:,}", className="text-end fw-bold"),
+                html.Td(f"{percentage:.1f}%", className="text-end"),
+                html.Td([
+                    html.Span(category, className="badge rounded-pill", style={
+                        'backgroundColor': color, 'color': 'white', 'fontSize': '11px'
+                    })
+                ], className="text-center"),
+                html.Td(f"{escalated:.0f}", className="text-end"),
+                html.Td(f"{escalation_rate:.1f}%", className="text-end"),
+                html.Td(duration, className="text-end")  # Changed to match Esc. Rate formatting
+            ], style={
+                'fontSize': '14px', 
+                'backgroundColor': '#f8f9fa' if i < 3 else 'white',
+                'borderLeft': f'4px solid {color}'
+            })
+            for i, (status, count, percentage, category, color, escalated, escalation_rate, duration) in enumerate(zip(
+                df_sorted['Status'], df_sorted['Count'], df_sorted['Percentage'], df_sorted['StatusCategory'],
+                colors, df_sorted['EscalatedCount'], df_sorted['EscalationRate'], durations
+            ))
+        ]
         
         # Create summary statistics
         total_tickets = df_sorted['Count'].sum()
@@ -427,92 +392,79 @@ def register_workflow_status_distribution_callbacks(app):
             def group_statuses_intelligently(df):
                 """
                 Group statuses intelligently to show top statuses individually and group smaller ones
+                Minor statuses are summed per category in one groupby
                 """
-                df_sorted = df.sort_values('Count', ascending=False).reset_index(drop=True)
-                
-                # Strategy: Show top statuses that together make up 90% of tickets
-                cumulative_percentage = df_sorted['Percentage'].cumsum()
+                df_sorted = df.sort_values('Count', ascending=False, kind='mergesort').reset_index(drop=True)
                 
                 # Find the cutoff for major statuses (top statuses that make up 85% of data)
-                major_cutoff = len(cumulative_percentage[cumulative_percentage <= 85])
+                major_cutoff = int((df_sorted['Percentage'].cumsum() <= 85).sum())
                 if major_cutoff < 3:  # Always show at least top 3
                     major_cutoff = min(3, len(df_sorted))
                 elif major_cutoff > 8:  # Never show more than 8 individual statuses
                     major_cutoff = 8
                 
-                # Split into major and minor statuses
-                major_statuses = df_sorted.iloc[:major_cutoff].copy()
-                minor_statuses = df_sorted.iloc[major_cutoff:].copy()
+                major_statuses = df_sorted.iloc[:major_cutoff]
+                minor_statuses = df_sorted.iloc[major_cutoff:]
+                if minor_statuses.empty:
+                    return major_statuses.reset_index(drop=True)
                 
-                # Create grouped data
-                grouped_data = major_statuses.copy()
+                # Group minor statuses by category for better insights
+                minor_by_category = minor_statuses.groupby('StatusCategory').agg(
+                    Count=('Count', 'sum'),
+                    Percentage=('Percentage', 'sum'),
+                    EscalatedCount=('EscalatedCount', 'sum'),
+                    StatusCount=('Status', 'size'),
+                    DetailedStatuses=('Status', lambda x: ', '.join(x.head(3)))
+                ).reset_index()
+                minor_by_category = minor_by_category[minor_by_category['Count'] > 0]
                 
-                if not minor_statuses.empty:
-                    # Group minor statuses by category for better insights
-                    minor_by_category = minor_statuses.groupby('StatusCategory').agg({
-                        'Count': 'sum',
-                        'Percentage': 'sum',
-                        'EscalatedCount': 'sum',
-                        'Status': lambda x: ', '.join(x.head(3).tolist()) + (f' (+{len(x)-3} more)' if len(x) > 3 else '')
-                    }).reset_index()
-                    
-                    # Add grouped entries
-                    for _, category_group in minor_by_category.iterrows():
-                        if category_group['Count'] > 0:  # Only add non-empty groups
-                            grouped_entry = {
-                                'Status': f"Other {category_group['StatusCategory']} ({category_group['Count']:,} tickets)",
-                                'Count': category_group['Count'],
-                                'Percentage': category_group['Percentage'],
-                                'StatusCategory': category_group['StatusCategory'],
-                                'EscalatedCount': category_group['EscalatedCount'],
-                                'EscalationRate': (category_group['EscalatedCount'] / category_group['Count'] * 100) if category_group['Count'] > 0 else 0,
-                                'DetailedStatuses': category_group['Status']  # Store the detailed breakdown
-                            }
-                            grouped_data = pd.concat([grouped_data, pd.DataFrame([grouped_entry])], ignore_index=True)
+                counts = minor_by_category['Count']
+                more = minor_by_category['StatusCount'] - 3
+                grouped_minor = pd.DataFrame({
+                    'Status': 'Other ' + minor_by_category['StatusCategory'] + ' (' + counts.map('{:,}'.format) + ' tickets)',
+                    'Count': counts,
+                    'Percentage': minor_by_category['Percentage'],
+                    'StatusCategory': minor_by_category['StatusCategory'],
+                    'StatusColor': category_colors(minor_by_category['StatusCategory']),
+                    'EscalatedCount': minor_by_category['EscalatedCount'],
+                    'EscalationRate': minor_by_category['EscalatedCount'] / counts * 100,
+                    'DetailedStatuses': minor_by_category['DetailedStatuses'].where(
+                        more <= 0, minor_by_category['DetailedStatuses'] + ' (+' + more.astype(str) + ' more)'
+                    )
+                })
                 
-                return grouped_data.sort_values('Count', ascending=False).reset_index(drop=True)
+                grouped_data = pd.concat([major_statuses, grouped_minor], ignore_index=True)
+                return grouped_data.sort_values('Count', ascending=False, kind='mergesort').reset_index(drop=True)
             
-            # Apply intelligent grouping
             # Apply intelligent grouping
             display_data = group_statuses_intelligently(status_data)
+            statuses = display_data['Status'].astype(str)
+            counts = display_data['Count']
             
             # Create consistent labels for all entries (both individual and grouped)
-            enhanced_labels = []
-            for _, row in display_data.iterrows():
-                if row['Status'].startswith('Other '):
-                    # Keep the existing grouped format
-                    enhanced_labels.append(row['Status'])
-                else:
-                    # Add ticket count to individual status entries for consistency
-                    enhanced_labels.append(f"{row['Status']} ({row['Count']:,})")
-            
-            # Define colors for different status categories
-            status_colors = {
-                'Open': '#E74C3C',          # Red
-                'In Progress': '#3498DB',    # Blue
-                'Escalated': '#E67E22',      # Orange
-                'Closed': '#2ECC71',         # Green
-                'On Hold': '#F39C12',        # Yellow/Orange
-                'Cancelled': '#95A5A6',      # Gray
-                'Other': '#9B59B6'           # Purple
-            }
+            # Grouped entries keep their format; individual statuses get their ticket count
+            enhanced_labels = statuses.where(
+                statuses.str.startswith('Other '), statuses + ' (' + counts.map('{:,}'.format) + ')'
+            ).tolist()
             
             # Map colors to statuses
-            colors = [status_colors.get(cat, '#7F8C8D') for cat in display_data['StatusCategory']]
+            if 'StatusColor' in display_data.columns:
+                colors = display_data['StatusColor'].tolist()
+            else:
+                colors = category_colors(display_data['StatusCategory'])
             
             # Create enhanced hover template with detailed information
-            hover_texts = []
-            for _, row in display_data.iterrows():
-                base_hover = f"<b>{row['Status']}</b><br>"
-                base_hover += f"Count: {row['Count']:,.0f}<br>"
-                base_hover += f"Percentage: {row['Percentage']:.1f}%<br>"
-                base_hover += f"Escalated: {row['EscalatedCount']:.0f} ({row['EscalationRate']:.1f}%)<br>"
-                
-                # Add detailed breakdown for grouped statuses
-                if 'DetailedStatuses' in row and pd.notna(row['DetailedStatuses']):
-                    base_hover += f"<br><i>Includes: {row['DetailedStatuses']}</i>"
-                
-                hover_texts.append(base_hover)
+            hover_texts = (
+                '<b>' + statuses + '</b><br>'
+                + 'Count: ' + counts.map('{:,.0f}'.format) + '<br>'
+                + 'Percentage: ' + display_data['Percentage'].map('{:.1f}'.format) + '%<br>'
+                + 'Escalated: ' + display_data['EscalatedCount'].map('{:.0f}'.format)
+                + ' (' + display_data['EscalationRate'].map('{:.1f}'.format) + '%)<br>'
+            )
+            if 'DetailedStatuses' in display_data.columns:
+                details = display_data['DetailedStatuses']
+                hover_texts = hover_texts.where(details.isna(), hover_texts + '<br><i>Includes: ' + details.astype(str) + '</i>')
+            hover_texts = hover_texts.tolist()
             
             # Create pie chart with better sizing and consistent labels
             fig = go.Figure(data=[
@@ -606,7 +558,7 @@ def register_workflow_status_distribution_callbacks(app):
             return fig
 
     @monitor_performance("Status Distribution Insights Generation")
-    def generate_status_distribution_insights(status_data, filtered_data, transitions_data):
+    def generate_status_distribution_insights(status_data, filtered_data, status_transitions_data):
         """
         Generate automated insights from status distribution data
         Always returns exactly 3 insights for consistency:
@@ -622,12 +574,6 @@ def register_workflow_status_distribution_callbacks(app):
             ], className="insights-container")
         
         try:
-            # Fix: Check transitions data properly
-            if transitions_data is not None and len(transitions_data) > 0:
-                df_transitions = pd.DataFrame(transitions_data).copy()
-            else:
-                df_transitions = pd.DataFrame()
-            
             # Calculate key metrics for the 3 focused insights
             total_tickets = status_data['Count'].sum()
             
@@ -643,7 +589,8 @@ def register_workflow_status_distribution_callbacks(app):
             
             # 3. BOTTLENECK ANALYSIS - Find status causing longest delays
             bottleneck_info = None
-            if not df_transitions.empty and 'StatusStickiness' in status_data.columns:
+            transition_engine = get_status_transition_engine(status_transitions_data)
+            if not transition_engine.empty and 'StatusStickiness' in status_data.columns:
                 # Find the status with highest average duration (bottleneck)
                 if status_data['StatusStickiness'].max() > 0:
                     max_stickiness_idx = status_data['StatusStickiness'].idxmax()
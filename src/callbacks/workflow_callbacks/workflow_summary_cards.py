@@ -1,10 +1,14 @@
 from dash.dependencies import Input, Output
 import pandas as pd
 from src.utils.db import run_queries
-from datetime import datetime, timedelta
+from src.utils.cache import LocalCache
+from src.utils.workflow_kpis import WorkflowKpiEngine
+from datetime import timedelta
 import time
 from functools import wraps
 
+_summary_kpi_engine = LocalCache(max_entries=1)
+
 def monitor_performance(func_name="Unknown"):
     """Decorator to monitor function performance"""
     def decorator(func):
@@ -64,82 +68,14 @@ def register_workflow_summary_cards_callbacks(app):
         # print(f"✅ Fetched workflow base data: {len(result['work_items'])} work items, {len(result['duration_summary'])} duration records")
         return result
 
-    def apply_filters_to_dataset(df, selected_aor=None, selected_case_types=None, selected_status=None, 
-                                selected_priority=None, selected_origins=None, selected_reasons=None,
-                                selected_products=None, selected_features=None, selected_modules=None, 
-                                selected_issues=None, start_date=None, end_date=None):
-        """Apply all filters to the work items dataset"""
-        if df.empty:
-            return df
-            
-        df['CreatedOn'] = pd.to_datetime(df['CreatedOn'], errors='coerce')
-        df['ClosedOn'] = pd.to_datetime(df['ClosedOn'], errors='coerce')            
-        filtered_df = df[df['ClosedOn'] >= df['CreatedOn']].copy()
-        
-        # Date range filter
-        if start_date and end_date:
-            try:
-                start_date = pd.to_datetime(start_date)
-                end_date = pd.to_datetime(end_date)
-                filtered_df['CreatedOn'] = pd.to_datetime(filtered_df['CreatedOn'])
-                filtered_df = filtered_df[
-                    (filtered_df['CreatedOn'] >= start_date) & 
-                    (filtered_df['CreatedOn'] <= end_date)
-                ]
-            except Exception as e:
-                print(f"⚠️ Error applying date filter: {e}")
-        
-        # AOR filter
-        if selected_aor is not None and len(selected_aor) > 0 and "All" not in selected_aor:
-            # print(f"Applying AOR filter: {selected_aor}")
-            filtered_df = filtered_df[filtered_df["AorShortName"].isin(selected_aor)]
-            
-        # Case Type filter - using CaseTypeCode logic from filters
-        if selected_case_types is not None and len(selected_case_types) > 0 and "All" not in selected_case_types:
-            print(f"Applying Case Type filter: {selected_case_types}")
-            filtered_df = filtered_df[filtered_df["WorkItemDefinitionShortCode"].isin(selected_case_types)]
-            
-        # Product filter
-        if selected_products is not None and len(selected_products) > 0 and "All" not in selected_products:
-            # print(f"Applying Product filter: {selected_products}")
-            filtered_df = filtered_df[filtered_df["Product"].isin(selected_products)]
-
-        # Module filter
-        if selected_modules is not None and len(selected_modules) > 0 and "All" not in selected_modules:
-            # print(f"Applying Module filter: {selected_modules}")
-            filtered_df = filtered_df[filtered_df["Module"].isin(selected_modules)]
-
-        # Feature filter
-        if selected_features is not None and len(selected_features) > 0 and "All" not in selected_features:
-            # print(f"Applying Feature filter: {selected_features}")
-            filtered_df = filtered_df[filtered_df["Feature"].isin(selected_features)]
-            
-        # Issue filter
-        if selected_issues is not None and len(selected_issues) > 0 and "All" not in selected_issues:
-            # print(f"Applying Issue filter: {selected_issues}")
-            filtered_df = filtered_df[filtered_df["Issue"].isin(selected_issues)]
-
-        # Case Origin filter
-        if selected_origins is not None and len(selected_origins) > 0 and "All" not in selected_origins:
-            # print(f"Applying Case Origin filter: {selected_origins}")
-            filtered_df = filtered_df[filtered_df["CaseOrigin"].isin(selected_origins)]
-            
-        # Case Reason filter
-        if selected_reasons is not None and len(selected_reasons) > 0 and "All" not in selected_reasons:
-            # print(f"Applying Case Reason filter: {selected_reasons}")
-            filtered_df = filtered_df[filtered_df["CaseReason"].isin(selected_reasons)]
-
-        # Status filter
-        if selected_status is not None and len(selected_status) > 0 and "All" not in selected_status:
-            # print(f"Applying Status filter: {selected_status}")
-            filtered_df = filtered_df[filtered_df["WorkItemStatus"].isin(selected_status)]
-            
-        # Priority filter
-        if selected_priority is not None and len(selected_priority) > 0 and "All" not in selected_priority:
-            # print(f"Applying Priority filter: {selected_priority}")
-            filtered_df = filtered_df[filtered_df["Priority"].isin(selected_priority)]
-            
-        return filtered_df
+    def get_summary_kpi_engine():
+        """Typed work item + duration arrays, built once per cache lifetime and shared by every filter selection"""
+        def build():
+            base_data = fetch_base_data()
+            return WorkflowKpiEngine(
+                base_data.get('work_items', pd.DataFrame()), base_data.get('duration_summary', pd.DataFrame())
+            )
+        return _summary_kpi_engine.get_or_build('summary_kpi_engine', build)
 
     def parse_filter_selections(stored_selections):
         """Parse stored filter selections into individual components"""
@@ -225,68 +161,26 @@ def register_workflow_summary_cards_callbacks(app):
         hidden_spinner = {"position": "absolute", "top": "10px", "right": "10px", "visibility": "hidden"}
         
         try:
-            # Fetch base data
-            base_data = fetch_base_data()
-            df_work_items = base_data.get('work_items', pd.DataFrame())
-            df_durations = base_data.get('duration_summary', pd.DataFrame())
-            
-            if df_work_items.empty:
+            kpi_engine = get_summary_kpi_engine()
+            if len(kpi_engine) == 0:
                 print("⚠️ No work items data available")
                 return default_values + [hidden_spinner] * 6
             
             # Parse filter selections
             filters = parse_filter_selections(stored_selections)
-            # print(f"Applying filters: {filters}")
-            # Apply filters to work items
-            filtered_df = apply_filters_to_dataset(df_work_items, **filters)
+            # All six cards are counted in one pass over the filter mask
+            totals = kpi_engine.totals(filters)
             
-            if filtered_df.empty:
+            if totals.total_tickets == 0:
                 print("⚠️ No data after filtering")
                 return default_values + [hidden_spinner] * 6
             
-            # Calculate summary metrics
-            
-            # 1. Total Tickets
-            total_tickets = len(filtered_df)
-            
-            # 2. Open Tickets (non-closed statuses)
-            open_statuses = ['Open', 'In Progress', 'On Hold', 'Pending Verification', 'Scheduled', 'Not Started', 'Pending']
-            open_tickets = len(filtered_df[
-                filtered_df['WorkItemStatus'].isin(open_statuses) | 
-                filtered_df['ClosedOn'].isna()
-            ])
-            
-            # 3. Escalated Tickets
-            escalated_tickets = len(filtered_df[filtered_df['IsEscalated'] == '1'])
-
-            # 4. Average Resolution Time
-            work_item_ids = filtered_df['WorkItemId'].tolist()
-            if not df_durations.empty and work_item_ids:
-                duration_filtered = df_durations[df_durations['WorkItemId'].isin(work_item_ids)]
-                
-                # Use OpenToClosed_Min or OpenToResolved_Min
-                resolution_times = []
-                for _, row in duration_filtered.iterrows():
-                    if pd.notna(row['OpenToClosed_Min']):
-                        resolution_times.append(row['OpenToClosed_Min'])
-                    elif pd.notna(row['OpenToResolved_Min']):
-                        resolution_times.append(row['OpenToResolved_Min'])
-                
-                avg_resolution_minutes = sum(resolution_times) / len(resolution_times) if resolution_times else 0
-                avg_resolution_formatted = format_duration(avg_resolution_minutes)
-            else:
-                avg_resolution_formatted = "0h"
-            
-            # 5. Closed This Month
-            current_month = datetime.now().replace(day=1)
-            filtered_df['ClosedOn'] = pd.to_datetime(filtered_df['ClosedOn'], errors='coerce')
-            closed_this_month = len(filtered_df[
-                (filtered_df['ClosedOn'] >= current_month) & 
-                (filtered_df['ClosedOn'].notna())
-            ])
-            
-            # 6. Active Assignees (unique assigned users in current dataset)
-            active_assignees = filtered_df['AssignedTo'].nunique() if 'AssignedTo' in filtered_df.columns else 0
+            total_tickets = totals.total_tickets
+            open_tickets = totals.open_tickets
+            escalated_tickets = totals.escalated_tickets
+            avg_resolution_formatted = format_duration(totals.avg_resolution_minutes)
+            closed_this_month = totals.closed_this_month
+            active_assignees = totals.active_assignees
             
             # Format values for display
             total_tickets_formatted = f"{total_tickets:,}"
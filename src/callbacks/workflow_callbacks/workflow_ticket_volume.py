@@ -7,6 +7,16 @@ import time
 import copy
 from functools import wraps
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
+from src.utils.cache import LocalCache, make_cache_key
+from src.utils.volume_rollup import DailyVolumeRollup, parse_selection, volume_time_series
+
+# Filters that are not rollup dimensions; selections using them are rolled up from their filtered tickets
+NON_ROLLUP_FILTERS = ['Status', 'Modules', 'Features', 'Issues', 'Reasons']
+
+# Daily rollup of every ticket (one per data refresh) and daily counts per filter selection,
+# so switching between daily/weekly/monthly only reduces cached daily counts
+_ticket_volume_rollups = LocalCache(max_entries=1)
+_ticket_volume_daily_counts = LocalCache(max_entries=16)
 
 def register_workflow_ticket_volume_callbacks(app):
     """
@@ -139,81 +149,41 @@ def register_workflow_ticket_volume_callbacks(app):
         
         return df_work_items
 
+    def build_daily_ticket_counts(stored_selections):
+        """Daily created/closed counts for a filter selection"""
+        base_data = get_ticket_volume_base_data()
+        
+        if any(value and "All" not in value for value in (parse_selection(stored_selections, key) for key in NON_ROLLUP_FILTERS)):
+            filtered_data = apply_ticket_volume_filters(base_data, stored_selections)
+            return DailyVolumeRollup(filtered_data).daily_counts() if not filtered_data.empty else pd.DataFrame()
+        
+        def build_rollup():
+            all_tickets = apply_ticket_volume_filters(base_data, {})
+            return DailyVolumeRollup(all_tickets) if not all_tickets.empty else None
+        
+        rollup = _ticket_volume_rollups.get_or_build('ticket_volume_rollup', build_rollup)
+        return rollup.daily_counts(stored_selections) if rollup is not None else pd.DataFrame()
+    
+    def get_daily_ticket_counts(stored_selections):
+        """Cached daily counts per filter selection (raw tickets are only read on a miss)"""
+        if not stored_selections:
+            stored_selections = {}
+        return _ticket_volume_daily_counts.get_or_build(
+            make_cache_key(stored_selections), lambda: build_daily_ticket_counts(stored_selections)
+        )
+
     @monitor_performance("Ticket Volume Time Series Preparation")
-    def prepare_ticket_volume_time_series(filtered_data, time_granularity):
+    def prepare_ticket_volume_time_series(daily_counts, time_granularity):
         """
         Prepare time series data for ticket volume analysis
+        Weekly and monthly series are reductions of the daily created/closed counts
         """
-        # print(f"📊 Preparing ticket volume time series: granularity={time_granularity}, records={len(filtered_data)}")
-        if filtered_data.empty:
+        # print(f"📊 Preparing ticket volume time series: granularity={time_granularity}, days={len(daily_counts)}")
+        if daily_counts.empty:
             return pd.DataFrame()
         
         try:
-            df = filtered_data.copy()
-            
-            # Create time period columns based on granularity
-            if time_granularity == "daily":
-                df['TimePeriod'] = df['CreatedOn'].dt.date
-                df['TimeLabel'] = df['CreatedOn'].dt.strftime('%Y-%m-%d')
-                df['SortKey'] = df['CreatedOn'].dt.date
-            elif time_granularity == "weekly":
-                df['TimePeriod'] = df['CreatedOn'].dt.to_period('W')
-                df['TimeLabel'] = df['CreatedOn'].dt.strftime('Week of %Y-%m-%d')
-                df['SortKey'] = df['CreatedOn'].dt.to_period('W').dt.start_time
-            else:  # monthly
-                df['TimePeriod'] = df['CreatedOn'].dt.to_period('M')
-                df['TimeLabel'] = df['CreatedOn'].dt.strftime('%Y-%m')
-                df['SortKey'] = df['CreatedOn'].dt.to_period('M').dt.start_time
-            
-            # Calculate tickets created by time period
-            created_series = df.groupby('TimeLabel').agg({
-                'WorkItemId': 'count',
-                'SortKey': 'first'
-            }).reset_index()
-            created_series = created_series.rename(columns={'WorkItemId': 'TicketsCreated'})
-            
-            # Calculate tickets closed by time period
-            closed_df = df[df['ClosedOn'].notna()].copy()
-            if not closed_df.empty:
-                if time_granularity == "daily":
-                    closed_df['ClosedTimePeriod'] = closed_df['ClosedOn'].dt.date
-                    closed_df['ClosedTimeLabel'] = closed_df['ClosedOn'].dt.strftime('%Y-%m-%d')
-                    closed_df['ClosedSortKey'] = closed_df['ClosedOn'].dt.date
-                elif time_granularity == "weekly":
-                    closed_df['ClosedTimePeriod'] = closed_df['ClosedOn'].dt.to_period('W')
-                    closed_df['ClosedTimeLabel'] = closed_df['ClosedOn'].dt.strftime('Week of %Y-%m-%d')
-                    closed_df['ClosedSortKey'] = closed_df['ClosedOn'].dt.to_period('W').dt.start_time
-                else:  # monthly
-                    closed_df['ClosedTimePeriod'] = closed_df['ClosedOn'].dt.to_period('M')
-                    closed_df['ClosedTimeLabel'] = closed_df['ClosedOn'].dt.strftime('%Y-%m')
-                    closed_df['ClosedSortKey'] = closed_df['ClosedOn'].dt.to_period('M').dt.start_time
-                
-                closed_series = closed_df.groupby('ClosedTimeLabel').agg({
-                    'WorkItemId': 'count',
-                    'ClosedSortKey': 'first'
-                }).reset_index()
-                closed_series = closed_series.rename(columns={
-                    'WorkItemId': 'TicketsClosed',
-                    'ClosedTimeLabel': 'TimeLabel',
-                    'ClosedSortKey': 'SortKey'
-                })
-            else:
-                closed_series = pd.DataFrame(columns=['TimeLabel', 'TicketsClosed', 'SortKey'])
-            
-            # Merge created and closed data
-            time_series = created_series.merge(closed_series, on='TimeLabel', how='outer', suffixes=('', '_closed'))
-            time_series['TicketsCreated'] = time_series['TicketsCreated'].fillna(0)
-            time_series['TicketsClosed'] = time_series['TicketsClosed'].fillna(0)
-            time_series['SortKey'] = time_series['SortKey'].fillna(time_series['SortKey_closed'])
-            
-            # Calculate active tickets (cumulative)
-            time_series = time_series.sort_values('SortKey').reset_index(drop=True)
-            time_series['NetChange'] = time_series['TicketsCreated'] - time_series['TicketsClosed']
-            time_series['ActiveTickets'] = time_series['NetChange'].cumsum()
-            
-            # Ensure active tickets don't go negative
-            time_series['ActiveTickets'] = time_series['ActiveTickets'].clip(lower=0)
-            
+            time_series = volume_time_series(daily_counts, time_granularity)
             print(f"📊 Prepared ticket volume time series: {len(time_series)} time periods")
             return time_series
             
@@ -471,14 +441,11 @@ def register_workflow_ticket_volume_callbacks(app):
             
             print(f"🔄 Updating ticket volume chart: granularity={time_granularity}")
             
-            # Get base data
-            base_data = get_ticket_volume_base_data()
-            
-            # Apply filters
-            filtered_data = apply_ticket_volume_filters(base_data, stored_selections)
+            # Daily counts for the filters (cached, so granularity switches skip the raw tickets)
+            daily_counts = get_daily_ticket_counts(stored_selections)
             
             # Prepare time series data
-            time_series_data = prepare_ticket_volume_time_series(filtered_data, time_granularity)
+            time_series_data = prepare_ticket_volume_time_series(daily_counts, time_granularity)
             
             # Create visualization
             fig = create_ticket_volume_chart(time_series_data, time_granularity)
@@ -6,8 +6,12 @@ import plotly.graph_objects as go
 import copy
 from inflection import titleize
 from src.utils.db import run_queries
+from src.utils.cache import LocalCache
+from src.utils.calendar_index import CalendarIndex
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
 
+_trends_calendar_index = LocalCache(max_entries=1)
+
 def register_workflow_trends_case_reasons_issues_callbacks(app):
 
     @monitor_query_performance("Trends Case Reasons & Issues Base Data")
@@ -105,40 +109,47 @@ def register_workflow_trends_case_reasons_issues_callbacks(app):
 
         return df
 
+    def get_trends_calendar_index(base_data):
+        """Dim_Date lookup arrays, built once per cache lifetime instead of merged on every request"""
+        return _trends_calendar_index.get_or_build('trends_calendar_index', lambda: CalendarIndex(base_data['date_dim']))
+
     @monitor_performance("Trends Case Reasons & Issues Data Preparation")
     def prepare_trends_case_reasons_issues_data(base_data, filtered_work_items, view_type, time_granularity):
-        work_items = filtered_work_items.copy()
-        date_dim = pd.DataFrame(base_data['date_dim'])
-        if work_items.empty or date_dim.empty:
+        if filtered_work_items.empty or len(base_data['date_dim']) == 0:
             return pd.DataFrame(), []
 
-        # Merge with date dimension for time grouping
-        work_items['DateKey'] = work_items['CreatedOn'].dt.date
-        date_dim['DateKey'] = pd.to_datetime(date_dim['DateKey']).dt.date
-        df = work_items.merge(date_dim, on='DateKey', how='left')
-
-        # Choose grouping column
-        if time_granularity == 'month':
-            df['Period'] = df['YearNumber'].astype(str) + '-' + df['MonthNumber'].astype(str).str.zfill(2)
-        elif time_granularity == 'quarter':
-            df['Period'] = df['YearNumber'].astype(str) + '-Q' + df['QuarterNumber'].astype(str)
-        elif time_granularity == 'year':
-            df['Period'] = df['YearNumber'].astype(str)
-        elif time_granularity == 'week':
-            df['Period'] = df['YearNumber'].astype(str) + '-W' + df['WeekNumber'].astype(str).str.zfill(2)
-        else:
-            df['Period'] = df['YearNumber'].astype(str) + '-' + df['MonthNumber'].astype(str).str.zfill(2)
-
         # Select CaseReason or Issue
         col = 'CaseReason' if view_type == 'case_reason' else 'Issue'
-        df = df[df[col].notnull() & (df[col] != '')].copy()
+        values = filtered_work_items[col]
+        has_value = (values.notnull() & (values != '')).to_numpy()
 
         # Get all unique items for chart filtering in callback
-        all_items = df[col].value_counts().index.tolist()
+        all_items = values[has_value].value_counts().index.tolist()
+
+        # Period code per ticket from the calendar lookup (tickets outside Dim_Date have no period)
+        calendar_index = get_trends_calendar_index(base_data)
+        period_codes = calendar_index.period_codes(filtered_work_items['CreatedOn'], time_granularity)
+        counted = has_value & (period_codes >= 0)
+        if not counted.any():
+            return pd.DataFrame(columns=['Period', col, 'Count']), all_items
+
+        # Aggregate for chart: count per period per reason/issue in one bincount
+        periods, period_positions = np.unique(period_codes[counted], return_inverse=True)
+        item_codes, items = pd.factorize(values[counted], sort=True)
+        n_items = len(items)
+        counts = np.bincount(
+            period_positions.ravel() * n_items + item_codes, minlength=len(periods) * n_items
+        ).reshape(len(periods), n_items)
 
-        # Aggregate for chart: count per period per reason/issue
-        chart_df = df.groupby(['Period', col]).size().reset_index(name='Count')
-        chart_df = chart_df.sort_values(['Period', 'Count'], ascending=[True, False])
+        period_index, item_index = np.nonzero(counts)
+        cell_counts = counts[period_index, item_index]
+        order = np.lexsort((item_index, -cell_counts, period_index))
+        period_labels = np.asarray(CalendarIndex.period_labels(periods, time_granularity), dtype=object)
+        chart_df = pd.DataFrame({
+            'Period': period_labels[period_index[order]],
+            col: np.asarray(items, dtype=object)[item_index[order]],
+            'Count': cell_counts[order]
+        })
 
         return chart_df, all_items    
 
@@ -266,6 +277,7 @@ def register_workflow_trends_case_reasons_issues_callbacks(app):
         chart_df, all_items = prepare_trends_case_reasons_issues_data(base_data, filtered_work_items, view_type, time_granularity)
 
         # Apply top/bottom filtering for chart only
+        selected_items = []
         if isinstance(chart_df, pd.DataFrame) and not chart_df.empty:
             col = 'CaseReason' if view_type == 'case_reason' else 'Issue'
             unique_items = all_items
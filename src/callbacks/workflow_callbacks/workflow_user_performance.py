@@ -4,10 +4,16 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import copy
-from src.utils.db import run_queries
+from src.utils.db import run_queries, run_aggregate_query, AggregateQuery
 from inflection import titleize
 from src.utils.performance import monitor_performance, monitor_query_performance, monitor_chart_performance
 
+USER_ACTION_COUNTS = AggregateQuery(
+    "[consumable].[Fact_WorkFlowHistory]",
+    group_by=['ChangedBy'],
+    aggregates={'ActionsTasksCompleted': ('count', None)}
+)
+
 def register_workflow_user_performance_callbacks(app):
 
     @monitor_query_performance("User Performance Base Data")
@@ -45,12 +51,17 @@ def register_workflow_user_performance_callbacks(app):
                     OpenToScheduled_Min
                 FROM [consumable].[Fact_DurationSummary]
             """,
+            # Raw history is only fetched if the action count aggregation cannot run in the database
             "workflow_history": """
                 SELECT WorkItemId, ChangedBy, ChangedField
                 FROM [consumable].[Fact_WorkFlowHistory]
             """
         }
-        return run_queries(queries, 'workflow', len(queries))
+        return run_queries(queries, 'workflow', len(queries), lazy=['workflow_history'])
+
+    def get_user_action_counts(base_data):
+        """History actions per user, aggregated in the database (a few hundred rows)"""
+        return run_aggregate_query('user_action_counts', USER_ACTION_COUNTS, 'workflow', fallback=base_data['workflow_history'])
 
     @monitor_performance("User Performance Filter Application")
     def apply_user_performance_filters(work_items, stored_selections):
@@ -118,7 +129,6 @@ def register_workflow_user_performance_callbacks(app):
     def prepare_user_performance_data(base_data, filtered_work_items, chart_type):
         work_items = filtered_work_items.copy()
         duration_summary = pd.DataFrame(base_data['duration_summary'])
-        workflow_history = pd.DataFrame(base_data['workflow_history'])
 
         # Merge work_items with duration_summary
         df = work_items.merge(duration_summary, on='WorkItemId', how='left')
@@ -159,8 +169,8 @@ def register_workflow_user_performance_callbacks(app):
             return avg_first_action
 
         elif chart_type == "actions_tasks":
-            actions_tasks = workflow_history.copy()
-            actions_tasks = actions_tasks[actions_tasks['ChangedBy'].isin(work_items['AssignedTo'])].groupby('ChangedBy').size().reset_index(name='ActionsTasksCompleted')
+            actions_tasks = get_user_action_counts(base_data).dropna(subset=['ChangedBy'])
+            actions_tasks = actions_tasks[actions_tasks['ChangedBy'].isin(work_items['AssignedTo'])].reset_index(drop=True)
             actions_tasks = actions_tasks.sort_values('ActionsTasksCompleted', ascending=False)
             return actions_tasks
 
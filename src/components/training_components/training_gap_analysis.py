@@ -84,7 +84,9 @@ def get_gap_analysis_layout():
                                     {"label": "By Topic", "value": "topic"},
                                     {"label": "By Instructor", "value": "instructor"},
                                     {"label": "By Location", "value": "location"},
-                                    {"label": "By AOR", "value": "aor"}
+                                    {"label": "By AOR", "value": "aor"},
+                                    {"label": "By Member Office", "value": "office"},
+                                    {"label": "By Member", "value": "member"}
                                 ],
                                 value="class",
                                 clearable=False,
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from src.utils.escalation_features import ESCALATED_VALUES, map_unique_values, format_assignee_name
+
+STATUS_CATEGORIES = ['Active', 'Closed', 'Non-Actionable']
+
+# CLOSED: Tickets that are completed/resolved
+CLOSED_STATUSES = {
+    'Closed', 'First Call Closed', 'Self-Fix', 'Resolved',
+    'Escalation Resolved', 'Done', 'Canceled', 'Escalation Canceled'
+}
+
+# ACTIVE: Tickets that require action/work
+ACTIVE_STATUSES = {
+    'Not Started', 'In Progress', 'Open', 'Scheduled',
+    'Escalated', 'Pending', 'Pending Verification', 'Existing Escalation'
+}
+
+# NON-ACTIONABLE: Tickets that are blocked/suspended/insufficient
+NON_ACTIONABLE_STATUSES = {
+    'On Hold', 'Insufficient Details'
+}
+
+ESCALATION_STATUSES = {'Escalated', 'Existing Escalation', 'Escalation Resolved', 'Escalation Canceled'}
+
+
+def categorize_status(status):
+    """Status bucket of a WorkItemStatus (unknown statuses count as Active)"""
+    if pd.isna(status):
+        return 'Non-Actionable'
+    status = str(status).strip()
+    if status in CLOSED_STATUSES:
+        return 'Closed'
+    if status in NON_ACTIONABLE_STATUSES:
+        return 'Non-Actionable'
+    return 'Active'
+
+
+def escalated_flags(is_escalated, statuses):
+    """Tickets flagged as escalated or sitting in an escalation status"""
+    flagged = map_unique_values(is_escalated, lambda value: str(value).strip() in ESCALATED_VALUES)
+    in_escalation = map_unique_values(statuses, lambda status: str(status).strip() in ESCALATION_STATUSES)
+    return flagged.astype(bool) | in_escalation.astype(bool)
+
+
+class AssigneeWorkloadMatrix:
+    """
+    Assignee x status category ticket counts for one filtered ticket set
+
+    Every assignee metric is a bincount over integer assignee codes, kept as NumPy arrays.
+    Assignees are ranked by ticket count once, so a top-N view is a head slice and a
+    category selection only picks columns of the ranked frame.
+    """
+
+    def __init__(self, tickets):
+        assignees = map_unique_values(tickets['AssignedTo'], format_assignee_name)
+        assignee_codes, self.assignees = pd.factorize(pd.Series(assignees), sort=True)
+        status_codes = pd.Index(STATUS_CATEGORIES).get_indexer(
+            map_unique_values(tickets['WorkItemStatus'], categorize_status)
+        )
+        n_assignees = len(self.assignees)
+        n_categories = len(STATUS_CATEGORIES)
+
+        self.status_counts = np.bincount(
+            assignee_codes * n_categories + status_codes, minlength=n_assignees * n_categories
+        ).reshape(n_assignees, n_categories)
+        self.escalated_counts = np.bincount(
+            assignee_codes, weights=escalated_flags(tickets['IsEscalated'], tickets['WorkItemStatus']), minlength=n_assignees
+        ).astype(np.int64)
+
+        created_on = pd.to_datetime(tickets['CreatedOn'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        has_date = ~np.isnat(created_on)
+        first_dates = np.full(n_assignees, np.iinfo(np.int64).max)
+        last_dates = np.full(n_assignees, np.iinfo(np.int64).min)
+        np.minimum.at(first_dates, assignee_codes[has_date], created_on[has_date].astype(np.int64))
+        np.maximum.at(last_dates, assignee_codes[has_date], created_on[has_date].astype(np.int64))
+        no_dates = np.bincount(assignee_codes[has_date], minlength=n_assignees) == 0
+        self.first_dates = np.where(no_dates, np.datetime64('NaT', 'ns'), first_dates.astype('datetime64[ns]'))
+        self.last_dates = np.where(no_dates, np.datetime64('NaT', 'ns'), last_dates.astype('datetime64[ns]'))
+
+        self.common_priorities = self._common_priorities(assignee_codes, tickets['Priority'], n_assignees)
+        self.metrics = self._ranked_metrics()
+
+    @staticmethod
+    def _common_priorities(assignee_codes, priorities, n_assignees):
+        """Most common priority per assignee (ties go to the first value in sort order, like Series.mode)"""
+        priority_codes, priority_values = pd.factorize(pd.Series(priorities), sort=True)
+        valid = priority_codes >= 0
+        n_priorities = max(len(priority_values), 1)
+        counts = np.bincount(
+            assignee_codes[valid] * n_priorities + priority_codes[valid], minlength=n_assignees * n_priorities
+        ).reshape(n_assignees, n_priorities)
+        values = np.asarray(priority_values, dtype=object) if len(priority_values) else np.array(['Unknown'], dtype=object)
+        return np.where(counts.sum(axis=1) > 0, values[counts.argmax(axis=1)], 'Unknown')
+
+    def _ranked_metrics(self):
+        """Per-assignee metrics frame, sorted by total tickets"""
+        totals = self.status_counts.sum(axis=1)
+        closed = self.status_counts[:, STATUS_CATEGORIES.index('Closed')]
+        metrics = pd.DataFrame({
+            'total_tickets': totals,
+            'escalated_tickets': self.escalated_counts,
+            'closed_tickets_alt': closed,
+            'first_ticket_date': self.first_dates,
+            'last_ticket_date': self.last_dates,
+            'common_priority': self.common_priorities
+        }, index=pd.Index(self.assignees, name='AssigneeDisplay'))
+        for position, category in enumerate(STATUS_CATEGORIES):
+            metrics[category] = self.status_counts[:, position]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            metrics['escalation_rate'] = (metrics['escalated_tickets'] / metrics['total_tickets'] * 100).round(1)
+            metrics['closure_rate'] = (metrics['Closed'] / metrics['total_tickets'] * 100).round(1)
+            metrics['active_rate'] = (metrics['Active'] / metrics['total_tickets'] * 100).round(1)
+        return metrics.sort_values('total_tickets', ascending=False)
+
+    @property
+    def total_tickets(self):
+        return int(self.status_counts.sum())
+
+    def category_total(self, category):
+        return int(self.status_counts[:, STATUS_CATEGORIES.index(category)].sum())
+
+    def assignee_total(self, assignee):
+        position = self.assignees.get_indexer([assignee])[0]
+        return int(self.status_counts[position].sum()) if position >= 0 else 0
+
+    def top(self, top_count=10):
+        """Top assignees by ticket count ('all' keeps every assignee)"""
+        if top_count != 'all' and isinstance(top_count, int):
+            return self.metrics.head(top_count)
+        return self.metrics
@@ -0,0 +1,76 @@
+import numpy as np
+
+# Outlier markers drawn per box; larger outlier sets are thinned to this many points
+MAX_OUTLIERS_PER_BOX = 150
+
+
+def sample_outliers(outliers, max_points=MAX_OUTLIERS_PER_BOX):
+    """
+    Cap a sorted outlier array to max_points evenly spaced values
+    Deterministic, and always keeps the most extreme values on both ends
+    """
+    if len(outliers) <= max_points:
+        return outliers
+    positions = np.unique(np.linspace(0, len(outliers) - 1, max_points).round().astype(np.int64))
+    return outliers[positions]
+
+
+def box_statistics(values, max_outliers=MAX_OUTLIERS_PER_BOX):
+    """
+    Box-plot statistics computed server-side, matching Plotly's own box calculation
+    (default 'linear' quartile method and 1.5 x IQR whisker fences)
+
+    Args:
+        values (array-like): numeric sample (NaNs are ignored)
+        max_outliers (int): cap on the outlier points returned
+
+    Returns:
+        dict: count, mean, q1, median, q3, lowerfence, upperfence,
+              outliers (sorted, capped), outlier_count
+    """
+    data = np.asarray(values, dtype=np.float64)
+    data = np.sort(data[~np.isnan(data)])
+    count = len(data)
+    if count == 0:
+        return {'count': 0, 'outliers': data, 'outlier_count': 0}
+
+    # Plotly interpolates at position p * N - 0.5, which is numpy's 'hazen' method
+    q1, median, q3 = np.quantile(data, [0.25, 0.5, 0.75], method='hazen')
+    iqr = q3 - q1
+
+    # Fences are the most extreme points still within 1.5 x IQR of the box
+    lower_index = min(np.searchsorted(data, q1 - 1.5 * iqr, side='left'), count - 1)
+    upper_index = max(np.searchsorted(data, q3 + 1.5 * iqr, side='right') - 1, 0)
+    lowerfence = min(q1, data[lower_index])
+    upperfence = max(q3, data[upper_index])
+
+    outliers = np.concatenate([data[data < lowerfence], data[data > upperfence]])
+
+    return {
+        'count': count,
+        'mean': data.mean(),
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': lowerfence,
+        'upperfence': upperfence,
+        'outliers': sample_outliers(outliers, max_outliers),
+        'outlier_count': len(outliers)
+    }
+
+
+def grouped_box_statistics(df, group_column, value_column, groups=None, max_outliers=MAX_OUTLIERS_PER_BOX):
+    """
+    Box statistics per group value in one grouping pass
+
+    Returns:
+        dict: group value -> box_statistics() result (only groups present in df)
+    """
+    if df.empty:
+        return {}
+    if groups is not None:
+        df = df.loc[df[group_column].isin(groups)]
+    return {
+        group: box_statistics(group_values.to_numpy(), max_outliers)
+        for group, group_values in df.groupby(group_column, sort=False)[value_column]
+    }
@@ -1,4 +1,61 @@
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
 from flask_caching import Cache
 from src.config.cache import cache_config
 
-cache = Cache(config=cache_config)
\ No newline at end of file
+cache = Cache(config=cache_config)
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Thread-safe in-process LRU with a TTL, for derived objects (prepared frames,
+    precomputed series) that are too large or too hot to round-trip through Redis
+    Entries expire with the same lifetime as the shared cache by default
+    """
+
+    def __init__(self, max_entries=8, ttl_seconds=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else cache_config.get('CACHE_DEFAULT_TIMEOUT', 3600)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if time.time() - entry[0] >= self.ttl_seconds:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_or_build(self, key, builder):
+        """Return the cached value for key, building it with builder() on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.set(key, builder())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def make_cache_key(*parts):
+    """Build a stable hash key from JSON-serializable parts (filter dicts, report types, ...)"""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.md5(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+# Trend granularity -> Dim_Date number columns that make up its period
+PERIOD_COLUMNS = {
+    'week': ('YearNumber', 'WeekNumber'),
+    'month': ('YearNumber', 'MonthNumber'),
+    'quarter': ('YearNumber', 'QuarterNumber'),
+    'year': ('YearNumber',)
+}
+
+# Period code = year * multiplier + sub-period number, so codes sort like their labels
+PERIOD_MULTIPLIERS = {
+    'week': 100,
+    'month': 100,
+    'quarter': 10,
+    'year': 1
+}
+
+
+def _day_numbers(dates):
+    """Day numbers (days since 1970-01-01) of datetime values, with a mask of the missing ones"""
+    dates = pd.to_datetime(pd.Series(dates), errors='coerce').to_numpy(dtype='datetime64[ns]')
+    return dates.astype('datetime64[D]').astype(np.int64), np.isnat(dates)
+
+
+class CalendarIndex:
+    """
+    Dim_Date as integer lookup arrays indexed by day number
+
+    Each granularity keeps one array of period codes (e.g. 202407 for July 2024 or
+    2024-W07), so bucketing any set of dates is a single array indexing operation
+    instead of a merge with the date dimension. Week/month/quarter numbers come from
+    Dim_Date itself, so they follow the warehouse calendar rather than pandas periods.
+    """
+
+    def __init__(self, date_dim):
+        date_dim = pd.DataFrame(date_dim)
+        days, missing = _day_numbers(date_dim['DateKey'])
+        days = days[~missing]
+        self.first_day = int(days.min()) if len(days) else 0
+        self.size = int(days.max()) - self.first_day + 1 if len(days) else 0
+
+        positions = days - self.first_day
+        self.period_codes_by_day = {}
+        for granularity, columns in PERIOD_COLUMNS.items():
+            numbers = [pd.to_numeric(date_dim[column], errors='coerce').to_numpy(dtype=np.float64)[~missing] for column in columns]
+            codes = numbers[0] * PERIOD_MULTIPLIERS[granularity]
+            if len(numbers) > 1:
+                codes = codes + numbers[1]
+            lookup = np.full(self.size, -1, dtype=np.int64)
+            known = ~np.isnan(codes)
+            lookup[positions[known]] = codes[known].astype(np.int64)
+            self.period_codes_by_day[granularity] = lookup
+
+    @property
+    def empty(self):
+        return self.size == 0
+
+    def period_codes(self, dates, granularity):
+        """Period code per date (-1 for missing dates or dates outside Dim_Date); unknown granularities use months"""
+        lookup = self.period_codes_by_day.get(granularity, self.period_codes_by_day['month'])
+        days, missing = _day_numbers(dates)
+        positions = days - self.first_day
+        in_range = ~missing & (positions >= 0) & (positions < self.size)
+        codes = np.full(len(days), -1, dtype=np.int64)
+        codes[in_range] = lookup[positions[in_range]]
+        return codes
+
+    @staticmethod
+    def period_labels(codes, granularity):
+        """Labels for (unique) period codes - '2024-W07', '2024-07', '2024-Q3' or '2024'"""
+        codes = np.asarray(codes, dtype=np.int64)
+        if granularity == 'year':
+            return [str(code) for code in codes]
+        if granularity == 'quarter':
+            return [f"{code // 10}-Q{code % 10}" for code in codes]
+        if granularity == 'week':
+            return [f"{code // 100}-W{code % 100:02d}" for code in codes]
+        return [f"{code // 100}-{code % 100:02d}" for code in codes]
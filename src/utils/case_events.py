@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+
+class CaseEventTable:
+    """
+    Fact_CaseEvents as one flat table sorted by case ID, with per-case offset ranges
+
+    The events of the case at position i of case_ids are rows offsets[i]:offsets[i + 1]
+    of events (in their original order), so counting or selecting the events of any set
+    of cases is array arithmetic on the offsets rather than a Python list of dicts per case.
+    """
+
+    def __init__(self, case_events, id_column='ID'):
+        case_events = pd.DataFrame(case_events)
+        if id_column not in case_events.columns:
+            case_events = pd.DataFrame(columns=[id_column])
+
+        codes, case_ids = pd.factorize(case_events[id_column], sort=True)
+        known = codes >= 0
+        order = np.flatnonzero(known)[np.argsort(codes[known], kind='stable')]
+        self.events = case_events.drop(columns=[id_column]).iloc[order].reset_index(drop=True)
+        self.case_ids = pd.Index(case_ids)
+        counts = np.bincount(codes[known], minlength=len(self.case_ids))
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def __len__(self):
+        return len(self.events)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def counts(self):
+        """Number of events of each case in case_ids"""
+        return np.diff(self.offsets)
+
+    def case_counts(self):
+        """One row per case with events: ID, NumCaseEvents"""
+        return pd.DataFrame({'ID': self.case_ids, 'NumCaseEvents': self.counts})
+
+    def positions(self, case_ids):
+        """
+        Event row positions of the given cases, case by case in the order given
+        (cases listed twice contribute their events twice; unknown cases none)
+
+        Returns:
+            tuple: (positions, lengths) - flat event positions and the number of events of each given case
+        """
+        indexer = self.case_ids.get_indexer(pd.Index(case_ids))
+        if len(self.case_ids) == 0:
+            # No events at all: every case is unknown (and -1 cannot index the empty offsets)
+            return np.empty(0, dtype=np.int64), np.zeros(len(indexer), dtype=np.int64)
+        known = indexer >= 0
+        starts = np.where(known, self.offsets[:-1][indexer], 0)
+        lengths = np.where(known, self.counts[indexer], 0)
+        run_starts = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - run_starts, lengths) + np.arange(int(lengths.sum()))
+        return positions, lengths
+
+    def select(self, case_ids):
+        """
+        Events of the given cases
+
+        Returns:
+            tuple: (case ID of every selected event, selected events DataFrame)
+        """
+        case_ids = pd.Series(case_ids)
+        positions, lengths = self.positions(case_ids)
+        return np.repeat(case_ids.to_numpy(), lengths), self.events.iloc[positions].reset_index(drop=True)
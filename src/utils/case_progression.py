@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+
+class StageProgression:
+    """
+    Case x lifecycle stage matrix built from one row per case event
+
+    Cases and stages are integer-coded once, so per-case stage counts are a single
+    bincount into a case x stage matrix and has-stage flags are that matrix > 0. The
+    ordered unique-stage sequence of a case comes from the first occurrence of each
+    (case, stage) pair, sorted by case and then by position.
+    """
+
+    def __init__(self, case_ids, stages, ignore_stages=('Other',)):
+        case_ids = pd.Series(case_ids).reset_index(drop=True)
+        stages = pd.Series(stages).reset_index(drop=True)
+        case_codes, self.case_ids = pd.factorize(case_ids, sort=True)
+        stage_codes, self.stages = pd.factorize(stages)
+        self.stages = pd.Index(self.stages)
+
+        n_cases, n_stages = len(self.case_ids), len(self.stages)
+        keep = (case_codes >= 0) & (stage_codes >= 0) & ~stages.isin(ignore_stages).to_numpy()
+        pair_keys = case_codes[keep].astype(np.int64) * n_stages + stage_codes[keep]
+        self.counts = np.bincount(pair_keys, minlength=n_cases * n_stages).reshape(n_cases, n_stages)
+
+        # First occurrence of each (case, stage) pair; rows keep their original order
+        unique_keys, first_positions = np.unique(pair_keys, return_index=True)
+        pair_cases = unique_keys // max(n_stages, 1)
+        order = np.lexsort((first_positions, pair_cases))
+        self.sequence_stages = (unique_keys % max(n_stages, 1))[order]
+        self.sequence_offsets = np.concatenate([[0], np.cumsum(np.bincount(pair_cases, minlength=n_cases))])
+
+    def __len__(self):
+        return len(self.case_ids)
+
+    def has_stage(self, *stage_names):
+        """Per case: whether any of stage_names occurred"""
+        positions = self.stages.get_indexer(list(stage_names))
+        positions = positions[positions >= 0]
+        return (self.counts[:, positions] > 0).any(axis=1) if len(positions) else np.zeros(len(self), dtype=bool)
+
+    @property
+    def unique_stage_counts(self):
+        """Number of distinct stages per case"""
+        return np.diff(self.sequence_offsets)
+
+    def sequences(self):
+        """Ordered unique stages of every case (as lists of stage names)"""
+        names = np.asarray(self.stages, dtype=object)[self.sequence_stages].tolist()
+        offsets = self.sequence_offsets.tolist()
+        return [names[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
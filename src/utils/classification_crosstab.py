@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from inflection import titleize
+
+# Classification dimension key -> (work item column, display column name)
+CLASSIFICATION_DIMENSIONS = {
+    'case_type': ('WorkItemDefinitionShortCode', 'CaseTypeDisplay'),
+    'case_origin': ('CaseOrigin', 'CaseOriginDisplay'),
+    'aor': ('AorShortName', 'AorDisplay'),
+    'case_reason': ('CaseReason', 'CaseReasonDisplay'),
+    'priority': ('Priority', 'PriorityDisplay'),
+    'product': ('Product', 'ProductDisplay'),
+    'module': ('Module', 'ModuleDisplay'),
+    'feature': ('Feature', 'FeatureDisplay'),
+    'issue': ('Issue', 'IssueDisplay'),
+    'status': ('WorkItemStatus', 'StatusDisplay')
+}
+
+# Pairs with more possible cells than this are counted into a sparse matrix
+DENSE_CELL_LIMIT = 100_000
+
+
+def format_for_display(value):
+    """Titleized display label with N/A removed like the filter callbacks ('Unspecified' for blanks)"""
+    if pd.isna(value) or value == '' or value == 'Unspecified':
+        return 'Unspecified'
+    formatted = str(value).replace('_', ' ').replace('-', ' ').replace('N/A', '').strip()
+    return titleize(formatted) if formatted else 'Unspecified'
+
+
+class ClassificationCrossTab:
+    """
+    Counts for one row x column pivot: a dense array, or a CSR matrix for high-cardinality pairs
+    Rows and columns are the labels present in the filtered tickets, in sorted order
+    """
+
+    def __init__(self, counts, row_labels, column_labels, row_name, column_name):
+        self.counts = counts
+        self.row_labels = pd.Index(row_labels)
+        self.column_labels = pd.Index(column_labels)
+        self.row_name = row_name
+        self.column_name = column_name
+        self.row_totals = np.asarray(counts.sum(axis=1)).ravel().astype(np.int64)
+        self.column_totals = np.asarray(counts.sum(axis=0)).ravel().astype(np.int64)
+
+    @property
+    def is_sparse(self):
+        return sparse.issparse(self.counts)
+
+    @property
+    def total(self):
+        return int(self.row_totals.sum())
+
+    def top_row(self):
+        """Most frequent row label (ties go to the first label, like Series.mode)"""
+        return self.row_labels[int(np.argmax(self.row_totals))] if len(self.row_labels) else 'N/A'
+
+    def top_column(self):
+        return self.column_labels[int(np.argmax(self.column_totals))] if len(self.column_labels) else 'N/A'
+
+    def to_frame(self, max_rows=None, margins_name='Total'):
+        """
+        Cross-tab frame with row and column margins, laid out like pd.crosstab(margins=True)
+
+        Args:
+            max_rows (int): keep only the rows with the most tickets (margins still cover all rows);
+                            only sparse results are trimmed, since they are densified here
+        """
+        rows = np.arange(len(self.row_labels))
+        if max_rows is not None and self.is_sparse and len(rows) > max_rows:
+            ranked = pd.Series(self.row_totals).sort_values(ascending=False).head(max_rows).index
+            rows = np.sort(ranked.to_numpy())
+
+        counts = self.counts[rows]
+        counts = counts.toarray() if self.is_sparse else counts
+        values = np.column_stack([counts, self.row_totals[rows]])
+        values = np.vstack([values, np.append(self.column_totals, self.total)]).astype(np.int64)
+
+        index = pd.Index(list(self.row_labels[rows]) + [margins_name], name=self.row_name)
+        columns = pd.Index(list(self.column_labels) + [margins_name], name=self.column_name)
+        return pd.DataFrame(values, index=index, columns=columns)
+
+
+class ClassificationCodes:
+    """
+    Every classification dimension integer-coded once per data refresh
+
+    Display labels are formatted per distinct raw value (the category table), never per
+    ticket; codes follow the sorted display labels. A pivot for any filtered subset of
+    rows is one bincount over combined row x column codes (or a sparse count for
+    high-cardinality pairs such as Feature x Issue).
+    """
+
+    def __init__(self, work_items, case_types=None):
+        self.index = pd.Index(work_items.index)
+        case_type_mapping = {}
+        if case_types is not None and len(case_types) > 0:
+            df_case_types = pd.DataFrame(case_types)
+            case_type_mapping = dict(zip(df_case_types['CaseTypeCode'], df_case_types['CaseTypeName']))
+
+        def get_case_type_display_name(code):
+            if pd.isna(code) or code == '' or code == 'Unspecified':
+                return 'Unspecified'
+            return case_type_mapping.get(code, format_for_display(code))
+
+        self.codes = {}
+        self.labels = {}
+        for dimension, (column, _) in CLASSIFICATION_DIMENSIONS.items():
+            formatter = get_case_type_display_name if dimension == 'case_type' else format_for_display
+            raw_codes, raw_values = pd.factorize(work_items[column], use_na_sentinel=False)
+            display_values = [formatter(value) for value in raw_values]
+            label_codes, labels = pd.factorize(pd.Series(display_values, dtype=object), sort=True)
+            self.codes[dimension] = np.asarray(label_codes, dtype=np.int64)[raw_codes] if len(raw_values) else np.array([], dtype=np.int64)
+            self.labels[dimension] = pd.Index(labels)
+
+    def positions(self, index):
+        """Row positions of a filtered frame's index labels"""
+        return self.index.get_indexer(index)
+
+    def crosstab(self, row_dimension, column_dimension, positions=None):
+        """Ticket counts per (row label, column label) for the rows at positions (all rows when None)"""
+        row_codes = self.codes[row_dimension]
+        column_codes = self.codes[column_dimension]
+        if positions is not None:
+            row_codes = row_codes[positions]
+            column_codes = column_codes[positions]
+
+        n_rows = len(self.labels[row_dimension])
+        n_columns = len(self.labels[column_dimension])
+        combined = row_codes * n_columns + column_codes
+
+        if n_rows * n_columns <= DENSE_CELL_LIMIT:
+            counts = np.bincount(combined, minlength=n_rows * n_columns).reshape(n_rows, n_columns)
+            present_rows = np.flatnonzero(counts.sum(axis=1))
+            present_columns = np.flatnonzero(counts.sum(axis=0))
+            counts = counts[np.ix_(present_rows, present_columns)]
+        else:
+            cells, cell_counts = np.unique(combined, return_counts=True)
+            present_rows, row_positions = np.unique(cells // n_columns, return_inverse=True)
+            present_columns, column_positions = np.unique(cells % n_columns, return_inverse=True)
+            counts = sparse.csr_matrix(
+                (cell_counts, (row_positions.ravel(), column_positions.ravel())),
+                shape=(len(present_rows), len(present_columns))
+            )
+
+        return ClassificationCrossTab(
+            counts, self.labels[row_dimension][present_rows], self.labels[column_dimension][present_columns],
+            CLASSIFICATION_DIMENSIONS[row_dimension][1], CLASSIFICATION_DIMENSIONS[column_dimension][1]
+        )
@@ -1,16 +1,19 @@
 import pandas as pd
 import numpy as np
 import re
-import json
-from datetime import datetime, timedelta
+from datetime import timedelta
 from src.utils.db import run_queries
-from functools import reduce, lru_cache
+from functools import reduce
 from src.utils.performance import monitor_performance
+from src.utils.json_columns import parse_json_list_columns
+from src.utils.case_events import CaseEventTable
+from src.utils.case_progression import StageProgression
+from src.utils.text_memo import TextMemo
+from src.utils.derived_cache import DerivedDataGraph, fingerprint_frames
 
-# Global cache for processed compliance data
-_compliance_data_cache = {}
-_cache_timestamp = None
-_cache_duration_minutes = 60  # Cache for 60 minutes
+# Derived compliance datasets: tables -> base data / case events -> event history -> case flow -> stages -> progression
+COMPLIANCE_CACHE_TTL_SECONDS = 60 * 60  # Cache for 60 minutes
+compliance_data_graph = DerivedDataGraph('compliance', ttl_seconds=COMPLIANCE_CACHE_TTL_SECONDS)
 
 def categorize_rule_violation(rule_list):
     """Categorize violations by business-meaningful rule categories based on actual rule content"""
@@ -480,121 +483,452 @@ def format_currency_list(fee_list):
         print(f"⚠️ Warning in format_currency_list: {e}, returning $0.00")
         return "$0.00"
 
-@lru_cache(maxsize=1)
+@compliance_data_graph.node('compliance_tables', fingerprint=fingerprint_frames)
+def get_compliance_tables():
+    """
+    Fetch the raw compliance tables (the queries themselves are cached by run_queries)
+    The content fingerprint means a refetch of unchanged data rebuilds nothing downstream
+    """
+    queries = {
+        "case_details": "SELECT * FROM [consumable].[Fact_CaseDetails]",
+        "case_events": "SELECT * FROM [consumable].[Fact_CaseEvents]", 
+        "case_notes": "SELECT * FROM [consumable].[Fact_CaseNotes]",
+        "case_notices": "SELECT * FROM [consumable].[Fact_CaseNotices]"
+    }
+    return run_queries(queries, 'compliance', 5)
+
+@compliance_data_graph.node('case_events', deps=['compliance_tables'], default=lambda: CaseEventTable(None))
+def get_case_event_table():
+    """
+    Flat, case-sorted Fact_CaseEvents table behind get_compliance_base_data and get_event_history
+    """
+    return CaseEventTable(get_compliance_tables()["case_events"])
+
+@compliance_data_graph.node('base_data', deps=['compliance_tables', 'case_events'], default=pd.DataFrame)
 def get_compliance_base_data():
     """
     Fetch and merge compliance case data with global caching
     This is shared across all compliance callbacks for consistency
     """
-    global _compliance_data_cache, _cache_timestamp
+    # print("📊 Processing fresh compliance case data...")
+    
+    result = get_compliance_tables()
+    
+    # Parse JSON columns in Fact_CaseDetails
+    case_details_df = result["case_details"].copy()
+    
+    # Each JSON column is decoded in one pass into flat values + row offsets,
+    # so the count columns come straight from the offsets
+    ragged = parse_json_list_columns(
+        case_details_df,
+        ['ViolationName', 'ViolationDescription', 'RuleNumber', 'RuleTitle', 'CitationFee', 'FineType', 'ReportIds']
+    )
+    if 'ReportIds' in ragged:
+        case_details_df.insert(case_details_df.columns.get_loc('ReportIds') + 1, 'NumReportIds', ragged['ReportIds'].lengths)
+    
+    # Parse JSON columns in other tables
+    case_notes_df = result["case_notes"].copy()
+    ragged = parse_json_list_columns(case_notes_df, ['Notes'])
+    if 'Notes' in ragged:
+        case_notes_df['NumNotes'] = ragged['Notes'].lengths
+    
+    case_notices_df = result["case_notices"].copy()
+    ragged = parse_json_list_columns(case_notices_df, ['CaseNotices'])
+    if 'CaseNotices' in ragged:
+        case_notices_df['NumCaseNotices'] = ragged['CaseNotices'].lengths
+    
+    # Keep case events as one flat table sorted by case ID (per-case offset ranges)
+    grouped_case_events_df = get_case_event_table().case_counts()
+    
+    # Merge all dataframes
+    dfs = [case_details_df, grouped_case_events_df, case_notices_df, case_notes_df]
+    merged_df = reduce(lambda left, right: pd.merge(left, right, on='ID', how='left'), dfs)
+    
+    # Fill missing values
+    list_columns = ['Notes', 'CaseNotices']
+    for col in list_columns:
+        if col in merged_df.columns:
+            merged_df[col] = merged_df[col].apply(lambda x: x if isinstance(x, list) else [])
+    
+    numeric_columns = ['NumNotes', 'NumCaseNotices', 'NumCaseEvents']
+    for col in numeric_columns:
+        if col in merged_df.columns:
+            merged_df[col] = merged_df[col].fillna(0).astype(int)
+    
+    # Convert date columns
+    date_columns = ['CreatedOn', 'ClosedOn']
+    for col in date_columns:
+        if col in merged_df.columns:
+            merged_df[col] = pd.to_datetime(merged_df[col], errors='coerce')
+        
+    merged_df['ViolationCategory'] = merged_df['RuleNumber'].apply(categorize_rule_violation)
+    merged_df['DetailedRuleCategory'] = merged_df['RuleNumber'].apply(categorize_detailed_rule)
+    merged_df['FirstViolation'] = merged_df['ViolationName'].apply(parse_list_field)
+    merged_df['FirstRuleNumber'] = merged_df['RuleNumber'].apply(parse_list_field)
+    merged_df['FirstRuleTitle'] = merged_df['RuleTitle'].apply(parse_list_field)
+    merged_df['TotalCitationFee'] = merged_df['CitationFee'].apply(format_currency_list)
 
-    try:
-        # Check if we have valid cached data
-        current_time = datetime.now()
-        if (_cache_timestamp and 
-            _compliance_data_cache and 
-            (current_time - _cache_timestamp).seconds < _cache_duration_minutes * 60):
-            # print(f"🎯 Using cached processed compliance data (age: {(current_time - _cache_timestamp).seconds}s)")
-            return _compliance_data_cache['merged_df']
-        
-        # print("📊 Processing fresh compliance case data...")
-        
-        # Fetch all required tables (these queries are still cached by run_queries)
-        queries = {
-            "case_details": "SELECT * FROM [consumable].[Fact_CaseDetails]",
-            "case_events": "SELECT * FROM [consumable].[Fact_CaseEvents]", 
-            "case_notes": "SELECT * FROM [consumable].[Fact_CaseNotes]",
-            "case_notices": "SELECT * FROM [consumable].[Fact_CaseNotices]"
-        }
-        
-        result = run_queries(queries, 'compliance', 5)
-        
-        # Parse JSON columns in Fact_CaseDetails
-        case_details_df = result["case_details"].copy()
-        
-        if 'ViolationName' in case_details_df.columns:
-            case_details_df['ViolationName'] = case_details_df['ViolationName'].apply(json.loads)
-        if 'ViolationDescription' in case_details_df.columns:
-            case_details_df['ViolationDescription'] = case_details_df['ViolationDescription'].apply(json.loads)
-        if 'RuleNumber' in case_details_df.columns:
-            case_details_df['RuleNumber'] = case_details_df['RuleNumber'].apply(json.loads)
-        if 'RuleTitle' in case_details_df.columns:
-            case_details_df['RuleTitle'] = case_details_df['RuleTitle'].apply(json.loads)
-        if 'CitationFee' in case_details_df.columns:
-            case_details_df['CitationFee'] = case_details_df['CitationFee'].apply(json.loads)
-        if 'FineType' in case_details_df.columns:
-            case_details_df['FineType'] = case_details_df['FineType'].apply(json.loads)
-        if 'ReportIds' in case_details_df.columns:
-            case_details_df['ReportIds'] = case_details_df['ReportIds'].apply(lambda x: json.loads(x) if pd.notna(x) else [])
-            case_details_df.insert(case_details_df.columns.get_loc('ReportIds') + 1, 'NumReportIds', case_details_df['ReportIds'].apply(len))
-        
-        # Parse JSON columns in other tables
-        case_notes_df = result["case_notes"].copy()
-        if 'Notes' in case_notes_df.columns:
-            case_notes_df['Notes'] = case_notes_df['Notes'].apply(json.loads)
-            case_notes_df['NumNotes'] = case_notes_df['Notes'].apply(lambda x: len(x) if isinstance(x, list) else 0)
-        
-        case_notices_df = result["case_notices"].copy()
-        if 'CaseNotices' in case_notices_df.columns:
-            case_notices_df['CaseNotices'] = case_notices_df['CaseNotices'].apply(json.loads)
-            case_notices_df['NumCaseNotices'] = case_notices_df['CaseNotices'].apply(lambda x: len(x) if isinstance(x, list) else 0)
-        
-        # Group case events by ID
-        case_events_df = result["case_events"].copy()
-        if not case_events_df.empty:
-            grouped_case_events_df = (
-                case_events_df
-                .drop(columns=['ID'])
-                .groupby(case_events_df['ID'])
-                .apply(lambda g: g.to_dict(orient='records'))
-                .reset_index(name='CaseEvents')
-            )
-            grouped_case_events_df['NumCaseEvents'] = grouped_case_events_df['CaseEvents'].apply(len)
-        else:
-            grouped_case_events_df = pd.DataFrame(columns=['ID', 'CaseEvents', 'NumCaseEvents'])
-        
-        # Merge all dataframes
-        dfs = [case_details_df, grouped_case_events_df, case_notices_df, case_notes_df]
-        merged_df = reduce(lambda left, right: pd.merge(left, right, on='ID', how='left'), dfs)
-        
-        # Fill missing values
-        list_columns = ['Notes', 'CaseNotices', 'CaseEvents']
-        for col in list_columns:
-            if col in merged_df.columns:
-                merged_df[col] = merged_df[col].apply(lambda x: x if isinstance(x, list) else [])
-        
-        numeric_columns = ['NumNotes', 'NumCaseNotices', 'NumCaseEvents']
-        for col in numeric_columns:
-            if col in merged_df.columns:
-                merged_df[col] = merged_df[col].fillna(0).astype(int)
-        
-        # Convert date columns
-        date_columns = ['CreatedOn', 'ClosedOn']
-        for col in date_columns:
-            if col in merged_df.columns:
-                merged_df[col] = pd.to_datetime(merged_df[col], errors='coerce')
-            
-        merged_df['ViolationCategory'] = merged_df['RuleNumber'].apply(categorize_rule_violation)
-        merged_df['DetailedRuleCategory'] = merged_df['RuleNumber'].apply(categorize_detailed_rule)
-        merged_df['FirstViolation'] = merged_df['ViolationName'].apply(parse_list_field)
-        merged_df['FirstRuleNumber'] = merged_df['RuleNumber'].apply(parse_list_field)
-        merged_df['FirstRuleTitle'] = merged_df['RuleTitle'].apply(parse_list_field)
-        merged_df['TotalCitationFee'] = merged_df['CitationFee'].apply(format_currency_list)
+    # print(f"✅ Processed and cached {len(merged_df)} compliance cases")
+    return merged_df
 
-        # Cache the processed result
-        _compliance_data_cache['merged_df'] = merged_df
-        _cache_timestamp = current_time
-        
-        # print(f"✅ Processed and cached {len(merged_df)} compliance cases")
-        return merged_df
-        
-    except Exception as e:
-        print(f"❌ Error fetching compliance base data: {e}")
-        return pd.DataFrame()
+# Event detail normalization patterns - HTML tags (searched once the text is unescaped)
+DETAIL_HTML_TAG_PATTERNS = [
+    r'<p[^>]*>.*?</p>',         # <p>content</p>
+    r'<div[^>]*>.*?</div>',     # <div>content</div>
+    r'<h[1-6][^>]*>.*?</h[1-6]>',  # Any header level: <h1>content</h1>, <h2>content</h2>, etc.
+    r'<span[^>]*>.*?</span>',   # <span>content</span>
+    r'<strong[^>]*>.*?</strong>', # <strong>content</strong>
+    r'<em[^>]*>.*?</em>',       # <em>content</em>
+    r'<ul[^>]*>.*?</ul>',       # <ul>content</ul>
+    r'<li[^>]*>.*?</li>',       # <li>content</li>
+    r'<br\s*/?>',               # <br> or <br/>
+    r'</p>',                    # </p> standalone
+    r'<p[^>]*>',               # <p> standalone with attributes
+    r'<p>',                     # <p> standalone
+    r'</div>',                  # </div> standalone
+    r'<div[^>]*>',             # <div> standalone with attributes
+    r'</h[1-6]>',              # Any closing header tag: </h1>, </h2>, etc.
+    r'<h[1-6][^>]*>',          # Any opening header tag with attributes
+    r'<h[1-6]>',               # Any simple opening header tag
+    r'&[a-zA-Z0-9#]+;',        # HTML entities like &nbsp;, &rsquo;
+]
+
+# Handle single hyperlink scenario
+DETAIL_HYPERLINK_PATTERNS = [
+    # Pattern for escaped hyperlinks like: <a href=\"https://...">text</a>
+    r'^\s*<a\s+href=\\?"[^"]*\\?"[^>]*>(.*?)<\\?/?a>\s*$',
+    # Pattern for normal hyperlinks like: <a href="https://...">text</a>
+    r'^\s*<a\s+href="[^"]*"[^>]*>(.*?)</a>\s*$',
+    # Pattern for hyperlinks without quotes: <a href=...>text</a>
+    r'^\s*<a\s+href=[^>]*>(.*?)</?a>\s*$',
+]
+
+# Case and investigation status changes
+DETAIL_CASE_STATUS_PATTERNS = [
+    # Case actions
+    (r'.*[Cc]ase [Cc]losed.*', 'Case Closed'),
+    (r'.*[Cc]ase [Cc]reated.*', 'Case Created'),
+    (r'.*[Cc]ase [Uu]pdated.*', 'Case Updated'),
+    (r'.*[Cc]ase [Rr]eopened.*', 'Case Reopened'),
+    (r'.*[Cc]ase.*unlinked.*', 'Case unlinked'),
+    (r'.*[Cc]ase.*linked.*', 'Case linked'),
+    
+    # Case Review Status - all variations
+    (r'.*[Cc]ase [Rr]eview [Ss]tatus changed.*', 'Case review status changed'),
+    (r'.*[Cc]ase [Rr]eview [Uu]pdated.*', 'Case review updated'),
+    
+    # Investigation patterns - ultra consolidated
+    (r'.*[Ii]nvestigation.*relocat.*', 'Investigation relocation to/from another case'),
+    (r'.*[Ii]nvestigatio.*[Mm]arked.*', 'Marked for investigation'),
+    (r'.*[Ii]nvestigation.*status.*change*', 'Investigation status changed'),
+    (r'.*[Ii]nvestigation [Uu]pdated.*', 'Investigation status changed'),
+    
+    # Notice patterns - consolidate variations
+    (r'.*[Nn]otice.*[Dd]efinition.*[Uu]pdated.*', 'NoticeDefinition Updated'),
+    (r'.*[Cc]itation.*[Nn]otice.*[Cc]reated.*', 'Citation notice created'),
+    (r'.*[Ee]mail.*[Nn]otice.*[Cc]reated.*', 'Email Notice Created'),
+    (r'.*[Ii]nquiry.*[Nn]otice.*[Cc]reated.*', 'Inquiry Notice Created'),
+    (r'.*[Ii]ncoming.*[Ee]mail.*[Nn]otice.*[Cc]reated.*', 'Incoming Email notice created'),
+    (r'.*NoticeType.*Incoming Email.*[Cc]reated.*', 'Incoming Email notice created'),
+    (r'.*NoticeType\.Incoming Email.*[Cc]reated.*', 'Incoming Email notice created'),
+    (r'.*[Oo]ther.*[Nn]otice.*[Cc]reated.*', 'Other notice created'),
+    (r'.*NoticeType.*Other.*[Cc]reated.*', 'Other notice created'),
+    (r'.*NoticeType\.Other.*[Cc]reated.*', 'Other notice created'),
+    (r'.*[Nn]otice.*[Tt]ranscript.*[Cc]reated.*', 'Notice Transcript created'),
+    (r'.*[Oo]ff.*[Ss]ystem.*[Ee]mail.*[Nn]otice.*[Cc]reated.*', 'Off System Email Notice Created'),
+    (r'.*[Rr]evised.*[Cc]itation.*[Nn]otice.*[Cc]reated.*', 'Revised Citation Notice Created'),
+    (r'.*[Rr]evised.*[Ii]nquiry.*[Nn]otice.*[Cc]reated.*', 'Revised Inquiry Notice Created'),
+    (r'.*[Rr]evised.*[Ww]arning.*[Nn]otice.*[Cc]reated.*', 'Revised Warning Notice Created'),
+    (r'.*[Ww]arning.*[Nn]otice.*[Cc]reated.*', 'Warning Notice Created'),
+    
+    # Invoice and payment patterns
+    (r'.*[Ii]nvoice.*[Cc]reated.*', 'Invoice created'),
+    (r'.*[Ii]nvoice.*[Ss]tatus.*[Cc]hanged.*', 'Invoice status changed'),
+    (r'.*[Pp]ayment.*[Cc]reated.*', 'Payment record created'),
+    
+    # Report patterns
+    (r'.*[Aa]ssociated report.*with.*case.*', 'Associated report with the case'),
+    (r'.*[Rr]eport.*[Uu]pdated.*', 'Report Updated'),
+    (r'.*[Dd]isposition.*[Cc]hanged.*', 'Report disposition changed'),
+    (r'.*[Rr]eason changed.*', 'Report reason changed'),
+    
+    # Communication patterns
+    (r'.*[Cc]all.*[Cc]ompliance.*', 'Call compliance'),
+    (r'.*[Cc]hat.*[Cc]ompliance.*', 'Chat compliance'),
+    (r'.*[Vv]oicemail.*[Cc]ompliance.*', 'Voicemail compliance'),
+    
+    # Citation and violation patterns
+    (r'.*[Cc]itation [Rr]evision.*', 'Citation revision'),
+    (r'.*[Cc]ombined [Cc]itation.*', 'Combined citation'),
+    (r'.*[Dd]isciplinary.*[Cc]omplaint.*', 'Disciplinary complaint'),
+    (r'.*[Gg]eneral.*[Cc]itation.*', 'General Citation'),
+    (r'.*[Gg]eneral.*[Ii]nquiry.*', 'General Inquiry'),
+    (r'.*[Gg]eneral.*[Ww]arning.*', 'General Warning'),
+    
+    # Listing modification patterns
+    (r'.*[Ll]isting.*[Mm]odification.*', 'Listing modification'),
+    
+    # System/test entries
+    (r'^[Aa][Nn]$', 'testing'),
+    (r'^\\n$', 'testing'),
+    (r'^[Cc]1 check$', 'C1 check'),
+    (r'.*[Tt]est.*', 'testing'),
+    (r'.*[Zz]he.*test.*', 'testing'),
+    
+    # Other patterns
+    (r'.*[Nn]ot.*[Aa]pplicable.*', 'Not applicable'),
+]
+
+# Remove ALL IDs, UUIDs, case numbers, and specific identifiers
+DETAIL_ID_CLEANUP_PATTERNS = [
+    # Remove UUIDs (8-4-4-4-12 format) and partial UUIDs
+    (r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}', ''),
+    (r'[a-f0-9]{6,}-[a-f0-9-]{10,}', ''),
+    (r'\([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\)', ''),
+    # Remove case numbers in various formats
+    (r'case: \d+', ''),
+    (r'Case \d+', ''),
+    (r'from \d+', 'from case'),
+    (r'Report \d+', 'Report'),
+    # Remove login IDs and member IDs
+    (r'Login: [A-Za-z0-9]*', 'Login:'),
+    (r'License: [A-Za-z0-9]*', 'License:'),
+    # Remove listing IDs and numbers
+    (r'for \d{6,}', 'for listing'),
+    (r'listing \d{6,}', 'listing'),
+    # Remove dollar amounts
+    (r'\$\d+(?:\.\d{2})?', '$[Amount]'),
+    # Remove standalone numbers (3+ digits)
+    (r'\b\d{3,}\b', ''),
+    # Remove bracketed content and extra punctuation
+    (r'\[ID\]', ''),
+    (r'\(\s*\)', ''),
+    (r'\(\s*-+\s*\)', ''),
+    (r'\([^)]*\)', ''),  # Remove all parenthetical content with IDs
+    # Clean up multiple spaces and dashes
+    (r'-+', '-'),
+    (r'\s+', ' '),
+]
+
+# Handle truncated and incomplete patterns first (catch "..." endings)
+DETAIL_TRUNCATION_PATTERNS = [
+    # Truncated Investigation patterns
+    (r'7\.8 Failure to Disclose Known Additional Property Owner.*', 'Failure to disclose additional property owner information'),
+    (r'Investigation of 11\.5\(e\) Branding in Media.*', 'Case investigation status changed'),
+    (r'Investigation of 12\.12 Unauthorized Distribution of MLS.*', 'Case investigation status changed'),
+    (r'Investigation of 4\.5 Failure of Participant to Notify.*', 'Case investigation status changed'),
+    (r'Investigation of 5\.1\.6 Failure to Comply with.*', 'Case investigation status changed'),
+    (r'Investigation of 7\.12 Withdrawal of Listing Prior to.*', 'Case investigation status changed'),
+    (r'Investigation of 7\.8 Failure to Disclose Known Additional.*', 'Case investigation status changed'),
+    
+    # Any other truncated investigation patterns
+    (r'Investigation of.*\.\.\.$', 'Case investigation status changed'),
+    (r'Investigation of.*: Marked as.*', 'Case investigation status changed'),
+    
+    # Case member change patterns with truncation
+    (r'Case Member changed from Name:.*Login:.*License:.*Name:.*', 'Case Member changed'),
+    (r'Case Member changed from Name:.*Login:.*Li\.\.\.', 'Case Member changed'),
+    (r'Case Member changed from Name:.*Login:.*Lic\.\.\.', 'Case Member changed'),
+    (r'Case Member changed from Name:.*Login:.*Lice\.\.\.', 'Case Member changed'),
+]
+
+# Assignment and member change patterns (ultra-consolidated)
+DETAIL_ASSIGNMENT_PATTERNS = [
+    # All From/To patterns become generic assignment change
+    (r'From:.*,To:.*', 'Assignment changed from one agent to another'),
+    (r'From:,To:.*', 'Assignment changed from one agent to another'),
+    
+    # All Case Member changed patterns
+    (r'Case Member changed from.*to.*', 'Case Member changed'),
+    (r'Case Member changed.*', 'Case Member changed'),
+    
+    # ListingId changes
+    (r'ListingId changed from.*to.*', 'ListingId changed'),
+    (r'ListingId changed.*', 'ListingId changed'),
+]
+
+# Rule-based violations (ultra-consolidated by rule number)
+DETAIL_RULE_VIOLATION_PATTERNS = [
+    # Admin fees
+    (r'.*Admin.*Fee.*Charged.*', 'Admin Fee Charged'),
+    
+    # Citation patterns
+    (r'.*Citation.*Corrective Action Required.*', 'Citation Corrective Action Required'),
+    (r'.*Citation.*NO Corrective Action Required.*', 'Citation NO Corrective Action Required'),
+    
+    # Rule 10.x patterns
+    (r'.*10\.1.*', 'Failure to Follow  Requirements for Coming Soon '),
+    (r'.*10\.2.*', 'Failure to Timely Report'),
+    
+    # Rule 11.x patterns
+    (r'.*11\.5\.1.*', 'Mandatory Submission of Photograph'),
+    (r'.*11\.5a.*', 'Improper Media Content'),
+    (r'.*11\.5b.*', 'Third-Party Photo'),
+    (r'.*11\.5c.*', 'Misrepresentation in Media'),
+    (r'.*11\.5d.*[Ww]atermark.*', 'Inadvertent Double Watermarks'),
+    (r'.*11\.5d.*[Aa]uthorization.*', 'Use of Media without Prior Authorization'),
+    (r'.*11\.5e.*', 'Branding in Media'),
+    (r'.*11\.5\(e\).*', 'Branding in Media'),  # Handle parenthetical version
+    
+    # Rule 12.x patterns
+    (r'.*12\.10.*', 'Misleading Advertising and Representations'),
+    (r'.*12\.11.*', 'Unauthorized Use of MLS Information'),
+    (r'.*12\.12.*', 'Unauthorized Use of MLS Information'),  # Consolidate with 12.11
+    (r'.*12\.15.*', 'Unauthorized Reproduction of Confidential Fields'),
+    (r'.*12\.22.*', 'Email Address Required'),
+    (r'.*12\.5.*', 'Misuse of Remarks'),
+    (r'.*12\.7.*', 'Unauthorized Use of Term'),
+    (r'.*12\.8.*[Aa]dvertisement.*', 'Unauthorized Advertisement'),
+    (r'.*12\.8.*[Cc]ontent.*', 'Unauthorized Listing Content'),
+    (r'.*12\.9.*', 'Inadequate Informational Notice'),
+    
+    # Rule 13.x patterns
+    (r'.*13\.2.*', 'Unauthorized Sharing of Lockbox Key'),
+    (r'.*13\.7.*', 'Unauthorized Entrance into property'),
+    (r'.*13\.9.*', 'Failure to Timely Remove Lockbox'),
+    
+    # Rule 14.x patterns
+    (r'.*14\.4.*[Aa]uto [Ss]old.*', 'Failure to Correct Auto Sold'),
+    (r'.*14\.4.*[Vv]iolation.*', 'Failure to Correct violation'),
+    (r'.*14\.5.*', 'Modification of Information'),
+    
+    # Rule 4.x patterns
+    (r'.*4\.3.*', 'Failure to notify of termination'),
+    (r'.*4\.5.*', 'Failure to notify of termination'),  # Consolidate with 4.3
+    
+    # Rule 5.x patterns
+    (r'.*5\.1\.6.*', 'Citation Corrective Action Required'),  # Consolidate with citation
+    
+    # Rule 7.x patterns
+    (r'.*7\.11.*[Aa]uthorization.*', 'Failure to obtain authorization for changes to listing'),
+    (r'.*7\.11.*[Cc]hange.*', 'Failure to change listing information'),
+    (r'.*7\.12.*', 'Failure to change listing information'),  # Consolidate withdrawal
+    (r'.*7\.15.*', 'No offers of compensation'),
+    (r'.*7\.16.*', 'Disclosure of compensation'),
+    (r'.*7\.18.*', 'Failure to Comply with Auction Listing Requirements'),
+    (r'.*7\.2.*', 'Duplicate Listing Entry'),
+    (r'.*7\.20.*', 'Failure to disclose interest in the subject listing'),
+    (r'.*7\.3.*', 'Prohibited co-listing'),
+    (r'.*7\.6.*', 'Improper Classification of Property Type'),
+    (r'.*7\.8.*[Aa]uthorization.*', 'Failure to disclose additional property owner information'),
+    (r'.*7\.8.*[Rr]egister.*', 'Failure to register property in MLS'),
+    (r'.*7\.8.*[Dd]isclose.*', 'Failure to disclose additional property owner information'),
+    (r'.*7\.9.*[Oo]ne.*', 'Citation - One property'),
+    (r'.*7\.9.*[Oo]NE.*', 'Citation - One property'),
+    (r'.*7\.9.*[Mm]ultiple.*', 'Citation - Multiple properties'),
+    (r'.*7\.9.*RLA.*', 'Requesting RLA'),
+    
+    # Rule 8.x patterns
+    (r'.*8\.1.*', 'Failure to obtain seller authorization'),
+    (r'.*8\.2.*[Ll]isting.*', 'Failure to provide listing agreement'),
+    (r'.*8\.2.*[Dd]ocumentation.*', 'Failure to provide written documentation'),
+    (r'.*8\.3.*[Aa]uto [Ss]old.*', 'Auto sold'),
+    (r'.*8\.3.*[Ll]isting [Ss]tatus.*', 'Display of inaccurate listing status'),
+    (r'.*8\.3.*[Aa]ccurate [Ii]nformation.*', 'Failure to input accurate information'),
+    
+    # Rule 9.x patterns
+    (r'.*9\.1.*', 'Failure to follow showing instructions'),
+    (r'.*9\.3.*', 'Misrepresenting availability to show'),
+]
+
+def _compile_first_match(pattern_pairs, flags=re.IGNORECASE):
+    """
+    Compile (pattern, replacement) pairs into one alternation with a named group per pattern
+    At the start of the text the alternatives are tried in order, so the first pattern
+    that matches wins - the same result as calling re.match pattern by pattern
+    """
+    combined = re.compile('|'.join(f'(?P<p{i}>{pattern})' for i, (pattern, _) in enumerate(pattern_pairs)), flags)
+    return combined, [replacement for _, replacement in pattern_pairs]
+
+def _first_match_replacement(compiled_patterns, text):
+    """Replacement of the first pattern matching text, or None"""
+    combined, replacements = compiled_patterns
+    match = combined.match(text)
+    return replacements[int(match.lastgroup[1:])] if match else None
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_EDGE_PUNCTUATION_RE = re.compile(r'^[-\s,:.]+|[-\s,:.]+$')
+_DOUBLE_DASH_RE = re.compile(r'\s*-\s*-\s*')
+_LINK_ENTITY_RE = re.compile(r'&[a-zA-Z0-9]+;')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_DETAIL_HTML_TAG_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in DETAIL_HTML_TAG_PATTERNS), re.IGNORECASE | re.DOTALL)
+_DETAIL_HYPERLINK_RES = [re.compile(pattern, re.IGNORECASE | re.DOTALL) for pattern in DETAIL_HYPERLINK_PATTERNS]
+_DETAIL_CASE_STATUS_RE = _compile_first_match(DETAIL_CASE_STATUS_PATTERNS)
+_DETAIL_ID_CLEANUP_RES = [(re.compile(pattern, re.IGNORECASE), replacement) for pattern, replacement in DETAIL_ID_CLEANUP_PATTERNS]
+_DETAIL_TRUNCATION_RE = _compile_first_match(DETAIL_TRUNCATION_PATTERNS)
+_DETAIL_ASSIGNMENT_RE = _compile_first_match(DETAIL_ASSIGNMENT_PATTERNS)
+_DETAIL_RULE_VIOLATION_RE = _compile_first_match(DETAIL_RULE_VIOLATION_PATTERNS)
+
+HTML_ENTITIES = {
+    '&amp;': '&',
+    '&nbsp;': ' ',
+    '&lt;': '<',
+    '&gt;': '>',
+    '&quot;': '"',
+    '&apos;': "'",
+    '&#39;': "'",
+    '&ndash;': '–',
+    '&mdash;': '—',
+    '&hellip;': '…',
+    '&copy;': '©',
+    '&reg;': '®',
+    '&trade;': '™'
+}
+
+# prepare_html_content substitutions, applied in order
+_HTML_CONTENT_RES = [(re.compile(pattern, flags), replacement) for pattern, replacement, flags in [
+    # Handle span tags - preserve content but remove the tags
+    # This handles both <span> and <span class="something" style="..."> variants
+    (r'<span[^>]*>(.*?)</span>', r'\1', re.IGNORECASE | re.DOTALL),
+    
+    # Line breaks and paragraphs
+    (r'<br\s*/?>', '\n', re.IGNORECASE),
+    (r'<p\s*/?>', '\n', re.IGNORECASE),
+    (r'</p>', '\n', re.IGNORECASE),
+    
+    # Bold formatting - handle both <strong> and <b> tags with any attributes
+    (r'<strong[^>]*>(.*?)</strong>', r'**\1**', re.IGNORECASE | re.DOTALL),
+    (r'<b[^>]*>(.*?)</b>', r'**\1**', re.IGNORECASE | re.DOTALL),
+    
+    # Italic formatting - handle both <em> and <i> tags with any attributes
+    (r'<em[^>]*>(.*?)</em>', r'*\1*', re.IGNORECASE | re.DOTALL),
+    (r'<i[^>]*>(.*?)</i>', r'*\1*', re.IGNORECASE | re.DOTALL),
+    
+    # Handle div tags - preserve content but remove the tags (convert to line breaks)
+    (r'<div[^>]*>', '\n', re.IGNORECASE),
+    (r'</div>', '\n', re.IGNORECASE),
+    
+    # Handle other common tags
+    (r'<u[^>]*>(.*?)</u>', r'\1', re.IGNORECASE | re.DOTALL),  # Underline (remove formatting)
+    (r'<strike[^>]*>(.*?)</strike>', r'~~\1~~', re.IGNORECASE | re.DOTALL),  # Strikethrough
+    (r'<del[^>]*>(.*?)</del>', r'~~\1~~', re.IGNORECASE | re.DOTALL),  # Delete
+    
+    # Handle list items
+    (r'<li[^>]*>', '• ', re.IGNORECASE),
+    (r'</li>', '\n', re.IGNORECASE),
+    (r'<ul[^>]*>|</ul>', '', re.IGNORECASE),
+    (r'<ol[^>]*>|</ol>', '', re.IGNORECASE),
+    
+    # Handle headings - convert to markdown
+    *[(rf'<h{i}[^>]*>(.*?)</h{i}>', rf'{"#" * i} \1\n', re.IGNORECASE | re.DOTALL) for i in range(1, 7)],
+    
+    # Handle links - preserve text but remove link formatting
+    (r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>(.*?)</a>', r'\2 (\1)', re.IGNORECASE | re.DOTALL),
+    (r'<a[^>]*>(.*?)</a>', r'\1', re.IGNORECASE | re.DOTALL),
+    
+    # Remove any remaining HTML tags (catch-all for unknown tags)
+    (r'<[^>]+>', '', 0),
+    
+    # Clean up excessive whitespace and newlines
+    (r'\n\s*\n+', '\n\n', 0),  # Replace multiple newlines with double newline
+    (r'^\s+|\s+$', '', 0),  # Strip leading/trailing whitespace
+    (r' +', ' ', 0),  # Replace multiple spaces with single space
+]]
 
 def create_normalized_detail_text(detail):
     """
     Normalize and consolidate event detail text for analysis - EXACT COPY from notebook
+    (patterns are precompiled at module level; each first-match pattern list is one alternation)
     """
     
     # Remove extra whitespace and normalize
@@ -602,312 +936,42 @@ def create_normalized_detail_text(detail):
     detail = detail.replace('\\/', '/')  # Unescape forward slashes
     
     # Remove extra whitespace and normalize
-    normalized = re.sub(r'\s+', ' ', detail.strip())
-    
-    # SECOND: Handle HTML tag scenarios - Use SIMPLE patterns since text is now unescaped
-    html_tag_patterns = [
-        r'<p[^>]*>.*?</p>',         # <p>content</p>
-        r'<div[^>]*>.*?</div>',     # <div>content</div>
-        r'<h[1-6][^>]*>.*?</h[1-6]>',  # Any header level: <h1>content</h1>, <h2>content</h2>, etc.
-        r'<span[^>]*>.*?</span>',   # <span>content</span>
-        r'<strong[^>]*>.*?</strong>', # <strong>content</strong>
-        r'<em[^>]*>.*?</em>',       # <em>content</em>
-        r'<ul[^>]*>.*?</ul>',       # <ul>content</ul>
-        r'<li[^>]*>.*?</li>',       # <li>content</li>
-        r'<br\s*/?>',               # <br> or <br/>
-        r'</p>',                    # </p> standalone
-        r'<p[^>]*>',               # <p> standalone with attributes
-        r'<p>',                     # <p> standalone
-        r'</div>',                  # </div> standalone
-        r'<div[^>]*>',             # <div> standalone with attributes
-        r'</h[1-6]>',              # Any closing header tag: </h1>, </h2>, etc.
-        r'<h[1-6][^>]*>',          # Any opening header tag with attributes
-        r'<h[1-6]>',               # Any simple opening header tag
-        r'&[a-zA-Z0-9#]+;',        # HTML entities like &nbsp;, &rsquo;
-    ]
+    normalized = _WHITESPACE_RE.sub(' ', detail.strip())
     
     # If any HTML tags are present, it's a case note update
-    for pattern in html_tag_patterns:
-        if re.search(pattern, normalized, re.IGNORECASE | re.DOTALL):
-            return 'Case Note updated'
-    
-    # Handle single hyperlink scenario
-    hyperlink_patterns = [
-        # Pattern for escaped hyperlinks like: <a href=\"https://...">text</a>
-        r'^\s*<a\s+href=\\?"[^"]*\\?"[^>]*>(.*?)<\\?/?a>\s*$',
-        # Pattern for normal hyperlinks like: <a href="https://...">text</a>
-        r'^\s*<a\s+href="[^"]*"[^>]*>(.*?)</a>\s*$',
-        # Pattern for hyperlinks without quotes: <a href=...>text</a>
-        r'^\s*<a\s+href=[^>]*>(.*?)</?a>\s*$',
-    ]
+    if _DETAIL_HTML_TAG_RE.search(normalized):
+        return 'Case Note updated'
     
     # Check if the entire detail is just a hyperlink
-    for pattern in hyperlink_patterns:
-        hyperlink_match = re.match(pattern, normalized, re.IGNORECASE | re.DOTALL)
+    for pattern in _DETAIL_HYPERLINK_RES:
+        hyperlink_match = pattern.match(normalized)
         if hyperlink_match:
             link_text = hyperlink_match.group(1).strip()
             # Clean up any remaining HTML entities or tags in the link text
-            link_text = re.sub(r'&[a-zA-Z0-9]+;', '', link_text)  # Remove HTML entities
-            link_text = re.sub(r'<[^>]+>', '', link_text)  # Remove any remaining tags
+            link_text = _LINK_ENTITY_RE.sub('', link_text)  # Remove HTML entities
+            link_text = _HTML_TAG_RE.sub('', link_text)  # Remove any remaining tags
             return link_text if link_text else 'Link'
         
-    # Case and investigation status changes
-    case_status_patterns = [
-        # Case actions
-        (r'.*[Cc]ase [Cc]losed.*', 'Case Closed'),
-        (r'.*[Cc]ase [Cc]reated.*', 'Case Created'),
-        (r'.*[Cc]ase [Uu]pdated.*', 'Case Updated'),
-        (r'.*[Cc]ase [Rr]eopened.*', 'Case Reopened'),
-        (r'.*[Cc]ase.*unlinked.*', 'Case unlinked'),
-        (r'.*[Cc]ase.*linked.*', 'Case linked'),
-        
-        # Case Review Status - all variations
-        (r'.*[Cc]ase [Rr]eview [Ss]tatus changed.*', 'Case review status changed'),
-        (r'.*[Cc]ase [Rr]eview [Uu]pdated.*', 'Case review updated'),
-        
-        # Investigation patterns - ultra consolidated
-        (r'.*[Ii]nvestigation.*relocat.*', 'Investigation relocation to/from another case'),
-        (r'.*[Ii]nvestigatio.*[Mm]arked.*', 'Marked for investigation'),
-        (r'.*[Ii]nvestigation.*status.*change*', 'Investigation status changed'),
-        (r'.*[Ii]nvestigation [Uu]pdated.*', 'Investigation status changed'),
-        
-        # Notice patterns - consolidate variations
-        (r'.*[Nn]otice.*[Dd]efinition.*[Uu]pdated.*', 'NoticeDefinition Updated'),
-        (r'.*[Cc]itation.*[Nn]otice.*[Cc]reated.*', 'Citation notice created'),
-        (r'.*[Ee]mail.*[Nn]otice.*[Cc]reated.*', 'Email Notice Created'),
-        (r'.*[Ii]nquiry.*[Nn]otice.*[Cc]reated.*', 'Inquiry Notice Created'),
-        (r'.*[Ii]ncoming.*[Ee]mail.*[Nn]otice.*[Cc]reated.*', 'Incoming Email notice created'),
-        (r'.*NoticeType.*Incoming Email.*[Cc]reated.*', 'Incoming Email notice created'),
-        (r'.*NoticeType\.Incoming Email.*[Cc]reated.*', 'Incoming Email notice created'),
-        (r'.*[Oo]ther.*[Nn]otice.*[Cc]reated.*', 'Other notice created'),
-        (r'.*NoticeType.*Other.*[Cc]reated.*', 'Other notice created'),
-        (r'.*NoticeType\.Other.*[Cc]reated.*', 'Other notice created'),
-        (r'.*[Nn]otice.*[Tt]ranscript.*[Cc]reated.*', 'Notice Transcript created'),
-        (r'.*[Oo]ff.*[Ss]ystem.*[Ee]mail.*[Nn]otice.*[Cc]reated.*', 'Off System Email Notice Created'),
-        (r'.*[Rr]evised.*[Cc]itation.*[Nn]otice.*[Cc]reated.*', 'Revised Citation Notice Created'),
-        (r'.*[Rr]evised.*[Ii]nquiry.*[Nn]otice.*[Cc]reated.*', 'Revised Inquiry Notice Created'),
-        (r'.*[Rr]evised.*[Ww]arning.*[Nn]otice.*[Cc]reated.*', 'Revised Warning Notice Created'),
-        (r'.*[Ww]arning.*[Nn]otice.*[Cc]reated.*', 'Warning Notice Created'),
-        
-        # Invoice and payment patterns
-        (r'.*[Ii]nvoice.*[Cc]reated.*', 'Invoice created'),
-        (r'.*[Ii]nvoice.*[Ss]tatus.*[Cc]hanged.*', 'Invoice status changed'),
-        (r'.*[Pp]ayment.*[Cc]reated.*', 'Payment record created'),
-        
-        # Report patterns
-        (r'.*[Aa]ssociated report.*with.*case.*', 'Associated report with the case'),
-        (r'.*[Rr]eport.*[Uu]pdated.*', 'Report Updated'),
-        (r'.*[Dd]isposition.*[Cc]hanged.*', 'Report disposition changed'),
-        (r'.*[Rr]eason changed.*', 'Report reason changed'),
-        
-        # Communication patterns
-        (r'.*[Cc]all.*[Cc]ompliance.*', 'Call compliance'),
-        (r'.*[Cc]hat.*[Cc]ompliance.*', 'Chat compliance'),
-        (r'.*[Vv]oicemail.*[Cc]ompliance.*', 'Voicemail compliance'),
-        
-        # Citation and violation patterns
-        (r'.*[Cc]itation [Rr]evision.*', 'Citation revision'),
-        (r'.*[Cc]ombined [Cc]itation.*', 'Combined citation'),
-        (r'.*[Dd]isciplinary.*[Cc]omplaint.*', 'Disciplinary complaint'),
-        (r'.*[Gg]eneral.*[Cc]itation.*', 'General Citation'),
-        (r'.*[Gg]eneral.*[Ii]nquiry.*', 'General Inquiry'),
-        (r'.*[Gg]eneral.*[Ww]arning.*', 'General Warning'),
-        
-        # Listing modification patterns
-        (r'.*[Ll]isting.*[Mm]odification.*', 'Listing modification'),
-        
-        # System/test entries
-        (r'^[Aa][Nn]$', 'testing'),
-        (r'^\\n$', 'testing'),
-        (r'^[Cc]1 check$', 'C1 check'),
-        (r'.*[Tt]est.*', 'testing'),
-        (r'.*[Zz]he.*test.*', 'testing'),
-        
-        # Other patterns
-        (r'.*[Nn]ot.*[Aa]pplicable.*', 'Not applicable'),
-    ]
-    
     # Apply case status patterns
-    for pattern, replacement in case_status_patterns:
-        if re.match(pattern, normalized, re.IGNORECASE):
-            return replacement
+    replacement = _first_match_replacement(_DETAIL_CASE_STATUS_RE, normalized)
+    if replacement is not None:
+        return replacement
                 
-    # Remove ALL IDs, UUIDs, case numbers, and specific identifiers
-    id_cleanup_patterns = [
-        # Remove UUIDs (8-4-4-4-12 format) and partial UUIDs
-        (r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}', ''),
-        (r'[a-f0-9]{6,}-[a-f0-9-]{10,}', ''),
-        (r'\([a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}\)', ''),
-        # Remove case numbers in various formats
-        (r'case: \d+', ''),
-        (r'Case \d+', ''),
-        (r'from \d+', 'from case'),
-        (r'Report \d+', 'Report'),
-        # Remove login IDs and member IDs
-        (r'Login: [A-Za-z0-9]*', 'Login:'),
-        (r'License: [A-Za-z0-9]*', 'License:'),
-        # Remove listing IDs and numbers
-        (r'for \d{6,}', 'for listing'),
-        (r'listing \d{6,}', 'listing'),
-        # Remove dollar amounts
-        (r'\$\d+(?:\.\d{2})?', '$[Amount]'),
-        # Remove standalone numbers (3+ digits)
-        (r'\b\d{3,}\b', ''),
-        # Remove bracketed content and extra punctuation
-        (r'\[ID\]', ''),
-        (r'\(\s*\)', ''),
-        (r'\(\s*-+\s*\)', ''),
-        (r'\([^)]*\)', ''),  # Remove all parenthetical content with IDs
-        # Clean up multiple spaces and dashes
-        (r'-+', '-'),
-        (r'\s+', ' '),
-    ]
-    
     # Apply ID cleanup
-    for pattern, replacement in id_cleanup_patterns:
-        normalized = re.sub(pattern, replacement, normalized, flags=re.IGNORECASE)
-    
-    # Handle truncated and incomplete patterns first (catch "..." endings)
-    truncation_patterns = [
-        # Truncated Investigation patterns
-        (r'7\.8 Failure to Disclose Known Additional Property Owner.*', 'Failure to disclose additional property owner information'),
-        (r'Investigation of 11\.5\(e\) Branding in Media.*', 'Case investigation status changed'),
-        (r'Investigation of 12\.12 Unauthorized Distribution of MLS.*', 'Case investigation status changed'),
-        (r'Investigation of 4\.5 Failure of Participant to Notify.*', 'Case investigation status changed'),
-        (r'Investigation of 5\.1\.6 Failure to Comply with.*', 'Case investigation status changed'),
-        (r'Investigation of 7\.12 Withdrawal of Listing Prior to.*', 'Case investigation status changed'),
-        (r'Investigation of 7\.8 Failure to Disclose Known Additional.*', 'Case investigation status changed'),
-        
-        # Any other truncated investigation patterns
-        (r'Investigation of.*\.\.\.$', 'Case investigation status changed'),
-        (r'Investigation of.*: Marked as.*', 'Case investigation status changed'),
-        
-        # Case member change patterns with truncation
-        (r'Case Member changed from Name:.*Login:.*License:.*Name:.*', 'Case Member changed'),
-        (r'Case Member changed from Name:.*Login:.*Li\.\.\.', 'Case Member changed'),
-        (r'Case Member changed from Name:.*Login:.*Lic\.\.\.', 'Case Member changed'),
-        (r'Case Member changed from Name:.*Login:.*Lice\.\.\.', 'Case Member changed'),
-    ]
-    
-    # Apply truncation patterns first
-    for pattern, replacement in truncation_patterns:
-        if re.match(pattern, normalized, re.IGNORECASE):
-            return replacement
-    
-    # Assignment and member change patterns (ultra-consolidated)
-    assignment_patterns = [
-        # All From/To patterns become generic assignment change
-        (r'From:.*,To:.*', 'Assignment changed from one agent to another'),
-        (r'From:,To:.*', 'Assignment changed from one agent to another'),
-        
-        # All Case Member changed patterns
-        (r'Case Member changed from.*to.*', 'Case Member changed'),
-        (r'Case Member changed.*', 'Case Member changed'),
-        
-        # ListingId changes
-        (r'ListingId changed from.*to.*', 'ListingId changed'),
-        (r'ListingId changed.*', 'ListingId changed'),
-    ]
-    
-    # Apply assignment patterns
-    for pattern, replacement in assignment_patterns:
-        if re.match(pattern, normalized, re.IGNORECASE):
-            return replacement
+    for pattern, replacement in _DETAIL_ID_CLEANUP_RES:
+        normalized = pattern.sub(replacement, normalized)
     
-    # Rule-based violations (ultra-consolidated by rule number)
-    rule_violation_patterns = [
-        # Admin fees
-        (r'.*Admin.*Fee.*Charged.*', 'Admin Fee Charged'),
-        
-        # Citation patterns
-        (r'.*Citation.*Corrective Action Required.*', 'Citation Corrective Action Required'),
-        (r'.*Citation.*NO Corrective Action Required.*', 'Citation NO Corrective Action Required'),
-        
-        # Rule 10.x patterns
-        (r'.*10\.1.*', 'Failure to Follow  Requirements for Coming Soon '),
-        (r'.*10\.2.*', 'Failure to Timely Report'),
-        
-        # Rule 11.x patterns
-        (r'.*11\.5\.1.*', 'Mandatory Submission of Photograph'),
-        (r'.*11\.5a.*', 'Improper Media Content'),
-        (r'.*11\.5b.*', 'Third-Party Photo'),
-        (r'.*11\.5c.*', 'Misrepresentation in Media'),
-        (r'.*11\.5d.*[Ww]atermark.*', 'Inadvertent Double Watermarks'),
-        (r'.*11\.5d.*[Aa]uthorization.*', 'Use of Media without Prior Authorization'),
-        (r'.*11\.5e.*', 'Branding in Media'),
-        (r'.*11\.5\(e\).*', 'Branding in Media'),  # Handle parenthetical version
-        
-        # Rule 12.x patterns
-        (r'.*12\.10.*', 'Misleading Advertising and Representations'),
-        (r'.*12\.11.*', 'Unauthorized Use of MLS Information'),
-        (r'.*12\.12.*', 'Unauthorized Use of MLS Information'),  # Consolidate with 12.11
-        (r'.*12\.15.*', 'Unauthorized Reproduction of Confidential Fields'),
-        (r'.*12\.22.*', 'Email Address Required'),
-        (r'.*12\.5.*', 'Misuse of Remarks'),
-        (r'.*12\.7.*', 'Unauthorized Use of Term'),
-        (r'.*12\.8.*[Aa]dvertisement.*', 'Unauthorized Advertisement'),
-        (r'.*12\.8.*[Cc]ontent.*', 'Unauthorized Listing Content'),
-        (r'.*12\.9.*', 'Inadequate Informational Notice'),
-        
-        # Rule 13.x patterns
-        (r'.*13\.2.*', 'Unauthorized Sharing of Lockbox Key'),
-        (r'.*13\.7.*', 'Unauthorized Entrance into property'),
-        (r'.*13\.9.*', 'Failure to Timely Remove Lockbox'),
-        
-        # Rule 14.x patterns
-        (r'.*14\.4.*[Aa]uto [Ss]old.*', 'Failure to Correct Auto Sold'),
-        (r'.*14\.4.*[Vv]iolation.*', 'Failure to Correct violation'),
-        (r'.*14\.5.*', 'Modification of Information'),
-        
-        # Rule 4.x patterns
-        (r'.*4\.3.*', 'Failure to notify of termination'),
-        (r'.*4\.5.*', 'Failure to notify of termination'),  # Consolidate with 4.3
-        
-        # Rule 5.x patterns
-        (r'.*5\.1\.6.*', 'Citation Corrective Action Required'),  # Consolidate with citation
-        
-        # Rule 7.x patterns
-        (r'.*7\.11.*[Aa]uthorization.*', 'Failure to obtain authorization for changes to listing'),
-        (r'.*7\.11.*[Cc]hange.*', 'Failure to change listing information'),
-        (r'.*7\.12.*', 'Failure to change listing information'),  # Consolidate withdrawal
-        (r'.*7\.15.*', 'No offers of compensation'),
-        (r'.*7\.16.*', 'Disclosure of compensation'),
-        (r'.*7\.18.*', 'Failure to Comply with Auction Listing Requirements'),
-        (r'.*7\.2.*', 'Duplicate Listing Entry'),
-        (r'.*7\.20.*', 'Failure to disclose interest in the subject listing'),
-        (r'.*7\.3.*', 'Prohibited co-listing'),
-        (r'.*7\.6.*', 'Improper Classification of Property Type'),
-        (r'.*7\.8.*[Aa]uthorization.*', 'Failure to disclose additional property owner information'),
-        (r'.*7\.8.*[Rr]egister.*', 'Failure to register property in MLS'),
-        (r'.*7\.8.*[Dd]isclose.*', 'Failure to disclose additional property owner information'),
-        (r'.*7\.9.*[Oo]ne.*', 'Citation - One property'),
-        (r'.*7\.9.*[Oo]NE.*', 'Citation - One property'),
-        (r'.*7\.9.*[Mm]ultiple.*', 'Citation - Multiple properties'),
-        (r'.*7\.9.*RLA.*', 'Requesting RLA'),
-        
-        # Rule 8.x patterns
-        (r'.*8\.1.*', 'Failure to obtain seller authorization'),
-        (r'.*8\.2.*[Ll]isting.*', 'Failure to provide listing agreement'),
-        (r'.*8\.2.*[Dd]ocumentation.*', 'Failure to provide written documentation'),
-        (r'.*8\.3.*[Aa]uto [Ss]old.*', 'Auto sold'),
-        (r'.*8\.3.*[Ll]isting [Ss]tatus.*', 'Display of inaccurate listing status'),
-        (r'.*8\.3.*[Aa]ccurate [Ii]nformation.*', 'Failure to input accurate information'),
-        
-        # Rule 9.x patterns
-        (r'.*9\.1.*', 'Failure to follow showing instructions'),
-        (r'.*9\.3.*', 'Misrepresenting availability to show'),
-    ]
-    
-    # Apply rule violation patterns
-    for pattern, replacement in rule_violation_patterns:
-        if re.match(pattern, normalized, re.IGNORECASE):
+    # Apply truncation patterns first, then assignment and rule violation patterns
+    for compiled_patterns in (_DETAIL_TRUNCATION_RE, _DETAIL_ASSIGNMENT_RE, _DETAIL_RULE_VIOLATION_RE):
+        replacement = _first_match_replacement(compiled_patterns, normalized)
+        if replacement is not None:
             return replacement
     
     # Final cleanup and return
     # Remove extra spaces, clean up punctuation
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
-    normalized = re.sub(r'^[-\s,:.]+|[-\s,:.]+$', '', normalized)  # Remove leading/trailing punctuation
-    normalized = re.sub(r'\s*-\s*-\s*', ' ', normalized)  # Clean up double dashes
+    normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
+    normalized = _EDGE_PUNCTUATION_RE.sub('', normalized)  # Remove leading/trailing punctuation
+    normalized = _DOUBLE_DASH_RE.sub(' ', normalized)  # Clean up double dashes
     
     # Return cleaned result or fallback
     return normalized if normalized and len(normalized) > 1 else 'Unknown'
@@ -921,73 +985,12 @@ def prepare_html_content(content):
     html_content = str(content)
     
     # Decode HTML entities first
-    html_entities = {
-        '&amp;': '&',
-        '&nbsp;': ' ',
-        '&lt;': '<',
-        '&gt;': '>',
-        '&quot;': '"',
-        '&apos;': "'",
-        '&#39;': "'",
-        '&ndash;': '–',
-        '&mdash;': '—',
-        '&hellip;': '…',
-        '&copy;': '©',
-        '&reg;': '®',
-        '&trade;': '™'
-    }
-    
-    for entity, char in html_entities.items():
+    for entity, char in HTML_ENTITIES.items():
         html_content = html_content.replace(entity, char)
     
-    # Handle span tags - preserve content but remove the tags
-    # This handles both <span> and <span class="something" style="..."> variants
-    html_content = re.sub(r'<span[^>]*>(.*?)</span>', r'\1', html_content, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Handle other formatting tags and convert to markdown equivalents
-    # Line breaks and paragraphs
-    html_content = re.sub(r'<br\s*/?>', '\n', html_content, flags=re.IGNORECASE)
-    html_content = re.sub(r'<p\s*/?>', '\n', html_content, flags=re.IGNORECASE)
-    html_content = re.sub(r'</p>', '\n', html_content, flags=re.IGNORECASE)
-    
-    # Bold formatting - handle both <strong> and <b> tags with any attributes
-    html_content = re.sub(r'<strong[^>]*>(.*?)</strong>', r'**\1**', html_content, flags=re.IGNORECASE | re.DOTALL)
-    html_content = re.sub(r'<b[^>]*>(.*?)</b>', r'**\1**', html_content, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Italic formatting - handle both <em> and <i> tags with any attributes
-    html_content = re.sub(r'<em[^>]*>(.*?)</em>', r'*\1*', html_content, flags=re.IGNORECASE | re.DOTALL)
-    html_content = re.sub(r'<i[^>]*>(.*?)</i>', r'*\1*', html_content, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Handle div tags - preserve content but remove the tags (convert to line breaks)
-    html_content = re.sub(r'<div[^>]*>', '\n', html_content, flags=re.IGNORECASE)
-    html_content = re.sub(r'</div>', '\n', html_content, flags=re.IGNORECASE)
-    
-    # Handle other common tags
-    html_content = re.sub(r'<u[^>]*>(.*?)</u>', r'\1', html_content, flags=re.IGNORECASE | re.DOTALL)  # Underline (remove formatting)
-    html_content = re.sub(r'<strike[^>]*>(.*?)</strike>', r'~~\1~~', html_content, flags=re.IGNORECASE | re.DOTALL)  # Strikethrough
-    html_content = re.sub(r'<del[^>]*>(.*?)</del>', r'~~\1~~', html_content, flags=re.IGNORECASE | re.DOTALL)  # Delete
-    
-    # Handle list items
-    html_content = re.sub(r'<li[^>]*>', '• ', html_content, flags=re.IGNORECASE)
-    html_content = re.sub(r'</li>', '\n', html_content, flags=re.IGNORECASE)
-    html_content = re.sub(r'<ul[^>]*>|</ul>', '', html_content, flags=re.IGNORECASE)
-    html_content = re.sub(r'<ol[^>]*>|</ol>', '', html_content, flags=re.IGNORECASE)
-    
-    # Handle headings - convert to markdown
-    for i in range(1, 7):
-        html_content = re.sub(rf'<h{i}[^>]*>(.*?)</h{i}>', rf'{"#" * i} \1\n', html_content, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Handle links - preserve text but remove link formatting
-    html_content = re.sub(r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>(.*?)</a>', r'\2 (\1)', html_content, flags=re.IGNORECASE | re.DOTALL)
-    html_content = re.sub(r'<a[^>]*>(.*?)</a>', r'\1', html_content, flags=re.IGNORECASE | re.DOTALL)
-    
-    # Remove any remaining HTML tags (catch-all for unknown tags)
-    html_content = re.sub(r'<[^>]+>', '', html_content)
-    
-    # Clean up excessive whitespace and newlines
-    html_content = re.sub(r'\n\s*\n+', '\n\n', html_content)  # Replace multiple newlines with double newline
-    html_content = re.sub(r'^\s+|\s+$', '', html_content)  # Strip leading/trailing whitespace
-    html_content = re.sub(r' +', ' ', html_content)  # Replace multiple spaces with single space
+    # Convert tags to markdown equivalents, strip the rest and clean up whitespace
+    for pattern, replacement in _HTML_CONTENT_RES:
+        html_content = pattern.sub(replacement, html_content)
     
     # Limit length for tooltip display
     if len(html_content) > 500:
@@ -995,568 +998,423 @@ def prepare_html_content(content):
     
     return html_content 
  
-@lru_cache(maxsize=1)
+def _normalize_event_detail(detail):
+    """Normalized detail text of an event, or None when the detail cannot be normalized"""
+    try:
+        return create_normalized_detail_text(detail)
+    except Exception:
+        return None
+
+# Normalized summary / display HTML per distinct detail text, kept across data refreshes
+_event_detail_summaries = TextMemo(_normalize_event_detail)
+_event_detail_html = TextMemo(prepare_html_content)
+
+@compliance_data_graph.node('event_history', deps=['base_data', 'case_events'], persist=True, default=pd.DataFrame)
 @monitor_performance("Event History Creation")
 def get_event_history():
     """
     Create event history dataframe from merged case details with normalized event details
     Following the exact notebook approach with caching
     """
-    global _compliance_data_cache, _cache_timestamp
+    # Get merged case details
+    merged_df = get_compliance_base_data()
     
-    try:
-        # Check if we have valid cached event history
-        current_time = datetime.now()
-        if (_cache_timestamp and 
-            'event_history_df' in _compliance_data_cache and 
-            (current_time - _cache_timestamp).seconds < _cache_duration_minutes * 60):
-            return _compliance_data_cache['event_history_df']
-        
-        # Get merged case details
-        merged_df = get_compliance_base_data()
-        
-        if merged_df.empty or 'CaseEvents' not in merged_df.columns:
-            return pd.DataFrame()
-        
-        # print(f"📊 Processing event history from {len(merged_df)} cases...")
-        
-        history_records = []
-        
-        for idx, row in merged_df.iterrows():
-            case_id = row['ID']
-            case_events = row['CaseEvents']
-            
-            # Process each event in the case events list
-            for event in case_events:
-                try:
-                    # Extract event details
-                    action_date = event.get('ActionDate', '')
-                    object_type = event.get('ObjectType', '')
-                    event_name = event.get('EventName', '')
-                    detail_text = event.get('Detail', '')
-                    
-                    # Apply normalization to the detail text 
-                    normalized_detail = create_normalized_detail_text(detail_text)
-                    
-                    # Create EventItem as ObjectType + ' - ' + normalized detail
-                    event_summary = f"{object_type.replace('Entity', '')} - {normalized_detail}"
-                    
-                    # Create history record
-                    history_record = {
-                        'CaseID': case_id,                    
-                        'ActionDate': action_date,
-                        'ObjectType': object_type,
-                        'EventName': event_name,
-                        'Detail': prepare_html_content(detail_text),
-                        'EventSummary': event_summary
-                    }
-                    
-                    history_records.append(history_record)
-                    
-                except Exception as e:
-                    continue
-            
-        # Create the dataframe
-        event_history_df = pd.DataFrame(history_records)
-        
-        # Sort by CaseID and ActionDate for better organization
-        if not event_history_df.empty:
-            event_history_df = event_history_df.sort_values(['CaseID', 'ActionDate']).reset_index(drop=True)
-
-            # Convert ActionDate to datetime if it's not already
-            try:
-                event_history_df['ActionDate'] = pd.to_datetime(event_history_df['ActionDate'])
-            except:
-                print("Warning: Could not convert ActionDate to datetime format")
-        
-        # Cache the result
-        _compliance_data_cache['event_history_df'] = event_history_df
-        
-        # print(f"✅ Event history dataframe created and cached: {len(event_history_df)} records")
-        return event_history_df
-        
-    except Exception as e:
-        print(f"❌ Error creating event history: {e}")
+    case_events = get_case_event_table()
+    
+    if merged_df.empty or case_events.empty:
         return pd.DataFrame()
+    
+    # print(f"📊 Processing event history from {len(merged_df)} cases...")
+    
+    # Select the events of every case in one go (in case order)
+    case_ids, events = case_events.select(merged_df['ID'])
+    
+    def event_column(name):
+        return events[name] if name in events.columns else pd.Series('', index=events.index, dtype=object)
+    
+    object_types = event_column('ObjectType')
+    details = event_column('Detail')
+    
+    # Events without text ObjectType/Detail cannot be summarized and are skipped
+    # Each distinct detail text is normalized once (and only once per process)
+    normalized = pd.Series(_event_detail_summaries.map(details), index=events.index, dtype=object)
+    normalized[~object_types.map(lambda value: isinstance(value, str)).astype(bool)] = None
+    valid = normalized.notna().to_numpy()
+    
+    if valid.any():
+        event_history_df = pd.DataFrame({
+            'CaseID': case_ids[valid],
+            'ActionDate': event_column('ActionDate')[valid].to_numpy(),
+            'ObjectType': object_types[valid].to_numpy(),
+            'EventName': event_column('EventName')[valid].to_numpy(),
+            'Detail': _event_detail_html.map(details[valid]),
+            # EventItem as ObjectType + ' - ' + normalized detail
+            'EventSummary': (object_types[valid].str.replace('Entity', '', regex=False) + ' - ' + normalized[valid]).to_numpy()
+        })
+    else:
+        event_history_df = pd.DataFrame()
+    
+    # Sort by CaseID and ActionDate for better organization
+    if not event_history_df.empty:
+        event_history_df = event_history_df.sort_values(['CaseID', 'ActionDate']).reset_index(drop=True)
+
+        # Convert ActionDate to datetime if it's not already
+        try:
+            event_history_df['ActionDate'] = pd.to_datetime(event_history_df['ActionDate'])
+        except:
+            print("Warning: Could not convert ActionDate to datetime format")
+    
+    # print(f"✅ Event history dataframe created and cached: {len(event_history_df)} records")
+    return event_history_df
 
-@lru_cache(maxsize=1)
+@compliance_data_graph.node('case_flow', deps=['event_history', 'base_data'], default=pd.DataFrame)
 @monitor_performance("Case Flow Analysis")
 def get_case_flow():
     """
     Create case flow dataframe following the exact notebook approach
     Merges event history with case details for complete context
     """
-    global _compliance_data_cache, _cache_timestamp
+    # Get event history and merged case data
+    event_history_df = get_event_history()
+    merged_case_df = get_compliance_base_data()
     
-    try:
-        # Check if we have valid cached case flow
-        current_time = datetime.now()
-        if (_cache_timestamp and 
-            'case_flow_df' in _compliance_data_cache and 
-            (current_time - _cache_timestamp).seconds < _cache_duration_minutes * 60):
-            return _compliance_data_cache['case_flow_df']
-        
-        # Get event history and merged case data
-        event_history_df = get_event_history()
-        merged_case_df = get_compliance_base_data()
-        
-        if event_history_df.empty or merged_case_df.empty:
-            return pd.DataFrame()
-        
-        # Merge event history with case details for complete context
-        case_flow_df = event_history_df.merge(
-            merged_case_df[['ID', 'CaseNumber', 'Description', 'MemberName', 'CreatedOn', 'ClosedOn', 
-                           'Disposition', 'Status', 'ViolationName', 'NumReportIds']],
-            left_on='CaseID', right_on='ID', how='left'
-        )
-        
-        # Convert dates
-        case_flow_df['ActionDate'] = pd.to_datetime(case_flow_df['ActionDate'], errors='coerce')
-        case_flow_df['CreatedOn'] = pd.to_datetime(case_flow_df['CreatedOn'], errors='coerce')
-        case_flow_df['ClosedOn'] = pd.to_datetime(case_flow_df['ClosedOn'], errors='coerce')
-        
-        # Cache the result
-        _compliance_data_cache['case_flow_df'] = case_flow_df
-        
-        # print(f"✅ Case flow dataframe created and cached: {case_flow_df.shape}")
-        return case_flow_df
-        
-    except Exception as e:
-        print(f"❌ Error creating case flow: {e}")
+    if event_history_df.empty or merged_case_df.empty:
         return pd.DataFrame()
+    
+    # Attach case details for complete context - a positional take when every event's
+    # case is found exactly once, otherwise a left merge
+    case_columns = merged_case_df[['ID', 'CaseNumber', 'Description', 'MemberName', 'CreatedOn', 'ClosedOn', 
+                                   'Disposition', 'Status', 'ViolationName', 'NumReportIds']]
+    positions = pd.Index(case_columns['ID']).get_indexer(event_history_df['CaseID']) if case_columns['ID'].is_unique else None
+    if positions is not None and (positions >= 0).all():
+        case_flow_df = pd.concat(
+            [event_history_df.reset_index(drop=True), case_columns.iloc[positions].reset_index(drop=True)], axis=1
+        )
+    else:
+        case_flow_df = event_history_df.merge(case_columns, left_on='CaseID', right_on='ID', how='left')
+    
+    # Convert dates
+    case_flow_df['ActionDate'] = pd.to_datetime(case_flow_df['ActionDate'], errors='coerce')
+    case_flow_df['CreatedOn'] = pd.to_datetime(case_flow_df['CreatedOn'], errors='coerce')
+    case_flow_df['ClosedOn'] = pd.to_datetime(case_flow_df['ClosedOn'], errors='coerce')
+    
+    # print(f"✅ Case flow dataframe created and cached: {case_flow_df.shape}")
+    return case_flow_df
 
-@lru_cache(maxsize=1) 
+@compliance_data_graph.node('case_flow_stages', deps=['case_flow'], default=pd.DataFrame)
 @monitor_performance("Lifecycle Stage Extraction")
 def get_case_flow_with_lifecycle_stages():
     """
     Extract and classify case lifecycle stages from event summaries
     Following EXACT notebook stage patterns
     """
-    global _compliance_data_cache, _cache_timestamp
+    # Get case flow dataframe
+    case_flow_df = get_case_flow()
     
-    try:
-        # Check if we have valid cached lifecycle data
-        current_time = datetime.now()
-        if (_cache_timestamp and 
-            'case_flow_with_stages_df' in _compliance_data_cache and 
-            (current_time - _cache_timestamp).seconds < _cache_duration_minutes * 60):
-            return _compliance_data_cache['case_flow_with_stages_df']
-        
-        # Get case flow dataframe
-        case_flow_df = get_case_flow()
-        
-        if case_flow_df.empty:
-            return pd.DataFrame()
-        
-        # Define stage patterns based on EventSummary - EXACT COPY from notebook
-        stage_patterns = {
-            'Note Update': [
-                'CaseNote - Admin Fee Charged',
-                'CaseNote - Auto sold',
-                'CaseNote - Branding in Media',
-                'CaseNote - C1 check',
-                'CaseNote - Call compliance',
-                'CaseNote - Case Note updated',
-                'CaseNote - Chat compliance',
-                'CaseNote - Citation - Multiple properties',
-                'CaseNote - Citation - One property',
-                'CaseNote - Citation Corrective Action Required',
-                'CaseNote - Citation revision',
-                'CaseNote - Combined citation',
-                'CaseNote - Disciplinary complaint',
-                'CaseNote - Disclosure of compensation',
-                'CaseNote - Display of inaccurate listing status',
-                'CaseNote - Duplicate Listing Entry',
-                'CaseNote - Email Address Required',
-                'CaseNote - Failure to Comply with Auction Listing Requirements',
-                'CaseNote - Failure to Correct Auto Sold',
-                'CaseNote - Failure to Correct violation',
-                'CaseNote - Failure to Follow Requirements for Coming Soon,',
-                'CaseNote - Failure to Timely Remove Lockbox',
-                'CaseNote - Failure to Timely Report',
-                'CaseNote - Failure to change listing information',
-                'CaseNote - Failure to disclose additional property owner information',
-                'CaseNote - Failure to follow showing instructions',
-                'CaseNote - Failure to input accurate information',
-                'CaseNote - Failure to notify of termination',
-                'CaseNote - Failure to obtain authorization for changes to listing',
-                'CaseNote - Failure to obtain seller authorization',
-                'CaseNote - Failure to provide listing agreement',
-                'CaseNote - Failure to provide written documentation',
-                'CaseNote - Failure to register property in MLS',
-                'CaseNote - General Citation',
-                'CaseNote - General Inquiry',
-                'CaseNote - General Warning',
-                'CaseNote - Improper Classification of Property Type',
-                'CaseNote - Improper Media Content',
-                'CaseNote - Inadequate Informational Notice',
-                'CaseNote - Inadvertent Double Watermarks',
-                'CaseNote - Investigation relocation to/from another case',
-                'CaseNote - Listing modification',
-                'CaseNote - Mandatory Submission of Photograph',
-                'CaseNote - Misleading Advertising and Representations',
-                'CaseNote - Misrepresentation in Media',
-                'CaseNote - Misrepresenting availability to show',
-                'CaseNote - Misuse of Remarks',
-                'CaseNote - Modification of Information',
-                'CaseNote - No offers of compensation',
-                'CaseNote - Not applicable',
-                'CaseNote - Prohibited co-listing',
-                'CaseNote - Third-Party Photo',
-                'CaseNote - Unauthorized Advertisement',
-                'CaseNote - Unauthorized Entrance into property',
-                'CaseNote - Unauthorized Listing Content',
-                'CaseNote - Unauthorized Reproduction of Confidential Fields',
-                'CaseNote - Unauthorized Sharing of Lockbox Key',
-                'CaseNote - Unauthorized Use of MLS Information',
-                'CaseNote - Unauthorized Use of Term',
-                'CaseNote - Unknown',
-                'CaseNote - Use of Media without Prior Authorization',
-                'CaseNote - Voicemail compliance',
-                'CaseNote - testing'
-            ],
-            'Review Status Change': [
-                'CaseReview - Case review status changed',
-                'CaseReview - Case review updated'
-            ],
-            'Investigation Status Change': [
-                'CaseViolation - Investigation status changed'
-            ],
-            'Investigation Start': [
-                'CaseViolation - Marked for investigation'
-            ],
-            'Assignee Change': [
-                'ComplianceCase - Assignment changed from one agent to another'
-            ],
-            'Case Closure': [
-                'ComplianceCase - Case Closed'
-            ],
-            'Case Creation': [
-                'ComplianceCase - Case Created'
-            ],
-            'Member Change': [
-                'ComplianceCase - Case Member changed'
-            ],
-            'Case Reopening': [
-                'ComplianceCase - Case Reopened'
-            ],
-            'Case Update': [
-                'ComplianceCase - Case Updated'
-            ],
-            'Listing Change': [
-                'ComplianceCase - ListingId changed'
-            ],
-            'Test Stage': [
-                'ComplianceCase - testing'
-            ],
-            'Invoice Creation': [
-                'Invoice - Invoice created'
-            ],
-            'Invoice Link': [
-                'Invoice - Invoice link'
-            ],
-            'Invoice Status Change': [
-                'Invoice - Invoice status changed'
-            ],
-            'Case Link': [
-                'LinkedCase - Case linked'
-            ],
-            'Case Unlink': [
-                'LinkedCase - Case unlinked'
-            ],
-            'Notice Creation': [
-                'NoticeDefinition - Citation notice created',
-                'NoticeDefinition - Email Notice Created',
-                'NoticeDefinition - Incoming Email notice created',
-                'NoticeDefinition - Inquiry Notice Created',
-                'NoticeDefinition - Notice Transcript created',
-                'NoticeDefinition - NoticeDefinition Updated',
-                'NoticeDefinition - Other notice created',
-                'NoticeDefinition - Revised Warning Notice Created',
-                'NoticeDefinition - Warning Notice Created'
-            ],
-            'Payment Invoice Creation': [
-                'Payment - Invoice created'
-            ],
-            'Payment Record Creation': [
-                'Payment - Payment record created'
-            ],
-            'Payment Record Update': [
-                'Payment - Payment record updated'
-            ],
-            'Report Association': [
-                'Report - Associated report with the case'
-            ],
-            'Report Update': [
-                'Report - Report Updated'
-            ],
-            'Report Disposition Change': [
-                'Report - Report disposition changed'
-            ],
-            'Report Reason Change': [
-                'Report - Report reason changed'
-            ]
-        }    
-
-        # Create stage mapping
-        stage_mapping = {}
-        for stage, patterns in stage_patterns.items():
-            for pattern in patterns:
-                stage_mapping[pattern] = stage
-        
-        # Apply stage mapping
-        case_flow_df['LifecycleStage'] = case_flow_df['EventSummary'].map(stage_mapping)
-        case_flow_df['LifecycleStage'] = case_flow_df['LifecycleStage'].fillna('Other')
-        
-        # Cache the result
-        _compliance_data_cache['case_flow_with_stages_df'] = case_flow_df
-        
-        # print(f"✅ Lifecycle stages extracted and cached")
-        return case_flow_df
-        
-    except Exception as e:
-        print(f"❌ Error extracting lifecycle stages: {e}")
+    if case_flow_df.empty:
         return pd.DataFrame()
+    
+    # Define stage patterns based on EventSummary - EXACT COPY from notebook
+    stage_patterns = {
+        'Note Update': [
+            'CaseNote - Admin Fee Charged',
+            'CaseNote - Auto sold',
+            'CaseNote - Branding in Media',
+            'CaseNote - C1 check',
+            'CaseNote - Call compliance',
+            'CaseNote - Case Note updated',
+            'CaseNote - Chat compliance',
+            'CaseNote - Citation - Multiple properties',
+            'CaseNote - Citation - One property',
+            'CaseNote - Citation Corrective Action Required',
+            'CaseNote - Citation revision',
+            'CaseNote - Combined citation',
+            'CaseNote - Disciplinary complaint',
+            'CaseNote - Disclosure of compensation',
+            'CaseNote - Display of inaccurate listing status',
+            'CaseNote - Duplicate Listing Entry',
+            'CaseNote - Email Address Required',
+            'CaseNote - Failure to Comply with Auction Listing Requirements',
+            'CaseNote - Failure to Correct Auto Sold',
+            'CaseNote - Failure to Correct violation',
+            'CaseNote - Failure to Follow Requirements for Coming Soon,',
+            'CaseNote - Failure to Timely Remove Lockbox',
+            'CaseNote - Failure to Timely Report',
+            'CaseNote - Failure to change listing information',
+            'CaseNote - Failure to disclose additional property owner information',
+            'CaseNote - Failure to follow showing instructions',
+            'CaseNote - Failure to input accurate information',
+            'CaseNote - Failure to notify of termination',
+            'CaseNote - Failure to obtain authorization for changes to listing',
+            'CaseNote - Failure to obtain seller authorization',
+            'CaseNote - Failure to provide listing agreement',
+            'CaseNote - Failure to provide written documentation',
+            'CaseNote - Failure to register property in MLS',
+            'CaseNote - General Citation',
+            'CaseNote - General Inquiry',
+            'CaseNote - General Warning',
+            'CaseNote - Improper Classification of Property Type',
+            'CaseNote - Improper Media Content',
+            'CaseNote - Inadequate Informational Notice',
+            'CaseNote - Inadvertent Double Watermarks',
+            'CaseNote - Investigation relocation to/from another case',
+            'CaseNote - Listing modification',
+            'CaseNote - Mandatory Submission of Photograph',
+            'CaseNote - Misleading Advertising and Representations',
+            'CaseNote - Misrepresentation in Media',
+            'CaseNote - Misrepresenting availability to show',
+            'CaseNote - Misuse of Remarks',
+            'CaseNote - Modification of Information',
+            'CaseNote - No offers of compensation',
+            'CaseNote - Not applicable',
+            'CaseNote - Prohibited co-listing',
+            'CaseNote - Third-Party Photo',
+            'CaseNote - Unauthorized Advertisement',
+            'CaseNote - Unauthorized Entrance into property',
+            'CaseNote - Unauthorized Listing Content',
+            'CaseNote - Unauthorized Reproduction of Confidential Fields',
+            'CaseNote - Unauthorized Sharing of Lockbox Key',
+            'CaseNote - Unauthorized Use of MLS Information',
+            'CaseNote - Unauthorized Use of Term',
+            'CaseNote - Unknown',
+            'CaseNote - Use of Media without Prior Authorization',
+            'CaseNote - Voicemail compliance',
+            'CaseNote - testing'
+        ],
+        'Review Status Change': [
+            'CaseReview - Case review status changed',
+            'CaseReview - Case review updated'
+        ],
+        'Investigation Status Change': [
+            'CaseViolation - Investigation status changed'
+        ],
+        'Investigation Start': [
+            'CaseViolation - Marked for investigation'
+        ],
+        'Assignee Change': [
+            'ComplianceCase - Assignment changed from one agent to another'
+        ],
+        'Case Closure': [
+            'ComplianceCase - Case Closed'
+        ],
+        'Case Creation': [
+            'ComplianceCase - Case Created'
+        ],
+        'Member Change': [
+            'ComplianceCase - Case Member changed'
+        ],
+        'Case Reopening': [
+            'ComplianceCase - Case Reopened'
+        ],
+        'Case Update': [
+            'ComplianceCase - Case Updated'
+        ],
+        'Listing Change': [
+            'ComplianceCase - ListingId changed'
+        ],
+        'Test Stage': [
+            'ComplianceCase - testing'
+        ],
+        'Invoice Creation': [
+            'Invoice - Invoice created'
+        ],
+        'Invoice Link': [
+            'Invoice - Invoice link'
+        ],
+        'Invoice Status Change': [
+            'Invoice - Invoice status changed'
+        ],
+        'Case Link': [
+            'LinkedCase - Case linked'
+        ],
+        'Case Unlink': [
+            'LinkedCase - Case unlinked'
+        ],
+        'Notice Creation': [
+            'NoticeDefinition - Citation notice created',
+            'NoticeDefinition - Email Notice Created',
+            'NoticeDefinition - Incoming Email notice created',
+            'NoticeDefinition - Inquiry Notice Created',
+            'NoticeDefinition - Notice Transcript created',
+            'NoticeDefinition - NoticeDefinition Updated',
+            'NoticeDefinition - Other notice created',
+            'NoticeDefinition - Revised Warning Notice Created',
+            'NoticeDefinition - Warning Notice Created'
+        ],
+        'Payment Invoice Creation': [
+            'Payment - Invoice created'
+        ],
+        'Payment Record Creation': [
+            'Payment - Payment record created'
+        ],
+        'Payment Record Update': [
+            'Payment - Payment record updated'
+        ],
+        'Report Association': [
+            'Report - Associated report with the case'
+        ],
+        'Report Update': [
+            'Report - Report Updated'
+        ],
+        'Report Disposition Change': [
+            'Report - Report disposition changed'
+        ],
+        'Report Reason Change': [
+            'Report - Report reason changed'
+        ]
+    }    
+
+    # Create stage mapping
+    stage_mapping = {}
+    for stage, patterns in stage_patterns.items():
+        for pattern in patterns:
+            stage_mapping[pattern] = stage
+    
+    # Apply stage mapping
+    case_flow_df['LifecycleStage'] = case_flow_df['EventSummary'].map(stage_mapping)
+    case_flow_df['LifecycleStage'] = case_flow_df['LifecycleStage'].fillna('Other')
+    
+    # print(f"✅ Lifecycle stages extracted and cached")
+    return case_flow_df
 
-@lru_cache(maxsize=1) 
+# Case progression columns -> lifecycle stages they cover. Has* columns flag cases with
+# any of the stages; *Count columns count them over the case's unique stage sequence,
+# so each stage contributes at most one
+CASE_PROGRESSION_STAGE_COLUMNS = [
+    ('HasReviewActivity', ['Review Status Change']),
+    ('ReviewCount', ['Review Status Change']),
+    ('HasInvestigationStart', ['Investigation Start']),
+    ('HasInvestigationChange', ['Investigation Status Change']),
+    ('InvestigationStartCount', ['Investigation Start']),
+    ('InvestigationChangeCount', ['Investigation Status Change']),
+    ('HasAssigneeChange', ['Assignee Change']),
+    ('HasMemberChange', ['Member Change']),
+    ('AssigneeChangeCount', ['Assignee Change']),
+    ('MemberChangeCount', ['Member Change']),
+    ('HasCaseCreation', ['Case Creation']),
+    ('HasCaseUpdate', ['Case Update']),
+    ('HasCaseReopening', ['Case Reopening']),
+    ('HasCaseClosure', ['Case Closure']),
+    ('HasListingChange', ['Listing Change']),
+    ('CaseUpdateCount', ['Case Update']),
+    ('HasInvoiceCreation', ['Invoice Creation']),
+    ('HasInvoiceLink', ['Invoice Link']),
+    ('HasInvoiceStatusChange', ['Invoice Status Change']),
+    ('HasPaymentInvoiceCreation', ['Payment Invoice Creation']),
+    ('HasPaymentRecordCreation', ['Payment Record Creation']),
+    ('HasPaymentRecordUpdate', ['Payment Record Update']),
+    ('InvoiceCreationCount', ['Invoice Creation']),
+    ('PaymentRecordCount', ['Payment Record Creation', 'Payment Record Update']),
+    ('HasCaseLink', ['Case Link']),
+    ('HasCaseUnlink', ['Case Unlink']),
+    ('CaseLinkCount', ['Case Link']),
+    ('CaseUnlinkCount', ['Case Unlink']),
+    ('HasReportAssociation', ['Report Association']),
+    ('HasReportUpdate', ['Report Update']),
+    ('HasReportDispositionChange', ['Report Disposition Change']),
+    ('HasReportReasonChange', ['Report Reason Change']),
+    ('ReportAssociationCount', ['Report Association']),
+    ('ReportUpdateCount', ['Report Update']),
+    ('HasNoticeCreation', ['Notice Creation']),
+    ('NoticeCreationCount', ['Notice Creation'])
+]
+
+@compliance_data_graph.node('case_progression', deps=['case_flow_stages'], default=pd.DataFrame)
 @monitor_performance("Case Progression Analysis")
 def get_case_progression_df():
     """
     Analyze case progression through lifecycle stages
     """
-    global _compliance_data_cache, _cache_timestamp
+    # Get case flow with lifecycle stages
+    case_flow_df = get_case_flow_with_lifecycle_stages()
     
-    try:
-        # Check if we have valid cached progression data
-        current_time = datetime.now()
-        if (_cache_timestamp and 
-            'case_progression_df' in _compliance_data_cache and 
-            (current_time - _cache_timestamp).seconds < _cache_duration_minutes * 60):
-            return _compliance_data_cache['case_progression_df']
-        
-        # Get case flow with lifecycle stages
-        case_flow_df = get_case_flow_with_lifecycle_stages()
-        
-        if case_flow_df.empty:
-            return pd.DataFrame()
-        
-        # Group by CaseID to get case-level aggregations
-        case_groups = case_flow_df.groupby('CaseID')
-        
-        # Basic case information (take first record for each case)
-        case_info = case_flow_df.groupby('CaseID').first()[
-            ['CaseNumber', 'MemberName', 'Disposition', 'Status', 'ViolationName', 'CreatedOn', 'ClosedOn']
-        ].reset_index()
-                
-        # Calculate duration metrics
-        case_info['CreatedOn'] = pd.to_datetime(case_info['CreatedOn'], errors='coerce')
-        case_info['ClosedOn'] = pd.to_datetime(case_info['ClosedOn'], errors='coerce')
-        case_info['DurationDays'] = (case_info['ClosedOn'] - case_info['CreatedOn']).dt.days
-        
-        # Event count metrics
-        event_counts = case_groups['EventSummary'].count().rename('TotalEvents').reset_index()
-        
-        # Stage progression analysis
-        stage_progression = case_groups['LifecycleStage'].apply(
-            lambda stages: list(dict.fromkeys([s for s in stages if s != 'Other']))
-        ).rename('UniqueStages').reset_index()
-        
-        stage_progression['ProgressionSequence'] = stage_progression['UniqueStages'].apply(
-            lambda stages: ' -> '.join(stages)  
-        )
-        stage_progression['TotalUniqueStages'] = stage_progression['UniqueStages'].apply(len)        
-
-        # Factual stage analysis functions
-        def analyze_note_updates(lifecycle_stages):
-            """Count Note Update stages and extract types"""
-            note_stages = [s for s in lifecycle_stages if s == 'Note Update']
-            return len(note_stages)
-        
-        def analyze_review_activity(lifecycle_stages):
-            """Analyze review status changes"""
-            return {
-                'HasReviewActivity': 'Review Status Change' in lifecycle_stages,
-                'ReviewCount': lifecycle_stages.count('Review Status Change')
-            }
-        
-        def analyze_investigation_activity(lifecycle_stages):
-            """Analyze investigation stages"""
-            has_investigation_start = 'Investigation Start' in lifecycle_stages
-            has_investigation_change = 'Investigation Status Change' in lifecycle_stages
-            return {
-                'HasInvestigationStart': has_investigation_start,
-                'HasInvestigationChange': has_investigation_change,
-                'InvestigationStartCount': lifecycle_stages.count('Investigation Start'),
-                'InvestigationChangeCount': lifecycle_stages.count('Investigation Status Change')
-            }
-        
-        def analyze_assignment_changes(lifecycle_stages):
-            """Analyze assignment and member changes"""
-            return {
-                'HasAssigneeChange': 'Assignee Change' in lifecycle_stages,
-                'HasMemberChange': 'Member Change' in lifecycle_stages,
-                'AssigneeChangeCount': lifecycle_stages.count('Assignee Change'),
-                'MemberChangeCount': lifecycle_stages.count('Member Change')
-            }
-        
-        def analyze_case_milestones(lifecycle_stages):
-            """Analyze general case milestones"""
-            return {
-                'HasCaseCreation': 'Case Creation' in lifecycle_stages,
-                'HasCaseUpdate': 'Case Update' in lifecycle_stages,
-                'HasCaseReopening': 'Case Reopening' in lifecycle_stages,
-                'HasCaseClosure': 'Case Closure' in lifecycle_stages,
-                'HasListingChange': 'Listing Change' in lifecycle_stages,
-                'CaseUpdateCount': lifecycle_stages.count('Case Update')
-            }
-        
-        def analyze_financial_activity(lifecycle_stages):
-            """Analyze invoice and payment activity"""
-            return {
-                'HasInvoiceCreation': 'Invoice Creation' in lifecycle_stages,
-                'HasInvoiceLink': 'Invoice Link' in lifecycle_stages,
-                'HasInvoiceStatusChange': 'Invoice Status Change' in lifecycle_stages,
-                'HasPaymentInvoiceCreation': 'Payment Invoice Creation' in lifecycle_stages,
-                'HasPaymentRecordCreation': 'Payment Record Creation' in lifecycle_stages,
-                'HasPaymentRecordUpdate': 'Payment Record Update' in lifecycle_stages,
-                'InvoiceCreationCount': lifecycle_stages.count('Invoice Creation'),
-                'PaymentRecordCount': lifecycle_stages.count('Payment Record Creation') + lifecycle_stages.count('Payment Record Update')
-            }
-        
-        def analyze_case_linking(lifecycle_stages):
-            """Analyze case linking activity"""
-            return {
-                'HasCaseLink': 'Case Link' in lifecycle_stages,
-                'HasCaseUnlink': 'Case Unlink' in lifecycle_stages,
-                'CaseLinkCount': lifecycle_stages.count('Case Link'),
-                'CaseUnlinkCount': lifecycle_stages.count('Case Unlink')
-            }
-        
-        def analyze_report_activity(lifecycle_stages):
-            """Analyze report-related activity"""
-            return {
-                'HasReportAssociation': 'Report Association' in lifecycle_stages,
-                'HasReportUpdate': 'Report Update' in lifecycle_stages,
-                'HasReportDispositionChange': 'Report Disposition Change' in lifecycle_stages,
-                'HasReportReasonChange': 'Report Reason Change' in lifecycle_stages,
-                'ReportAssociationCount': lifecycle_stages.count('Report Association'),
-                'ReportUpdateCount': lifecycle_stages.count('Report Update')
-            }
-        
-        def analyze_notice_creation(lifecycle_stages):
-            """Analyze notice creation activity"""
-            return {
-                'HasNoticeCreation': 'Notice Creation' in lifecycle_stages,
-                'NoticeCreationCount': lifecycle_stages.count('Notice Creation')
-            }
-
-        # Apply analysis functions using pandas operations
-        # print("Analyzing note updates...")
-        stage_progression['NoteUpdateCount'] = stage_progression['UniqueStages'].apply(analyze_note_updates)
-
-        # print("Analyzing review activity...")
-        review_analysis = stage_progression['UniqueStages'].apply(analyze_review_activity)
-        review_df = pd.json_normalize(review_analysis)
-
-        # print("Analyzing investigation activity...")
-        investigation_analysis = stage_progression['UniqueStages'].apply(analyze_investigation_activity)
-        investigation_df = pd.json_normalize(investigation_analysis)
-
-        # print("Analyzing assignment changes...")
-        assignment_analysis = stage_progression['UniqueStages'].apply(analyze_assignment_changes)
-        assignment_df = pd.json_normalize(assignment_analysis)
-
-        # print("Analyzing case milestones...")
-        milestone_analysis = stage_progression['UniqueStages'].apply(analyze_case_milestones)
-        milestone_df = pd.json_normalize(milestone_analysis)
-
-        # print("Analyzing financial activity...")
-        financial_analysis = stage_progression['UniqueStages'].apply(analyze_financial_activity)
-        financial_df = pd.json_normalize(financial_analysis)
-
-        # print("Analyzing case linking...")
-        linking_analysis = stage_progression['UniqueStages'].apply(analyze_case_linking)
-        linking_df = pd.json_normalize(linking_analysis)
-
-        # print("Analyzing report activity...")
-        report_analysis = stage_progression['UniqueStages'].apply(analyze_report_activity)
-        report_df = pd.json_normalize(report_analysis)
-
-        # print("Analyzing notice creation...")
-        notice_analysis = stage_progression['UniqueStages'].apply(analyze_notice_creation)
-        notice_df = pd.json_normalize(notice_analysis)
-        
-        # Combine all analysis results
-        case_progression_df = (case_info
-                        .merge(event_counts, on='CaseID', how='left')
-                        .merge(stage_progression, on='CaseID', how='left')
-                        .reset_index(drop=True)) 
+    if case_flow_df.empty:
+        return pd.DataFrame()
+    
+    # Group by CaseID to get case-level aggregations
+    case_groups = case_flow_df.groupby('CaseID')
+    
+    # Basic case information (take first record for each case)
+    case_info = case_flow_df.groupby('CaseID').first()[
+        ['CaseNumber', 'MemberName', 'Disposition', 'Status', 'ViolationName', 'CreatedOn', 'ClosedOn']
+    ].reset_index()
+            
+    # Calculate duration metrics
+    case_info['CreatedOn'] = pd.to_datetime(case_info['CreatedOn'], errors='coerce')
+    case_info['ClosedOn'] = pd.to_datetime(case_info['ClosedOn'], errors='coerce')
+    case_info['DurationDays'] = (case_info['ClosedOn'] - case_info['CreatedOn']).dt.days
+    
+    # Event count metrics
+    event_counts = case_groups['EventSummary'].count().rename('TotalEvents').reset_index()
+    
+    # Stage progression analysis - one case x stage matrix; sequences are the ordered unique stages
+    progression = StageProgression(case_flow_df['CaseID'], case_flow_df['LifecycleStage'])
+    unique_stages = progression.sequences()
+    stage_progression = pd.DataFrame({
+        'CaseID': progression.case_ids,
+        'UniqueStages': unique_stages,
+        'ProgressionSequence': [' -> '.join(stages) for stages in unique_stages],
+        'TotalUniqueStages': progression.unique_stage_counts,
+        'NoteUpdateCount': progression.has_stage('Note Update').astype(np.int64)
+    })
+    
+    # Combine all analysis results
+    case_progression_df = (case_info
+                    .merge(event_counts, on='CaseID', how='left')
+                    .merge(stage_progression, on='CaseID', how='left')
+                    .reset_index(drop=True)) 
 
-        # Add analysis results
-        analysis_dfs = [review_df, investigation_df, assignment_df, milestone_df, 
-                    financial_df, linking_df, report_df, notice_df]
-        
-        for df in analysis_dfs:
-            for col in df.columns:
-                case_progression_df[col] = df[col].values
+    # Add stage flags and counts (rows of case_info and progression are both sorted by CaseID)
+    for column, stages in CASE_PROGRESSION_STAGE_COLUMNS:
+        has_stages = [progression.has_stage(stage) for stage in stages]
+        if column.startswith('Has'):
+            case_progression_df[column] = np.logical_or.reduce(has_stages)
+        else:
+            case_progression_df[column] = np.sum(has_stages, axis=0, dtype=np.int64)
 
-        # Summary statistics
-        print(f"\n📈 Analysis Results:")
-        print(f"   Cases analyzed: {len(case_progression_df):,}")
-        print(f"   Average events per case: {case_progression_df['TotalEvents'].mean():.1f}")
-        print(f"   Average unique stages per case: {case_progression_df['TotalUniqueStages'].mean():.1f}")
-        print(f"   Cases with investigation activity: {case_progression_df['HasInvestigationStart'].sum():,}")
-        print(f"   Cases with financial activity: {(case_progression_df['HasInvoiceCreation'] | case_progression_df['HasPaymentRecordCreation']).sum():,}")
-        print(f"   Cases with review activity: {case_progression_df['HasReviewActivity'].sum():,}")
+    # Summary statistics
+    print(f"\n📈 Analysis Results:")
+    print(f"   Cases analyzed: {len(case_progression_df):,}")
+    print(f"   Average events per case: {case_progression_df['TotalEvents'].mean():.1f}")
+    print(f"   Average unique stages per case: {case_progression_df['TotalUniqueStages'].mean():.1f}")
+    print(f"   Cases with investigation activity: {case_progression_df['HasInvestigationStart'].sum():,}")
+    print(f"   Cases with financial activity: {(case_progression_df['HasInvoiceCreation'] | case_progression_df['HasPaymentRecordCreation']).sum():,}")
+    print(f"   Cases with review activity: {case_progression_df['HasReviewActivity'].sum():,}")
 
-        
-        # Most common progression patterns
-        print(f"\n🎯 Most Common Progression Patterns:")
-        common_progressions = case_progression_df['ProgressionSequence'].value_counts().head(10)
-        for i, (sequence, count) in enumerate(common_progressions.items(), 1):
-            print(f"   {i:2d}. {sequence} ({count} cases)")
-        
-        # Stage distribution analysis
-        print(f"\n📊 Stage Activity Distribution:")
-        stage_metrics = {
-            'Note Updates': case_progression_df['NoteUpdateCount'].sum(),
-            'Review Activities': case_progression_df['ReviewCount'].sum(),
-            'Investigation Starts': case_progression_df['InvestigationStartCount'].sum(),
-            'Investigation Changes': case_progression_df['InvestigationChangeCount'].sum(),
-            'Assignment Changes': case_progression_df['AssigneeChangeCount'].sum(),
-            'Member Changes': case_progression_df['MemberChangeCount'].sum(),
-            'Case Updates': case_progression_df['CaseUpdateCount'].sum(),
-            'Invoice Creations': case_progression_df['InvoiceCreationCount'].sum(),
-            'Payment Records': case_progression_df['PaymentRecordCount'].sum(),
-            'Notice Creations': case_progression_df['NoticeCreationCount'].sum(),
-            'Report Associations': case_progression_df['ReportAssociationCount'].sum()
-        }
-        
-        for metric, count in stage_metrics.items():
-            cases_with_metric = case_progression_df[case_progression_df[f"{metric.replace(' ', '').replace('s', '')}Count"] > 0].shape[0] if f"{metric.replace(' ', '').replace('s', '')}Count" in case_progression_df.columns else 0
-            print(f"   {metric}: {count:,} total events across cases")
+    
+    # Most common progression patterns
+    print(f"\n🎯 Most Common Progression Patterns:")
+    common_progressions = case_progression_df['ProgressionSequence'].value_counts().head(10)
+    for i, (sequence, count) in enumerate(common_progressions.items(), 1):
+        print(f"   {i:2d}. {sequence} ({count} cases)")
+    
+    # Stage distribution analysis
+    print(f"\n📊 Stage Activity Distribution:")
+    stage_metrics = {
+        'Note Updates': case_progression_df['NoteUpdateCount'].sum(),
+        'Review Activities': case_progression_df['ReviewCount'].sum(),
+        'Investigation Starts': case_progression_df['InvestigationStartCount'].sum(),
+        'Investigation Changes': case_progression_df['InvestigationChangeCount'].sum(),
+        'Assignment Changes': case_progression_df['AssigneeChangeCount'].sum(),
+        'Member Changes': case_progression_df['MemberChangeCount'].sum(),
+        'Case Updates': case_progression_df['CaseUpdateCount'].sum(),
+        'Invoice Creations': case_progression_df['InvoiceCreationCount'].sum(),
+        'Payment Records': case_progression_df['PaymentRecordCount'].sum(),
+        'Notice Creations': case_progression_df['NoticeCreationCount'].sum(),
+        'Report Associations': case_progression_df['ReportAssociationCount'].sum()
+    }
+    
+    for metric, count in stage_metrics.items():
+        cases_with_metric = case_progression_df[case_progression_df[f"{metric.replace(' ', '').replace('s', '')}Count"] > 0].shape[0] if f"{metric.replace(' ', '').replace('s', '')}Count" in case_progression_df.columns else 0
+        print(f"   {metric}: {count:,} total events across cases")
 
 
-        # Cache the result
-        _compliance_data_cache['case_progression_df'] = case_progression_df
-        
-        # print(f"✅ Case progression dataframe created and cached")
-        return case_progression_df
-        
-    except Exception as e:
-        print(f"❌ Error creating case progression: {e}")
-        return pd.DataFrame()
+    # print(f"✅ Case progression dataframe created and cached")
+    return case_progression_df
 
 def invalidate_compliance_cache():
-    """Manually invalidate the cache if needed"""
-    global _compliance_data_cache, _cache_timestamp
-    _compliance_data_cache = {}
-    _cache_timestamp = None
-    get_compliance_base_data.cache_clear()
-    get_event_history.cache_clear()
-    get_case_flow.cache_clear()
-    get_case_flow_with_lifecycle_stages.cache_clear()
-    get_case_progression_df.cache_clear()
+    """Manually invalidate the cache if needed - every derived dataset is rebuilt on next use"""
+    compliance_data_graph.invalidate()
     # print("🗑️ All compliance data caches invalidated")
 
 @monitor_performance("Compliance Filter Application")
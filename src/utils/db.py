@@ -1,5 +1,6 @@
 import pandas as pd
 import concurrent.futures
+import threading
 from src.config.db import training_engine, workflow_engine, compliance_engine
 
 from src.utils.cache import cache
@@ -20,10 +21,115 @@ def run_compliance_query(key, query):
     df = pd.read_sql_query(query, compliance_engine)
     return key, df
     
-def run_queries(queries, database, workers = 5):
+class LazyDataset:
+    """
+    A declared query result that is only fetched the first time a view loads it
+    """
+    def __init__(self, key, query, database):
+        self.key = key
+        self.query = query
+        self.database = database
+        self._data = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._data is not None
+
+    def load(self):
+        with self._lock:
+            if self._data is None:
+                self._data = run_queries({self.key: self.query}, self.database, 1)[self.key]
+        return self._data
+
+def load_dataset(data):
+    """Fetch a LazyDataset (other values are returned unchanged)"""
+    return data.load() if isinstance(data, LazyDataset) else data
+
+class AggregateQuery:
+    """
+    A declared "group by X, aggregate Y, with these filters" query
+
+    Runs as one GROUP BY in the database so only the aggregated rows are transferred;
+    aggregate() computes the same result in pandas from the raw table.
+
+    Args:
+        table (str): source table, e.g. "[consumable].[Fact_WorkFlowHistory]"
+        group_by (list): grouping columns
+        aggregates (dict): output column -> (function, source column); function is one of
+                           AGGREGATE_FUNCTIONS, source column None counts rows
+        filters (dict): column -> allowed values
+    """
+    AGGREGATE_FUNCTIONS = {'count': 'COUNT', 'sum': 'SUM', 'mean': 'AVG', 'min': 'MIN', 'max': 'MAX'}
+
+    def __init__(self, table, group_by, aggregates, filters=None):
+        self.table = table
+        self.group_by = list(group_by)
+        self.aggregates = aggregates
+        self.filters = filters or {}
+
+    @staticmethod
+    def _literal(value):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return str(value)
+        return "'" + str(value).replace("'", "''") + "'"
+
+    def to_sql(self):
+        columns = [f"[{column}]" for column in self.group_by]
+        for name, (function, source) in self.aggregates.items():
+            if source is None:
+                columns.append(f"COUNT(*) AS [{name}]")
+            elif function == 'mean':
+                columns.append(f"AVG(CAST([{source}] AS FLOAT)) AS [{name}]")
+            else:
+                columns.append(f"{self.AGGREGATE_FUNCTIONS[function]}([{source}]) AS [{name}]")
+
+        conditions = []
+        for column, values in self.filters.items():
+            values = list(values)
+            conditions.append(f"[{column}] IN ({', '.join(self._literal(v) for v in values)})" if values else "1 = 0")
+
+        query = f"SELECT {', '.join(columns)} FROM {self.table}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return query + f" GROUP BY {', '.join(f'[{column}]' for column in self.group_by)}"
+
+    def aggregate(self, df):
+        """Same aggregation in pandas (NULL groups are kept, as in SQL)"""
+        df = pd.DataFrame(df)
+        for column, values in self.filters.items():
+            df = df.loc[df[column].isin(list(values))]
+        grouped = df.groupby(self.group_by, dropna=False)
+        result = pd.DataFrame({
+            name: grouped.size() if source is None else grouped[source].agg(function)
+            for name, (function, source) in self.aggregates.items()
+        })
+        return result.reset_index()
+
+def run_aggregate_query(key, query, database, fallback=None):
+    """
+    Run an AggregateQuery in the database, ordered by its group columns
+    If the database cannot run it, the fallback raw table (a DataFrame or LazyDataset)
+    is aggregated in pandas instead
+    """
+    try:
+        result = run_queries({key: query.to_sql()}, database, 1)[key]
+    except Exception as e:
+        if fallback is None:
+            raise
+        print(f"⚠️ Aggregation pushdown failed for {key}, aggregating locally: {e}")
+        result = query.aggregate(load_dataset(fallback))
+    return result.sort_values(query.group_by, kind='mergesort').reset_index(drop=True)
+
+def run_queries(queries, database, workers = 5, lazy = ()):
+    """
+    Run queries in parallel and return their results by key
+    Keys listed in lazy are not run; they map to LazyDataset handles instead
+    """
+    eager_queries = {k: q for k, q in queries.items() if k not in lazy}
     futures = []
     with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
-        for k, q in queries.items():
+        for k, q in eager_queries.items():
             if 'train' in database.lower():
                 futures.append(executor.submit(run_training_query, k, q))
             elif 'work' in database.lower():
@@ -36,5 +142,5 @@ def run_queries(queries, database, workers = 5):
             results[key] = df
     response = {}
     for key in queries.keys():
-        response[key] = results[key]
+        response[key] = LazyDataset(key, queries[key], database) if key in lazy else results[key]
     return response
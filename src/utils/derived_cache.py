@@ -0,0 +1,191 @@
+import time
+import uuid
+import hashlib
+import threading
+from functools import wraps
+import pandas as pd
+from src.utils.cache import cache, make_cache_key
+
+
+def fingerprint_frames(frames):
+    """Content hash of a DataFrame or a dict of DataFrames (e.g. a run_queries result)"""
+    if isinstance(frames, pd.DataFrame):
+        frames = {'': frames}
+    digest = hashlib.md5()
+    for name in sorted(frames):
+        frame = frames[name]
+        digest.update(f"{name}:{list(frame.columns)}:{len(frame)}".encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class DerivedNode:
+    """One derived dataset in a DerivedDataGraph, with its current value and build statistics"""
+
+    def __init__(self, name, builder, deps, ttl_seconds, persist, fingerprint, default):
+        self.name = name
+        self.builder = builder
+        self.deps = tuple(deps)
+        self.ttl_seconds = ttl_seconds
+        self.persist = persist
+        self.fingerprint = fingerprint
+        self.default = default
+        self.value = None
+        self.version = None
+        self.dep_versions = None
+        self.built_at = None
+        self.last_build_seconds = None
+        self.builds = 0
+        self.lock = threading.Lock()
+
+    def planned_version(self, dep_versions):
+        """Version a rebuild will get when it can be known up front (deterministic derived nodes)"""
+        if self.fingerprint is None and self.deps:
+            return make_cache_key(self.name, dep_versions)
+        return None
+
+
+class DerivedDataGraph:
+    """
+    Derived datasets with explicit dependencies, rebuilt only when they are stale
+
+    Each node has a version. A root node (no dependencies) is stale when its TTL has
+    passed or it was invalidated, which is what makes it re-read its source. A derived
+    node is a function of its dependencies only, so it is stale when it was invalidated
+    or the version of any dependency changed since it was built; its TTL just bounds how
+    long a persisted copy lives in the shared cache. Derived node versions are a hash of
+    the dependency versions, so they only change when upstream data did. Root nodes get a content fingerprint when one is given,
+    otherwise a fresh id on every build. Every node builds under its own lock, so
+    concurrent callers wait for a single rebuild. A node marked persist=True is also
+    stored in the shared cache under its version, which lets other workers with the
+    same upstream versions reuse it. A node whose dependencies or builder raise
+    returns default() and caches nothing, so the next call tries again.
+    """
+
+    def __init__(self, name, ttl_seconds=3600):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.nodes = {}
+
+    def node(self, name, deps=(), ttl_seconds=None, persist=False, fingerprint=None, default=None):
+        """Decorator registering builder() as node name; the decorated function returns the node's current value"""
+        def decorator(builder):
+            missing = [dep for dep in deps if dep not in self.nodes]
+            if missing:
+                raise ValueError(f"Unknown dependencies for {name}: {missing}")
+            self.nodes[name] = DerivedNode(
+                name, builder, deps, ttl_seconds if ttl_seconds is not None else self.ttl_seconds,
+                persist, fingerprint, default
+            )
+
+            @wraps(builder)
+            def getter():
+                return self.get(name)
+            getter.node = self.nodes[name]
+            return getter
+        return decorator
+
+    def get(self, name):
+        node = self.nodes[name]
+        try:
+            dep_versions = {dep: self._resolve_version(dep) for dep in node.deps}
+            with node.lock:
+                if not self._is_fresh(node, dep_versions):
+                    self._rebuild(node, dep_versions)
+                return node.value
+        except Exception as e:
+            if node.default is None:
+                raise
+            print(f"❌ Error building {self.name} {name}: {e}")
+            return node.default()
+
+    def _resolve_version(self, name):
+        self.get(name)
+        version = self.nodes[name].version
+        if version is None:
+            raise RuntimeError(f"{name} is unavailable")
+        return version
+
+    def _is_fresh(self, node, dep_versions):
+        if node.version is None or node.dep_versions != dep_versions:
+            return False
+        return bool(node.deps) or time.time() - node.built_at < node.ttl_seconds
+
+    def _persist_key(self, node, version):
+        return f"derived:{self.name}:{node.name}:{version}"
+
+    def _rebuild(self, node, dep_versions):
+        version = node.planned_version(dep_versions)
+        if node.persist and version is not None:
+            value = self._load_persisted(node, version)
+            if value is not None:
+                self._store(node, value, version, dep_versions)
+                return
+
+        start_time = time.time()
+        value = node.builder()
+        node.last_build_seconds = time.time() - start_time
+        node.builds += 1
+
+        if version is None:
+            version = self._fingerprint(node, value)
+        self._store(node, value, version, dep_versions)
+        if node.persist:
+            self._save_persisted(node, version, value)
+
+    def _fingerprint(self, node, value):
+        if node.fingerprint is not None:
+            try:
+                return node.fingerprint(value)
+            except Exception as e:
+                print(f"⚠️ Could not fingerprint {self.name} {node.name}: {e}")
+        return uuid.uuid4().hex
+
+    def _store(self, node, value, version, dep_versions):
+        node.value = value
+        node.version = version
+        node.dep_versions = dep_versions
+        node.built_at = time.time()
+
+    def _load_persisted(self, node, version):
+        try:
+            return cache.get(self._persist_key(node, version))
+        except Exception as e:
+            print(f"⚠️ Could not read persisted {self.name} {node.name}: {e}")
+            return None
+
+    def _save_persisted(self, node, version, value):
+        try:
+            cache.set(self._persist_key(node, version), value, timeout=node.ttl_seconds)
+        except Exception as e:
+            print(f"⚠️ Could not persist {self.name} {node.name}: {e}")
+
+    def invalidate(self, name=None):
+        """
+        Drop a node (all nodes when name is None) so it is rebuilt on next use; nodes
+        depending on it rebuild in turn if its version changes
+        """
+        for node in ([self.nodes[name]] if name is not None else self.nodes.values()):
+            with node.lock:
+                if node.persist and node.version is not None:
+                    try:
+                        cache.delete(self._persist_key(node, node.version))
+                    except Exception as e:
+                        print(f"⚠️ Could not delete persisted {self.name} {node.name}: {e}")
+                node.value = None
+                node.version = None
+                node.dep_versions = None
+                node.built_at = None
+
+    def stats(self):
+        """Per-node version, age and build timing"""
+        now = time.time()
+        return pd.DataFrame([{
+            'Node': node.name,
+            'Dependencies': ', '.join(node.deps),
+            'Version': node.version,
+            'AgeSeconds': now - node.built_at if node.built_at else None,
+            'LastBuildSeconds': node.last_build_seconds,
+            'Builds': node.builds,
+            'Persisted': node.persist
+        } for node in self.nodes.values()])
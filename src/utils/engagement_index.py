@@ -0,0 +1,123 @@
+import heapq
+from itertools import islice
+import numpy as np
+import pandas as pd
+
+ENGAGEMENT_COLUMNS = ['MemberID', 'MemberName', 'TotalSessionsRegistered', 'TotalSessionsAttended',
+                      'MissedSessions', 'AttendanceRate']
+
+# engagement metric -> (score column, value label)
+ENGAGEMENT_METRICS = {
+    'sessions_attended': ('TotalSessionsAttended', ''),
+    'training_hours': ('training_hours', ' hrs'),
+    'topics_completed': ('topics_completed', '')
+}
+
+# Largest leaderboard offered by the top-members dropdown
+MAX_LEADERBOARD_SIZE = 50
+
+
+def score_members(df_members):
+    """
+    Vectorized engagement scores for Fact_MemberEngagement rows
+        training_hours   - estimate: 1 hour per session attended
+        topics_completed - placeholder estimate: half the sessions attended, at least 1
+    """
+    df_scores = df_members.copy()
+
+    # Fill any null values with defaults
+    for column in ['TotalSessionsRegistered', 'TotalSessionsAttended', 'AttendanceRate', 'MissedSessions']:
+        df_scores[column] = df_scores[column].fillna(0)
+
+    attended = df_scores['TotalSessionsAttended'].to_numpy(dtype=np.float64)
+    df_scores['training_hours'] = attended * 1.0
+    df_scores['topics_completed'] = np.maximum(1, np.trunc(attended / 2)).astype(np.int64)
+    return df_scores
+
+
+class EngagementIndex:
+    """
+    Members ranked once per data refresh for every engagement metric
+
+    For each metric the index keeps the global rank order plus, per office, the
+    ranks of that office's top MAX_LEADERBOARD_SIZE members. A leaderboard
+    restricted to a set of offices is a k-way heap merge of those short lists,
+    so serving it never touches the full member table. Ties keep source row order.
+    """
+
+    def __init__(self, df_members, top_k=MAX_LEADERBOARD_SIZE):
+        self.top_k = top_k
+        if df_members.empty or any(column not in df_members.columns for column in ENGAGEMENT_COLUMNS):
+            self.members = pd.DataFrame()
+            return
+
+        self.members = score_members(df_members).reset_index(drop=True)
+        self.has_offices = 'OfficeCode' in self.members.columns
+        if self.has_offices:
+            office_codes, self.offices = pd.factorize(self.members['OfficeCode'])
+        else:
+            office_codes, self.offices = np.full(len(self.members), -1), pd.Index([])
+        self.office_sizes = np.bincount(office_codes[office_codes >= 0], minlength=len(self.offices))
+
+        self.orders = {}
+        self.office_ranks = {}
+        for metric, (column, _) in ENGAGEMENT_METRICS.items():
+            order = np.argsort(-self.members[column].to_numpy(dtype=np.float64), kind='stable')
+            self.orders[metric] = order
+            self.office_ranks[metric] = self._office_top_ranks(office_codes[order])
+
+    def _office_top_ranks(self, ranked_office_codes):
+        """office code -> global ranks of the office's best top_k members"""
+        ranks = np.arange(len(ranked_office_codes))
+        valid = ranked_office_codes >= 0
+        ranks, codes = ranks[valid], ranked_office_codes[valid]
+
+        by_office = np.lexsort((ranks, codes))
+        ranks, codes = ranks[by_office], codes[by_office]
+        bounds = np.searchsorted(codes, np.arange(len(self.offices) + 1))
+        return [ranks[start:min(end, start + self.top_k)] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    @property
+    def empty(self):
+        return self.members.empty
+
+    def member_count(self, offices=None):
+        """Members in scope for an office restriction (None = all members)"""
+        if self.empty:
+            return 0
+        if offices is None or not self.has_offices:
+            return len(self.members)
+        codes = self.offices.get_indexer(list(offices))
+        return int(self.office_sizes[codes[codes >= 0]].sum())
+
+    def leaderboard(self, metric, top_count, offices=None):
+        """
+        Top members for a metric, optionally restricted to a set of office codes
+
+        Returns:
+            pd.DataFrame: member rows in rank order with metric_value and metric_label
+        """
+        if self.empty:
+            return pd.DataFrame()
+
+        metric = metric if metric in ENGAGEMENT_METRICS else 'sessions_attended'
+        column, metric_label = ENGAGEMENT_METRICS[metric]
+        order = self.orders[metric]
+
+        if offices is None or not self.has_offices:
+            positions = order[:top_count]
+        elif top_count <= self.top_k:
+            codes = self.offices.get_indexer(list(offices))
+            office_lists = [self.office_ranks[metric][code] for code in np.unique(codes[codes >= 0])]
+            ranks = np.fromiter(islice(heapq.merge(*office_lists), top_count), dtype=np.int64)
+            positions = order[ranks]
+        else:
+            in_offices = self.members['OfficeCode'].isin(list(offices)).to_numpy()
+            positions = order[in_offices[order]][:top_count]
+
+        top_members = self.members.iloc[positions].copy()
+        top_members['metric_value'] = top_members[column]
+
+        # Add metric label for display
+        top_members['metric_label'] = metric_label
+        return top_members
@@ -0,0 +1,140 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from inflection import titleize
+
+# Escalation duration buckets: bucket i holds durations in [edges[i-1], edges[i]) minutes
+DURATION_BUCKETS = ['<1h', '1-2h', '2-3h', '3-6h', '6-12h', '12-24h',
+                    '1-2d', '2-3d', '3-5d', '5-10d', '10-30d', '1-2m',
+                    '2-3m', '3-6m', '6-12m', '>12m']
+DURATION_BUCKET_EDGES = [60, 120, 180, 360, 720, 1440, 2880, 4320, 7200, 14400, 43200, 86400, 129600, 259200, 525600]
+NO_DURATION_BUCKET = 'No Duration Data'
+
+# Open escalations older than this many days are 'long_duration'
+LONG_DURATION_DAYS = 5
+
+ESCALATED_VALUES = ['1', 'True', 'true']
+
+
+def map_unique_values(values, formatter):
+    """
+    Apply a scalar formatter once per distinct value and broadcast the results back
+    (the formatter also receives missing values)
+    """
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=False)
+    formatted = np.array([formatter(value) for value in uniques], dtype=object)
+    return formatted[codes] if len(formatted) else np.array([], dtype=object)
+
+
+def format_assignee_name(assignee):
+    if pd.isna(assignee) or assignee == '' or assignee.lower() == 'unassigned':
+        return 'Unassigned'
+    cleaned = str(assignee).split('@')[0].replace('.', ' ').replace('_', ' ').replace('\r', ' ').replace('\n', ' ')
+    return titleize(cleaned)
+
+
+def case_type_names(codes, case_type_mapping=None):
+    """Case type display names from the Dim_WorkItemAttributes mapping (titleized code as fallback)"""
+    case_type_dict = {}
+    if case_type_mapping is not None and not case_type_mapping.empty:
+        case_type_dict = dict(zip(case_type_mapping['CaseTypeCode'], case_type_mapping['CaseTypeName']))
+        case_type_dict['Unspecified'] = 'Unspecified'
+        case_type_dict[''] = 'Unspecified'
+
+    def map_case_type(code):
+        if pd.isna(code) or code == '':
+            return 'Unspecified'
+        return case_type_dict.get(str(code), titleize(str(code)))
+
+    return map_unique_values(codes, map_case_type)
+
+
+def duration_buckets(minutes):
+    """Escalation duration bucket labels ('No Duration Data' for missing durations)"""
+    buckets = pd.cut(
+        pd.Series(minutes, dtype=np.float64), bins=[-np.inf] + DURATION_BUCKET_EDGES + [np.inf],
+        labels=DURATION_BUCKETS, right=False
+    )
+    return np.asarray(buckets.astype(object).fillna(NO_DURATION_BUCKET), dtype=object)
+
+
+def format_durations(minutes):
+    """'2d 3h' / '5h 12m' / '42m' labels for minute durations ('0h' for missing or zero)"""
+    values = pd.Series(minutes, dtype=np.float64).to_numpy()
+    blank = np.isnan(values) | (values == 0)
+    values = np.where(blank, 0, values)
+
+    hours = np.trunc(values / 60).astype(np.int64)
+    remaining_minutes = np.trunc(np.mod(values, 60)).astype(np.int64)
+    days = np.trunc(hours / 24).astype(np.int64)
+    remaining_hours = np.mod(hours, 24)
+
+    def text(numbers):
+        return pd.Series(numbers).astype(str).to_numpy(dtype=object)
+
+    return np.select(
+        [blank, days > 0, hours > 0],
+        [np.full(len(values), '0h', dtype=object),
+         text(days) + 'd ' + text(remaining_hours) + 'h',
+         text(hours) + 'h ' + text(remaining_minutes) + 'm'],
+        default=text(remaining_minutes) + 'm'
+    )
+
+
+def escalation_categories(is_escalated, closed_on, escalated_on, now=None):
+    """
+    Escalation category per ticket
+        recently_resolved - escalated and closed
+        current_escalated - escalated, still open, escalated at most LONG_DURATION_DAYS days ago
+        long_duration     - escalated, still open for longer
+        other_escalated   - not flagged as escalated, or missing the escalation date
+    """
+    now = now or datetime.now()
+    escalated = pd.Series(is_escalated).astype(str).str.strip().isin(ESCALATED_VALUES).to_numpy()
+    closed = pd.Series(closed_on).notna().to_numpy()
+    has_escalation_date = pd.Series(escalated_on).notna().to_numpy()
+    days_escalated = (pd.Timestamp(now) - pd.to_datetime(pd.Series(escalated_on), errors='coerce')).dt.days.to_numpy()
+
+    return np.select(
+        [~escalated, closed & has_escalation_date, has_escalation_date & (days_escalated > LONG_DURATION_DAYS),
+         has_escalation_date],
+        ['other_escalated', 'recently_resolved', 'long_duration', 'current_escalated'],
+        default='other_escalated'
+    ).astype(object)
+
+
+def long_duration_starts(is_escalated, closed_on, escalated_on):
+    """
+    Sorted moments at which open escalations turn from current_escalated into long_duration
+    (escalated_on + LONG_DURATION_DAYS + 1 days); the number of moments passed at a given time
+    identifies its escalation categories
+    """
+    escalated = pd.Series(is_escalated).astype(str).str.strip().isin(ESCALATED_VALUES).to_numpy()
+    open_escalations = escalated & pd.Series(closed_on).isna().to_numpy()
+    escalated_on = pd.to_datetime(pd.Series(escalated_on), errors='coerce')[open_escalations].dropna()
+    starts = escalated_on + pd.Timedelta(days=LONG_DURATION_DAYS + 1)
+    return np.sort(starts.to_numpy(dtype='datetime64[ns]'))
+
+
+def category_epoch(starts, now=None):
+    """Number of long_duration_starts passed at now (categories only change when it does)"""
+    now = np.datetime64(pd.Timestamp(now or datetime.now()).tz_localize(None), 'ns')
+    return int(np.searchsorted(starts, now, side='right'))
+
+
+def add_escalation_features(work_items, case_type_mapping=None, now=None):
+    """
+    Derived display and category columns for escalated tickets, computed in vectorized passes
+    Every column depends only on its own row, so the result can be computed once and filtered later
+
+    Adds: AssigneeDisplay, CaseTypeName, EscalationDurationBucket, EscalationCategory,
+          EscalationDurationFormatted, TimeToEscalationFormatted
+    """
+    df = work_items.copy()
+    df['AssigneeDisplay'] = map_unique_values(df['AssignedTo'], format_assignee_name)
+    df['CaseTypeName'] = case_type_names(df['WorkItemDefinitionShortCode'], case_type_mapping)
+    df['EscalationDurationBucket'] = duration_buckets(df['EscalationDurationMinutes'])
+    df['EscalationCategory'] = escalation_categories(df['IsEscalated'], df['ClosedOn'], df['EscalatedOn'], now)
+    df['EscalationDurationFormatted'] = format_durations(df['EscalationDurationMinutes'])
+    df['TimeToEscalationFormatted'] = format_durations(df['TimeToEscalationMinutes'])
+    return df
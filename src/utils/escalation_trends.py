@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+# Trend window in days -> granularity of the chart
+TREND_WINDOWS = {
+    7: 'daily',
+    30: 'daily',
+    90: 'weekly'
+}
+
+# 'All Time' trends switch from weekly to monthly points past this span
+ALL_TIME_WEEKLY_SPAN_DAYS = 365
+
+GRANULARITY_LABELS = {
+    'daily': 'Daily',
+    'weekly': 'Weekly',
+    'monthly': 'Monthly'
+}
+
+_ONE_DAY = np.timedelta64(1, 'D')
+
+
+def calendar_numbers(dates):
+    """
+    Integer calendar numbers of datetime64 values (all counted from 1970-01-01)
+        daily   - day number
+        weekly  - Monday-based week number (1970-01-01 was a Thursday)
+        monthly - month number
+    """
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    days = dates.astype('datetime64[D]').astype(np.int64)
+    return {
+        'daily': days,
+        'weekly': (days + 3) // 7,
+        'monthly': dates.astype('datetime64[M]').astype(np.int64)
+    }
+
+
+def calendar_labels(numbers, granularity):
+    """Chart labels for calendar numbers - '2025-02-04', 'Week of 2025-02-03' or '2025-02'"""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    if granularity == 'monthly':
+        return pd.DatetimeIndex(numbers.astype('datetime64[M]').astype('datetime64[ns]')).strftime('%Y-%m')
+    if granularity == 'weekly':
+        week_starts = (numbers * 7 - 3).astype('datetime64[D]').astype('datetime64[ns]')
+        return 'Week of ' + pd.DatetimeIndex(week_starts).strftime('%Y-%m-%d')
+    return pd.DatetimeIndex(numbers.astype('datetime64[D]').astype('datetime64[ns]')).strftime('%Y-%m-%d')
+
+
+class EscalationTrendIndex:
+    """
+    Escalations sorted by EscalatedOn with a category code and calendar numbers per row
+
+    A 'last N days' window is a searchsorted slice of the sorted timestamps, and the
+    category x period counts for it are a single bincount over that slice, so moving
+    between trend windows never re-groups the ticket table. Tickets without an
+    escalation date are only part of the 'All Time' ticket count.
+    """
+
+    def __init__(self, tickets):
+        self.ticket_count = len(tickets)
+        escalated_on = pd.to_datetime(tickets['EscalatedOn'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        codes, categories = pd.factorize(pd.Series(tickets['EscalationCategory']), sort=True)
+        valid = ~np.isnat(escalated_on) & (codes >= 0)
+
+        order = np.argsort(escalated_on[valid], kind='stable')
+        self.escalated_on = escalated_on[valid][order]
+        self.category_codes = np.asarray(codes, dtype=np.int64)[valid][order]
+        self.categories = pd.Index(categories)
+        self.calendar = calendar_numbers(self.escalated_on)
+
+    def window(self, time_period, end_date):
+        """
+        Positions, granularity and title of a trend window ending on end_date
+
+        Returns:
+            tuple: (start, stop, granularity, title_period) - rows [start, stop) are in the window
+        """
+        if time_period == 'all':
+            span_days = 0
+            if len(self.escalated_on):
+                span_days = int((self.escalated_on[-1] - self.escalated_on[0]) // _ONE_DAY)
+            granularity = 'weekly' if span_days <= ALL_TIME_WEEKLY_SPAN_DAYS else 'monthly'
+            return 0, len(self.escalated_on), granularity, "All Time"
+
+        days = int(time_period)
+        granularity = TREND_WINDOWS.get(days, 'daily' if days <= 30 else 'weekly')
+        end_date = pd.Timestamp(end_date)
+        start_date = end_date - pd.Timedelta(days=days - 1)
+        start = np.searchsorted(self.escalated_on, np.datetime64(start_date, 'ns'), side='left')
+        stop = np.searchsorted(self.escalated_on, np.datetime64(end_date + pd.Timedelta(days=1), 'ns'), side='right')
+        return int(start), int(stop), granularity, f"Last {days} Days"
+
+    def trends(self, time_period, end_date):
+        """
+        Escalations per category per period for a trend window
+
+        Returns:
+            tuple: (trends_data, granularity, title_period, ticket_count) - trends_data has one row
+                   per period with escalations (chronological labels) and one column per category
+                   present in the window (sorted)
+        """
+        start, stop, granularity, title_period = self.window(time_period, end_date)
+        ticket_count = self.ticket_count if time_period == 'all' else stop - start
+
+        periods, period_codes = np.unique(self.calendar[granularity][start:stop], return_inverse=True)
+        n_categories = len(self.categories)
+        counts = np.bincount(
+            period_codes.ravel() * n_categories + self.category_codes[start:stop],
+            minlength=len(periods) * n_categories
+        ).reshape(len(periods), n_categories)
+
+        present = counts.sum(axis=0) > 0
+        trends_data = pd.DataFrame(
+            counts[:, present], index=calendar_labels(periods, granularity), columns=self.categories[present]
+        )
+        return trends_data, granularity, title_period, ticket_count
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# A "session slot" is one class occurrence with its instructor/location/AOR attributes.
+# Every filter of the gap analysis is a predicate on slot attributes, so filtering
+# is a boolean mask over matrix columns rather than a re-filter of raw registrations.
+SLOT_COLUMNS = ['TrainingClassId', 'ClassName', 'ParsedStartTime', 'InstructorId', 'InstructorName',
+                'LocationId', 'LocationName', 'AorShortName']
+MEMBER_COLUMNS = ['MemberID', 'MemberName', 'MemberOffice']
+
+# analysis_level -> (grouping columns, label column)
+SLOT_LEVELS = {
+    'class': (['TrainingClassId', 'ClassName'], 'ClassName'),
+    'instructor': (['InstructorName'], 'InstructorName'),
+    'location': (['LocationName'], 'LocationName'),
+    'aor': (['AorShortName'], 'AorShortName')
+}
+MEMBER_LEVELS = {
+    'member': (['MemberID', 'MemberName'], 'MemberName'),
+    'office': (['MemberOffice'], 'MemberOffice')
+}
+
+
+def _group_codes(frame, columns, label_column):
+    """
+    Integer group codes for frame rows plus the label of every group
+    Rows with a missing key get -1, matching pandas groupby(dropna=True)
+    """
+    grouped = frame.groupby(columns, sort=True, dropna=True)
+    codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    labels = grouped.size().index.get_level_values(label_column) if len(columns) > 1 else grouped.size().index
+    return codes, np.asarray(labels, dtype=object)
+
+
+def _reduce(codes, weights, size):
+    """Sum weights per group code, ignoring rows outside any group"""
+    valid = codes >= 0
+    return np.bincount(codes[valid], weights=weights[valid], minlength=size)
+
+
+class GapAnalysisEngine:
+    """
+    Registration vs attendance matrices built once per data refresh
+
+    R and P are sparse member x slot matrices of registrations and attendances
+    (presences). Gaps at any level are reductions over them:
+        slot levels (class, instructor, location, AOR) - column sums grouped by slot attribute
+        topic - slot totals pushed through the sparse slot x topic incidence matrix
+        member levels (member, office) - R @ mask and P @ mask row reductions
+    """
+
+    def __init__(self, df_class_attendance, df_topics=None, df_aor_offices=None):
+        records = df_class_attendance.dropna(subset=['ParsedStartTime']).reset_index(drop=True)
+        self.aor_offices = df_aor_offices if df_aor_offices is not None else pd.DataFrame()
+
+        registered = records['AttendanceID'].notna().to_numpy(dtype=np.float64)
+        present = (records['WasPresent'] == 'True').to_numpy(dtype=np.float64)
+
+        # Slots (matrix columns)
+        slot_codes = records.groupby(SLOT_COLUMNS, sort=True, dropna=False).ngroup().to_numpy(dtype=np.int64)
+        _, first_rows = np.unique(slot_codes, return_index=True)
+        self.slots = records.iloc[first_rows][SLOT_COLUMNS].reset_index(drop=True)
+        n_slots = len(self.slots)
+
+        # Members (matrix rows)
+        row_codes = records.groupby(MEMBER_COLUMNS, sort=True, dropna=False).ngroup().to_numpy(dtype=np.int64)
+        _, first_member_rows = np.unique(row_codes, return_index=True)
+        self.members = records.iloc[first_member_rows][MEMBER_COLUMNS].reset_index(drop=True)
+        n_rows = len(self.members)
+
+        shape = (n_rows, n_slots)
+        self.registrations = sparse.csr_matrix((registered, (row_codes, slot_codes)), shape=shape)
+        self.attendances = sparse.csr_matrix((present, (row_codes, slot_codes)), shape=shape)
+
+        # Column totals never depend on the row set, so they are reduced once
+        self.slot_registrations = np.asarray(self.registrations.sum(axis=0)).ravel()
+        self.slot_attendances = np.asarray(self.attendances.sum(axis=0)).ravel()
+
+        self.slot_level_codes = {
+            level: _group_codes(self.slots, columns, label) for level, (columns, label) in SLOT_LEVELS.items()
+        }
+        self.member_level_codes = {
+            level: _group_codes(self.members, columns, label) for level, (columns, label) in MEMBER_LEVELS.items()
+        }
+
+        self._build_topic_pairs(df_topics)
+
+    def _build_topic_pairs(self, df_topics):
+        """(slot, topic, assignment row) pairs equivalent to merging registrations onto topic assignments"""
+        self.topics = df_topics.reset_index(drop=True) if df_topics is not None else pd.DataFrame()
+        if self.topics.empty:
+            self.topic_labels = np.array([], dtype=object)
+            self.topic_pairs = np.empty((0, 3), dtype=np.int64)
+            return
+
+        topic_codes, self.topic_labels = _group_codes(self.topics, ['TrainingTopicName'], 'TrainingTopicName')
+        assignments = pd.DataFrame({
+            'TrainingClassId': self.topics['TrainingClassId'],
+            'TopicCode': topic_codes,
+            'AssignmentRow': np.arange(len(self.topics))
+        })
+        assignments = assignments.loc[assignments['TopicCode'] >= 0]
+        slot_classes = pd.DataFrame({
+            'TrainingClassId': self.slots['TrainingClassId'],
+            'SlotCode': np.arange(len(self.slots))
+        })
+        pairs = slot_classes.merge(assignments, on='TrainingClassId', how='inner')
+        self.topic_pairs = pairs[['SlotCode', 'TopicCode', 'AssignmentRow']].to_numpy(dtype=np.int64)
+
+    def topic_matrix(self, topic_mask=None):
+        """Sparse slot x topic incidence for the assignment rows kept by topic_mask"""
+        pairs = self.topic_pairs
+        if topic_mask is not None:
+            pairs = pairs[topic_mask[pairs[:, 2]]]
+        return sparse.csr_matrix(
+            (np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])),
+            shape=(len(self.slots), len(self.topic_labels))
+        )
+
+    def gap_totals(self, analysis_level, slot_mask=None, topic_mask=None):
+        """
+        Registrations and attendances per category for the masked slots
+
+        Returns:
+            pd.DataFrame: CategoryName, Registrations, Attendances
+        """
+        if slot_mask is None:
+            slot_mask = np.ones(len(self.slots), dtype=bool)
+        weights = slot_mask.astype(np.float64)
+
+        if analysis_level == 'topic' and len(self.topic_pairs) and (topic_mask is None or topic_mask.any()):
+            incidence = self.topic_matrix(topic_mask)
+            registrations = incidence.T @ (self.slot_registrations * weights)
+            attendances = incidence.T @ (self.slot_attendances * weights)
+            labels = self.topic_labels
+            # Topics without any matched registration do not appear in a grouped result
+            present_groups = np.asarray(incidence.T @ weights > 0).ravel()
+        elif analysis_level in MEMBER_LEVELS:
+            codes, labels = self.member_level_codes[analysis_level]
+            row_registrations = self.registrations @ weights
+            row_attendances = self.attendances @ weights
+            registrations = _reduce(codes, row_registrations, len(labels))
+            attendances = _reduce(codes, row_attendances, len(labels))
+            present_groups = registrations > 0
+        else:
+            # Fallback to class level if no topic data
+            level = analysis_level if analysis_level in SLOT_LEVELS else 'class'
+            codes, labels = self.slot_level_codes[level]
+            slot_codes = np.where(slot_mask, codes, -1)
+            registrations = _reduce(slot_codes, self.slot_registrations, len(labels))
+            attendances = _reduce(slot_codes, self.slot_attendances, len(labels))
+            present_groups = np.bincount(slot_codes[slot_codes >= 0], minlength=len(labels)) > 0
+
+        return pd.DataFrame({
+            'CategoryName': labels[present_groups],
+            'Registrations': np.rint(registrations[present_groups]).astype(np.int64),
+            'Attendances': np.rint(attendances[present_groups]).astype(np.int64)
+        })
@@ -0,0 +1,252 @@
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# Recent classes can still change, so training classes starting (or modified) within this
+# window before the previous sync are reloaded on every sync
+REOPEN_WINDOW = pd.Timedelta(days=30)
+
+SESSION_COLUMNS = ['InstructorId', 'InstructorName', 'TrainingClassId', 'ParsedStartTime', 'AorShortName',
+                   'LocationId', 'Registrations', 'AttendeesPresent', 'ClassSize']
+ENROLLMENT_COLUMNS = ['InstructorId', 'TrainingClassId', 'MemberID']
+CLASS_COLUMNS = ['InstructorId', 'TrainingClassId', 'ParsedStartTime', 'AorShortName', 'LocationId']
+# Fact_ClassAttendance has no ModifiedOn, so a class is re-aggregated whenever the checksum
+# of these columns over its attendance rows changes
+ATTENDANCE_CHECKSUM_COLUMNS = ['InstructorId', 'InstructorName', 'TrainingClassId', 'StartTime', 'AorShortName',
+                               'LocationId', 'MemberID', 'WasPresent', 'AttendeeEmail']
+
+
+def top_n_positions(values, n):
+    """
+    Positions of the n largest values, largest first
+    Uses argpartition so only the selected head is fully sorted
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if n >= len(values):
+        return np.argsort(-values, kind='stable')
+    head = np.argpartition(-values, n)[:n]
+    return head[np.argsort(-values[head], kind='stable')]
+
+
+def rank_frame(df, column, head=20):
+    """Order a frame so its first `head` rows are the top values of column (remaining rows unordered)"""
+    if df.empty:
+        return df
+    values = df[column].fillna(-np.inf).to_numpy(dtype=np.float64)
+    head_positions = top_n_positions(values, head)
+    rest = np.setdiff1d(np.arange(len(df)), head_positions, assume_unique=True)
+    return df.iloc[np.concatenate([head_positions, rest])]
+
+
+def attendance_checksums(df_class_attendance):
+    """Order-independent checksum of every class's attendance rows (Series indexed by TrainingClassId)"""
+    columns = [column for column in ATTENDANCE_CHECKSUM_COLUMNS if column in df_class_attendance.columns]
+    row_hashes = pd.util.hash_pandas_object(df_class_attendance[columns], index=False)
+    # uint64 sums wrap around, which keeps them exact
+    return row_hashes.groupby(df_class_attendance['TrainingClassId'].to_numpy()).sum()
+
+
+def _append(kept, rows):
+    """Concatenate kept cells with new ones (skipping empty frames so dtypes are preserved)"""
+    if rows.empty:
+        return kept.reset_index(drop=True)
+    if kept.empty:
+        return rows.reset_index(drop=True)
+    return pd.concat([kept, rows], ignore_index=True)
+
+
+class InstructorMetricsStore:
+    """
+    Compact per-instructor session metrics, synced incrementally from the raw facts
+
+    sessions     - one row per instructor x class: registrations, attendees present, class size
+    enrollments  - distinct instructor x class x member (only needed for unique-student counts)
+    classes      - one row per instructor x class from Fact_TrainingClasses (sessions per month)
+
+    Each cell keeps its session start time, AOR and location so every dashboard filter
+    stays exact, while a sync only aggregates classes whose attendance rows changed
+    (new classes included) and reloads classes that are new or still open.
+    Classes missing from the incoming facts are dropped, so deletions show up.
+    Assumes a class has a single start time, AOR and location.
+    """
+
+    def __init__(self):
+        self.sessions = pd.DataFrame(columns=SESSION_COLUMNS)
+        self.enrollments = pd.DataFrame(columns=ENROLLMENT_COLUMNS)
+        self.classes = pd.DataFrame(columns=CLASS_COLUMNS)
+        self.session_checksums = pd.Series(dtype=np.uint64)
+        self.instructors = pd.DataFrame()
+        self.aor_offices = pd.DataFrame()
+        self.version = 0
+        self.synced_at = None
+        self.synced_on = None
+        self._lock = threading.Lock()
+
+    @property
+    def empty(self):
+        return self.sessions.empty and self.instructors.empty
+
+    def _changed_class_ids(self, frame, known):
+        """
+        Class ids in frame that are unknown to the store, start within REOPEN_WINDOW before
+        the previous sync or later (scheduled classes included), or carry a ModifiedOn in
+        that window
+        """
+        incoming = frame['TrainingClassId'].dropna().unique()
+        if known.empty or self.synced_on is None:
+            return incoming
+        reopen_from = self.synced_on - REOPEN_WINDOW
+        known_starts = known.drop_duplicates('TrainingClassId').set_index('TrainingClassId')['ParsedStartTime']
+        reopened = known_starts.index[known_starts >= reopen_from]
+        unknown = incoming[~pd.Index(incoming).isin(known_starts.index)]
+        changed = np.union1d(unknown, np.intersect1d(incoming, reopened))
+
+        if 'ModifiedOn' in frame.columns:
+            modified_on = pd.to_datetime(frame['ModifiedOn'], errors='coerce')
+            if modified_on.dt.tz is not None:
+                modified_on = modified_on.dt.tz_convert(None)
+            modified = frame.loc[(modified_on >= reopen_from).to_numpy(), 'TrainingClassId'].dropna().unique()
+            changed = np.union1d(changed, modified)
+        return changed
+
+    def _changed_session_ids(self, checksums):
+        """Class ids whose attendance checksum is new or differs from the one of the previous sync"""
+        known = self.session_checksums
+        common = checksums.index.intersection(known.index)
+        unchanged = common[checksums.loc[common].to_numpy() == known.loc[common].to_numpy()]
+        return checksums.index.difference(unchanged).to_numpy()
+
+    def sync(self, df_instructor_perf, df_class_attendance, df_training_classes, parse_start_times,
+             df_aor_offices=None):
+        """
+        Fold new or changed classes into the store
+        Instructor profiles and the AOR-office mapping are small and replaced outright
+
+        Args:
+            parse_start_times (callable): Series of raw StartTime values -> datetime Series;
+                only called for the rows being (re)aggregated
+        """
+        with self._lock:
+            self.instructors = df_instructor_perf.copy() if df_instructor_perf is not None else pd.DataFrame()
+            self.aor_offices = df_aor_offices.copy() if df_aor_offices is not None else pd.DataFrame()
+
+            if df_class_attendance is not None and not df_class_attendance.empty:
+                checksums = attendance_checksums(df_class_attendance)
+                changed = self._changed_session_ids(checksums)
+                rows = df_class_attendance.loc[df_class_attendance['TrainingClassId'].isin(changed)].copy()
+                if not rows.empty:
+                    rows.loc[:, 'ParsedStartTime'] = parse_start_times(rows['StartTime'])
+                    rows = rows.dropna(subset=['ParsedStartTime'])
+                incoming = df_class_attendance['TrainingClassId'].dropna().unique()
+                self.sessions, self.enrollments = self._upsert_sessions(rows, changed, incoming)
+                self.session_checksums = checksums
+
+            if df_training_classes is not None and not df_training_classes.empty:
+                changed = self._changed_class_ids(df_training_classes, self.classes)
+                rows = df_training_classes.loc[df_training_classes['TrainingClassId'].isin(changed)].copy()
+                if not rows.empty:
+                    rows.loc[:, 'ParsedStartTime'] = parse_start_times(rows['StartTime'])
+                    rows = rows.dropna(subset=['ParsedStartTime'])
+                kept = self.classes.loc[
+                    ~self.classes['TrainingClassId'].isin(changed) &
+                    self.classes['TrainingClassId'].isin(df_training_classes['TrainingClassId'])
+                ]
+                self.classes = _append(kept, rows.reindex(columns=CLASS_COLUMNS))
+
+            self.version += 1
+            self.synced_at = time.time()
+            self.synced_on = pd.Timestamp.now()
+
+    def _upsert_sessions(self, rows, changed, incoming):
+        """Replace the cells of changed classes and drop those of classes no longer in incoming"""
+        kept_sessions = self.sessions.loc[
+            ~self.sessions['TrainingClassId'].isin(changed) & self.sessions['TrainingClassId'].isin(incoming)
+        ]
+        kept_enrollments = self.enrollments.loc[
+            ~self.enrollments['TrainingClassId'].isin(changed) & self.enrollments['TrainingClassId'].isin(incoming)
+        ]
+        if rows.empty:
+            return _append(kept_sessions, rows), _append(kept_enrollments, rows)
+
+        rows.loc[:, 'IsPresent'] = (rows['WasPresent'] == 'True').astype(np.int64)
+        sessions = rows.groupby(['InstructorId', 'TrainingClassId'], sort=False).agg(
+            InstructorName=('InstructorName', 'first'),
+            ParsedStartTime=('ParsedStartTime', 'first'),
+            AorShortName=('AorShortName', 'first'),
+            LocationId=('LocationId', 'first'),
+            Registrations=('AttendeeEmail', 'count'),
+            AttendeesPresent=('IsPresent', 'sum'),
+            ClassSize=('MemberID', 'nunique')
+        ).reset_index()[SESSION_COLUMNS]
+        enrollments = rows[ENROLLMENT_COLUMNS].dropna(subset=['MemberID']).drop_duplicates()
+
+        return _append(kept_sessions, sessions), _append(kept_enrollments, enrollments)
+
+    @staticmethod
+    def filter_mask(frame, start_dt=None, end_dt=None, aor_list=None, office_aors=None,
+                    instructor_list=None, location_list=None):
+        """Boolean mask over store cells for the dashboard filter selections"""
+        mask = np.ones(len(frame), dtype=bool)
+        if frame.empty:
+            return mask
+        if start_dt is not None and end_dt is not None:
+            starts = frame['ParsedStartTime']
+            mask &= ((starts >= start_dt) & (starts <= end_dt)).to_numpy()
+        if aor_list:
+            mask &= frame['AorShortName'].isin(aor_list).to_numpy()
+        if office_aors is not None and len(office_aors) > 0:
+            mask &= frame['AorShortName'].isin(office_aors).to_numpy()
+        if instructor_list:
+            mask &= frame['InstructorId'].astype(str).isin(instructor_list).to_numpy()
+        if location_list:
+            mask &= frame['LocationId'].astype(str).isin(location_list).to_numpy()
+        return mask
+
+    def attendance_metrics(self, session_mask, include_unique_students=False):
+        """Per-instructor attendance metrics for the masked session cells"""
+        sessions = self.sessions.loc[session_mask]
+        if sessions.empty:
+            return pd.DataFrame()
+
+        metrics = sessions.groupby('InstructorId').agg(
+            ClassesConductedFromAttendance=('TrainingClassId', 'nunique'),
+            AttendeesPresent=('AttendeesPresent', 'sum'),
+            TotalRegistrations=('Registrations', 'sum'),
+            AverageClassSize=('ClassSize', 'mean')
+        ).reset_index()
+
+        # Calculate attendance rate
+        metrics.loc[:, 'CalculatedAttendanceRate'] = (
+            metrics['AttendeesPresent'] / metrics['TotalRegistrations'] * 100
+        ).fillna(0)
+
+        if include_unique_students:
+            session_keys = pd.MultiIndex.from_frame(sessions[['InstructorId', 'TrainingClassId']])
+            enrollment_keys = pd.MultiIndex.from_frame(self.enrollments[['InstructorId', 'TrainingClassId']])
+            enrollments = self.enrollments.loc[enrollment_keys.isin(session_keys)]
+            unique_students = enrollments.groupby('InstructorId')['MemberID'].nunique().rename('UniqueStudents')
+            metrics = metrics.merge(unique_students, left_on='InstructorId', right_index=True, how='left')
+
+        return metrics.rename(columns={'InstructorId': 'InstructorID'})
+
+    def session_rate_metrics(self, class_mask):
+        """Sessions per month per instructor for the masked classes"""
+        classes = self.classes.loc[class_mask]
+        if classes.empty:
+            return pd.DataFrame()
+
+        instructor_sessions = classes.groupby('InstructorId').agg(
+            TotalClassesFromClasses=('TrainingClassId', 'nunique'),
+            FirstSession=('ParsedStartTime', 'min'),
+            LastSession=('ParsedStartTime', 'max')
+        ).reset_index()
+
+        # Months between first and last session, at least 1 month
+        months_active = (instructor_sessions['LastSession'] - instructor_sessions['FirstSession']).dt.days / 30.44
+        instructor_sessions.loc[:, 'MonthsActive'] = months_active.fillna(1).clip(lower=1)
+        instructor_sessions.loc[:, 'SessionsPerMonth'] = (
+            instructor_sessions['TotalClassesFromClasses'] / instructor_sessions['MonthsActive']
+        )
+
+        return instructor_sessions.rename(columns={'InstructorId': 'InstructorID'})[['InstructorID', 'SessionsPerMonth']]
@@ -0,0 +1,103 @@
+import json
+import numpy as np
+import pandas as pd
+
+
+class RaggedColumn:
+    """
+    A column of lists stored as one flat values array plus row offsets
+
+    Row i holds values[offsets[i]:offsets[i + 1]], so list lengths are np.diff(offsets)
+    and never need a Python object per cell. to_lists slices the per-row lists out
+    only for callers that work on list cells.
+    """
+
+    def __init__(self, values, offsets):
+        self.values = values
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def row_ids(self):
+        """Row number of every flat value"""
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+    def to_lists(self):
+        """One Python list per row (for callers that work on list cells)"""
+        values = self.values.tolist()
+        return [values[start:stop] for start, stop in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())]
+
+
+class _RowEnd:
+    """Marker decoded in place of the separator written after every row"""
+
+
+_ROW_END = _RowEnd()
+_ROW_END_KEY = '\x00row_end'
+_ROW_END_JSON = json.dumps({_ROW_END_KEY: 0})
+
+
+def _row_end_hook(decoded):
+    return _ROW_END if len(decoded) == 1 and _ROW_END_KEY in decoded else decoded
+
+
+def _scalar_text(text):
+    """JSON text of a non-array cell's values: JSON null holds none, a scalar holds one"""
+    return '' if json.loads(text) is None else text
+
+
+def decode_json_lists(column):
+    """
+    Decode a column of JSON arrays ('["a", "b"]') into a RaggedColumn in one pass
+
+    The contents of every cell are written into a single flat JSON array, each row
+    followed by a row-end marker, and parsed with one json.loads call. The marker
+    positions give the row offsets, so no Python list is built per cell. Missing
+    cells and JSON null become empty rows and scalars become one-value rows.
+    Malformed JSON raises json.JSONDecodeError like json.loads.
+    """
+    texts = pd.Series(column, dtype=object).to_numpy()
+    missing = pd.isna(texts)
+
+    parts = []
+    for text, is_missing in zip(texts.tolist(), missing.tolist()):
+        text = '' if is_missing else text.strip() if isinstance(text, str) else json.dumps(text)
+        if is_missing:
+            contents = ''
+        elif text[:1] == '[' and text[-1:] == ']':
+            contents = text[1:-1]
+        else:
+            contents = _scalar_text(text)
+        parts.append(f"{contents},{_ROW_END_JSON}" if contents.strip() else _ROW_END_JSON)
+
+    flat = json.loads('[' + ','.join(parts) + ']', object_hook=_row_end_hook)
+    flat = np.fromiter(flat, dtype=object, count=len(flat))
+    is_row_end = flat == _ROW_END
+    row_ends = np.flatnonzero(is_row_end)
+    if len(row_ends) != len(texts):
+        # Unbalanced brackets across cells ('[[1]' then '[2]]') nested some row ends
+        raise json.JSONDecodeError('Unbalanced JSON array cell', '', 0)
+
+    # Each row end sits after its row's values, shifted by the row ends before it
+    offsets = np.concatenate([[0], row_ends - np.arange(len(row_ends))])
+    return RaggedColumn(flat[~is_row_end], offsets)
+
+
+def parse_json_list_columns(df, columns):
+    """
+    Replace JSON array columns of df with list cells, decoding each column in one pass
+
+    Returns:
+        dict: column -> RaggedColumn for every column present in df (for list lengths)
+    """
+    ragged = {}
+    for column in columns:
+        if column in df.columns:
+            ragged[column] = decode_json_lists(df[column])
+            df[column] = ragged[column].to_lists()
+    return ragged
@@ -0,0 +1,208 @@
+import re
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.utils.cache import LocalCache
+
+# Dash DataTable filter operators (symbolic and relational forms) mapped to a canonical name
+FILTER_OPERATORS = {
+    '=': 'eq', 'eq': 'eq',
+    '!=': 'ne', 'ne': 'ne',
+    '<': 'lt', 'lt': 'lt',
+    '<=': 'le', 'le': 'le',
+    '>': 'gt', 'gt': 'gt',
+    '>=': 'ge', 'ge': 'ge',
+    'contains': 'contains',
+    'datestartswith': 'datestartswith',
+}
+
+_FILTER_PART_PATTERN = re.compile(r'^\s*\{(?P<column>[^}]+)\}\s*(?P<rest>.*)$')
+
+
+def split_filter_part(filter_part):
+    """
+    Parse one DataTable filter expression, e.g. '{Member Name} icontains "smith"'
+
+    Returns:
+        tuple: (column, operator, value, case_sensitive) or (None, None, None, False)
+    """
+    match = _FILTER_PART_PATTERN.match(filter_part)
+    if not match:
+        return None, None, None, False
+
+    column = match.group('column')
+    rest = match.group('rest').strip()
+
+    operator = None
+    case_sensitive = False
+    value_part = rest
+
+    token, _, remainder = rest.partition(' ')
+    candidate = token.lower()
+    if candidate[:1] in ('s', 'i') and candidate[1:] in FILTER_OPERATORS and candidate not in FILTER_OPERATORS:
+        case_sensitive = candidate[0] == 's'
+        candidate = candidate[1:]
+    if candidate in FILTER_OPERATORS:
+        operator = FILTER_OPERATORS[candidate]
+        value_part = remainder.strip()
+
+    if not value_part:
+        return column, operator, None, case_sensitive
+
+    quote = value_part[0]
+    if quote == value_part[-1] and quote in ("'", '"', '`') and len(value_part) > 1:
+        value = value_part[1:-1].replace('\\' + quote, quote)
+    else:
+        try:
+            value = float(value_part)
+        except ValueError:
+            value = value_part
+
+    return column, operator, value, case_sensitive
+
+
+def build_filter_mask(df, filter_query):
+    """
+    Evaluate a DataTable filter_query against a frame as a boolean NumPy mask
+    Returns None when the query does not restrict any rows
+    """
+    if not filter_query or df.empty:
+        return None
+
+    mask = None
+    for filter_part in filter_query.split(' && '):
+        column, operator, value, case_sensitive = split_filter_part(filter_part)
+        if column not in df.columns or value is None:
+            continue
+
+        series = df[column]
+        is_numeric = pd.api.types.is_numeric_dtype(series)
+        if operator is None:
+            operator = 'eq' if is_numeric and isinstance(value, float) else 'contains'
+
+        if operator in ('eq', 'ne', 'lt', 'le', 'gt', 'ge'):
+            if is_numeric:
+                target = pd.to_numeric(pd.Series([value]), errors='coerce').iloc[0]
+                if pd.isna(target):
+                    part_mask = np.zeros(len(df), dtype=bool)
+                else:
+                    part_mask = getattr(series, operator)(target).to_numpy(dtype=bool)
+            else:
+                text = series.astype(str)
+                target = str(value)
+                if isinstance(value, float) and value.is_integer():
+                    target = str(int(value))
+                if not case_sensitive:
+                    text = text.str.lower()
+                    target = target.lower()
+                part_mask = (getattr(text, operator)(target) & series.notna()).to_numpy(dtype=bool)
+        elif operator == 'contains':
+            target = str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+            part_mask = series.astype(str).str.contains(
+                target, case=case_sensitive, regex=False, na=False
+            ).to_numpy(dtype=bool) & series.notna().to_numpy()
+        elif operator == 'datestartswith':
+            part_mask = series.astype(str).str.startswith(str(value), na=False).to_numpy(dtype=bool)
+        else:
+            continue
+
+        mask = part_mask if mask is None else (mask & part_mask)
+
+    return mask
+
+
+class PagedFrame:
+    """
+    Report frame prepared once for server-side DataTable paging
+    Sort orders are computed once per sort spec and reused across page requests,
+    so serving a page is a mask-and-slice over a pre-sorted position index
+    """
+
+    def __init__(self, df, max_cached_views=16):
+        self.df = df.reset_index(drop=True)
+        self._max_cached_views = max_cached_views
+        self._sort_orders = {}
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def empty(self):
+        return self.df.empty
+
+    def sort_order(self, sort_by=None):
+        """Row positions ordered by a DataTable sort_by spec (cached per spec)"""
+        sort_by = [s for s in (sort_by or []) if s.get('column_id') in self.df.columns]
+        sort_key = tuple((s['column_id'], s.get('direction', 'asc')) for s in sort_by)
+
+        with self._lock:
+            order = self._sort_orders.get(sort_key)
+        if order is not None:
+            return order
+
+        if not sort_key:
+            order = np.arange(len(self.df))
+        else:
+            order = self.df.sort_values(
+                by=[column for column, _ in sort_key],
+                ascending=[direction == 'asc' for _, direction in sort_key],
+                kind='mergesort',
+                na_position='last'
+            ).index.to_numpy()
+
+        with self._lock:
+            self._sort_orders[sort_key] = order
+        return order
+
+    def view_positions(self, sort_by=None, filter_query=None):
+        """Sorted row positions that survive the filter query"""
+        view_key = (
+            tuple((s.get('column_id'), s.get('direction')) for s in (sort_by or [])),
+            filter_query or ''
+        )
+        with self._lock:
+            positions = self._views.get(view_key)
+            if positions is not None:
+                self._views.move_to_end(view_key)
+                return positions
+
+        order = self.sort_order(sort_by)
+        mask = build_filter_mask(self.df, filter_query)
+        positions = order if mask is None else order[mask[order]]
+
+        with self._lock:
+            self._views[view_key] = positions
+            while len(self._views) > self._max_cached_views:
+                self._views.popitem(last=False)
+        return positions
+
+    def get_page(self, page_current=0, page_size=25, sort_by=None, filter_query=None):
+        """
+        Serve a single page of records
+
+        Returns:
+            tuple: (records, matching_row_count, page_count)
+        """
+        positions = self.view_positions(sort_by, filter_query)
+        total_rows = len(positions)
+        page_size = max(1, int(page_size or 25))
+        page_count = max(1, -(-total_rows // page_size))
+        page_current = min(max(0, int(page_current or 0)), page_count - 1)
+
+        start = page_current * page_size
+        page_positions = positions[start:start + page_size]
+        records = self.df.iloc[page_positions].to_dict('records')
+        return records, total_rows, page_count
+
+
+class PagedFrameCache(LocalCache):
+    """
+    In-process LRU of PagedFrame objects keyed by filter/report hash
+    """
+
+    def get_or_build(self, key, builder):
+        """Return the cached PagedFrame for key, building it from builder() on a miss"""
+        return super().get_or_build(key, lambda: PagedFrame(builder()))
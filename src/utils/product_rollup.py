@@ -0,0 +1,77 @@
+import numpy as np
+
+
+def top_positions(counts, top_count):
+    """
+    Positions of the top_count largest counts, largest first (ties keep their original order)
+    Uses a partial selection, so only the selected counts are sorted
+    """
+    counts = np.asarray(counts)
+    if top_count == 'all' or top_count is None or top_count >= len(counts):
+        return np.argsort(-counts, kind='stable')
+    if top_count <= 0:
+        return np.array([], dtype=np.int64)
+
+    threshold = np.partition(counts, len(counts) - top_count)[len(counts) - top_count]
+    above = np.flatnonzero(counts > threshold)
+    at_threshold = np.flatnonzero(counts == threshold)[:top_count - len(above)]
+    selected = np.concatenate([above, at_threshold])
+    return selected[np.argsort(-counts[selected], kind='stable')]
+
+
+class ProductImpactRollup:
+    """
+    Ticket counts for the Product -> Feature -> Issue hierarchy of one filtered ticket set
+
+    Tickets are grouped once at the issue level; the feature and product levels are rolled
+    up from those leaf counts. Rows missing a level's key count toward the levels above it
+    only, like grouping each level separately. Every chart type and the insights read from
+    these tables, and top-N selections are partial selections over their counts.
+    """
+
+    def __init__(self, tickets):
+        self.total_tickets = len(tickets)
+        leaves = tickets.groupby(['Product', 'Feature', 'Issue'], dropna=False).size().rename('TicketCount').reset_index()
+
+        self.products = leaves.groupby('Product').agg(TicketCount=('TicketCount', 'sum')).reset_index()
+        self.product_features = (
+            leaves.dropna(subset=['Product', 'Feature'])
+            .groupby(['Product', 'Feature'])['TicketCount'].sum()
+            .reset_index()
+        )
+        feature_counts = self.product_features.groupby('Product').size()
+        self.products['FeatureCount'] = feature_counts.reindex(self.products['Product']).fillna(0).astype(np.int64).to_numpy()
+
+        issues = leaves.dropna(subset=['Product', 'Feature', 'Issue'])
+        self.issues = issues[issues['Issue'] != ''].rename(columns={'TicketCount': 'Count'}).reset_index(drop=True)
+
+        self.num_products = tickets['Product'].nunique()
+        self.num_features = tickets['Feature'].nunique()
+
+    @property
+    def empty(self):
+        return self.total_tickets == 0
+
+    def top_product_features(self, top_count):
+        """Top Product/Feature pairs by ticket count"""
+        positions = top_positions(self.product_features['TicketCount'].to_numpy(), top_count)
+        return self.product_features.iloc[positions]
+
+    def top_products(self, top_count):
+        """Top products by ticket count"""
+        positions = top_positions(self.products['TicketCount'].to_numpy(), top_count)
+        return self.products.iloc[positions]
+
+    def features_of(self, products):
+        """Product/Feature counts for a set of products, in Product, Feature order"""
+        return self.product_features[self.product_features['Product'].isin(list(products))]
+
+    def widest_product(self):
+        """Product with the most distinct features"""
+        return self.products.iloc[top_positions(self.products['FeatureCount'].to_numpy(), 1)[0]]
+
+    def top_issue(self):
+        """Most reported Product/Feature/Issue combination (None when no issues are recorded)"""
+        if self.issues.empty:
+            return None
+        return self.issues.iloc[top_positions(self.issues['Count'].to_numpy(), 1)[0]]
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Relative accuracy of sketch quantiles (DDSketch-style log buckets)
+#
+# Bucket i holds values in (gamma^(i-1), gamma^i] with gamma = (1 + a) / (1 - a), and reports
+# 2 * gamma^i / (gamma + 1). Every reported order statistic is therefore within a relative
+# error of `a` of the true order statistic of the same rank, no matter how many sketches were
+# merged. Quantiles between two ranks are linearly interpolated like pandas' default method,
+# so they carry the same bound. Counts, means, standard deviations, minimums and maximums are
+# kept as exact moments next to the buckets.
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = np.log(GAMMA)
+
+# Smallest value tracked by the log buckets; values at or below it share bucket 0
+MIN_TRACKED_VALUE = 1e-3
+_BUCKET_OFFSET = int(np.ceil(np.log(MIN_TRACKED_VALUE) / _LOG_GAMMA))
+
+
+def bucket_indices(values):
+    """Non-negative log-bucket index of every (positive) value"""
+    values = np.maximum(np.asarray(values, dtype=np.float64), MIN_TRACKED_VALUE)
+    return (np.ceil(np.log(values) / _LOG_GAMMA) - _BUCKET_OFFSET).astype(np.int64)
+
+
+def bucket_values(indices):
+    """Representative value of each bucket index"""
+    exponent = np.asarray(indices, dtype=np.float64) + _BUCKET_OFFSET
+    return 2 * np.power(GAMMA, exponent) / (GAMMA + 1)
+
+
+def _pad_buckets(histograms, width):
+    """Widen a dense group x bucket histogram with empty high buckets"""
+    if histograms.shape[1] == width:
+        return histograms
+    return np.pad(histograms, ((0, 0), (0, width - histograms.shape[1])))
+
+
+class MergedSketches:
+    """
+    Bucket histograms and exact moments for a set of groups, produced by merging sketch cells
+    """
+
+    def __init__(self, labels, histograms, counts, sums, sums_sq, minimums, maximums):
+        self.labels = pd.Index(labels)
+        self.histograms = histograms
+        self.counts = counts
+        self.sums = sums
+        self.sums_sq = sums_sq
+        self.minimums = minimums
+        self.maximums = maximums
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __add__(self, other):
+        width = max(self.histograms.shape[1], other.histograms.shape[1])
+        histograms = _pad_buckets(self.histograms, width) + _pad_buckets(other.histograms, width)
+        return MergedSketches(
+            self.labels, histograms, self.counts + other.counts,
+            self.sums + other.sums, self.sums_sq + other.sums_sq,
+            np.fmin(self.minimums, other.minimums), np.fmax(self.maximums, other.maximums)
+        )
+
+    def total(self, label='All'):
+        """Collapse every group into one sketch"""
+        return MergedSketches(
+            [label], self.histograms.sum(axis=0, keepdims=True), self.counts.sum(keepdims=True),
+            self.sums.sum(keepdims=True), self.sums_sq.sum(keepdims=True),
+            np.array([np.nanmin(self.minimums)]) if len(self) and self.counts.sum() else np.array([np.nan]),
+            np.array([np.nanmax(self.maximums)]) if len(self) and self.counts.sum() else np.array([np.nan])
+        )
+
+    def mean(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.counts > 0, self.sums / np.maximum(self.counts, 1), np.nan)
+
+    def std(self):
+        """Sample standard deviation (ddof=1, NaN for fewer than two values)"""
+        counts = self.counts.astype(np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = (self.sums_sq - self.sums ** 2 / np.maximum(counts, 1)) / (counts - 1)
+        return np.where(counts > 1, np.sqrt(np.maximum(variance, 0)), np.nan)
+
+    def quantile(self, q):
+        """
+        Quantile q of every group (NaN for empty groups)
+        Interpolates between the order statistics at rank q * (n - 1), like pandas
+        """
+        result = np.full(len(self), np.nan)
+        cumulative = np.cumsum(self.histograms, axis=1)
+        for group in np.flatnonzero(self.counts > 0):
+            position = q * (self.counts[group] - 1)
+            lower, upper = int(np.floor(position)), int(np.ceil(position))
+            buckets = np.searchsorted(cumulative[group], [lower + 1, upper + 1], side='left')
+            low_value, high_value = bucket_values(buckets)
+            # Order statistics are clamped to the exact extremes
+            low_value = min(max(low_value, self.minimums[group]), self.maximums[group])
+            high_value = min(max(high_value, self.minimums[group]), self.maximums[group])
+            result[group] = low_value + (high_value - low_value) * (position - lower)
+        return result
+
+
+class SketchCube:
+    """
+    Mergeable quantile sketches for every distinct combination of key columns
+
+    One row per cell (key combination) with a sparse bucket histogram and exact
+    moments. A filter is a boolean mask over cells; merging the masked cells by
+    a group code yields per-group sketches without touching the raw values.
+    """
+
+    def __init__(self, values, keys):
+        values = np.asarray(values, dtype=np.float64)
+        grouped = keys.groupby(list(keys.columns), sort=True, dropna=False)
+        cell_codes = grouped.ngroup().to_numpy(dtype=np.int64)
+        n_cells = int(cell_codes.max()) + 1 if len(cell_codes) else 0
+
+        _, first_rows = np.unique(cell_codes, return_index=True)
+        self.cells = keys.iloc[first_rows].reset_index(drop=True)
+
+        buckets = bucket_indices(values)
+        self.n_buckets = int(buckets.max()) + 1 if len(buckets) else 1
+        self.histograms = sparse.csr_matrix(
+            (np.ones(len(values)), (cell_codes, buckets)), shape=(n_cells, self.n_buckets)
+        )
+        self.counts = np.bincount(cell_codes, minlength=n_cells)
+        self.sums = np.bincount(cell_codes, weights=values, minlength=n_cells)
+        self.sums_sq = np.bincount(cell_codes, weights=values ** 2, minlength=n_cells)
+        self.minimums = np.full(n_cells, np.inf)
+        self.maximums = np.full(n_cells, -np.inf)
+        np.minimum.at(self.minimums, cell_codes, values)
+        np.maximum.at(self.maximums, cell_codes, values)
+
+    def merge(self, cell_mask, group_codes, labels):
+        """
+        Merge the masked cells into one sketch per group
+
+        Args:
+            cell_mask (np.ndarray): boolean mask over cells
+            group_codes (np.ndarray): group code of every cell
+            labels (array-like): label of every group code
+        """
+        n_groups = len(labels)
+        selected = np.flatnonzero(cell_mask)
+        indicator = sparse.csr_matrix(
+            (np.ones(len(selected)), (group_codes[selected], selected)), shape=(n_groups, len(self.cells))
+        )
+        minimums = np.full(n_groups, np.inf)
+        maximums = np.full(n_groups, -np.inf)
+        np.minimum.at(minimums, group_codes[selected], self.minimums[selected])
+        np.maximum.at(maximums, group_codes[selected], self.maximums[selected])
+        return MergedSketches(
+            labels,
+            (indicator @ self.histograms).toarray(),
+            np.rint(np.asarray(indicator @ self.counts).ravel()).astype(np.int64),
+            np.asarray(indicator @ self.sums).ravel(),
+            np.asarray(indicator @ self.sums_sq).ravel(),
+            np.where(np.isinf(minimums), np.nan, minimums),
+            np.where(np.isinf(maximums), np.nan, maximums)
+        )
+
+    def sketch_values(self, values, group_codes, labels):
+        """Sketches for raw values (used to merge partially covered cells exactly)"""
+        values = np.asarray(values, dtype=np.float64)
+        n_groups = len(labels)
+        buckets = bucket_indices(values)
+        histograms = np.zeros((n_groups, max(self.n_buckets, int(buckets.max()) + 1 if len(buckets) else 0)))
+        np.add.at(histograms, (group_codes, buckets), 1)
+        minimums = np.full(n_groups, np.inf)
+        maximums = np.full(n_groups, -np.inf)
+        np.minimum.at(minimums, group_codes, values)
+        np.maximum.at(maximums, group_codes, values)
+        return MergedSketches(
+            labels,
+            histograms,
+            np.bincount(group_codes, minlength=n_groups),
+            np.bincount(group_codes, weights=values, minlength=n_groups),
+            np.bincount(group_codes, weights=values ** 2, minlength=n_groups),
+            np.where(np.isinf(minimums), np.nan, minimums),
+            np.where(np.isinf(maximums), np.nan, maximums)
+        )
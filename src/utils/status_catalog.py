@@ -0,0 +1,105 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# Status category -> chart/table color, in display sort order
+STATUS_CATEGORY_COLORS = {
+    'Open': '#E74C3C',          # Red
+    'In Progress': '#3498DB',   # Blue
+    'Escalated': '#E67E22',     # Orange
+    'Closed': '#2ECC71',        # Green
+    'On Hold': '#F39C12',       # Yellow/Orange
+    'Cancelled': '#95A5A6',     # Gray
+    'Other': '#9B59B6'          # Purple
+}
+DEFAULT_STATUS_COLOR = '#7F8C8D'
+STATUS_CATEGORY_ORDER = list(STATUS_CATEGORY_COLORS) + ['Unknown']
+
+# Dim_ItemStatus Item terms -> category (first match wins)
+ITEM_CATEGORY_TERMS = [
+    ('Open', ['open', 'new', 'created']),
+    ('In Progress', ['progress', 'working', 'active']),
+    ('Escalated', ['escalated', 'escalation']),
+    ('Closed', ['closed', 'resolved', 'completed']),
+    ('On Hold', ['hold', 'waiting', 'pending'])
+]
+
+# Status name terms -> category, used when the dimension table has no usable Item
+STATUS_CATEGORY_TERMS = [
+    ('Open', ['open', 'new', 'created', 'not started']),
+    ('In Progress', ['in progress', 'working', 'assigned', 'active']),
+    ('Escalated', ['escalated', 'escalation']),
+    ('Closed', ['closed', 'resolved', 'completed', 'done']),
+    ('On Hold', ['hold', 'waiting', 'pending']),
+    ('Cancelled', ['cancelled', 'canceled'])
+]
+
+
+def _match_terms(text, category_terms):
+    text = str(text).lower()
+    for category, terms in category_terms:
+        if any(term in text for term in terms):
+            return category
+    return None
+
+
+def categorize_status(status, item_type=None):
+    """Status category from the Dim_ItemStatus Item of a status, falling back to the status name"""
+    if pd.isna(status):
+        return 'Unknown'
+    if item_type is not None and pd.notna(item_type):
+        category = _match_terms(item_type, ITEM_CATEGORY_TERMS)
+        if category:
+            return category
+    return _match_terms(status, STATUS_CATEGORY_TERMS) or 'Other'
+
+
+class StatusCatalog:
+    """
+    Status -> category, color and sort order, derived from Dim_ItemStatus
+
+    Statuses are matched case-insensitively to the first Dim_ItemStatus row with that
+    name. Each distinct status is categorized once and remembered, so describing a
+    status column only looks up its unique values.
+    """
+
+    def __init__(self, item_status=None):
+        item_status = pd.DataFrame(item_status) if item_status is not None else pd.DataFrame()
+        self.item_types = {}
+        if not item_status.empty:
+            named = item_status.dropna(subset=['Status'])
+            named = named.assign(StatusKey=named['Status'].astype(str).str.lower()).drop_duplicates('StatusKey')
+            self.item_types = dict(zip(named['StatusKey'], named['Item']))
+        self._categories = {}
+        self._lock = threading.Lock()
+
+    def category(self, status):
+        if pd.isna(status):
+            return 'Unknown'
+        with self._lock:
+            category = self._categories.get(status)
+        if category is None:
+            category = categorize_status(status, self.item_types.get(str(status).lower()))
+            with self._lock:
+                self._categories[status] = category
+        return category
+
+    def describe(self, statuses):
+        """
+        Category, color and sort order for a status column
+
+        Returns:
+            tuple: (categories, colors, sort_orders) as NumPy arrays aligned with statuses
+        """
+        codes, uniques = pd.factorize(pd.Series(statuses), use_na_sentinel=False)
+        categories = np.array([self.category(status) for status in uniques], dtype=object)
+        if not len(categories):
+            return np.array([], dtype=object), np.array([], dtype=object), np.array([], dtype=np.int64)
+        colors = np.array([STATUS_CATEGORY_COLORS.get(category, DEFAULT_STATUS_COLOR) for category in categories], dtype=object)
+        sort_orders = pd.Index(STATUS_CATEGORY_ORDER).get_indexer(categories)
+        return categories[codes], colors[codes], sort_orders[codes]
+
+
+def category_colors(categories):
+    """Chart color of each category (DEFAULT_STATUS_COLOR for unknown categories)"""
+    return [STATUS_CATEGORY_COLORS.get(category, DEFAULT_STATUS_COLOR) for category in categories]
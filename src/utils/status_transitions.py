@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+from src.utils.quantile_sketch import MergedSketches, bucket_indices
+
+
+class StatusTransitionEngine:
+    """
+    Fact_StatusTransitions as integer-coded NumPy arrays, built once per data version
+
+    Every timed transition (DurationMinutes of a transition leaving a status) is kept as
+    a work item code, a status code, its duration and its quantile sketch bucket. A work
+    item selection is a boolean mask over the work item codes, so the time-in-status
+    sketches for any selection come from a few bincounts over the masked rows, with no
+    per-work-item cells to store or merge.
+    """
+
+    # The only Fact_StatusTransitions columns the engine reads
+    COLUMNS = ['WorkItemId', 'FromStatusName', 'DurationMinutes']
+
+    def __init__(self, transitions):
+        transitions = pd.DataFrame(transitions)
+        if transitions.empty:
+            transitions = pd.DataFrame(columns=self.COLUMNS)
+
+        item_codes, self.work_item_ids = pd.factorize(transitions['WorkItemId'])
+        self.work_item_ids = pd.Index(self.work_item_ids)
+        from_codes, self.statuses = pd.factorize(transitions['FromStatusName'], sort=True)
+        self.statuses = pd.Index(self.statuses)
+
+        durations = pd.to_numeric(transitions['DurationMinutes'], errors='coerce').to_numpy(dtype=np.float64)
+        timed = ~np.isnan(durations) & (from_codes >= 0)
+        self.n_transitions = len(transitions)
+        self.item_codes = np.asarray(item_codes[timed], dtype=np.int64)
+        self.status_codes = np.asarray(from_codes[timed], dtype=np.int64)
+        self.durations = durations[timed]
+        self.buckets = bucket_indices(self.durations)
+        self.n_buckets = int(self.buckets.max()) + 1 if len(self.buckets) else 1
+
+    def __len__(self):
+        return self.n_transitions
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    def work_item_mask(self, work_item_ids):
+        """Boolean mask over the engine's work items that are in work_item_ids"""
+        mask = np.zeros(len(self.work_item_ids), dtype=bool)
+        positions = self.work_item_ids.get_indexer(pd.unique(pd.Series(work_item_ids)))
+        mask[positions[positions >= 0]] = True
+        return mask
+
+    def dwell_sketches(self, item_mask=None):
+        """Time-in-status sketches (one group per status) for the masked work items"""
+        rows = slice(None) if item_mask is None else item_mask[self.item_codes]
+        statuses, durations = self.status_codes[rows], self.durations[rows]
+        n_statuses = len(self.statuses)
+        histograms = np.bincount(
+            statuses * self.n_buckets + self.buckets[rows], minlength=n_statuses * self.n_buckets
+        ).reshape(n_statuses, self.n_buckets)
+        minimums = np.full(n_statuses, np.inf)
+        maximums = np.full(n_statuses, -np.inf)
+        np.minimum.at(minimums, statuses, durations)
+        np.maximum.at(maximums, statuses, durations)
+        return MergedSketches(
+            self.statuses,
+            histograms,
+            np.bincount(statuses, minlength=n_statuses),
+            np.bincount(statuses, weights=durations, minlength=n_statuses),
+            np.bincount(statuses, weights=durations ** 2, minlength=n_statuses),
+            np.where(np.isinf(minimums), np.nan, minimums),
+            np.where(np.isinf(maximums), np.nan, maximums)
+        )
+
+    def dwell_summary(self, item_mask=None, quantiles=(0.5, 0.9)):
+        """
+        Time spent in each status (minutes) by the masked work items
+
+        Returns:
+            pd.DataFrame: Status, AvgDurationMinutes, TransitionCount (transitions with a duration)
+                          and one P<q>DurationMinutes column per quantile; only statuses with
+                          timed transitions are listed
+        """
+        sketches = self.dwell_sketches(item_mask)
+        summary = pd.DataFrame({
+            'Status': self.statuses,
+            'AvgDurationMinutes': sketches.mean(),
+            'TransitionCount': sketches.counts
+        })
+        for q in quantiles:
+            summary[f"P{int(round(q * 100))}DurationMinutes"] = sketches.quantile(q)
+        return summary[summary['TransitionCount'] > 0].reset_index(drop=True)
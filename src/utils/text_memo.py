@@ -0,0 +1,55 @@
+import threading
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+
+
+class TextMemo:
+    """
+    Process-wide memo of a pure text -> value function, applied column by column
+
+    A column is deduplicated first, only distinct strings never seen before are passed
+    to func, and results are mapped back to the rows by their codes. The memo outlives
+    data refreshes, so a reload only pays for new distinct texts. When it grows past
+    max_entries it is cleared and refilled from the next columns mapped.
+    """
+
+    def __init__(self, func, max_entries=200000):
+        self.func = func
+        self.max_entries = max_entries
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def __call__(self, text):
+        return self.map([text])[0]
+
+    def map(self, texts):
+        """func of every text (as an object array aligned with texts)"""
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=False)
+        with self._lock:
+            known = [self._values.get(text, _MISSING) if isinstance(text, str) else _MISSING for text in uniques]
+
+        computed = {}
+        results = np.empty(len(uniques), dtype=object)
+        for position, (text, value) in enumerate(zip(uniques, known)):
+            if value is _MISSING:
+                # Not memoized yet (non-strings are never memoized)
+                value = self.func(text)
+                if isinstance(text, str):
+                    computed[text] = value
+            results[position] = value
+
+        if computed:
+            with self._lock:
+                if len(self._values) + len(computed) > self.max_entries:
+                    self._values.clear()
+                self._values.update(computed)
+        return results[codes] if len(results) else np.empty(len(codes), dtype=object)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+# Dashboard granularity names mapped to pandas period frequencies
+GRANULARITY_FREQUENCIES = {
+    'daily': 'D',
+    'weekly': 'W',
+    'monthly': 'M',
+    'quarterly': 'Q',
+    'yearly': 'Y'
+}
+
+
+def period_codes(dates, granularity):
+    """
+    Bucket a datetime series into calendar periods in one vectorized pass
+
+    Args:
+        dates (pd.Series): datetime64 series
+        granularity (str): 'daily', 'weekly', 'monthly', 'quarterly' or 'yearly'
+
+    Returns:
+        tuple: (codes, periods) - int codes per row (-1 for NaT) and the sorted unique PeriodIndex
+    """
+    freq = GRANULARITY_FREQUENCIES.get(granularity, 'M')
+    periods = pd.Series(dates).dt.to_period(freq)
+    codes, uniques = pd.factorize(periods, sort=True)
+    return codes, pd.PeriodIndex(uniques, freq=freq)
+
+
+def format_period_labels(periods, granularity):
+    """
+    Format unique periods as the labels used on the trend charts
+    daily/weekly: '2025-02-04' (week start), monthly: '2025-02', quarterly: '2025-Q1', yearly: '2025'
+    """
+    periods = pd.PeriodIndex(periods)
+    if granularity == 'quarterly':
+        return periods.year.astype(str) + '-Q' + periods.quarter.astype(str)
+    if granularity == 'yearly':
+        return periods.year.astype(str)
+    if granularity == 'weekly':
+        return periods.start_time.strftime('%Y-%m-%d')
+    if granularity == 'daily':
+        return periods.strftime('%Y-%m-%d')
+    return periods.strftime('%Y-%m')
+
+
+def period_labels(dates, granularity):
+    """
+    Chronologically ordered categorical period labels for a datetime series
+    Labels are formatted once per unique period, not once per row
+    """
+    codes, periods = period_codes(dates, granularity)
+    labels = format_period_labels(periods, granularity)
+    return pd.Categorical.from_codes(codes, categories=pd.Index(labels), ordered=True)
+
+
+def combine_labels(left, right, sep='-'):
+    """
+    Categorical '<left><sep><right>' labels (e.g. 'AOR-OFFICE') built from the unique pairs only
+    """
+    left_codes, left_uniques = pd.factorize(pd.Series(left), use_na_sentinel=False)
+    right_codes, right_uniques = pd.factorize(pd.Series(right), use_na_sentinel=False)
+
+    pair_codes = left_codes.astype(np.int64) * max(len(right_uniques), 1) + right_codes
+    codes, unique_pairs = pd.factorize(pair_codes)
+
+    left_labels = pd.Index(left_uniques).astype(str)
+    right_labels = pd.Index(right_uniques).astype(str)
+    labels = pd.Index(
+        left_labels[unique_pairs // max(len(right_uniques), 1)] + sep +
+        right_labels[unique_pairs % max(len(right_uniques), 1)]
+    )
+
+    if not labels.is_unique:
+        # Separator collisions ('A-B' + 'C' vs 'A' + 'B-C') - fall back to plain labels
+        return pd.Categorical(np.asarray(labels)[codes])
+
+    # Sorted categories keep grouped output in the same order as grouping the plain strings
+    order = np.argsort(np.asarray(labels, dtype=object), kind='stable')
+    ranks = np.empty_like(order)
+    ranks[order] = np.arange(len(order))
+    return pd.Categorical.from_codes(ranks[codes], categories=labels[order])
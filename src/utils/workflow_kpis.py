@@ -0,0 +1,250 @@
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Filter selection key -> work item column it filters
+KPI_FILTER_COLUMNS = {
+    'selected_aor': 'AorShortName',
+    'selected_case_types': 'WorkItemDefinitionShortCode',
+    'selected_products': 'Product',
+    'selected_modules': 'Module',
+    'selected_features': 'Feature',
+    'selected_issues': 'Issue',
+    'selected_origins': 'CaseOrigin',
+    'selected_reasons': 'CaseReason',
+    'selected_status': 'WorkItemStatus',
+    'selected_priority': 'Priority'
+}
+
+OPEN_STATUSES = ['Open', 'In Progress', 'On Hold', 'Pending Verification', 'Scheduled', 'Not Started', 'Pending']
+
+
+def _encode(values, categories=None):
+    """Integer codes of values against categories (-1 for missing), extending categories with unseen values"""
+    codes, uniques = pd.factorize(pd.Series(values))
+    if categories is None:
+        return np.asarray(codes, dtype=np.int64), pd.Index(uniques)
+
+    positions = categories.get_indexer(uniques)
+    unseen = positions < 0
+    positions[unseen] = len(categories) + np.arange(unseen.sum())
+    categories = categories.append(pd.Index(uniques[unseen]))
+    codes = np.where(codes >= 0, positions[codes] if len(positions) else codes, -1)
+    return np.asarray(codes, dtype=np.int64), categories
+
+
+def _resolution_minutes(duration_summary):
+    """Per WorkItemId sum and count of resolution minutes (OpenToClosed_Min, else OpenToResolved_Min)"""
+    durations = pd.DataFrame(duration_summary)
+    if durations.empty:
+        return pd.DataFrame({'total': pd.Series(dtype=np.float64), 'count': pd.Series(dtype=np.int64)})
+    minutes = pd.to_numeric(durations['OpenToClosed_Min'], errors='coerce').fillna(
+        pd.to_numeric(durations['OpenToResolved_Min'], errors='coerce')
+    )
+    return minutes.groupby(durations['WorkItemId']).agg(total='sum', count='count')
+
+
+class WorkflowKpiTotals:
+    """
+    Running card totals for one filter selection
+
+    Remembers how many engine rows (rows_counted) and late duration updates
+    (updates_counted) it has counted, so tickets and duration records added to the
+    engine later are folded in with WorkflowKpiEngine.update_totals instead of a full
+    recount. 'Closed This Month' is relative to month_start.
+    """
+
+    def __init__(self, month_start, n_assignees=0):
+        self.month_start = month_start
+        self.rows_counted = 0
+        self.updates_counted = 0
+        self.total_tickets = 0
+        self.open_tickets = 0
+        self.escalated_tickets = 0
+        self.closed_this_month = 0
+        self.resolution_total = 0.0
+        self.resolution_count = 0
+        self.assignee_counts = np.zeros(n_assignees, dtype=np.int64)
+
+    @property
+    def avg_resolution_minutes(self):
+        return self.resolution_total / self.resolution_count if self.resolution_count else 0
+
+    @property
+    def active_assignees(self):
+        return int(np.count_nonzero(self.assignee_counts))
+
+
+class WorkflowKpiEngine:
+    """
+    Pre-joined, typed work item + duration arrays behind the workflow summary cards
+
+    Only tickets closed on or after their creation date are kept. Filter columns are
+    integer-coded once, resolution minutes are joined per ticket once, and a filter
+    selection becomes a boolean mask; all six card totals are then counted in a single
+    pass over that mask. New tickets and duration records can be appended and folded
+    into existing totals. Duration records may arrive before or after their ticket:
+    records for tickets already in the engine are added to their rows and logged, so
+    update_totals can add them to totals that counted those rows earlier.
+    Appends and reads hold the engine lock, so readers never see a partial append.
+    """
+
+    def __init__(self, work_items, duration_summary=None):
+        self.work_item_ids = np.array([], dtype=object)
+        self.created_on = np.array([], dtype='datetime64[ns]')
+        self.closed_on = np.array([], dtype='datetime64[ns]')
+        self.is_open = np.array([], dtype=bool)
+        self.is_escalated = np.array([], dtype=bool)
+        self.resolution_total = np.array([], dtype=np.float64)
+        self.resolution_count = np.array([], dtype=np.int64)
+        self.assignee_codes = np.array([], dtype=np.int64)
+        self.assignees = pd.Index([])
+        self.filter_codes = {column: np.array([], dtype=np.int64) for column in KPI_FILTER_COLUMNS.values()}
+        self.filter_categories = {column: pd.Index([]) for column in KPI_FILTER_COLUMNS.values()}
+        # Resolution sum/count of every duration record seen so far, per WorkItemId
+        self.durations = _resolution_minutes(None)
+        # (rows, total, count) added to existing rows by late duration records
+        self.duration_updates = []
+        self._lock = threading.RLock()
+        self.append(work_items, duration_summary)
+
+    def __len__(self):
+        return len(self.created_on)
+
+    def add_durations(self, duration_summary):
+        """
+        Add duration records, for tickets already in the engine or appended later
+        (records are summed like in a full rebuild, so pass each record only once)
+
+        Returns:
+            int: number of existing ticket rows whose resolution minutes changed
+        """
+        resolution = _resolution_minutes(duration_summary)
+        if resolution.empty:
+            return 0
+
+        with self._lock:
+            self.durations = pd.concat([self.durations, resolution]).groupby(level=0).sum()
+
+            positions = resolution.index.get_indexer(self.work_item_ids)
+            rows = np.flatnonzero(positions >= 0)
+            if len(rows) == 0:
+                return 0
+            total = resolution['total'].to_numpy(dtype=np.float64)[positions[rows]]
+            count = resolution['count'].to_numpy(dtype=np.int64)[positions[rows]]
+            self.resolution_total[rows] += total
+            self.resolution_count[rows] += count
+            self.duration_updates.append((rows, total, count))
+            return len(rows)
+
+    def append(self, work_items, duration_summary=None):
+        """
+        Add tickets (and duration records) to the engine
+
+        Returns:
+            int: number of tickets added (tickets not closed on or after creation are skipped)
+        """
+        with self._lock:
+            if duration_summary is not None:
+                self.add_durations(duration_summary)
+
+            work_items = pd.DataFrame(work_items)
+            if work_items.empty:
+                return 0
+
+            created_on = pd.to_datetime(work_items['CreatedOn'], errors='coerce')
+            closed_on = pd.to_datetime(work_items['ClosedOn'], errors='coerce')
+            valid = (closed_on >= created_on).to_numpy()
+            work_items = work_items[valid]
+
+            # Tickets without duration records (position -1) pick the trailing zero
+            positions = self.durations.index.get_indexer(work_items['WorkItemId'])
+
+            self.work_item_ids = np.concatenate([self.work_item_ids, work_items['WorkItemId'].to_numpy(dtype=object)])
+            self.created_on = np.concatenate([self.created_on, created_on[valid].to_numpy(dtype='datetime64[ns]')])
+            self.closed_on = np.concatenate([self.closed_on, closed_on[valid].to_numpy(dtype='datetime64[ns]')])
+            self.is_open = np.concatenate([self.is_open, work_items['WorkItemStatus'].isin(OPEN_STATUSES).to_numpy()])
+            self.is_escalated = np.concatenate([self.is_escalated, (work_items['IsEscalated'] == '1').to_numpy()])
+            self.resolution_total = np.concatenate([
+                self.resolution_total, np.append(self.durations['total'].to_numpy(dtype=np.float64), 0.0)[positions]
+            ])
+            self.resolution_count = np.concatenate([
+                self.resolution_count, np.append(self.durations['count'].to_numpy(dtype=np.int64), 0)[positions]
+            ])
+
+            assignee_codes, self.assignees = _encode(work_items['AssignedTo'], self.assignees)
+            self.assignee_codes = np.concatenate([self.assignee_codes, assignee_codes])
+            for column in KPI_FILTER_COLUMNS.values():
+                codes, self.filter_categories[column] = _encode(work_items[column], self.filter_categories[column])
+                self.filter_codes[column] = np.concatenate([self.filter_codes[column], codes])
+            return len(work_items)
+
+    def filter_mask(self, start=0, start_date=None, end_date=None, **selections):
+        """
+        Tickets from row start onwards that match the parsed filter selections
+        ('All' or an empty selection leaves a dimension unfiltered)
+        """
+        with self._lock:
+            return self._rows_mask(slice(start, None), start_date, end_date, **selections)
+
+    def _rows_mask(self, rows, start_date=None, end_date=None, **selections):
+        """filter_mask over the given rows (a slice or row positions)"""
+        created_on = self.created_on[rows]
+        mask = np.ones(len(created_on), dtype=bool)
+
+        if start_date and end_date:
+            try:
+                mask &= (created_on >= np.datetime64(pd.to_datetime(start_date), 'ns')) & \
+                        (created_on <= np.datetime64(pd.to_datetime(end_date), 'ns'))
+            except Exception as e:
+                print(f"⚠️ Error applying date filter: {e}")
+
+        for key, column in KPI_FILTER_COLUMNS.items():
+            selected = selections.get(key)
+            if selected is None or len(selected) == 0 or "All" in selected:
+                continue
+            selected_codes = self.filter_categories[column].get_indexer(pd.Index(selected))
+            mask &= np.isin(self.filter_codes[column][rows], selected_codes[selected_codes >= 0])
+        return mask
+
+    def update_totals(self, totals, filters):
+        """Count the rows and late duration records added since totals were last updated into totals"""
+        with self._lock:
+            start = totals.rows_counted
+
+            # Duration records that arrived after their (already counted) rows
+            for rows, total, count in self.duration_updates[totals.updates_counted:]:
+                counted = rows < start
+                selected = self._rows_mask(rows[counted], **filters)
+                totals.resolution_total += float(total[counted][selected].sum())
+                totals.resolution_count += int(count[counted][selected].sum())
+            totals.updates_counted = len(self.duration_updates)
+
+            mask = self._rows_mask(slice(start, None), **filters)
+            rows = np.flatnonzero(mask) + start
+
+            totals.total_tickets += len(rows)
+            totals.open_tickets += int(np.count_nonzero(self.is_open[rows]))
+            totals.escalated_tickets += int(np.count_nonzero(self.is_escalated[rows]))
+            totals.closed_this_month += int(np.count_nonzero(
+                self.closed_on[rows] >= np.datetime64(pd.Timestamp(totals.month_start), 'ns')
+            ))
+            totals.resolution_total += float(self.resolution_total[rows].sum())
+            totals.resolution_count += int(self.resolution_count[rows].sum())
+
+            assignee_codes = self.assignee_codes[rows]
+            assignee_counts = np.bincount(assignee_codes[assignee_codes >= 0], minlength=len(self.assignees))
+            assignee_counts[:len(totals.assignee_counts)] += totals.assignee_counts
+            totals.assignee_counts = assignee_counts
+            totals.rows_counted = len(self)
+            return totals
+
+    def totals(self, filters, now=None):
+        """All six card totals for a filter selection, counted in one pass"""
+        month_start = (now or datetime.now()).replace(day=1)
+        with self._lock:
+            totals = WorkflowKpiTotals(month_start, len(self.assignees))
+            # Every row is counted with its current resolution minutes, so no logged update applies
+            totals.updates_counted = len(self.duration_updates)
+            return self.update_totals(totals, filters)
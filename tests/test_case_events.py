@@ -0,0 +1,31 @@
+import pandas as pd
+
+from src.utils.case_events import CaseEventTable
+
+
+def make_events():
+    return pd.DataFrame({'ID': [3, 1, 3, 2, 3], 'EventType': ['c1', 'a1', 'c2', 'b1', 'c3']})
+
+
+def test_select_returns_events_case_by_case():
+    table = CaseEventTable(make_events())
+
+    assert table.case_counts().to_dict('list') == {'ID': [1, 2, 3], 'NumCaseEvents': [1, 1, 3]}
+    ids, events = table.select([3, 9, 1, 3])
+    assert ids.tolist() == [3, 3, 3, 1, 3, 3, 3]
+    assert events['EventType'].tolist() == ['c1', 'c2', 'c3', 'a1', 'c1', 'c2', 'c3']
+
+
+def test_empty_table_selects_nothing():
+    for case_events in [pd.DataFrame(), make_events().iloc[:0]]:
+        table = CaseEventTable(case_events)
+        assert table.empty
+
+        positions, lengths = table.positions([1, 2])
+        assert positions.tolist() == []
+        assert lengths.tolist() == [0, 0]
+
+        ids, events = table.select([1, 2])
+        assert ids.tolist() == []
+        assert events.empty
+        assert table.case_counts().empty
@@ -0,0 +1,190 @@
+import pandas as pd
+import pytest
+
+import src.utils.derived_cache as derived_cache
+from src.utils.derived_cache import DerivedDataGraph
+
+
+class FakeCache(dict):
+    def get(self, key):
+        return dict.get(self, key)
+
+    def set(self, key, value, timeout=None):
+        self[key] = value
+
+    def delete(self, key):
+        self.pop(key, None)
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    fake = FakeCache()
+    monkeypatch.setattr(derived_cache, 'cache', fake)
+    return fake
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(derived_cache, 'time', fake)
+    return fake
+
+
+def make_graph(fail):
+    graph = DerivedDataGraph('test')
+
+    @graph.node('source')
+    def get_source():
+        return pd.DataFrame({'value': [1, 2, 3]})
+
+    @graph.node('derived', deps=['source'], persist=True, default=pd.DataFrame)
+    def get_derived():
+        if fail['derived']:
+            raise ValueError('builder failed')
+        return get_source() * 2
+
+    return graph, get_derived
+
+
+def test_raising_builder_returns_default_and_caches_nothing(shared_cache):
+    fail = {'derived': True}
+    graph, get_derived = make_graph(fail)
+
+    assert get_derived().empty
+    node = graph.nodes['derived']
+    assert node.value is None
+    assert node.version is None
+    assert not shared_cache
+
+    # The next call builds again once the builder succeeds
+    fail['derived'] = False
+    assert get_derived()['value'].tolist() == [2, 4, 6]
+    assert node.builds == 1
+    assert list(shared_cache) == [f"derived:test:derived:{node.version}"]
+
+
+def test_failing_dependency_returns_default_without_building(shared_cache):
+    graph = DerivedDataGraph('test')
+
+    @graph.node('source', default=pd.DataFrame)
+    def get_source():
+        raise ValueError('query failed')
+
+    @graph.node('derived', deps=['source'], persist=True, default=pd.DataFrame)
+    def get_derived():
+        return get_source() * 2
+
+    assert get_derived().empty
+    assert graph.nodes['derived'].builds == 0
+    assert graph.nodes['derived'].value is None
+    assert not shared_cache
+
+
+def make_pipeline(sources, root_ttl=3600):
+    """
+    Two fingerprinted roots and derived nodes: left <- a, right <- b, combined <- (left, right)
+    combined is persisted so other graphs (workers) with the same upstream data can reuse it
+    """
+    graph = DerivedDataGraph('test', ttl_seconds=root_ttl)
+
+    @graph.node('a', fingerprint=derived_cache.fingerprint_frames)
+    def get_a():
+        return sources['a'].copy()
+
+    @graph.node('b', fingerprint=derived_cache.fingerprint_frames)
+    def get_b():
+        return sources['b'].copy()
+
+    @graph.node('left', deps=['a'])
+    def get_left():
+        return get_a() * 10
+
+    @graph.node('right', deps=['b'])
+    def get_right():
+        return get_b() + 1
+
+    @graph.node('combined', deps=['left', 'right'], persist=True)
+    def get_combined():
+        return pd.concat([get_left(), get_right()], ignore_index=True)
+
+    return graph, get_combined
+
+
+def make_sources():
+    return {'a': pd.DataFrame({'value': [1, 2]}), 'b': pd.DataFrame({'value': [5]})}
+
+
+def builds(graph):
+    return {name: node.builds for name, node in graph.nodes.items()}
+
+
+def test_upstream_change_rebuilds_only_affected_nodes_once(shared_cache):
+    sources = make_sources()
+    graph, get_combined = make_pipeline(sources)
+    assert get_combined()['value'].tolist() == [10, 20, 6]
+    assert builds(graph) == {'a': 1, 'b': 1, 'left': 1, 'right': 1, 'combined': 1}
+    versions = {name: node.version for name, node in graph.nodes.items()}
+
+    # New data for a: left and combined get new versions and rebuild once; b's side is reused
+    sources['a'] = pd.DataFrame({'value': [3]})
+    graph.invalidate('a')
+    assert get_combined()['value'].tolist() == [30, 6]
+    assert get_combined()['value'].tolist() == [30, 6]
+    assert builds(graph) == {'a': 2, 'b': 1, 'left': 2, 'right': 1, 'combined': 2}
+    changed = {name for name, node in graph.nodes.items() if node.version != versions[name]}
+    assert changed == {'a', 'left', 'combined'}
+
+
+def test_unchanged_root_content_keeps_downstream_versions(shared_cache):
+    graph, get_combined = make_pipeline(make_sources())
+    get_combined()
+    version = graph.nodes['combined'].version
+
+    # Re-reading identical data gives the same fingerprint, so nothing downstream rebuilds
+    graph.invalidate('b')
+    get_combined()
+    assert graph.nodes['b'].builds == 2
+    assert graph.nodes['combined'].version == version
+    assert builds(graph)['right'] == 1 and builds(graph)['combined'] == 1
+
+
+def test_root_ttl_expiry_reuses_derived_nodes_while_versions_match(shared_cache, clock):
+    sources = make_sources()
+    graph, get_combined = make_pipeline(sources, root_ttl=60)
+    get_combined()
+
+    # Past the TTL the roots re-read their source; the same data keeps every derived node
+    clock.now += 61
+    get_combined()
+    assert builds(graph) == {'a': 2, 'b': 2, 'left': 1, 'right': 1, 'combined': 1}
+
+    clock.now += 61
+    sources['b'] = pd.DataFrame({'value': [7]})
+    assert get_combined()['value'].tolist() == [10, 20, 8]
+    assert builds(graph) == {'a': 3, 'b': 3, 'left': 1, 'right': 2, 'combined': 2}
+
+
+def test_persisted_node_is_reused_by_another_graph(shared_cache):
+    first, get_first = make_pipeline(make_sources())
+    get_first()
+    assert list(shared_cache) == [f"derived:test:combined:{first.nodes['combined'].version}"]
+
+    # A second worker with the same upstream data loads combined instead of building it
+    second, get_second = make_pipeline(make_sources())
+    pd.testing.assert_frame_equal(get_second(), get_first())
+    assert second.nodes['combined'].builds == 0
+    assert second.nodes['combined'].version == first.nodes['combined'].version
+
+    # Invalidating drops the persisted copy, so the next build is a real one
+    second.invalidate('combined')
+    assert not shared_cache
+    get_second()
+    assert second.nodes['combined'].builds == 1
@@ -0,0 +1,75 @@
+import pandas as pd
+
+from src.utils.instructor_metrics_store import InstructorMetricsStore
+
+NOW = pd.Timestamp.now()
+CLASS_STARTS = {
+    'old': NOW - pd.Timedelta(days=90),
+    'recent': NOW - pd.Timedelta(days=3),
+    'future': NOW + pd.Timedelta(days=200),
+    'gone': NOW - pd.Timedelta(days=200),
+}
+
+
+def parse_start_times(start_times):
+    return pd.to_datetime(start_times)
+
+
+def class_attendance(present=None):
+    present = present or {}
+    return pd.DataFrame([{
+        'TrainingClassId': class_id, 'StartTime': start, 'InstructorId': 'i1', 'InstructorName': 'Instructor',
+        'AorShortName': 'A', 'LocationId': 'L', 'MemberID': f'm{member}', 'AttendeeEmail': f'e{member}',
+        'WasPresent': 'True' if member < present.get(class_id, 0) else 'False'
+    } for class_id, start in CLASS_STARTS.items() for member in range(3)])
+
+
+def training_classes():
+    return pd.DataFrame({
+        'TrainingClassId': list(CLASS_STARTS), 'StartTime': list(CLASS_STARTS.values()), 'InstructorId': 'i1',
+        'AorShortName': 'A', 'LocationId': 'L', 'ModifiedOn': NOW - pd.Timedelta(days=400)
+    })
+
+
+def synced_store(*syncs):
+    store = InstructorMetricsStore()
+    for attendance, classes in syncs:
+        store.sync(pd.DataFrame(), attendance, classes, parse_start_times)
+    return store
+
+
+def sessions_by_class(store):
+    return store.sessions.set_index('TrainingClassId').sort_index()
+
+
+def test_old_class_attendance_correction_is_reaggregated():
+    # 'old' started long before the reopen window and its training class was not modified
+    corrected = class_attendance({'old': 2, 'recent': 1})
+    store = synced_store((class_attendance(), training_classes()), (corrected, training_classes()))
+
+    assert sessions_by_class(store).loc['old', 'AttendeesPresent'] == 2
+    pd.testing.assert_frame_equal(
+        sessions_by_class(store), sessions_by_class(synced_store((corrected, training_classes()))), check_dtype=False
+    )
+
+
+def test_deleted_classes_are_dropped():
+    attendance = class_attendance({'recent': 3})
+    attendance = attendance[attendance['TrainingClassId'] != 'gone']
+    classes = training_classes()
+    classes = classes[classes['TrainingClassId'] != 'gone']
+    store = synced_store((class_attendance(), training_classes()), (attendance, classes))
+
+    assert sorted(store.sessions['TrainingClassId']) == ['future', 'old', 'recent']
+    assert sorted(store.classes['TrainingClassId']) == ['future', 'old', 'recent']
+    assert sessions_by_class(store).loc['recent', 'AttendeesPresent'] == 3
+
+
+def test_unchanged_classes_are_not_reaggregated():
+    store = synced_store((class_attendance(), training_classes()))
+    parsed = []
+    store.sync(pd.DataFrame(), class_attendance({'future': 1}), training_classes(),
+               lambda start_times: parsed.append(len(start_times)) or parse_start_times(start_times))
+
+    # Only the three attendance rows of 'future' are re-parsed for the sessions
+    assert parsed[0] == 3
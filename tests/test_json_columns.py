@@ -0,0 +1,39 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.json_columns import decode_json_lists, parse_json_list_columns
+
+
+def test_flat_values_and_offsets():
+    ragged = decode_json_lists(pd.Series(['["a", "b"]', '[]', ' [[1, 2], {"k": 3}] ', '[null]']))
+
+    assert ragged.values.tolist() == ['a', 'b', [1, 2], {'k': 3}, None]
+    assert ragged.offsets.tolist() == [0, 2, 2, 4, 5]
+    assert ragged.lengths.tolist() == [2, 0, 2, 1]
+    assert ragged.row_ids().tolist() == [0, 0, 2, 2, 3]
+    assert ragged.to_lists() == [['a', 'b'], [], [[1, 2], {'k': 3}], [None]]
+
+
+def test_null_and_scalar_cells():
+    ragged = decode_json_lists(pd.Series(['null', None, np.nan, '5', '"R-1"', '[ ]', '["R-2"]'], dtype=object))
+
+    assert ragged.to_lists() == [[], [], [], [5], ['R-1'], [], ['R-2']]
+    assert ragged.lengths.tolist() == [0, 0, 0, 1, 1, 0, 1]
+
+
+def test_counts_of_parsed_columns():
+    df = pd.DataFrame({'ID': [1, 2, 3], 'Notes': ['["n1", "n2"]', 'null', '"n3"']})
+    ragged = parse_json_list_columns(df, ['Notes', 'Missing'])
+
+    assert list(ragged) == ['Notes']
+    assert df['Notes'].tolist() == [['n1', 'n2'], [], ['n3']]
+    assert ragged['Notes'].lengths.tolist() == [2, 0, 1]
+
+
+@pytest.mark.parametrize('cells', [['[1], [2]'], ['[[1]', '[2]]'], ['[1,]'], ['1, 2']])
+def test_malformed_cells_raise(cells):
+    with pytest.raises(json.JSONDecodeError):
+        decode_json_lists(pd.Series(cells))
@@ -0,0 +1,111 @@
+import threading
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.workflow_kpis import WorkflowKpiEngine
+
+NOW = datetime(2025, 6, 15)
+
+FILTERS = [
+    {},
+    {'selected_aor': ['A'], 'selected_priority': ['High', 'Low']},
+    {'start_date': '2025-03-01', 'end_date': '2025-05-31', 'selected_products': ['p1']},
+]
+
+
+def make_data(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    created = pd.Timestamp('2025-01-01') + pd.to_timedelta(rng.integers(0, 150 * 1440, n), 'min')
+    closed = created + pd.to_timedelta(rng.integers(-600, 30 * 1440, n), 'min')
+    work_items = pd.DataFrame({
+        'WorkItemId': np.arange(n),
+        'CreatedOn': created,
+        'ClosedOn': pd.Series(closed).where(rng.random(n) < 0.9),
+        'WorkItemStatus': rng.choice(['Open', 'Closed', 'In Progress'], n),
+        'IsEscalated': rng.choice(['0', '1'], n),
+        'AssignedTo': rng.choice([f'user{i}' for i in range(40)] + [None], n),
+        'AorShortName': rng.choice(['A', 'B', 'C'], n),
+        'WorkItemDefinitionShortCode': rng.choice(['case_a', 'case_b'], n),
+        'Product': rng.choice(['p1', 'p2', None], n),
+        'Module': 'm1', 'Feature': 'f1', 'Issue': 'i1', 'CaseOrigin': 'email', 'CaseReason': 'r1',
+        'Priority': rng.choice(['High', 'Low', 'Medium'], n),
+    })
+    # Some tickets have several duration records, some none
+    duration_ids = rng.choice(work_items['WorkItemId'], int(n * 1.2))
+    duration_summary = pd.DataFrame({
+        'WorkItemId': duration_ids,
+        'OpenToClosed_Min': pd.Series(rng.integers(1, 5000, len(duration_ids)), dtype=np.float64)
+            .where(rng.random(len(duration_ids)) < 0.8),
+        'OpenToResolved_Min': rng.integers(1, 5000, len(duration_ids)).astype(np.float64),
+    })
+    return work_items, duration_summary
+
+
+def split(frame, parts):
+    bounds = np.linspace(0, len(frame), parts + 1).astype(int)
+    return [frame.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def card_values(totals):
+    return (totals.total_tickets, totals.open_tickets, totals.escalated_tickets, totals.closed_this_month,
+            totals.resolution_count, round(totals.resolution_total, 6), totals.active_assignees)
+
+
+def test_append_and_update_totals_match_full_rebuild():
+    work_items, duration_summary = make_data()
+    full = WorkflowKpiEngine(work_items, duration_summary)
+
+    # Tickets arrive in batches; their duration records mostly arrive in later batches
+    ticket_batches = split(work_items, 4)
+    duration_batches = split(duration_summary.sample(frac=1, random_state=1), 5)
+    engine = WorkflowKpiEngine(ticket_batches[0], duration_batches[0])
+    running = [engine.totals(filters, NOW) for filters in FILTERS]
+    for tickets, durations in zip(ticket_batches[1:] + [None], duration_batches[1:]):
+        engine.append(tickets if tickets is not None else pd.DataFrame(), durations)
+        for totals, filters in zip(running, FILTERS):
+            engine.update_totals(totals, filters)
+
+    for totals, filters in zip(running, FILTERS):
+        assert card_values(totals) == card_values(full.totals(filters, NOW))
+        assert card_values(engine.totals(filters, NOW)) == card_values(full.totals(filters, NOW))
+    np.testing.assert_allclose(engine.resolution_total, full.resolution_total)
+    np.testing.assert_array_equal(engine.resolution_count, full.resolution_count)
+
+
+def test_late_duration_updates_counted_rows():
+    work_items, _ = make_data(n=10)
+    closed = work_items[work_items['ClosedOn'] >= work_items['CreatedOn']]
+    engine = WorkflowKpiEngine(closed)
+    totals = engine.totals({}, NOW)
+    assert totals.resolution_count == 0
+
+    late = pd.DataFrame({'WorkItemId': closed['WorkItemId'].iloc[:2], 'OpenToClosed_Min': [60.0, 120.0],
+                         'OpenToResolved_Min': [np.nan, np.nan]})
+    assert engine.add_durations(late) == 2
+    engine.update_totals(totals, {})
+    assert (totals.resolution_count, totals.resolution_total) == (2, 180.0)
+    assert totals.avg_resolution_minutes == pytest.approx(90.0)
+
+
+def test_concurrent_reads_see_whole_appends():
+    work_items, duration_summary = make_data()
+    engine = WorkflowKpiEngine(work_items.iloc[:100], duration_summary)
+    errors = []
+
+    def read():
+        try:
+            for _ in range(200):
+                totals = engine.totals({'selected_aor': ['A']}, NOW)
+                assert totals.total_tickets <= len(engine)
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for batch in split(work_items.iloc[100:], 50):
+        engine.append(batch)
+    reader.join()
+    assert not errors